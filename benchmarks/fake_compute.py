@@ -0,0 +1,305 @@
+"""In-memory stand-in for ComputeManagementClient, used to benchmark the module without a network"""
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from azure.core.paging import ItemPaged
+from module_snapshot.infra import azure_cloud_services
+from module_snapshot.infra.credential_provider import CredentialProvider, get_credential_provider, set_credential_provider
+
+LOCATIONS = ("eastus", "westus", "brazilsouth", "westeurope")
+ENVIRONMENTS = ("prod", "dev", "qa")
+SNAPSHOT_TYPE = "Microsoft.Compute/snapshots"
+DISK_SIZES_GB = (32, 64, 128, 256, 512, 1024)
+SKUS = ("Standard_LRS", "Premium_LRS", "Standard_ZRS")
+
+
+@dataclass
+class BackendConfig:
+    """
+    Shape and behaviour of the simulated Azure backend.
+
+    Attributes:
+        snapshots_per_subscription (int): The number of snapshots generated for each subscription.
+        resource_groups (int): The number of resource groups the snapshots are spread across.
+        page_size (int): The number of snapshots returned per listing page.
+        latency_seconds (float): The time each request takes.
+        throttle_every (int): Answer every n-th request with a 429; 0 disables throttling.
+        retry_after_seconds (float): The Retry-After of the simulated 429 responses.
+        remaining_requests (int): The value of the x-ms-ratelimit-remaining-subscription-* headers.
+    """
+    snapshots_per_subscription: int = 100_000
+    resource_groups: int = 50
+    page_size: int = 1000
+    latency_seconds: float = 0.0
+    throttle_every: int = 0
+    retry_after_seconds: float = 0.0
+    remaining_requests: int = 11_999
+
+
+def snapshot_key(index: int, resource_groups: int) -> tuple:
+    """Returns the (resource group, name) of the index-th generated snapshot."""
+    return f"rg-{index % resource_groups:03d}", f"snap-{index:07d}"
+
+
+class FakeSnapshot:
+    """The attributes of azure.mgmt.compute.models.Snapshot read by the module."""
+
+    __slots__ = ("id", "name", "location", "tags", "type", "time_created", "creation_data", "disk_size_gb", "incremental",
+                 "sku")
+
+    def __init__(self, snapshot_id, name, location, tags, time_created, creation_data, disk_size_gb=None,
+                 incremental=None, sku=None):
+        self.id = snapshot_id
+        self.name = name
+        self.location = location
+        self.tags = tags
+        self.type = SNAPSHOT_TYPE
+        self.time_created = time_created
+        self.creation_data = creation_data
+        self.disk_size_gb = disk_size_gb
+        self.incremental = incremental
+        self.sku = sku
+
+
+class FakeHttpResponse:
+    """The parts of an azure-core HTTP response read by HttpResponseError and by the response hooks."""
+
+    content_type = "application/json"
+
+    def __init__(self, status_code, reason, headers):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+
+    def text(self, encoding=None):
+        """Returns the empty body of the response."""
+        return ""
+
+
+class FakePoller:
+    """A long-running operation that is already finished."""
+
+    def __init__(self, result=None):
+        self.__result = result
+
+    def result(self, timeout=None):
+        """Returns the result of the operation."""
+        return self.__result
+
+    def wait(self, timeout=None):
+        """Returns at once, the operation being finished."""
+        return None
+
+    def done(self):
+        """Returns True, the operation being finished."""
+        return True
+
+    def finished(self):
+        """Returns True, the operation being finished."""
+        return True
+
+    def status(self):
+        """Returns the final status of the operation."""
+        return "Succeeded"
+
+    def add_done_callback(self, callback):
+        """Calls the callback at once with the poller, which is also its own polling method."""
+        callback(self)
+
+
+class FakeComputeBackend:
+    """
+    The snapshots of every simulated subscription, generated on first use, and the request accounting.
+
+    Attributes:
+        config (BackendConfig): The shape and behaviour of the backend.
+        requests (int): The number of requests received, including the throttled ones.
+        throttled (int): The number of requests answered with a 429.
+    """
+
+    def __init__(self, config: BackendConfig = None):
+        self.config = config or BackendConfig()
+        self.requests = 0
+        self.throttled = 0
+        self.__subscriptions = {}
+        self.__lock = threading.Lock()
+
+    def snapshots(self, subscription_id: str) -> dict:
+        """
+        Returns the snapshots of a subscription keyed by (resource group, name) in lower case, generating them on
+        first use.
+
+        Args:
+            subscription_id (str): The subscription ID.
+
+        Returns:
+            dict: The FakeSnapshot objects of the subscription.
+        """
+        with self.__lock:
+            snapshots = self.__subscriptions.get(subscription_id)
+            if snapshots is None:
+                snapshots = self.__subscriptions[subscription_id] = self.__generate(subscription_id)
+
+        return snapshots
+
+    def __generate(self, subscription_id: str) -> dict:
+        """Builds a deterministic inventory for a subscription."""
+        config = self.config
+        created = datetime(2023, 1, 1, tzinfo=timezone.utc)
+        disks = max(config.snapshots_per_subscription // 4, 1)
+        snapshots = {}
+
+        for index in range(config.snapshots_per_subscription):
+            resource_group_name, name = snapshot_key(index, config.resource_groups)
+            prefix = f"/subscriptions/{subscription_id}/resourceGroups/{resource_group_name}/providers/Microsoft.Compute"
+            snapshots[(resource_group_name, name)] = FakeSnapshot(
+                f"{prefix}/snapshots/{name}",
+                name,
+                LOCATIONS[index % len(LOCATIONS)],
+                {"env": ENVIRONMENTS[index % len(ENVIRONMENTS)], "owner": f"team-{index % 20}"},
+                created + timedelta(minutes=index),
+                SimpleNamespace(source_resource_id=f"{prefix}/disks/disk-{index % disks}"),
+                DISK_SIZES_GB[index % len(DISK_SIZES_GB)],
+                index % 2 == 0,
+                SimpleNamespace(name=SKUS[index % len(SKUS)])
+            )
+
+        return snapshots
+
+    def request(self, kind: str, raw_response_hook=None) -> None:
+        """
+        Simulates the round trip of one request: latency, throttling and rate-limit headers.
+
+        Args:
+            kind (str): "reads", "writes" or "deletes", the suffix of the remaining-requests header.
+            raw_response_hook (callable): The azure-core hook called with the pipeline response.
+
+        Raises:
+            HttpResponseError: A 429 with Retry-After on every throttle_every-th request.
+        """
+        config = self.config
+
+        with self.__lock:
+            self.requests += 1
+            throttled = config.throttle_every and self.requests % config.throttle_every == 0
+            if throttled:
+                self.throttled += 1
+
+        if config.latency_seconds:
+            time.sleep(config.latency_seconds)
+
+        if throttled:
+            response = FakeHttpResponse(429, "Too Many Requests", {"retry-after": str(config.retry_after_seconds)})
+        else:
+            response = FakeHttpResponse(200, "OK", {f"x-ms-ratelimit-remaining-subscription-{kind}": str(config.remaining_requests)})
+
+        if raw_response_hook is not None:
+            raw_response_hook(SimpleNamespace(http_response=response))
+
+        if throttled:
+            raise HttpResponseError(response=response)
+
+
+class FakeSnapshotsOperations:
+    """The snapshots operation group of the fake client."""
+
+    def __init__(self, backend: FakeComputeBackend, subscription_id: str):
+        self.__backend = backend
+        self.__subscription_id = subscription_id
+
+    def __pager(self, snapshots, raw_response_hook):
+        """Serves a list of snapshots in pages of config.page_size, one simulated request per page."""
+        page_size = self.__backend.config.page_size
+
+        def get_next(continuation_token=None):
+            self.__backend.request("reads", raw_response_hook)
+            start = continuation_token or 0
+            return start, snapshots[start:start + page_size]
+
+        def extract_data(response):
+            start, page = response
+            next_token = start + page_size if start + page_size < len(snapshots) else None
+            return next_token, iter(page)
+
+        return ItemPaged(get_next, extract_data)
+
+    def __find(self, resource_group_name, snapshot_name):
+        snapshot = self.__backend.snapshots(self.__subscription_id).get((resource_group_name.lower(), snapshot_name.lower()))
+        if snapshot is None:
+            raise ResourceNotFoundError(f"The snapshot '{snapshot_name}' was not found.")
+
+        return snapshot
+
+    def list(self, raw_response_hook=None, **kwargs):
+        """Lists the snapshots of the subscription, one simulated request per page."""
+        return self.__pager(list(self.__backend.snapshots(self.__subscription_id).values()), raw_response_hook)
+
+    def list_by_resource_group(self, resource_group_name, raw_response_hook=None, **kwargs):
+        """Lists the snapshots of a resource group, one simulated request per page."""
+        resource_group_name = resource_group_name.lower()
+        snapshots = [snapshot for (name, _), snapshot in self.__backend.snapshots(self.__subscription_id).items()
+                     if name == resource_group_name]
+
+        return self.__pager(snapshots, raw_response_hook)
+
+    def get(self, resource_group_name, snapshot_name, raw_response_hook=None, **kwargs):
+        """Returns a snapshot, raising ResourceNotFoundError if it does not exist."""
+        self.__backend.request("reads", raw_response_hook)
+        return self.__find(resource_group_name, snapshot_name)
+
+    def begin_update(self, resource_group_name, snapshot_name, snapshot, raw_response_hook=None, **kwargs):
+        """Replaces the tags of a snapshot when the update carries some."""
+        self.__backend.request("writes", raw_response_hook)
+        stored = self.__find(resource_group_name, snapshot_name)
+        if snapshot.tags is not None:
+            stored.tags = dict(snapshot.tags)
+
+        return FakePoller(stored)
+
+    def begin_delete(self, resource_group_name, snapshot_name, raw_response_hook=None, **kwargs):
+        """Removes a snapshot, raising ResourceNotFoundError if it does not exist."""
+        self.__backend.request("deletes", raw_response_hook)
+        self.__find(resource_group_name, snapshot_name)
+        del self.__backend.snapshots(self.__subscription_id)[(resource_group_name.lower(), snapshot_name.lower())]
+
+        return FakePoller()
+
+
+class FakeComputeManagementClient:
+    """A ComputeManagementClient whose snapshots operations are served by a FakeComputeBackend."""
+
+    def __init__(self, backend: FakeComputeBackend, credential, subscription_id: str):
+        self.snapshots = FakeSnapshotsOperations(backend, subscription_id)
+
+    def close(self):
+        """Does nothing, the client holding no connection."""
+        return None
+
+
+@contextmanager
+def fake_azure(backend: FakeComputeBackend):
+    """
+    Routes every ComputeManagementClient built by the module to the backend, with a dummy credential.
+
+    Args:
+        backend (FakeComputeBackend): The simulated backend.
+
+    yields:
+        FakeComputeBackend: The backend.
+    """
+    original_client = azure_cloud_services.ComputeManagementClient
+    original_provider = get_credential_provider()
+
+    azure_cloud_services.ComputeManagementClient = \
+        lambda credential, subscription_id, **kwargs: FakeComputeManagementClient(backend, credential, subscription_id)
+    set_credential_provider(CredentialProvider(config=SimpleNamespace(), credential=object()))
+
+    try:
+        yield backend
+    finally:
+        azure_cloud_services.ComputeManagementClient = original_client
+        set_credential_provider(original_provider)
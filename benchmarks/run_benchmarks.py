@@ -0,0 +1,228 @@
+"""Measures the throughput, latency and memory of the snapshot services against the simulated backend.
+
+Usage:
+    python -m benchmarks.run_benchmarks --snapshots 100000 --latency-ms 2 --throttle-every 500 --workers 8
+"""
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from benchmarks.fake_compute import BackendConfig, FakeComputeBackend, fake_azure, snapshot_key
+from module_snapshot.infra.throttling import RateLimiter, RetryPolicy, Throttle
+from module_snapshot.services.az_snapshot_services import AzureSnapshot
+
+SUBSCRIPTION_ID = "00000000-0000-0000-0000-000000000000"
+SCENARIOS = ("list", "list-table", "get", "tag", "delete")
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    The measurements of one scenario.
+
+    Attributes:
+        scenario (str): The name of the scenario.
+        operations (int): The number of operations (snapshots for the listings).
+        errors (int): The number of operations that failed.
+        seconds (float): The wall-clock time of the scenario.
+        ops_per_second (float): The operations completed per second.
+        p50_ms (float): The median latency of a call (of a page for the listings), in milliseconds.
+        p99_ms (float): The 99th percentile latency, in milliseconds.
+        peak_memory_mb (float): The peak memory allocated during the scenario, in MiB.
+        requests (int): The requests received by the backend.
+        throttled (int): The requests answered with a 429.
+    """
+    scenario: str
+    operations: int
+    errors: int
+    seconds: float
+    ops_per_second: float
+    p50_ms: float
+    p99_ms: float
+    peak_memory_mb: float
+    requests: int
+    throttled: int
+
+
+def percentile(latencies: list, fraction: float) -> float:
+    """Returns a percentile of sorted latencies, in milliseconds, using the nearest rank."""
+    if not latencies:
+        return 0.0
+
+    return latencies[min(len(latencies) - 1, int(round(fraction * (len(latencies) - 1))))] * 1000
+
+
+def timed_calls(function, items, workers: int):
+    """Calls a function once per item on a thread pool and returns the latency and success of each call."""
+    def call(item):
+        started = time.perf_counter()
+        succeeded = function(item)
+        return time.perf_counter() - started, bool(succeeded)
+
+    if workers == 1:
+        return [call(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(call, items))
+
+
+def run_list(azure_snapshot: AzureSnapshot, items, workers: int):
+    """Streams the subscription listing and times each page."""
+    latencies, count = [], 0
+    started = time.perf_counter()
+
+    for page in azure_snapshot.iter_snapshot_pages_by_subscription_id(SUBSCRIPTION_ID):
+        now = time.perf_counter()
+        latencies.append(now - started)
+        count += len(page)
+        started = now
+
+    return count, 0, latencies
+
+
+def run_list_table(azure_snapshot: AzureSnapshot, items, workers: int):
+    """Builds a SnapshotTable of the whole subscription."""
+    started = time.perf_counter()
+    table = azure_snapshot.list_snapshot_by_subscription_id(SUBSCRIPTION_ID, as_table=True)
+
+    return len(table), 0, [time.perf_counter() - started]
+
+
+def run_get(azure_snapshot: AzureSnapshot, items, workers: int):
+    """Reads one snapshot per item."""
+    results = timed_calls(lambda item: azure_snapshot.get_snapshot(SUBSCRIPTION_ID, *item), items, workers)
+    return len(results), sum(not succeeded for _, succeeded in results), [latency for latency, _ in results]
+
+
+def run_tag(azure_snapshot: AzureSnapshot, items, workers: int):
+    """Updates the env tag of one snapshot per item."""
+    results = timed_calls(lambda item: azure_snapshot.update_snapshot_tag(SUBSCRIPTION_ID, *item, 'env', 'archived'),
+                          items, workers)
+    return len(results), sum(not succeeded for _, succeeded in results), [latency for latency, _ in results]
+
+
+def run_delete(azure_snapshot: AzureSnapshot, items, workers: int):
+    """Deletes one snapshot per item."""
+    results = timed_calls(lambda item: azure_snapshot.delete_snapshot(SUBSCRIPTION_ID, *item), items, workers)
+    return len(results), sum(not succeeded for _, succeeded in results), [latency for latency, _ in results]
+
+
+RUNNERS = {"list": run_list, "list-table": run_list_table, "get": run_get, "tag": run_tag, "delete": run_delete}
+
+
+def execute(scenario: str, config: BackendConfig, targets: list, workers: int, arm_limits: bool, trace_memory: bool):
+    """Runs a scenario once against a fresh simulated backend.
+
+     returns:
+         tuple: The backend, the result of the runner, the wall-clock seconds and the peak traced memory in bytes.
+    """
+    backend = FakeComputeBackend(config)
+    backend.snapshots(SUBSCRIPTION_ID)
+
+    limiter = RateLimiter() if arm_limits else RateLimiter({kind: (1e9, 1e9) for kind in ("read", "write", "delete")})
+    throttle = Throttle(limiter, RetryPolicy(max_attempts=10, backoff=0.01, max_backoff=1))
+    peak = 0
+
+    with fake_azure(backend), AzureSnapshot(throttle=throttle) as azure_snapshot:
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        outcome = RUNNERS[scenario](azure_snapshot, targets, workers)
+        seconds = time.perf_counter() - started
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    return backend, outcome, seconds, peak
+
+
+def run_scenario(scenario: str, config: BackendConfig, operations: int = 1000, workers: int = 1,
+                 arm_limits: bool = False, measure_memory: bool = True, seed: int = 0) -> BenchmarkResult:
+    """
+    Runs one scenario against a fresh simulated backend.
+
+    Timings come from a run without tracemalloc, whose hooks slow allocations down; the peak memory comes from a
+    second run on another fresh backend.
+
+    Args:
+        scenario (str): One of SCENARIOS.
+        config (BackendConfig): The shape and behaviour of the backend.
+        operations (int): The number of get, tag or delete calls.
+        workers (int): The number of threads issuing the calls.
+        arm_limits (bool): Whether to keep the ARM request limits of the throttle instead of lifting them.
+        measure_memory (bool): Whether to run the scenario a second time to measure the peak memory.
+        seed (int): The seed choosing the snapshots targeted by the calls.
+
+    Returns:
+        BenchmarkResult: The measurements.
+    """
+    if scenario not in RUNNERS:
+        raise ValueError(f"Unknown scenario '{scenario}'; expected one of {', '.join(SCENARIOS)}.")
+
+    keys = [snapshot_key(index, config.resource_groups) for index in range(config.snapshots_per_subscription)]
+    targets = random.Random(seed).sample(keys, min(operations, len(keys)))
+
+    backend, (count, errors, latencies), seconds, _ = execute(scenario, config, targets, workers, arm_limits, False)
+    peak = execute(scenario, config, targets, workers, arm_limits, True)[3] if measure_memory else 0
+
+    latencies.sort()
+
+    return BenchmarkResult(
+        scenario=scenario,
+        operations=count,
+        errors=errors,
+        seconds=round(seconds, 3),
+        ops_per_second=round(count / seconds, 1) if seconds else 0.0,
+        p50_ms=round(percentile(latencies, 0.50), 3),
+        p99_ms=round(percentile(latencies, 0.99), 3),
+        peak_memory_mb=round(peak / 2 ** 20, 2),
+        requests=backend.requests,
+        throttled=backend.throttled
+    )
+
+
+def main(argv=None) -> list:
+    """Parses the command line, runs the requested scenarios and prints their measurements."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of " + ", ".join(SCENARIOS))
+    parser.add_argument("--snapshots", type=int, default=100_000, help="snapshots in the simulated subscription")
+    parser.add_argument("--resource-groups", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated time of each request")
+    parser.add_argument("--throttle-every", type=int, default=0, help="answer every n-th request with a 429")
+    parser.add_argument("--retry-after", type=float, default=0.0, help="Retry-After of the simulated 429s, in seconds")
+    parser.add_argument("--operations", type=int, default=1000, help="calls of the get, tag and delete scenarios")
+    parser.add_argument("--workers", type=int, default=1, help="threads issuing the get, tag and delete calls")
+    parser.add_argument("--arm-limits", action="store_true", help="keep the ARM request limits of the throttle")
+    parser.add_argument("--skip-memory", action="store_true", help="do not run each scenario again to measure memory")
+    parser.add_argument("--json", action="store_true", help="print one JSON object per scenario")
+    args = parser.parse_args(argv)
+
+    config = BackendConfig(snapshots_per_subscription=args.snapshots, resource_groups=args.resource_groups,
+                           page_size=args.page_size, latency_seconds=args.latency_ms / 1000,
+                           throttle_every=args.throttle_every, retry_after_seconds=args.retry_after)
+    results = []
+
+    if not args.json:
+        print(f"{'scenario':<12}{'ops':>9}{'errors':>8}{'seconds':>10}{'ops/sec':>12}{'p50 ms':>10}{'p99 ms':>10}"
+              f"{'peak MiB':>10}{'requests':>10}{'429s':>7}")
+
+    for scenario in args.scenarios.split(","):
+        result = run_scenario(scenario.strip(), config, args.operations, args.workers, args.arm_limits, not args.skip_memory)
+        results.append(result)
+
+        if args.json:
+            print(json.dumps(asdict(result)))
+        else:
+            print(f"{result.scenario:<12}{result.operations:>9}{result.errors:>8}{result.seconds:>10}"
+                  f"{result.ops_per_second:>12}{result.p50_ms:>10}{result.p99_ms:>10}{result.peak_memory_mb:>10}"
+                  f"{result.requests:>10}{result.throttled:>7}")
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
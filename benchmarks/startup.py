@@ -0,0 +1,112 @@
+"""Measures the time to import the module and build an AzureSnapshot in a fresh interpreter, against a budget.
+
+Usage:
+    python -m benchmarks.startup --runs 5 --budget-ms 400
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import asdict, dataclass
+
+# Packages that must only be imported by the first real call, never by the import or the construction.
+DEFERRED_MODULES = ("azure.mgmt.compute", "azure.identity", "msal", "dynaconf", "pyarrow", "zstandard",
+                    "azure.mgmt.resourcegraph")
+
+DEFAULT_BUDGET_MS = 400.0
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from module_snapshot.services.az_snapshot_services import AzureSnapshot
+imported = time.perf_counter()
+AzureSnapshot()
+built = time.perf_counter()
+print(json.dumps({"import": imported - started, "startup": built - started,
+                  "loaded": [name for name in %r if name in sys.modules]}))
+"""
+
+
+@dataclass
+class StartupResult:
+    """
+    The measurements of the startup benchmark.
+
+    Attributes:
+        runs (int): The number of fresh interpreters measured.
+        import_ms (float): The median time to import az_snapshot_services, in milliseconds.
+        startup_ms (float): The median time to import it and build an AzureSnapshot, in milliseconds.
+        budget_ms (float): The maximum startup_ms allowed.
+        loaded (list): The DEFERRED_MODULES that were imported anyway.
+    """
+    runs: int
+    import_ms: float
+    startup_ms: float
+    budget_ms: float
+    loaded: list
+
+    @property
+    def within_budget(self) -> bool:
+        """Whether the startup fits the budget without importing any deferred module."""
+        return self.startup_ms <= self.budget_ms and not self.loaded
+
+
+def measure_startup(runs: int = 5, budget_ms: float = DEFAULT_BUDGET_MS) -> StartupResult:
+    """
+    Imports the module and builds an AzureSnapshot in fresh interpreters.
+
+    The interpreter's own start is not counted, only the import and the construction. No settings or credentials
+    are needed since neither may load them.
+
+    Args:
+        runs (int): The number of interpreters to start.
+        budget_ms (float): The maximum median startup time, in milliseconds.
+
+    Returns:
+        StartupResult: The median timings and the deferred modules that were imported.
+    """
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", PROBE % (DEFERRED_MODULES,)], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(output))
+
+    return StartupResult(
+        runs=runs,
+        import_ms=round(statistics.median(sample["import"] for sample in samples) * 1000, 1),
+        startup_ms=round(statistics.median(sample["startup"] for sample in samples) * 1000, 1),
+        budget_ms=budget_ms,
+        loaded=sorted({name for sample in samples for name in sample["loaded"]})
+    )
+
+
+def main(argv=None) -> StartupResult:
+    """Parses the command line, measures the startup and exits with status 1 when it is over budget."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to measure")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="maximum median startup time")
+    parser.add_argument("--json", action="store_true", help="print the result as a JSON object")
+    args = parser.parse_args(argv)
+
+    result = measure_startup(args.runs, args.budget_ms)
+
+    if args.json:
+        print(json.dumps(asdict(result)))
+    else:
+        print(f"import {result.import_ms} ms, import + AzureSnapshot() {result.startup_ms} ms "
+              f"(budget {result.budget_ms} ms, median of {result.runs})")
+        if result.loaded:
+            print(f"deferred modules imported at startup: {', '.join(result.loaded)}")
+
+    if not result.within_budget:
+        sys.exit(1)
+
+    return result
+
+
+if __name__ == "__main__":
+    main()
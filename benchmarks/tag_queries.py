@@ -0,0 +1,97 @@
+"""Measures the latency of TagIndex queries over a large synthetic inventory.
+
+Usage:
+    python -m benchmarks.tag_queries --snapshots 1000000 --repeat 200
+"""
+import argparse
+import json
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from module_snapshot.entities.tag_index import HasTag, TagIndex
+
+ENVIRONMENTS = ("prod", "staging", "dev", "test")
+TEAMS = 50
+
+
+def build_index(snapshots: int) -> TagIndex:
+    """Indexes snapshots tagged with an environment, an owning team and a unique ticket."""
+    index = TagIndex()
+    for number in range(snapshots):
+        index.add(f"/subscriptions/sub/resourceGroups/rg{number % 100}/providers/Microsoft.Compute/snapshots/s{number}",
+                  {"env": ENVIRONMENTS[number % len(ENVIRONMENTS)], "owner": f"team-{number % TEAMS:02d}",
+                   "ticket": f"T{number:08d}"})
+
+    return index
+
+
+QUERIES = {
+    "exact": lambda: HasTag("ticket", "T00012345"),
+    "exact-ignore-case": lambda: HasTag("TICKET", "t00012345", ignore_case=True),
+    "prefix": lambda: HasTag("ticket", "T0001234", prefix=True),
+    "and-not": lambda: HasTag("ticket", "T000123", prefix=True) & ~HasTag("env", "prod"),
+    "key-missing": lambda: HasTag("owner", "nobody"),
+}
+
+
+@dataclass
+class TagQueryResult:
+    """
+    The latency of one kind of query.
+
+    Attributes:
+        query (str): The name of the query in QUERIES.
+        matches (int): The number of matching snapshots.
+        median_us (float): The median latency of index.query(), in microseconds.
+    """
+    query: str
+    matches: int
+    median_us: float
+
+
+def measure_tag_queries(snapshots: int = 1000000, repeat: int = 200) -> list:
+    """
+    Builds an index and times each query of QUERIES after a first call that sorts the prefixes.
+
+    Args:
+        snapshots (int): The number of snapshots indexed.
+        repeat (int): The number of timed calls per query.
+
+    Returns:
+        list: A TagQueryResult per query.
+    """
+    index = build_index(snapshots)
+    results = []
+    for name, build_query in QUERIES.items():
+        query = build_query()
+        matches = len(index.query(query))
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            index.query(query)
+            samples.append(time.perf_counter() - started)
+        results.append(TagQueryResult(name, matches, round(statistics.median(samples) * 1e6, 1)))
+
+    return results
+
+
+def main(argv=None) -> list:
+    """Parses the command line and prints the latency of each query."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--snapshots", type=int, default=1000000, help="snapshots indexed")
+    parser.add_argument("--repeat", type=int, default=200, help="timed calls per query")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON lines")
+    args = parser.parse_args(argv)
+
+    results = measure_tag_queries(args.snapshots, args.repeat)
+    for result in results:
+        if args.json:
+            print(json.dumps(asdict(result)))
+        else:
+            print(f"{result.query:<18} {result.matches:>8} matches {result.median_us:>10.1f} us")
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""Command-line entry point running snapshot sweeps across many subscriptions.
+
+Usage:
+    module-snapshot list SUBSCRIPTION_ID ... [--location eastus] [--tag env=prod] [--fields resource_id tags]
+    module-snapshot get [RESOURCE_ID ...] [--input ids.txt]
+    module-snapshot tag [RESOURCE_ID ...] --set KEY=VALUE [--set KEY=VALUE ...]
+    module-snapshot delete [RESOURCE_ID ...] [--no-wait]
+    module-snapshot export SUBSCRIPTION_ID ... --output inventory.parquet
+
+IDs are read from the arguments, from --input files, or from the standard input when neither is given ("-" also
+names the standard input), one per line; blank lines and lines starting with "#" are skipped. Results are written
+as JSON lines as each chunk completes, and a progress line with the throughput is shown on stderr.
+"""
+import argparse
+import itertools
+import json
+import sys
+import time
+from contextlib import ExitStack
+from dataclasses import asdict
+from module_snapshot.entities.operation_result import OperationStatus
+from module_snapshot.entities.snapshot_filter import SNAPSHOT_FIELDS, SnapshotFilter
+from module_snapshot.services.az_snapshot_services import AzureSnapshot
+
+DEFAULT_JOBS = 8
+DEFAULT_CHUNK_SIZE = 500
+
+
+class Progress:
+    """
+    Shows how many items were processed, how many failed and the throughput on one rewritten line.
+
+    Methods:
+        update(done, failed): Adds processed items and redraws the line at most every interval seconds.
+        close(): Draws the final line.
+    """
+
+    def __init__(self, label: str, stream=None, enabled: bool = None, interval: float = 0.2) -> None:
+        """
+        Args:
+            label (str): The name of the operation shown at the start of the line.
+            stream: The text stream to draw on; sys.stderr by default.
+            enabled (bool): Whether to draw; by default only when the stream is a terminal.
+            interval (float): The minimum number of seconds between two redraws.
+        """
+        self.label = label
+        self.stream = stream or sys.stderr
+        self.enabled = enabled if enabled is not None else self.stream.isatty()
+        self.interval = interval
+        self.done = 0
+        self.failed = 0
+        self.__started = time.monotonic()
+        self.__drawn = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Returns the number of items processed per second so far."""
+        elapsed = time.monotonic() - self.__started
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def update(self, done: int = 0, failed: int = 0) -> None:
+        """Adds processed items, failed ones included, and redraws the line if the interval elapsed."""
+        self.done += done
+        self.failed += failed
+        if self.enabled and time.monotonic() - self.__drawn >= self.interval:
+            self.__draw("\r")
+
+    def close(self) -> None:
+        """Draws the final line."""
+        if self.enabled:
+            self.__draw("\r")
+            self.stream.write("\n")
+            self.stream.flush()
+
+    def __draw(self, prefix: str) -> None:
+        self.__drawn = time.monotonic()
+        self.stream.write(f"{prefix}{self.label}: {self.done} done, {self.failed} failed, {self.rate:.1f}/s")
+        self.stream.flush()
+
+
+def read_ids(values: list, inputs: list, stdin=None):
+    """
+    Yields the IDs given as arguments, then those of the input files, lazily.
+
+    Args:
+        values (list): The IDs given on the command line.
+        inputs (list): Files holding one ID per line; "-" is the standard input.
+        stdin: The standard input stream; sys.stdin by default.
+
+    Yields:
+        str: The IDs, stripped, without blank and comment lines. The standard input is read when no ID and no
+        file are given.
+    """
+    stdin = stdin or sys.stdin
+    if not values and not inputs:
+        inputs = ["-"]
+
+    yield from values
+    for path in inputs:
+        if path == "-":
+            yield from id_lines(stdin)
+            continue
+
+        with open(path, encoding="utf-8") as file:
+            yield from id_lines(file)
+
+
+def id_lines(file):
+    """Yields the stripped lines of a file of IDs, without blank and comment lines."""
+    for line in file:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+
+def chunks(iterable, size: int):
+    """Yields lists of at most size consecutive items of an iterable."""
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def key_value(value: str) -> tuple:
+    """
+    Parses a KEY=VALUE argument.
+
+    Raises:
+        argparse.ArgumentTypeError: If the argument has no "=" or no key.
+    """
+    key, separator, tag_value = value.partition("=")
+    if not separator or not key:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got '{value}'")
+
+    return key, tag_value
+
+
+def result_to_dict(result) -> dict:
+    """Converts an OperationResult into a JSON-serializable dict."""
+    row = {"resource_id": result.resource_id, "status": result.status.value,
+           "error": str(result.error) if result.error is not None else None}
+    if getattr(result, "snapshot", None) is not None:
+        row["snapshot"] = asdict(result.snapshot)
+    if getattr(result, "duration_seconds", None) is not None:
+        row["duration_seconds"] = result.duration_seconds
+
+    return row
+
+
+def write_line(output, row: dict) -> None:
+    """Writes one JSON line."""
+    output.write(json.dumps(row, default=str) + "\n")
+
+
+def run_list(azure_snapshot: AzureSnapshot, args, output, progress: Progress) -> int:
+    """Streams the snapshots of the subscriptions as JSON lines, page by page as the subscriptions are listed."""
+    snapshot_filter = None
+    if args.resource_group or args.location or args.tag:
+        snapshot_filter = SnapshotFilter(resource_groups=args.resource_group, locations=args.location,
+                                         tags=dict(args.tag) if args.tag else None)
+
+    subscription_ids = list(dict.fromkeys(read_ids(args.subscription_ids, args.input)))
+    pages = azure_snapshot.iter_snapshot_pages_across_subscriptions(subscription_ids, snapshot_filter, args.fields, args.jobs)
+    failed = 0
+
+    try:
+        for subscription_id, page, exception in pages:
+            if exception is not None:
+                write_line(output, {"subscription_id": subscription_id, "status": OperationStatus.ERROR.value,
+                                    "error": str(exception)})
+                failed += 1
+                progress.update(failed=1)
+                continue
+
+            for snapshot in page:
+                write_line(output, {field: getattr(snapshot, field) for field in args.fields} if args.fields else asdict(snapshot))
+            output.flush()
+            progress.update(done=len(page))
+    finally:
+        pages.close()
+
+    return 1 if failed else 0
+
+
+def run_batches(args, output, progress: Progress, run_chunk) -> int:
+    """Runs a bulk operation on the input IDs chunk by chunk and writes each result as a JSON line."""
+    failed = 0
+    for chunk in chunks(read_ids(args.resource_ids, args.input), args.chunk_size):
+        results = run_chunk(chunk)
+        chunk_failed = 0
+        for result in results:
+            write_line(output, result_to_dict(result))
+            if result.status not in (OperationStatus.SUCCESS, OperationStatus.IN_PROGRESS):
+                chunk_failed += 1
+        output.flush()
+        failed += chunk_failed
+        progress.update(done=len(results), failed=chunk_failed)
+
+    return 1 if failed else 0
+
+
+def run_get(azure_snapshot: AzureSnapshot, args, output, progress: Progress) -> int:
+    """Reads the snapshots of the input IDs."""
+    return run_batches(args, output, progress,
+                       lambda chunk: list(azure_snapshot.get_snapshots(chunk, args.jobs).values()))
+
+
+def run_tag(azure_snapshot: AzureSnapshot, args, output, progress: Progress) -> int:
+    """Updates existing tags of the snapshots of the input IDs."""
+    tag_changes = dict(args.set)
+    return run_batches(args, output, progress,
+                       lambda chunk: azure_snapshot.update_snapshot_tags([(resource_id, tag_changes) for resource_id in chunk], args.jobs))
+
+
+def run_delete(azure_snapshot: AzureSnapshot, args, output, progress: Progress) -> int:
+    """Deletes the snapshots of the input IDs."""
+    return run_batches(args, output, progress,
+                       lambda chunk: azure_snapshot.delete_snapshots(chunk, args.jobs, wait=not args.no_wait))
+
+
+def run_export(azure_snapshot: AzureSnapshot, args, output, progress: Progress) -> int:
+    """Exports the snapshots of the subscriptions into a file and writes a summary line."""
+    subscription_ids = list(dict.fromkeys(read_ids(args.subscription_ids, args.input)))
+    result = azure_snapshot.export_snapshots(subscription_ids, args.output, args.format, args.compression,
+                                             fields=args.fields, batch_size=args.batch_size, max_workers=args.jobs)
+    if result is None:
+        write_line(output, {"path": args.output, "status": OperationStatus.ERROR.value})
+        return 1
+
+    write_line(output, {"path": result.path, "rows": result.rows, "batches": result.batches,
+                        "failures": {subscription_id: str(error) for subscription_id, error in result.failures.items()}})
+    progress.update(done=result.rows, failed=len(result.failures))
+
+    return 0 if result.succeeded else 1
+
+
+COMMANDS = {"list": run_list, "get": run_get, "tag": run_tag, "delete": run_delete, "export": run_export}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Builds the parser of the command line."""
+    parser = argparse.ArgumentParser(prog="module-snapshot", description=__doc__.splitlines()[0])
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--jobs", "-j", type=int, default=DEFAULT_JOBS, help="operations or listings run at the same time")
+    common.add_argument("--input", "-i", action="append", default=[], metavar="FILE",
+                        help="file of IDs, one per line; '-' is the standard input")
+    common.add_argument("--progress", action=argparse.BooleanOptionalAction, default=None,
+                        help="show the progress line on stderr (default: when stderr is a terminal)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    listing = commands.add_parser("list", parents=[common], help="stream the snapshots of subscriptions as JSON lines")
+    listing.add_argument("subscription_ids", nargs="*")
+    listing.add_argument("--resource-group", action="append", help="only this resource group (repeatable)")
+    listing.add_argument("--location", action="append", help="only this location (repeatable)")
+    listing.add_argument("--tag", action="append", type=key_value, metavar="KEY=VALUE", help="only snapshots with this tag (repeatable)")
+    listing.add_argument("--fields", nargs="+", choices=SNAPSHOT_FIELDS, help="fields to output")
+    listing.add_argument("--output", "-o", default="-", help="output file (default: stdout)")
+
+    for name, description in (("get", "read snapshots"), ("tag", "update existing tags"), ("delete", "delete snapshots")):
+        command = commands.add_parser(name, parents=[common], help=f"{description} from their resource IDs")
+        command.add_argument("resource_ids", nargs="*")
+        command.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                             help="IDs read and processed at once; results are written after each chunk")
+        command.add_argument("--output", "-o", default="-", help="output file (default: stdout)")
+    commands.choices["tag"].add_argument("--set", action="append", type=key_value, required=True, metavar="KEY=VALUE",
+                                         help="new value of an existing tag (repeatable)")
+    commands.choices["delete"].add_argument("--no-wait", action="store_true",
+                                            help="return once the deletions are accepted")
+
+    export = commands.add_parser("export", parents=[common], help="export the snapshots of subscriptions to a file")
+    export.add_argument("subscription_ids", nargs="*")
+    export.add_argument("--output", "-o", required=True, help="JSONL, CSV or Parquet file, e.g. inventory.csv.gz")
+    export.add_argument("--format", choices=("jsonl", "csv", "parquet"), help="inferred from the output by default")
+    export.add_argument("--compression", choices=("gzip", "zstd"), help="inferred from the output by default")
+    export.add_argument("--fields", nargs="+", choices=SNAPSHOT_FIELDS, help="fields to export")
+    export.add_argument("--batch-size", type=int, default=10000, help="rows written at once")
+
+    return parser
+
+
+def main(argv=None, azure_snapshot: AzureSnapshot = None) -> int:
+    """
+    Parses the command line and runs the command.
+
+    Args:
+        argv (list): The arguments; sys.argv by default.
+        azure_snapshot (AzureSnapshot): The service to use; a new one by default.
+
+    Returns:
+        int: 0 when every operation succeeded, 1 otherwise (2 for invalid arguments, through argparse).
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.jobs < 1 or getattr(args, "chunk_size", 1) < 1 or getattr(args, "batch_size", 1) < 1:
+        parser.error("--jobs, --chunk-size and --batch-size must be greater than zero")
+
+    output_path = "-" if args.command == "export" else args.output
+
+    with ExitStack() as stack:
+        if azure_snapshot is None:
+            azure_snapshot = stack.enter_context(AzureSnapshot())
+        output = sys.stdout if output_path == "-" else stack.enter_context(open(output_path, "w", encoding="utf-8"))
+        progress = Progress(args.command, enabled=args.progress)
+        stack.callback(progress.close)
+
+        return COMMANDS[args.command](azure_snapshot, args, output, progress)
+
+
+def run() -> None:
+    """Console script entry point."""
+    sys.exit(main())
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,14 @@
+"""Model for the result of an inventory export."""
+from dataclasses import dataclass, field
+
+@dataclass
+class ExportResult:
+    path: str
+    rows: int = 0
+    batches: int = 0
+    failures: dict = field(default_factory=dict)
+
+    @property
+    def succeeded(self) -> bool:
+        """Returns True when every subscription was exported."""
+        return not self.failures
@@ -0,0 +1,180 @@
+"""Model and single-pass aggregation of the size and count of snapshot inventories."""
+import time
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from module_snapshot.entities.snapshot_table import date_to_epoch
+
+SUBSCRIPTION = "subscription_id"
+RESOURCE_GROUP = "resource_group"
+LOCATION = "location"
+SKU = "sku"
+AGE = "age"
+TAG_PREFIX = "tag:"
+DIMENSIONS = (SUBSCRIPTION, RESOURCE_GROUP, LOCATION, SKU, AGE)
+
+# Upper bounds, in days, of the age buckets; a last bucket holds the older snapshots.
+AGE_BUCKETS_DAYS = (7, 30, 90, 180, 365)
+
+SECONDS_PER_DAY = 86400
+
+
+def age_bucket_labels(bounds_days) -> tuple:
+    """Returns the labels of the age buckets, e.g. ("<7d", "7-30d", ">=30d") for the bounds (7, 30)."""
+    bounds_days = tuple(bounds_days)
+    if not bounds_days:
+        return ("all",)
+
+    labels = [f"<{bounds_days[0]}d"]
+    labels.extend(f"{low}-{high}d" for low, high in zip(bounds_days, bounds_days[1:]))
+    labels.append(f">={bounds_days[-1]}d")
+
+    return tuple(labels)
+
+
+def dimension_fields(dimensions) -> tuple:
+    """Returns the SnapshotModel fields read to aggregate by the given dimensions."""
+    fields = {"disk_size_gb"}
+    for dimension in dimensions:
+        if dimension == RESOURCE_GROUP:
+            fields.update((SUBSCRIPTION, "resource_group_name"))
+        elif dimension == AGE:
+            fields.add("created_date")
+        elif dimension.startswith(TAG_PREFIX):
+            fields.add("tags")
+        else:
+            fields.add(dimension)
+
+    return tuple(sorted(fields))
+
+
+@dataclass
+class SizeTotals:
+    count: int = 0
+    size_gb: int = 0
+    unknown_size: int = 0
+
+    def add(self, count: int, size_gb: int, unknown_size: int) -> None:
+        """Adds the totals of one snapshot or of a group of snapshots."""
+        self.count += count
+        self.size_gb += size_gb
+        self.unknown_size += unknown_size
+
+
+@dataclass
+class InventorySummary:
+    total: SizeTotals = field(default_factory=SizeTotals)
+    groups: dict = field(default_factory=dict)
+    failures: dict = field(default_factory=dict)
+
+    @property
+    def succeeded(self) -> bool:
+        """Returns True when every subscription was aggregated."""
+        return not self.failures
+
+    def by(self, dimension: str) -> dict:
+        """Returns the SizeTotals per value of a dimension, largest size first."""
+        totals = self.groups[dimension]
+        return dict(sorted(totals.items(), key=lambda item: (-item[1].size_gb, -item[1].count)))
+
+    def to_rows(self) -> list:
+        """Returns one dict per dimension and value, e.g. to be written as CSV."""
+        return [{"dimension": dimension, "value": value, "count": totals.count, "size_gb": totals.size_gb,
+                 "unknown_size": totals.unknown_size}
+                for dimension in self.groups for value, totals in self.by(dimension).items()]
+
+
+class InventoryAggregator:
+    """
+    Aggregates the count and the total disk size of snapshots by several dimensions in a single pass.
+
+    The dimensions are "subscription_id", "resource_group" (a (subscription_id, resource_group_name) pair, as
+    resource group names repeat across subscriptions), "location", "sku", "age" (the label of the age bucket) and
+    "tag:<key>" (the value of a tag, None when the snapshot does not have it). Snapshots without a known size are
+    counted in unknown_size.
+
+    Methods:
+        add(snapshot): Adds one SnapshotModel.
+        add_all(snapshots): Adds every SnapshotModel of an iterable.
+        add_group(keys, count, size_gb, unknown_size): Adds snapshots already grouped by every dimension.
+        summary(): Returns the InventorySummary.
+
+    A SnapshotTable is aggregated on its dictionary codes with SnapshotTable.summarize(aggregator).
+    """
+
+    def __init__(self, dimensions=DIMENSIONS, age_buckets_days=AGE_BUCKETS_DAYS, now: float = None) -> None:
+        """
+        Args:
+            dimensions (iterable): The dimensions to group by.
+            age_buckets_days (iterable): The increasing upper bounds of the age buckets, in days.
+            now (float): The epoch the ages are computed from; the current time by default.
+
+        Raises:
+            ValueError: If a dimension is unknown.
+        """
+        self.dimensions = tuple(dimensions)
+        for dimension in self.dimensions:
+            if dimension not in DIMENSIONS and not (dimension.startswith(TAG_PREFIX) and len(dimension) > len(TAG_PREFIX)):
+                raise ValueError(f"Unknown dimension '{dimension}'; expected one of {', '.join(DIMENSIONS)} or 'tag:<key>'.")
+
+        self.age_bounds = tuple(int(days * SECONDS_PER_DAY) for days in age_buckets_days)
+        self.age_labels = age_bucket_labels(age_buckets_days)
+        self.now = int(now if now is not None else time.time())
+        self.fields = dimension_fields(self.dimensions)
+        self.__summary = InventorySummary(groups={dimension: {} for dimension in self.dimensions})
+        self.__key_getters = [self.__key_getter(dimension) for dimension in self.dimensions]
+
+    def age_index(self, created_epoch: int) -> int:
+        """Returns the index of the age bucket of a creation time in age_labels."""
+        return bisect_right(self.age_bounds, self.now - created_epoch)
+
+    def age_label(self, created_epoch: int) -> str:
+        """Returns the label of the age bucket of a creation time."""
+        return self.age_labels[self.age_index(created_epoch)]
+
+    def __key_getter(self, dimension: str):
+        """Returns the function reading the value of a dimension from a SnapshotModel."""
+        if dimension == RESOURCE_GROUP:
+            return lambda snapshot: (snapshot.subscription_id, snapshot.resource_group_name)
+        if dimension == AGE:
+            return lambda snapshot: self.age_label(date_to_epoch(snapshot.created_date))
+        if dimension.startswith(TAG_PREFIX):
+            tag_key = dimension[len(TAG_PREFIX):]
+            return lambda snapshot: snapshot.tags.get(tag_key) if snapshot.tags else None
+
+        return lambda snapshot: getattr(snapshot, dimension)
+
+    def add_group(self, keys: tuple, count: int, size_gb: int, unknown_size: int) -> None:
+        """
+        Adds snapshots sharing the same value for every dimension.
+
+        Args:
+            keys (tuple): The value of each dimension, in the order of the dimensions.
+            count (int): The number of snapshots.
+            size_gb (int): Their total known size.
+            unknown_size (int): How many of them have no known size.
+        """
+        groups = self.__summary.groups
+        for dimension, key in zip(self.dimensions, keys):
+            totals = groups[dimension].get(key)
+            if totals is None:
+                totals = groups[dimension][key] = SizeTotals()
+            totals.add(count, size_gb, unknown_size)
+
+        self.__summary.total.add(count, size_gb, unknown_size)
+
+    def add(self, snapshot) -> None:
+        """Adds one SnapshotModel."""
+        size = snapshot.disk_size_gb
+        self.add_group(tuple(getter(snapshot) for getter in self.__key_getters), 1,
+                       size or 0, 1 if size is None else 0)
+
+    def add_all(self, snapshots) -> "InventoryAggregator":
+        """Adds every SnapshotModel of an iterable, e.g. a streamed listing, and returns the aggregator."""
+        for snapshot in snapshots:
+            self.add(snapshot)
+
+        return self
+
+    def summary(self) -> InventorySummary:
+        """Returns the totals aggregated so far."""
+        return self.__summary
@@ -0,0 +1,12 @@
+"""Model for the result of a listing spanning several subscriptions."""
+from dataclasses import dataclass, field
+
+@dataclass
+class MultiSubscriptionListing:
+    snapshots: list = field(default_factory=list)
+    failures: dict = field(default_factory=dict)
+
+    @property
+    def succeeded(self) -> bool:
+        """Returns True when every subscription was listed."""
+        return not self.failures
@@ -0,0 +1,48 @@
+"""Model for the result of an operation on one snapshot."""
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+
+class OperationStatus(str, Enum):
+    SUCCESS = "success"
+    TAG_NOT_FOUND = "tag_not_found"
+    NOT_FOUND = "not_found"
+    IN_PROGRESS = "in_progress"
+    CONFLICT = "conflict"
+    ERROR = "error"
+
+@dataclass
+class OperationResult:
+    resource_id: str
+    status: OperationStatus
+    error: Exception = None
+
+    @property
+    def succeeded(self) -> bool:
+        """Returns True when the operation succeeded."""
+        return self.status is OperationStatus.SUCCESS
+
+
+@dataclass
+class GetResult(OperationResult):
+    snapshot: object = None
+
+
+@dataclass
+class TagPatchResult(OperationResult):
+    tags: dict = None
+
+
+@dataclass
+class DeleteResult(OperationResult):
+    started_at: datetime = None
+    completed_at: datetime = None
+    poller: object = None
+
+    @property
+    def duration_seconds(self) -> float:
+        """Returns how long the deletion took, or None if it did not complete."""
+        if self.started_at is None or self.completed_at is None:
+            return None
+
+        return (self.completed_at - self.started_at).total_seconds()
@@ -0,0 +1,29 @@
+"""Models for retention policies and the plans they produce."""
+from dataclasses import dataclass, field
+
+@dataclass
+class RetentionPolicy:
+    max_age_days: float = None
+    keep_last_per_source: int = None
+    exempt_tags: dict = field(default_factory=dict)
+
+@dataclass
+class RetentionDecision:
+    snapshot: object
+    reason: str
+
+@dataclass
+class RetentionPlan:
+    evaluated_at: str
+    to_delete: list = field(default_factory=list)
+    to_keep: list = field(default_factory=list)
+
+    def summary(self) -> dict:
+        """Returns the number of snapshots per action and reason."""
+        counts = {}
+        for action, decisions in (("delete", self.to_delete), ("keep", self.to_keep)):
+            for decision in decisions:
+                key = f"{action}:{decision.reason}"
+                counts[key] = counts.get(key, 0) + 1
+
+        return counts
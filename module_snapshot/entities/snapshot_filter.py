@@ -0,0 +1,104 @@
+"""Model for the criteria used to filter snapshot listings."""
+from dataclasses import dataclass, fields as dataclass_fields
+from datetime import datetime
+from module_snapshot.entities.snapshot_model import SnapshotModel
+from module_snapshot.entities.snapshot_table import date_to_epoch, datetime_to_epoch
+
+SNAPSHOT_FIELDS = tuple(field.name for field in dataclass_fields(SnapshotModel))
+
+
+def validate_fields(fields) -> None:
+    """Checks that a projection only names SnapshotModel fields.
+
+     Args:
+         fields(iterable): The requested field names, or None for every field.
+
+     Raises:
+         ValueError: If a field is not a SnapshotModel field.
+    """
+    for field in fields or ():
+        if field not in SNAPSHOT_FIELDS:
+            raise ValueError(f"'{field}' is not a SnapshotModel field.")
+
+
+@dataclass
+class SnapshotFilter:
+    resource_groups: set = None
+    locations: set = None
+    tags: dict = None
+    created_after: datetime = None
+    created_before: datetime = None
+
+    def __post_init__(self):
+        self.__resource_groups = {name.lower() for name in self.resource_groups} if self.resource_groups else None
+        self.__locations = {location.lower() for location in self.locations} if self.locations else None
+        self.__after = datetime_to_epoch(self.created_after) if self.created_after is not None else None
+        self.__before = datetime_to_epoch(self.created_before) if self.created_before is not None else None
+
+    def accepts_resource_group(self, resource_group_name: str) -> bool:
+        """Checks the resource group criterion, ignoring case as Azure does."""
+        return self.__resource_groups is None or resource_group_name.lower() in self.__resource_groups
+
+    def matches(self, resource_group_name: str, location: str, tags: dict, created_epoch) -> bool:
+        """Checks every criterion against the raw values of a snapshot.
+
+         Args:
+             resource_group_name(str): The name of the resource group.
+             location(str): The location of the snapshot.
+             tags(dict): The tags of the snapshot. A criterion value of None only requires the key, a callable is
+                 called with the tag value, and any other value must be equal.
+             created_epoch(callable): A function returning the creation time in epoch seconds, only called when a
+                 date criterion is set.
+
+         returns:
+             bool: True if the snapshot matches every criterion.
+        """
+        if not self.accepts_resource_group(resource_group_name):
+            return False
+
+        if self.__locations is not None and (location or "").lower() not in self.__locations:
+            return False
+
+        for tag_key, expected in (self.tags or {}).items():
+            if not tags or tag_key not in tags:
+                return False
+            if expected is not None and not (expected(tags[tag_key]) if callable(expected) else tags[tag_key] == expected):
+                return False
+
+        if self.__after is not None or self.__before is not None:
+            created = created_epoch()
+            if self.__after is not None and created < self.__after:
+                return False
+            if self.__before is not None and created >= self.__before:
+                return False
+
+        return True
+
+    def matches_azure_snapshot(self, resource_group_name: str, snapshot) -> bool:
+        """Checks every criterion against a Snapshot object returned by the Azure SDK."""
+        return self.matches(resource_group_name, snapshot.location, snapshot.tags,
+                            lambda: datetime_to_epoch(snapshot.time_created))
+
+    def matches_model(self, snapshot: SnapshotModel) -> bool:
+        """Checks every criterion against a SnapshotModel."""
+        return self.matches(snapshot.resource_group_name, snapshot.location, snapshot.tags,
+                            lambda: date_to_epoch(snapshot.created_date))
+
+
+def project_model(snapshot: SnapshotModel, fields) -> SnapshotModel:
+    """Returns a copy of a SnapshotModel holding only the requested fields.
+
+     Args:
+         snapshot(SnapshotModel): The complete snapshot.
+         fields(list): The fields to keep, or None to keep every field.
+
+     returns:
+         SnapshotModel: The projected snapshot; the other fields are None.
+    """
+    if fields is None:
+        return snapshot
+
+    values = dict.fromkeys(SNAPSHOT_FIELDS)
+    values.update((field, getattr(snapshot, field)) for field in fields)
+
+    return SnapshotModel(**values)
@@ -10,4 +10,8 @@ class SnapshotModel:
     location: str
     tags: dict
     resource_type: str
-    created_date: str
\ No newline at end of file
+    created_date: str
+    source_resource_id: str = None
+    disk_size_gb: int = None
+    incremental: bool = None
+    sku: str = None
@@ -0,0 +1,406 @@
+"""Columnar container for large snapshot inventories."""
+import calendar
+import time
+from array import array
+from collections import Counter
+from datetime import datetime
+from module_snapshot.entities.snapshot_model import SnapshotModel
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+ENCODED_COLUMNS = ("subscription_id", "resource_group_name", "location", "resource_type", "source_resource_id", "sku")
+PLAIN_COLUMNS = ("resource_id", "snapshot_name")
+# Integer columns and their array typecodes; NULL stands for None.
+NUMERIC_COLUMNS = {"disk_size_gb": "q", "incremental": "b"}
+NULL = -1
+
+
+def date_to_epoch(created_date: str) -> int:
+    """Converts a "%Y-%m-%d %H:%M:%S" UTC date into epoch seconds."""
+    return calendar.timegm(datetime.fromisoformat(created_date).timetuple())
+
+
+def datetime_to_epoch(value: datetime) -> int:
+    """Converts a datetime into epoch seconds, reading naive datetimes as UTC."""
+    return calendar.timegm(value.utctimetuple())
+
+
+def epoch_to_date(epoch: int) -> str:
+    """Converts epoch seconds into a "%Y-%m-%d %H:%M:%S" UTC date."""
+    return time.strftime(DATE_FORMAT, time.gmtime(epoch))
+
+
+def encode_number(value) -> int:
+    """Encodes the value of a numeric column, None becoming NULL."""
+    return NULL if value is None else int(value)
+
+
+def decode_number(name: str, value: int):
+    """Decodes the value of a numeric column: None for NULL, a bool for "incremental"."""
+    if value == NULL:
+        return None
+
+    return bool(value) if name == "incremental" else value
+
+
+class Dictionary:
+    """A dictionary encoding that maps each distinct value to a small integer code."""
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def encode(self, value) -> int:
+        """Returns the code of a value, assigning a new one the first time the value is seen."""
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+
+        return code
+
+
+class SnapshotTable:
+    """
+    A compact, columnar container of snapshots.
+
+    Repeated strings (subscription, resource group, location, type, source disk, SKU) are dictionary-encoded into
+    arrays of integer codes, sizes and the incremental flag are stored in integer arrays, created dates are stored as
+    epoch seconds, and tags are encoded as shared tag sets: every
+    distinct (key, value) pair and every distinct combination of pairs is stored once. Tables derived with filter(),
+    sort_by() or group_by() share the dictionaries of the table they come from.
+
+    Methods:
+        from_models(snapshots): Builds a table from SnapshotModel objects.
+        to_models(): Returns the rows as SnapshotModel objects.
+        add(...): Appends one row from raw values.
+        filter(...): Returns the rows matching every given criterion.
+        sort_by(column): Returns the rows ordered by a column.
+        group_by(column): Splits the table by the values of a column.
+        count_by(column): Counts the rows per value of a column.
+        summarize(aggregator): Adds the sizes and counts of the rows to an InventoryAggregator.
+    """
+
+    def __init__(self, dictionaries: dict = None) -> None:
+        """
+        Creates an empty table.
+
+        Args:
+            dictionaries (dict): Dictionaries to share with another table; new ones are created when omitted.
+        """
+        self.__dictionaries = dictionaries or {name: Dictionary() for name in (*ENCODED_COLUMNS, "tag_pair", "tag_set")}
+        self.__codes = {name: array("I") for name in ENCODED_COLUMNS}
+        self.__plain = {name: [] for name in PLAIN_COLUMNS}
+        self.__numbers = {name: array(typecode) for name, typecode in NUMERIC_COLUMNS.items()}
+        self.__created = array("q")
+        self.__tag_sets = array("I")
+
+    @classmethod
+    def from_models(cls, snapshots) -> "SnapshotTable":
+        """
+        Builds a table from SnapshotModel objects.
+
+        Args:
+            snapshots (iterable): The SnapshotModel objects.
+
+        Returns:
+            SnapshotTable: The table holding every snapshot.
+        """
+        table = cls()
+        for snapshot in snapshots:
+            table.add(snapshot.subscription_id, snapshot.resource_group_name, snapshot.resource_id,
+                      snapshot.snapshot_name, snapshot.location, snapshot.tags, snapshot.resource_type,
+                      date_to_epoch(snapshot.created_date), snapshot.source_resource_id, snapshot.disk_size_gb,
+                      snapshot.incremental, snapshot.sku)
+
+        return table
+
+    def add(self, subscription_id, resource_group_name, resource_id, snapshot_name, location, tags, resource_type,
+            created_epoch, source_resource_id=None, disk_size_gb=None, incremental=None, sku=None) -> None:
+        """
+        Appends one row from raw values, without building a SnapshotModel.
+
+        Args:
+            created_epoch (int): The creation time in epoch seconds. The other arguments are the SnapshotModel fields.
+        """
+        dictionaries = self.__dictionaries
+        for name, value in (("subscription_id", subscription_id), ("resource_group_name", resource_group_name),
+                            ("location", location), ("resource_type", resource_type),
+                            ("source_resource_id", source_resource_id), ("sku", sku)):
+            self.__codes[name].append(dictionaries[name].encode(value))
+
+        self.__numbers["disk_size_gb"].append(encode_number(disk_size_gb))
+        self.__numbers["incremental"].append(encode_number(incremental))
+
+        self.__plain["resource_id"].append(resource_id)
+        self.__plain["snapshot_name"].append(snapshot_name)
+        self.__created.append(created_epoch)
+
+        tag_pairs = dictionaries["tag_pair"]
+        tag_set = None if tags is None else tuple(sorted(tag_pairs.encode(pair) for pair in tags.items()))
+        self.__tag_sets.append(dictionaries["tag_set"].encode(tag_set))
+
+    def __len__(self) -> int:
+        return len(self.__created)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> SnapshotModel:
+        return SnapshotModel(**self.__row(index))
+
+    def __row(self, index: int) -> dict:
+        """Decodes one row into a dict of SnapshotModel fields."""
+        dictionaries = self.__dictionaries
+        row = {name: dictionaries[name].values[self.__codes[name][index]] for name in ENCODED_COLUMNS}
+        row.update((name, self.__plain[name][index]) for name in PLAIN_COLUMNS)
+        row.update((name, decode_number(name, numbers[index])) for name, numbers in self.__numbers.items())
+        row["created_date"] = epoch_to_date(self.__created[index])
+        row["tags"] = self.__decode_tags(self.__tag_sets[index])
+
+        return row
+
+    def __decode_tags(self, tag_set_code: int):
+        """Decodes a tag set code into a new tags dict."""
+        tag_set = self.__dictionaries["tag_set"].values[tag_set_code]
+        if tag_set is None:
+            return None
+
+        pairs = self.__dictionaries["tag_pair"].values
+        return dict(pairs[code] for code in tag_set)
+
+    def to_models(self) -> list:
+        """
+        Returns the rows as SnapshotModel objects.
+
+        Returns:
+            list: A list of SnapshotModel objects.
+        """
+        return list(self)
+
+    def column(self, name: str) -> list:
+        """
+        Returns the decoded values of a column.
+
+        Args:
+            name (str): A SnapshotModel field name, or "created_epoch".
+
+        Returns:
+            list: The values of the column, one per row.
+        """
+        if name in ENCODED_COLUMNS:
+            values = self.__dictionaries[name].values
+            return [values[code] for code in self.__codes[name]]
+        if name in PLAIN_COLUMNS:
+            return list(self.__plain[name])
+        if name in NUMERIC_COLUMNS:
+            return [decode_number(name, value) for value in self.__numbers[name]]
+        if name == "created_epoch":
+            return list(self.__created)
+        if name == "created_date":
+            return [epoch_to_date(epoch) for epoch in self.__created]
+        if name == "tags":
+            return [self.__decode_tags(code) for code in self.__tag_sets]
+
+        raise KeyError(name)
+
+    def take(self, indexes) -> "SnapshotTable":
+        """
+        Returns a new table holding the given rows, sharing the dictionaries of this table.
+
+        Args:
+            indexes (iterable): The row indexes, in the order of the new table.
+
+        Returns:
+            SnapshotTable: The new table.
+        """
+        indexes = list(indexes)
+        table = SnapshotTable(self.__dictionaries)
+
+        for name in ENCODED_COLUMNS:
+            codes = self.__codes[name]
+            table.__codes[name] = array("I", [codes[index] for index in indexes])
+        for name in PLAIN_COLUMNS:
+            values = self.__plain[name]
+            table.__plain[name] = [values[index] for index in indexes]
+        for name, typecode in NUMERIC_COLUMNS.items():
+            numbers = self.__numbers[name]
+            table.__numbers[name] = array(typecode, [numbers[index] for index in indexes])
+        table.__created = array("q", [self.__created[index] for index in indexes])
+        table.__tag_sets = array("I", [self.__tag_sets[index] for index in indexes])
+
+        return table
+
+    def __matching_tag_sets(self, tags: dict) -> set:
+        """Returns the codes of the tag sets containing every given tag; a None value only requires the key."""
+        pairs = self.__dictionaries["tag_pair"].values
+        matching = set()
+
+        for code, tag_set in enumerate(self.__dictionaries["tag_set"].values):
+            if tag_set is None:
+                continue
+            tag_dict = dict(pairs[pair] for pair in tag_set)
+            if all(key in tag_dict and (value is None or tag_dict[key] == value) for key, value in tags.items()):
+                matching.add(code)
+
+        return matching
+
+    def filter(self, predicate=None, tags: dict = None, created_after: int = None, created_before: int = None,
+               **equals) -> "SnapshotTable":
+        """
+        Returns the rows matching every given criterion.
+
+        Equality criteria on encoded columns are compared on codes and tag criteria are resolved once per distinct
+        tag set, so neither decodes the rows.
+
+        Args:
+            predicate (callable): Optional function receiving a SnapshotModel; slower, as rows are decoded.
+            tags (dict): Tags the rows must carry. A None value only requires the key to exist.
+            created_after (int): Only rows created at or after this epoch.
+            created_before (int): Only rows created before this epoch.
+            **equals: Column values the rows must be equal to, e.g. location="eastus".
+
+        Returns:
+            SnapshotTable: The matching rows.
+        """
+        indexes = range(len(self))
+
+        for name, value in equals.items():
+            if name in ENCODED_COLUMNS:
+                code = self.__dictionaries[name].codes.get(value)
+                codes = self.__codes[name]
+                indexes = [index for index in indexes if codes[index] == code] if code is not None else []
+            elif name in PLAIN_COLUMNS:
+                values = self.__plain[name]
+                indexes = [index for index in indexes if values[index] == value]
+            elif name in NUMERIC_COLUMNS:
+                numbers, encoded = self.__numbers[name], encode_number(value)
+                indexes = [index for index in indexes if numbers[index] == encoded]
+            else:
+                raise KeyError(name)
+
+        if tags:
+            matching = self.__matching_tag_sets(tags)
+            tag_sets = self.__tag_sets
+            indexes = [index for index in indexes if tag_sets[index] in matching]
+
+        created = self.__created
+        if created_after is not None:
+            indexes = [index for index in indexes if created[index] >= created_after]
+        if created_before is not None:
+            indexes = [index for index in indexes if created[index] < created_before]
+
+        if predicate is not None:
+            indexes = [index for index in indexes if predicate(self[index])]
+
+        return self.take(indexes)
+
+    def __sort_key(self, name: str):
+        """Returns a function mapping a row index to the sort value of a column."""
+        if name in ENCODED_COLUMNS:
+            values, codes = self.__dictionaries[name].values, self.__codes[name]
+            return lambda index: (values[codes[index]] is None, values[codes[index]] or "")
+        if name in PLAIN_COLUMNS:
+            return self.__plain[name].__getitem__
+        if name in NUMERIC_COLUMNS:
+            numbers = self.__numbers[name]
+            return lambda index: (numbers[index] == NULL, numbers[index])
+        if name in ("created_date", "created_epoch"):
+            return self.__created.__getitem__
+
+        raise KeyError(name)
+
+    def sort_by(self, name: str, reverse: bool = False) -> "SnapshotTable":
+        """
+        Returns the rows ordered by a column.
+
+        Args:
+            name (str): The column to sort by.
+            reverse (bool): Whether to sort in descending order.
+
+        Returns:
+            SnapshotTable: The sorted rows.
+        """
+        return self.take(sorted(range(len(self)), key=self.__sort_key(name), reverse=reverse))
+
+    def group_by(self, name: str) -> dict:
+        """
+        Splits the table by the values of an encoded column.
+
+        Args:
+            name (str): One of the dictionary-encoded columns, e.g. "resource_group_name".
+
+        Returns:
+            dict: A SnapshotTable per value of the column.
+        """
+        groups = {}
+        for index, code in enumerate(self.__codes[name]):
+            groups.setdefault(code, []).append(index)
+
+        values = self.__dictionaries[name].values
+        return {values[code]: self.take(indexes) for code, indexes in groups.items()}
+
+    def count_by(self, name: str) -> dict:
+        """
+        Counts the rows per value of an encoded column.
+
+        Args:
+            name (str): One of the dictionary-encoded columns, e.g. "location".
+
+        Returns:
+            dict: The number of rows per value of the column.
+        """
+        values = self.__dictionaries[name].values
+        return {values[code]: count for code, count in Counter(self.__codes[name]).items()}
+
+    def summarize(self, aggregator):
+        """
+        Adds the sizes and counts of the rows to an InventoryAggregator in a single pass.
+
+        Rows are grouped on codes, so each distinct combination of dimension values is decoded once, whatever the
+        number of rows.
+
+        Args:
+            aggregator (InventoryAggregator): The aggregator defining the dimensions.
+
+        Returns:
+            InventorySummary: The summary of the aggregator.
+        """
+        dictionaries, codes = self.__dictionaries, self.__codes
+        columns, decoders = [], []
+
+        for dimension in aggregator.dimensions:
+            if dimension == "resource_group":
+                subscriptions, groups = dictionaries["subscription_id"].values, dictionaries["resource_group_name"].values
+                columns.append(zip(codes["subscription_id"], codes["resource_group_name"]))
+                decoders.append(lambda pair, subscriptions=subscriptions, groups=groups:
+                                (subscriptions[pair[0]], groups[pair[1]]))
+            elif dimension == "age":
+                columns.append(map(aggregator.age_index, self.__created))
+                decoders.append(aggregator.age_labels.__getitem__)
+            elif dimension.startswith("tag:"):
+                tag_key, pairs = dimension[len("tag:"):], dictionaries["tag_pair"].values
+                values = [None if tag_set is None else dict(pairs[code] for code in tag_set).get(tag_key)
+                          for tag_set in dictionaries["tag_set"].values]
+                columns.append(self.__tag_sets)
+                decoders.append(values.__getitem__)
+            else:
+                columns.append(codes[dimension])
+                decoders.append(dictionaries[dimension].values.__getitem__)
+
+        totals = {}
+        for key, size in zip(zip(*columns), self.__numbers["disk_size_gb"]):
+            entry = totals.get(key)
+            if entry is None:
+                entry = totals[key] = [0, 0, 0]
+            entry[0] += 1
+            if size == NULL:
+                entry[2] += 1
+            else:
+                entry[1] += size
+
+        for key, (count, size_gb, unknown_size) in totals.items():
+            aggregator.add_group(tuple(decode(code) for decode, code in zip(decoders, key)), count, size_gb, unknown_size)
+
+        return aggregator.summary()
@@ -0,0 +1,28 @@
+"""Models for the changes found by an inventory sync."""
+from dataclasses import dataclass, field
+
+@dataclass
+class SnapshotChange:
+    snapshot: object
+    changed: tuple
+
+@dataclass
+class SyncResult:
+    subscription_id: str
+    base_watermark: int
+    synced_at: str
+    added: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    changed: list = field(default_factory=list)
+    unchanged: int = 0
+    pending: dict = field(default_factory=dict, repr=False)
+
+    @property
+    def has_changes(self) -> bool:
+        """Returns True when a snapshot was added, removed or changed since the last committed sync."""
+        return bool(self.added or self.removed or self.changed)
+
+    def summary(self) -> dict:
+        """Returns the number of snapshots per kind of change."""
+        return {"added": len(self.added), "removed": len(self.removed), "changed": len(self.changed),
+                "unchanged": self.unchanged}
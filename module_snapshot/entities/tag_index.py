@@ -0,0 +1,377 @@
+"""Inverted index of snapshot tags and the queries it answers."""
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+
+
+class TagQuery(ABC):
+    """
+    A query on the tags of the indexed snapshots. Queries are combined with & (AND), | (OR) and ~ (NOT).
+
+    Methods:
+        evaluate(index): Returns the document numbers of the matching snapshots.
+    """
+
+    def __and__(self, other: "TagQuery") -> "TagQuery":
+        return And(self, other)
+
+    def __or__(self, other: "TagQuery") -> "TagQuery":
+        return Or(self, other)
+
+    def __invert__(self) -> "TagQuery":
+        return Not(self)
+
+    @abstractmethod
+    def evaluate(self, index: "TagIndex") -> set:
+        """Returns the document numbers of the matching snapshots. Called with the lock of the index held."""
+
+
+class HasTag(TagQuery):
+    """
+    Matches the snapshots carrying a tag.
+
+    Tag keys are matched case-insensitively, as ARM does. With a value, the value must be equal to it, or start with
+    it when prefix is True, case-insensitively when ignore_case is True. Without a value, the key must exist, or a
+    key starting with the given one when prefix is True.
+    """
+
+    def __init__(self, key: str, value: str = None, prefix: bool = False, ignore_case: bool = False) -> None:
+        self.key = key
+        self.value = value
+        self.prefix = prefix
+        self.ignore_case = ignore_case
+
+    def __repr__(self) -> str:
+        return f"HasTag({self.key!r}, {self.value!r}, prefix={self.prefix}, ignore_case={self.ignore_case})"
+
+    def evaluate(self, index: "TagIndex") -> set:
+        return index.lookup(self.key, self.value, self.prefix, self.ignore_case)
+
+
+class And(TagQuery):
+    """Matches the snapshots matching every query."""
+
+    def __init__(self, *queries: TagQuery) -> None:
+        self.queries = queries
+
+    def __repr__(self) -> str:
+        return f"And{self.queries!r}"
+
+    def evaluate(self, index: "TagIndex") -> set:
+        # Negations are applied last as differences, so "A & ~B" never builds the complement of B.
+        positives = [query for query in self.queries if not isinstance(query, Not)]
+        negatives = [query.query for query in self.queries if isinstance(query, Not)]
+        if not positives:
+            return index.all_documents() - set().union(*(query.evaluate(index) for query in negatives))
+
+        results = sorted((query.evaluate(index) for query in positives), key=len)
+        matching = set(results[0])
+        for result in results[1:]:
+            if not matching:
+                break
+            matching &= result
+        for query in negatives:
+            if not matching:
+                break
+            matching -= query.evaluate(index)
+
+        return matching
+
+
+class Or(TagQuery):
+    """Matches the snapshots matching at least one query."""
+
+    def __init__(self, *queries: TagQuery) -> None:
+        self.queries = queries
+
+    def __repr__(self) -> str:
+        return f"Or{self.queries!r}"
+
+    def evaluate(self, index: "TagIndex") -> set:
+        return set().union(*(query.evaluate(index) for query in self.queries))
+
+
+class Not(TagQuery):
+    """Matches the indexed snapshots not matching a query."""
+
+    def __init__(self, query: TagQuery) -> None:
+        self.query = query
+
+    def __repr__(self) -> str:
+        return f"Not({self.query!r})"
+
+    def evaluate(self, index: "TagIndex") -> set:
+        return index.all_documents() - self.query.evaluate(index)
+
+
+class TagIndex:
+    """
+    A thread-safe inverted index mapping tag keys and (key, value) pairs to the snapshots carrying them.
+
+    Each snapshot is a small document number; the index keeps a set of documents per key, per (key, value) pair and
+    per (key, lower-cased value) pair, so an exact lookup is two dictionary accesses whatever the number of
+    snapshots. Prefix lookups bisect the sorted distinct keys, or the sorted distinct values of one key, which are
+    sorted again only after they changed. Resource IDs are matched case-insensitively.
+
+    Methods:
+        add(resource_id, tags): Indexes a snapshot, replacing its previous tags.
+        add_snapshots(snapshots): Indexes SnapshotModel objects.
+        update_tags(resource_id, tag_changes): Merges new tag values into an indexed snapshot.
+        remove(resource_id): Removes a snapshot from the index.
+        query(query): Returns the resource IDs of the snapshots matching a TagQuery.
+        count(query): Returns the number of matching snapshots.
+        get_tags(resource_id): Returns the indexed tags of a snapshot.
+        all_documents(): Returns the documents of every indexed snapshot, for TagQuery.evaluate().
+        lookup(key, value, prefix, ignore_case): Returns the documents carrying a tag, for TagQuery.evaluate().
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__resource_ids = []
+        self.__tags = []
+        self.__documents = {}
+        self.__free = []
+        self.__alive = set()
+        self.__by_key = {}
+        self.__by_value = {}
+        self.__by_folded_value = {}
+        self.__sorted_keys = None
+        self.__sorted_values = {}
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__alive)
+
+    def __contains__(self, resource_id: str) -> bool:
+        with self.__lock:
+            return resource_id.strip().lower() in self.__documents
+
+    @staticmethod
+    def __post(postings: dict, key, document: int) -> bool:
+        """Adds a document to a postings set; returns True if the set is new."""
+        documents = postings.get(key)
+        if documents is None:
+            postings[key] = {document}
+            return True
+
+        documents.add(document)
+        return False
+
+    @staticmethod
+    def __unpost(postings: dict, key, document: int) -> bool:
+        """Removes a document from a postings set; returns True if the set became empty and was dropped."""
+        documents = postings.get(key)
+        if documents is None:
+            return False
+
+        documents.discard(document)
+        if documents:
+            return False
+
+        del postings[key]
+        return True
+
+    def __index_tag(self, document: int, key: str, value: str) -> None:
+        folded_key, value = key.lower(), value or ""
+        if self.__post(self.__by_key, folded_key, document):
+            self.__sorted_keys = None
+        if self.__post(self.__by_value.setdefault(folded_key, {}), value, document):
+            self.__sorted_values.pop((folded_key, False), None)
+        if self.__post(self.__by_folded_value.setdefault(folded_key, {}), value.lower(), document):
+            self.__sorted_values.pop((folded_key, True), None)
+
+    def __unindex_tag(self, document: int, key: str, value: str) -> None:
+        folded_key, value = key.lower(), value or ""
+        if self.__unpost(self.__by_key, folded_key, document):
+            self.__sorted_keys = None
+        for postings, term, ignore_case in ((self.__by_value, value, False), (self.__by_folded_value, value.lower(), True)):
+            values = postings[folded_key]
+            if self.__unpost(values, term, document):
+                self.__sorted_values.pop((folded_key, ignore_case), None)
+                if not values:
+                    del postings[folded_key]
+
+    def __document(self, resource_id: str) -> int:
+        """Returns the document number of a resource ID, assigning one if needed. Must be called with the lock."""
+        normalized = resource_id.strip().lower()
+        document = self.__documents.get(normalized)
+        if document is not None:
+            return document
+
+        if self.__free:
+            document = self.__free.pop()
+            self.__resource_ids[document], self.__tags[document] = resource_id, {}
+        else:
+            document = len(self.__resource_ids)
+            self.__resource_ids.append(resource_id)
+            self.__tags.append({})
+
+        self.__documents[normalized] = document
+        self.__alive.add(document)
+        return document
+
+    def __set_tags(self, resource_id: str, tags: dict) -> None:
+        """Replaces the indexed tags of a snapshot. Must be called with the lock."""
+        document = self.__document(resource_id)
+        for key, value in self.__tags[document].items():
+            self.__unindex_tag(document, key, value)
+
+        self.__tags[document] = dict(tags or {})
+        for key, value in self.__tags[document].items():
+            self.__index_tag(document, key, value)
+
+    def add(self, resource_id: str, tags: dict) -> None:
+        """
+        Indexes a snapshot, replacing the tags indexed for it before.
+
+        Args:
+            resource_id (str): The resource ID of the snapshot.
+            tags (dict): Its tags; None for none.
+        """
+        with self.__lock:
+            self.__set_tags(resource_id, tags)
+
+    def add_snapshots(self, snapshots) -> int:
+        """
+        Indexes SnapshotModel objects, e.g. the result of a listing.
+
+        Args:
+            snapshots (iterable): The SnapshotModel objects; they must have their resource_id and tags fields.
+
+        Returns:
+            int: The number of snapshots indexed.
+        """
+        count = 0
+        with self.__lock:
+            for snapshot in snapshots:
+                self.__set_tags(snapshot.resource_id, snapshot.tags)
+                count += 1
+
+        return count
+
+    def update_tags(self, resource_id: str, tag_changes: dict) -> None:
+        """
+        Merges new tag values into a snapshot, e.g. after a successful tag update. Unknown snapshots are ignored:
+        their other tags are not known.
+
+        Args:
+            resource_id (str): The resource ID of the snapshot.
+            tag_changes (dict): The new values, keyed by tag key.
+        """
+        with self.__lock:
+            document = self.__documents.get(resource_id.strip().lower())
+            if document is None:
+                return
+
+            tags = self.__tags[document]
+            existing_keys = {key.lower(): key for key in tags}
+            for key, value in tag_changes.items():
+                existing_key = existing_keys.get(key.lower())
+                if existing_key is not None:
+                    self.__unindex_tag(document, existing_key, tags.pop(existing_key))
+                tags[key] = value
+                existing_keys[key.lower()] = key
+                self.__index_tag(document, key, value)
+
+    def remove(self, resource_id: str) -> bool:
+        """
+        Removes a snapshot from the index, e.g. after it was deleted.
+
+        Args:
+            resource_id (str): The resource ID of the snapshot.
+
+        Returns:
+            bool: True if the snapshot was indexed.
+        """
+        with self.__lock:
+            document = self.__documents.pop(resource_id.strip().lower(), None)
+            if document is None:
+                return False
+
+            for key, value in self.__tags[document].items():
+                self.__unindex_tag(document, key, value)
+            self.__resource_ids[document], self.__tags[document] = None, None
+            self.__alive.discard(document)
+            self.__free.append(document)
+
+            return True
+
+    def get_tags(self, resource_id: str):
+        """Returns a copy of the indexed tags of a snapshot, or None if it is not indexed."""
+        with self.__lock:
+            document = self.__documents.get(resource_id.strip().lower())
+            return dict(self.__tags[document]) if document is not None else None
+
+    def query(self, query: TagQuery) -> list:
+        """
+        Returns the snapshots matching a query.
+
+        Args:
+            query (TagQuery): E.g. HasTag("env", "prod") & ~HasTag("owner", "team-", prefix=True).
+
+        Returns:
+            list: The resource IDs of the matching snapshots, by document number.
+        """
+        with self.__lock:
+            return [self.__resource_ids[document] for document in sorted(query.evaluate(self))]
+
+    def count(self, query: TagQuery) -> int:
+        """Returns the number of snapshots matching a query."""
+        with self.__lock:
+            return len(query.evaluate(self))
+
+    def all_documents(self) -> set:
+        """Returns the documents of every indexed snapshot. Called by the queries with the lock held; the set must not
+        be modified."""
+        return self.__alive
+
+    def lookup(self, key: str, value: str = None, prefix: bool = False, ignore_case: bool = False) -> set:
+        """
+        Returns the documents carrying a tag, matched as HasTag describes. Called by the queries with the lock held;
+        the set must not be modified.
+
+        Args:
+            key (str): The tag key, matched case-insensitively.
+            value (str): The value the tag must have, or None for any value.
+            prefix (bool): True to match the keys, or the values when one is given, starting with the given one.
+            ignore_case (bool): True to match the value case-insensitively.
+
+        Returns:
+            set: The document numbers.
+        """
+        folded_key = key.lower()
+        if value is None:
+            if not prefix:
+                return self.__by_key.get(folded_key, EMPTY)
+            if self.__sorted_keys is None:
+                self.__sorted_keys = sorted(self.__by_key)
+            return set().union(*(self.__by_key[match] for match in starting_with(self.__sorted_keys, folded_key)))
+
+        postings = self.__by_folded_value if ignore_case else self.__by_value
+        values = postings.get(folded_key)
+        if values is None:
+            return EMPTY
+
+        term = value.lower() if ignore_case else value
+        if not prefix:
+            return values.get(term, EMPTY)
+
+        sorted_values = self.__sorted_values.get((folded_key, ignore_case))
+        if sorted_values is None:
+            sorted_values = self.__sorted_values[(folded_key, ignore_case)] = sorted(values)
+
+        return set().union(*(values[match] for match in starting_with(sorted_values, term)))
+
+
+EMPTY = frozenset()
+
+
+def starting_with(sorted_strings: list, prefix: str) -> list:
+    """Returns the strings of a sorted list starting with a prefix."""
+    matches = []
+    for index in range(bisect_left(sorted_strings, prefix), len(sorted_strings)):
+        if not sorted_strings[index].startswith(prefix):
+            break
+        matches.append(sorted_strings[index])
+
+    return matches
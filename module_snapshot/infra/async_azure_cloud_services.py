@@ -0,0 +1,188 @@
+"""Provide asyncio services related to snapshots"""
+from contextlib import asynccontextmanager
+from module_snapshot.infra.authenticate import AzureAuthenticate
+from module_snapshot.infra.azure_cloud_services import to_snapshot_model
+from module_snapshot.infra.client_cache import ClientCache
+from module_snapshot.utils.lazy_import import import_attribute
+from module_snapshot.utils.resource_id import parse_snapshot_id
+from module_snapshot.utils.tag_exception import TagNotFoundException
+
+ComputeManagementClient = None
+
+
+class AsyncSnapshotServices:
+    """Class responsible for providing asyncio services related to snapshots."""
+
+    def __init__(self, max_cached_clients: int = 32):
+        self.__az_authenticate = AzureAuthenticate()
+        self.__credential = None
+        self.__leases = {}
+        self.__evicted = []
+        self.__client_cache = ClientCache(self.__create_client, max_cached_clients, on_evict=self.__evicted.append)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def __create_client(self, subscription_id: str):
+        """Creates an async ComputeManagementClient bound to a subscription.
+
+         Args:
+             subscription_id(str): The subscription ID.
+
+         returns:
+             ComputeManagementClient: A new async compute client.
+        """
+        if self.__credential is None:
+            self.__credential = self.__az_authenticate.async_client_credentials()
+
+        client_class = ComputeManagementClient or import_attribute("azure.mgmt.compute.aio", "ComputeManagementClient")
+
+        return client_class(self.__credential, subscription_id)
+
+    @asynccontextmanager
+    async def __lease(self, subscription_id: str):
+        """Lends the cached ComputeManagementClient of a subscription for the duration of a call.
+
+         Clients evicted from the cache are closed as soon as no call is using them.
+
+         Args:
+             subscription_id(str): The subscription ID.
+
+         yields:
+             ComputeManagementClient: The async compute client.
+        """
+        compute_client = self.__client_cache.get_client(subscription_id)
+        self.__leases[id(compute_client)] = self.__leases.get(id(compute_client), 0) + 1
+
+        try:
+            await self.__close_evicted()
+            yield compute_client
+        finally:
+            self.__leases[id(compute_client)] -= 1
+            if not self.__leases[id(compute_client)]:
+                del self.__leases[id(compute_client)]
+            await self.__close_evicted()
+
+    async def __close_evicted(self):
+        """Closes the evicted clients that no call is using."""
+        idle = [compute_client for compute_client in self.__evicted if id(compute_client) not in self.__leases]
+        self.__evicted[:] = [compute_client for compute_client in self.__evicted if id(compute_client) in self.__leases]
+
+        for compute_client in idle:
+            await compute_client.close()
+
+    async def close(self):
+        """Closes every cached or evicted ComputeManagementClient and the async credential."""
+        compute_clients = self.__evicted + self.__client_cache.drain()
+        self.__evicted.clear()
+
+        for compute_client in compute_clients:
+            await compute_client.close()
+
+        if self.__credential is not None:
+            await self.__credential.close()
+            self.__credential = None
+
+
+    async def list_by_subscription_id(self, subscription_id:str):
+        """Lists all snapshots of a specific subscription.
+
+         Args:
+             subscription_id(str): The subscription ID.
+
+         returns:
+             list: A list of SnapshotModel objects containing snapshot information.
+        """
+        snapshot_list = []
+        async with self.__lease(subscription_id) as compute_client:
+            async for snapshot in compute_client.snapshots.list():
+                resource_group_name = parse_snapshot_id(snapshot.id)[1]
+                snapshot_list.append(to_snapshot_model(subscription_id, resource_group_name, snapshot))
+
+        return snapshot_list
+
+
+    async def list_by_resource_group(self, subscription_id:str, resource_group_name:str):
+        """Lists all snapshots of a given resource group.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group.
+
+         returns:
+             list: A list of SnapshotModel objects containing snapshot information.
+        """
+        snapshot_list = []
+        async with self.__lease(subscription_id) as compute_client:
+            async for snapshot in compute_client.snapshots.list_by_resource_group(resource_group_name):
+                snapshot_list.append(to_snapshot_model(subscription_id, resource_group_name, snapshot))
+
+        return snapshot_list
+
+
+    async def get(self,subscription_id, resource_group_name: str, snapshot_name: str):
+        """Get information for a specific snapshot.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group.
+             snapshot_name (str): The name of the snapshot.
+
+         returns:
+             SnapshotModel: A SnapshotModel object containing snapshot information.
+        """
+        async with self.__lease(subscription_id) as compute_client:
+            snapshot = await compute_client.snapshots.get(resource_group_name, snapshot_name)
+
+        return to_snapshot_model(subscription_id, resource_group_name, snapshot)
+
+
+    async def update_tag(self, subscription_id: str, resource_group_name: str, snapshot_name: str, tag_key:str, new_tag_value:str):
+        """Updates the value of a tag in a snapshot.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group.
+             snapshot_name (str): The name of the snapshot.
+             tag_key (str): The key of the tag to be updated.
+             new_tag_value(str): The new value for the tag.
+
+         returns:
+             bool: True if the update was successful, False otherwise.
+
+         Raises:
+             TagNotFoundException: If the specified tag does not exist in the snapshot.
+        """
+        async with self.__lease(subscription_id) as compute_client:
+            snapshot = await compute_client.snapshots.get(resource_group_name, snapshot_name)
+
+            existing_tags = snapshot.tags
+
+            if tag_key in existing_tags:
+                existing_tags[tag_key] = new_tag_value
+                result = await compute_client.snapshots.begin_update(resource_group_name, snapshot_name, snapshot)
+
+            else:
+                raise TagNotFoundException(tag_key)
+
+        return bool(result)
+
+
+    async def delete(self,subscription_id, resource_group_name: str, snapshot_name: str):
+        """Deletes a snapshot.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group.
+             snapshot_name (str): The name of the snapshot.
+
+         returns:
+             bool: True if deletion was successful, False otherwise.
+        """
+        async with self.__lease(subscription_id) as compute_client:
+            result = await compute_client.snapshots.begin_delete(resource_group_name, snapshot_name)
+
+        return bool(result)
@@ -1,25 +1,28 @@
 """Credentials authentication"""
-from azure.identity import ClientSecretCredential
-from module_snapshot.infra.config import Config
+from module_snapshot.infra.credential_provider import get_credential_provider
+from module_snapshot.utils.lazy_import import import_attribute
+
+AsyncClientSecretCredential = None
 
 class AzureAuthenticate:
     """
     A class that handles Azure authentication using a client secret.
 
     Attributes:
-        __config (Config): An instance of the Config class that stores the necessary Azure credentials.
+        __provider (CredentialProvider): The process-wide provider of the Config and the shared credential.
 
     Methods:
         client_credentials(): Returns a ClientSecretCredential object, which can be used to authenticate Azure services
         using a client secret.
+        async_client_credentials(): Returns the asyncio counterpart of client_credentials().
     """
 
     def __init__(self) -> None:
         """
-        Initializes an instance of the AzureAuthenticate class and creates an instance of the Config class to store
-        the necessary Azure credentials.
+        Initializes an instance of the AzureAuthenticate class bound to the process-wide CredentialProvider, which
+        loads the Config only once per process.
         """
-        self.__config = Config()
+        self.__provider = get_credential_provider()
 
 
     def client_credentials(self):
@@ -27,11 +30,26 @@ class AzureAuthenticate:
         Returns a ClientSecretCredential object, which can be used to authenticate Azure services using a client secret.
 
         Returns:
-            ClientSecretCredential: A ClientSecretCredential object that contains the tenant ID, client ID, and client
-            secret necessary for Azure authentication.
+            ClientSecretCredential: The ClientSecretCredential shared by the process, so that its access token is
+            reused by every client.
+        """
+        return self.__provider.credential()
+
+
+    def async_client_credentials(self):
+        """
+        Returns an asyncio ClientSecretCredential object, to be used with the clients of the azure.mgmt.*.aio
+        packages.
+
+        Returns:
+            azure.identity.aio.ClientSecretCredential: An async credential built from the same tenant ID, client ID,
+            and client secret as client_credentials().
         """
-        return ClientSecretCredential(
-            tenant_id= self.__config.tenant_id,
-            client_id= self.__config.client_id,
-            client_secret= self.__config.client_secret
+        config = self.__provider.config()
+        credential_class = AsyncClientSecretCredential or import_attribute("azure.identity.aio", "ClientSecretCredential")
+
+        return credential_class(
+            tenant_id= config.tenant_id,
+            client_id= config.client_id,
+            client_secret= config.client_secret
         )
@@ -1,76 +1,589 @@
 """Provide services related to snapshots"""
-from azure.mgmt.compute import ComputeManagementClient
+import threading
+import time
+from contextlib import contextmanager
 from module_snapshot.infra.authenticate import AzureAuthenticate
+from module_snapshot.infra.client_cache import ClientCache
+from module_snapshot.infra.instrumentation import Instrumentation, get_instrumentation
+from module_snapshot.infra.single_flight import SingleFlight, get_single_flight
+from module_snapshot.infra.tags_client import TagsClient
+from module_snapshot.infra.throttling import DELETE, READ, WRITE, Throttle, get_throttle
 from module_snapshot.entities.snapshot_model import SnapshotModel
+from module_snapshot.entities.snapshot_table import SnapshotTable, datetime_to_epoch
+from module_snapshot.entities.snapshot_filter import SNAPSHOT_FIELDS
+from module_snapshot.utils.resource_id import format_snapshot_id, parse_snapshot_id
+from module_snapshot.utils.lazy_import import import_attribute
 from module_snapshot.utils.tag_exception import TagNotFoundException
 
+ComputeManagementClient = None
+
+# The operations of the ARM Tags API: merge adds or overwrites keys, replace sets the whole set, delete removes the
+# tags matching the given names, or name/value pairs.
+TAG_MERGE, TAG_REPLACE, TAG_DELETE = "Merge", "Replace", "Delete"
+TAG_OPERATIONS = (TAG_MERGE, TAG_REPLACE, TAG_DELETE)
+
+
+def find_tag(tags: dict, key: str, operation: str, value: str = None):
+    """Returns the key under which a tag of an operation exists on a resource, matched the way ARM does.
+
+     Keys are matched case-insensitively. For TAG_DELETE, a value other than None or empty must also be the value of
+     the tag, as ARM only deletes the matching name/value pairs; the other operations ignore the value.
+
+     Args:
+         tags(dict): The current tags; None for none.
+         key(str): The tag key of the operation.
+         operation(str): TAG_MERGE, TAG_REPLACE or TAG_DELETE.
+         value(str): The tag value of the operation.
+
+     returns:
+         str: The existing key, in the case it is stored with, or None if no tag matches.
+    """
+    lower_key = key.lower()
+    for existing_key, existing_value in (tags or {}).items():
+        if existing_key.lower() == lower_key and (operation != TAG_DELETE or not value or existing_value == value):
+            return existing_key
+
+    return None
+
+
+def apply_tag_operation(tags: dict, changes: dict, operation: str) -> dict:
+    """Returns the tags a Tags API operation leaves on a resource.
+
+     Tags are matched by find_tag(); a merged key takes the case it is given with.
+
+     Args:
+         tags(dict): The current tags; None for none.
+         changes(dict): The tags of the operation, keyed by tag key.
+         operation(str): TAG_MERGE, TAG_REPLACE or TAG_DELETE.
+
+     returns:
+         dict: The new tags.
+    """
+    if operation == TAG_REPLACE:
+        return dict(changes)
+
+    result = dict(tags or {})
+    for key, value in changes.items():
+        existing_key = find_tag(result, key, operation, value)
+        if existing_key is not None:
+            del result[existing_key]
+        if operation == TAG_MERGE:
+            result[key] = value
+
+    return result
+
+
+def to_snapshot_model(subscription_id: str, resource_group_name: str, snapshot, fields=None):
+    """Converts a snapshot returned by the Azure SDK into a SnapshotModel.
+
+     Args:
+         subscription_id(str): The subscription ID.
+         resource_group_name (str): The name of the resource group.
+         snapshot: The Snapshot object returned by the ComputeManagementClient.
+         fields(list): Optional SnapshotModel fields to fill; the others are left as None and are not computed.
+
+     returns:
+         SnapshotModel: A SnapshotModel object containing snapshot information.
+    """
+    if fields is not None:
+        return project_snapshot_model(subscription_id, resource_group_name, snapshot, fields)
+
+    created_time = snapshot.time_created.strftime("%Y-%m-%d %H:%M:%S")
+    creation_data = snapshot.creation_data
+
+    return SnapshotModel(
+                        subscription_id,
+                        resource_group_name,
+                        snapshot.id,
+                        snapshot.name,
+                        snapshot.location,
+                        snapshot.tags,
+                        snapshot.type,
+                        created_time,
+                        creation_data.source_resource_id if creation_data is not None else None,
+                        snapshot.disk_size_gb,
+                        snapshot.incremental,
+                        snapshot.sku.name if snapshot.sku is not None else None
+                    )
+
+
+FIELD_GETTERS = {
+    "resource_id": lambda snapshot: snapshot.id,
+    "snapshot_name": lambda snapshot: snapshot.name,
+    "location": lambda snapshot: snapshot.location,
+    "tags": lambda snapshot: snapshot.tags,
+    "resource_type": lambda snapshot: snapshot.type,
+    "created_date": lambda snapshot: snapshot.time_created.strftime("%Y-%m-%d %H:%M:%S"),
+    "source_resource_id": lambda snapshot: snapshot.creation_data.source_resource_id if snapshot.creation_data is not None else None,
+    "disk_size_gb": lambda snapshot: snapshot.disk_size_gb,
+    "incremental": lambda snapshot: snapshot.incremental,
+    "sku": lambda snapshot: snapshot.sku.name if snapshot.sku is not None else None,
+}
+
+
+def project_snapshot_model(subscription_id: str, resource_group_name: str, snapshot, fields):
+    """Converts a snapshot returned by the Azure SDK into a SnapshotModel holding only the requested fields.
+
+     Args:
+         subscription_id(str): The subscription ID.
+         resource_group_name (str): The name of the resource group.
+         snapshot: The Snapshot object returned by the ComputeManagementClient.
+         fields(list): The SnapshotModel fields to fill; the others are left as None.
+
+     returns:
+         SnapshotModel: A partially filled SnapshotModel object.
+    """
+    values = dict.fromkeys(SNAPSHOT_FIELDS)
+    for field in fields:
+        if field == "subscription_id":
+            values[field] = subscription_id
+        elif field == "resource_group_name":
+            values[field] = resource_group_name
+        else:
+            values[field] = FIELD_GETTERS[field](snapshot)
+
+    return SnapshotModel(**values)
+
+
+def add_to_snapshot_table(table: SnapshotTable, subscription_id: str, resource_group_name: str, snapshot):
+    """Appends a snapshot returned by the Azure SDK to a SnapshotTable, without building a SnapshotModel.
+
+     Args:
+         table(SnapshotTable): The table receiving the row.
+         subscription_id(str): The subscription ID.
+         resource_group_name (str): The name of the resource group.
+         snapshot: The Snapshot object returned by the ComputeManagementClient.
+    """
+    creation_data = snapshot.creation_data
+
+    table.add(subscription_id,
+              resource_group_name,
+              snapshot.id,
+              snapshot.name,
+              snapshot.location,
+              snapshot.tags,
+              snapshot.type,
+              datetime_to_epoch(snapshot.time_created),
+              creation_data.source_resource_id if creation_data is not None else None,
+              snapshot.disk_size_gb,
+              snapshot.incremental,
+              snapshot.sku.name if snapshot.sku is not None else None)
+
 
 class SnapshotServices:
-    """Class responsible for providing services related to snapshots."""
+    """Class responsible for providing services related to snapshots.
+
+     Concurrent identical calls of get() and of the unfiltered list_by_subscription_id() and
+     list_by_resource_group() share one request through a SingleFlight, the process-wide one unless one is given; the
+     mutations forget the results it memoized for the snapshot they change.
+    """
 
-    def __init__(self):
+    def __init__(self, max_cached_clients: int = 32, credential=None, throttle: Throttle = None,
+                 instrumentation: Instrumentation = None, single_flight: SingleFlight = None):
         self.__az_authenticate = AzureAuthenticate()
-        self.__credential = self.__az_authenticate.client_credentials()
+        self.__credential = credential
+        self.__leases = {}
+        self.__evicted = []
+        self.__lease_lock = threading.Lock()
+        self.__client_cache = ClientCache(self.__create_client, max_cached_clients, on_evict=self.__evict)
+        self.__throttle = throttle or get_throttle()
+        self.__instrumentation = instrumentation or get_instrumentation()
+        self.__single_flight = single_flight or get_single_flight()
+        self.__tags_client = None
+        self.__tags_client_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __create_client(self, subscription_id: str):
+        """Creates a ComputeManagementClient bound to a subscription, without retries of its own.
+
+         The Config and the shared credential are only loaded here, when the first client is needed.
+
+         Args:
+             subscription_id(str): The subscription ID.
+
+         returns:
+             ComputeManagementClient: A new compute client.
+        """
+        if self.__credential is None:
+            self.__credential = self.__az_authenticate.client_credentials()
+
+        client_class = ComputeManagementClient or import_attribute("azure.mgmt.compute", "ComputeManagementClient")
+
+        # The throttle retries the transient failures itself, taking a token per attempt; the retry policy of the
+        # SDK is turned off so that its retries do not multiply the requests of an operation behind the throttle.
+        return client_class(self.__credential, subscription_id, retry_total=0)
+
+    def __get_tags_client(self) -> TagsClient:
+        """Returns the client of the Tags API, built with the shared credential on first use."""
+        with self.__tags_client_lock:
+            if self.__tags_client is None:
+                if self.__credential is None:
+                    self.__credential = self.__az_authenticate.client_credentials()
+                self.__tags_client = TagsClient(self.__credential)
+
+            return self.__tags_client
+
+    def __evict(self, compute_client):
+        """Keeps a client dropped by the cache until no call or running operation is using it."""
+        with self.__lease_lock:
+            self.__evicted.append(compute_client)
+
+    @contextmanager
+    def __lease(self, subscription_id: str):
+        """Lends the cached ComputeManagementClient of a subscription for the duration of a call.
+
+         Clients evicted from the cache are closed as soon as no call or running operation is using them.
+
+         Args:
+             subscription_id(str): The subscription ID.
+
+         yields:
+             ComputeManagementClient: The compute client.
+        """
+        while True:
+            compute_client = self.__client_cache.get_client(subscription_id)
+            with self.__lease_lock:
+                # The client may have been evicted and closed between get_client() and here; it is only safe to use
+                # if it is still cached or waiting, unclosed, among the evicted clients.
+                if self.__client_cache.peek(subscription_id) is compute_client \
+                        or any(evicted is compute_client for evicted in self.__evicted):
+                    self.__leases[id(compute_client)] = self.__leases.get(id(compute_client), 0) + 1
+                    break
+
+        try:
+            self.__close_evicted()
+            yield compute_client
+        finally:
+            self.__release(compute_client)
+
+    def __retain(self, compute_client):
+        """Takes one more lease on a client, for a long-running operation polled through it after the call."""
+        with self.__lease_lock:
+            self.__leases[id(compute_client)] += 1
+
+    def __retain_until_done(self, compute_client, poller):
+        """Keeps a client leased until the long-running operation of an LROPoller is done."""
+        self.__retain(compute_client)
+        poller.add_done_callback(lambda _: self.__release(compute_client))
+
+    def __release(self, compute_client):
+        """Returns a lease on a client, then closes the evicted clients that are no longer used."""
+        with self.__lease_lock:
+            self.__leases[id(compute_client)] -= 1
+            if not self.__leases[id(compute_client)]:
+                del self.__leases[id(compute_client)]
+
+        self.__close_evicted()
+
+    def __close_evicted(self):
+        """Closes the evicted clients that no call or running operation is using."""
+        with self.__lease_lock:
+            idle = [compute_client for compute_client in self.__evicted if id(compute_client) not in self.__leases]
+            self.__evicted[:] = [compute_client for compute_client in self.__evicted if id(compute_client) in self.__leases]
+
+        for compute_client in idle:
+            compute_client.close()
+
+    def close(self):
+        """Closes every cached or evicted ComputeManagementClient and the Tags API client, releasing their
+        connections."""
+        with self.__lease_lock:
+            compute_clients, self.__evicted = self.__evicted + self.__client_cache.drain(), []
+
+        for compute_client in compute_clients:
+            compute_client.close()
+
+        with self.__tags_client_lock:
+            tags_client, self.__tags_client = self.__tags_client, None
+        if tags_client is not None:
+            tags_client.close()
+
+
+    @property
+    def single_flight(self) -> SingleFlight:
+        """The SingleFlight coalescing the concurrent identical reads."""
+        return self.__single_flight
+
+
+    @staticmethod
+    def __read_key(operation: str, subscription_id: str, resource_group_name: str = None, detail=None) -> tuple:
+        """Builds the SingleFlight key of a read. Azure names are case-insensitive, so they are lower-cased."""
+        return (operation, subscription_id.lower(), resource_group_name.lower() if resource_group_name is not None else None,
+                detail.lower() if operation == "get" else detail)
+
+
+    def __forget(self, subscription_id: str, resource_group_name: str, snapshot_name: str):
+        """Forgets the memoized reads that include a snapshot: its get and the listings of its scopes."""
+        _, subscription_id, resource_group_name, snapshot_name = self.__read_key("get", subscription_id, resource_group_name,
+                                                                                 snapshot_name)
+
+        def includes(key):
+            operation, key_subscription_id, key_resource_group_name, detail = key
+            return (key_subscription_id == subscription_id
+                    and key_resource_group_name in (None, resource_group_name)
+                    and (operation != "get" or detail == snapshot_name))
+
+        self.__single_flight.invalidate(includes)
+
+
+    def __retry_recorder(self, operation: str, subscription_id: str):
+        """Returns the on_retry callback that reports the retries of an operation to the instrumentation."""
+        instrumentation = self.__instrumentation
+
+        return lambda exception, attempt: instrumentation.record_retry(operation, subscription_id, exception, attempt)
+
+
+    def __call(self, operation: str, subscription_id: str, kind: str, function, *args, **kwargs):
+        """Calls an SDK operation through the throttle and reports its duration and outcome.
+
+         Args:
+             operation(str): The name reported to the instrumentation.
+             subscription_id(str): The subscription ID.
+             kind(str): READ, WRITE or DELETE.
+             function(callable): The SDK operation.
+             *args: The arguments of the operation.
+             **kwargs: The keyword arguments of the operation.
+
+         returns:
+             The result of the operation.
+        """
+        started = time.perf_counter()
+        try:
+            result = self.__throttle.call(subscription_id, kind, function, *args,
+                                          on_retry=self.__retry_recorder(operation, subscription_id), **kwargs)
+        except Exception as exception:
+            self.__instrumentation.record_call(operation, subscription_id, time.perf_counter() - started, exception)
+            raise
+
+        self.__instrumentation.record_call(operation, subscription_id, time.perf_counter() - started)
 
+        return result
 
-    def list_by_subscription_id(self, subscription_id:str):
+
+    def __iter_listing(self, operation: str, subscription_id: str, list_function, *args):
+        """Yields the pages of an SDK listing through the throttle, reporting each page and the whole listing.
+
+         Only the time spent fetching pages is measured, not the time the caller spends between two pages.
+
+         Args:
+             operation(str): The name reported to the instrumentation.
+             subscription_id(str): The subscription ID.
+             list_function(callable): The SDK listing operation.
+             *args: The arguments of the operation.
+
+         yields:
+             list: The raw Azure snapshots of each page.
+        """
+        instrumentation = self.__instrumentation
+        pages = self.__throttle.iter_pages(subscription_id, list_function, *args,
+                                           on_retry=self.__retry_recorder(operation, subscription_id))
+        fetching = 0.0
+
+        while True:
+            started = time.perf_counter()
+            try:
+                page = next(pages)
+            except StopIteration:
+                break
+            except Exception as exception:
+                instrumentation.record_call(operation, subscription_id, fetching + time.perf_counter() - started, exception)
+                raise
+
+            elapsed = time.perf_counter() - started
+            fetching += elapsed
+            instrumentation.record_page(operation, subscription_id, len(page), elapsed)
+
+            try:
+                yield page
+            except GeneratorExit:
+                instrumentation.record_call(operation, subscription_id, fetching)
+                raise
+
+        instrumentation.record_call(operation, subscription_id, fetching + time.perf_counter() - started)
+
+
+    def __iter_azure_pages(self, subscription_id:str, resource_group_name:str = None, snapshot_filter=None):
+        """Yields the raw Azure snapshots one page at a time, keeping only those accepted by the filter.
+
+         The resource group criterion is applied remotely: a subscription listing filtered by resource groups is
+         replaced by one resource group listing per group. The other criteria are checked on the raw Azure objects,
+         so rejected snapshots are never converted.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group, or None for the whole subscription.
+             snapshot_filter(SnapshotFilter): Optional criteria the snapshots must match.
+
+         yields:
+             list: A list of (resource_group_name, snapshot) tuples for each page returned by Azure.
+        """
+        if resource_group_name is None and snapshot_filter is not None and snapshot_filter.resource_groups:
+            for filtered_resource_group in sorted(snapshot_filter.resource_groups):
+                yield from self.__iter_azure_pages(subscription_id, filtered_resource_group, snapshot_filter)
+            return
+
+        if resource_group_name is not None and snapshot_filter is not None \
+                and not snapshot_filter.accepts_resource_group(resource_group_name):
+            return
+
+        with self.__lease(subscription_id) as compute_client:
+            if resource_group_name is None:
+                pages = self.__iter_listing("list", subscription_id, compute_client.snapshots.list)
+            else:
+                pages = self.__iter_listing("list_by_resource_group", subscription_id,
+                                            compute_client.snapshots.list_by_resource_group, resource_group_name)
+
+            for page in pages:
+                page = [(resource_group_name or parse_snapshot_id(snapshot.id)[1], snapshot) for snapshot in page]
+
+                if snapshot_filter is not None:
+                    page = [(snapshot_resource_group, snapshot) for snapshot_resource_group, snapshot in page
+                            if snapshot_filter.matches_azure_snapshot(snapshot_resource_group, snapshot)]
+
+                yield page
+
+
+    def iter_snapshots_by_subscription_id(self, subscription_id:str, snapshot_filter=None, fields=None):
+        """Yields the snapshots of a specific subscription as the pages arrive from Azure.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             snapshot_filter(SnapshotFilter): Optional criteria the snapshots must match.
+             fields(list): Optional SnapshotModel fields to fill; the others are left as None.
+
+         yields:
+             SnapshotModel: A SnapshotModel object containing snapshot information.
+        """
+        for page in self.iter_snapshot_pages_by_subscription_id(subscription_id, snapshot_filter, fields):
+            yield from page
+
+
+    def iter_snapshot_pages_by_subscription_id(self, subscription_id:str, snapshot_filter=None, fields=None):
+        """Yields the snapshots of a specific subscription one page at a time.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             snapshot_filter(SnapshotFilter): Optional criteria the snapshots must match.
+             fields(list): Optional SnapshotModel fields to fill; the others are left as None.
+
+         yields:
+             list: A list of SnapshotModel objects for each page returned by Azure.
+        """
+        for page in self.__iter_azure_pages(subscription_id, None, snapshot_filter):
+            yield [to_snapshot_model(subscription_id, resource_group_name, snapshot, fields) for resource_group_name, snapshot in page]
+
+
+    def list_by_subscription_id(self, subscription_id:str, snapshot_filter=None, fields=None):
         """Lists all snapshots of a specific subscription.
 
          Args:
              subscription_id(str): The subscription ID.
+             snapshot_filter(SnapshotFilter): Optional criteria the snapshots must match.
+             fields(list): Optional SnapshotModel fields to fill; the others are left as None.
 
          returns:
              list: A list of SnapshotModel objects containing snapshot information.
         """
-        compute_client = ComputeManagementClient(self.__credential, subscription_id)
+        if snapshot_filter is not None:
+            return list(self.iter_snapshots_by_subscription_id(subscription_id, snapshot_filter, fields))
+
+        key = self.__read_key("list", subscription_id, None, tuple(fields) if fields is not None else None)
+        return list(self.__single_flight.do(
+            key, lambda: list(self.iter_snapshots_by_subscription_id(subscription_id, None, fields))))
+
+
+    def list_table_by_subscription_id(self, subscription_id:str, snapshot_filter=None):
+        """Lists all snapshots of a specific subscription into a columnar SnapshotTable.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             snapshot_filter(SnapshotFilter): Optional criteria the snapshots must match.
+
+         returns:
+             SnapshotTable: A table holding every snapshot of the subscription.
+        """
+        table = SnapshotTable()
+        for page in self.__iter_azure_pages(subscription_id, None, snapshot_filter):
+            for resource_group_name, snapshot in page:
+                add_to_snapshot_table(table, subscription_id, resource_group_name, snapshot)
+
+        return table
+
+
+    def iter_snapshots_by_resource_group(self, subscription_id:str, resource_group_name:str, snapshot_filter=None, fields=None):
+        """Yields the snapshots of a given resource group as the pages arrive from Azure.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group.
+             snapshot_filter(SnapshotFilter): Optional criteria the snapshots must match.
+             fields(list): Optional SnapshotModel fields to fill; the others are left as None.
+
+         yields:
+             SnapshotModel: A SnapshotModel object containing snapshot information.
+        """
+        for page in self.iter_snapshot_pages_by_resource_group(subscription_id, resource_group_name, snapshot_filter, fields):
+            yield from page
+
 
-        snapshots_list = compute_client.snapshots.list()
-        snapshot_list = []
-        for snapshot in snapshots_list:
-            resource_group_name = snapshot.id.split("/")[4]
-            created_time = snapshot.time_created.strftime("%Y-%m-%d %H:%M:%S")
-            snapshot_list.append(SnapshotModel(
-                                subscription_id,
-                                resource_group_name,
-                                snapshot.id,
-                                snapshot.name,
-                                snapshot.location,
-                                snapshot.tags,
-                                snapshot.type,
-                                created_time)
-                            )
+    def iter_snapshot_pages_by_resource_group(self, subscription_id:str, resource_group_name:str, snapshot_filter=None, fields=None):
+        """Yields the snapshots of a given resource group one page at a time.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group.
+             snapshot_filter(SnapshotFilter): Optional criteria the snapshots must match.
+             fields(list): Optional SnapshotModel fields to fill; the others are left as None.
 
-        return snapshot_list
+         yields:
+             list: A list of SnapshotModel objects for each page returned by Azure.
+        """
+        for page in self.__iter_azure_pages(subscription_id, resource_group_name, snapshot_filter):
+            yield [to_snapshot_model(subscription_id, resource_group_name, snapshot, fields) for _, snapshot in page]
 
 
-    def list_by_resource_group(self, subscription_id:str, resource_group_name:str):
+    def list_by_resource_group(self, subscription_id:str, resource_group_name:str, snapshot_filter=None, fields=None):
         """Lists all snapshots of a given resource group.
 
          Args:
              subscription_id(str): The subscription ID.
              resource_group_name (str): The name of the resource group.
+             snapshot_filter(SnapshotFilter): Optional criteria the snapshots must match.
+             fields(list): Optional SnapshotModel fields to fill; the others are left as None.
 
          returns:
              list: A list of SnapshotModel objects containing snapshot information.
         """
-        compute_client = ComputeManagementClient(self.__credential, subscription_id)
-        snapshot_list = []
-        snapshots_list = compute_client.snapshots.list_by_resource_group(resource_group_name)
+        if snapshot_filter is not None:
+            return list(self.iter_snapshots_by_resource_group(subscription_id, resource_group_name, snapshot_filter, fields))
+
+        key = self.__read_key("list", subscription_id, resource_group_name, tuple(fields) if fields is not None else None)
+        return list(self.__single_flight.do(
+            key, lambda: list(self.iter_snapshots_by_resource_group(subscription_id, resource_group_name, None, fields))))
 
-        for snapshot in snapshots_list:
-            created_time = snapshot.time_created.strftime("%Y-%m-%d %H:%M:%S")
-            snapshot_list.append(SnapshotModel(
-                                subscription_id,
-                                resource_group_name,
-                                snapshot.id,
-                                snapshot.name,
-                                snapshot.location,
-                                snapshot.tags,
-                                snapshot.type,
-                                created_time)
-                            )
 
-        return snapshot_list
+    def list_table_by_resource_group(self, subscription_id:str, resource_group_name:str, snapshot_filter=None):
+        """Lists all snapshots of a given resource group into a columnar SnapshotTable.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group.
+             snapshot_filter(SnapshotFilter): Optional criteria the snapshots must match.
+
+         returns:
+             SnapshotTable: A table holding every snapshot of the resource group.
+        """
+        table = SnapshotTable()
+        for page in self.__iter_azure_pages(subscription_id, resource_group_name, snapshot_filter):
+            for _, snapshot in page:
+                add_to_snapshot_table(table, subscription_id, resource_group_name, snapshot)
+
+        return table
 
 
     def get(self,subscription_id, resource_group_name: str, snapshot_name: str):
@@ -84,20 +597,11 @@ class SnapshotServices:
          returns:
              SnapshotModel: A SnapshotModel object containing snapshot information.
         """
-        compute_client = ComputeManagementClient(self.__credential, subscription_id)
-        snapshot = compute_client.snapshots.get(resource_group_name, snapshot_name)
-        created_time = snapshot.time_created.strftime("%Y-%m-%d %H:%M:%S")
-
-        return SnapshotModel(
-                            subscription_id,
-                            resource_group_name,
-                            snapshot.id,
-                            snapshot.name,
-                            snapshot.location,
-                            snapshot.tags,
-                            snapshot.type,
-                            created_time
-                        )
+        with self.__lease(subscription_id) as compute_client:
+            return self.__single_flight.do(
+                self.__read_key("get", subscription_id, resource_group_name, snapshot_name),
+                lambda: to_snapshot_model(subscription_id, resource_group_name,
+                                          self.__call("get", subscription_id, READ, compute_client.snapshots.get, resource_group_name, snapshot_name)))
 
 
     def update_tag(self, subscription_id: str, resource_group_name: str, snapshot_name: str, tag_key:str, new_tag_value:str):
@@ -116,21 +620,240 @@ class SnapshotServices:
          Raises:
              TagNotFoundException: If the specified tag does not exist in the snapshot.
         """
-        compute_client = ComputeManagementClient(self.__credential, subscription_id)
-        snapshot = compute_client.snapshots.get(resource_group_name, snapshot_name)
+        return self.update_tags(subscription_id, resource_group_name, snapshot_name, {tag_key: new_tag_value})
 
-        existing_tags = snapshot.tags
 
-        if tag_key in existing_tags:
-            existing_tags[tag_key] = new_tag_value
-            result = compute_client.snapshots.begin_update(resource_group_name, snapshot_name, snapshot)
+    def update_tags(self, subscription_id: str, resource_group_name: str, snapshot_name: str, tag_changes: dict):
+        """Updates the value of several existing tags of a snapshot in a single update.
 
-        else:
-            raise TagNotFoundException(tag_key)
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group.
+             snapshot_name (str): The name of the snapshot.
+             tag_changes (dict): The new values, keyed by tag key.
+
+         returns:
+             bool: True if the update was successful, False otherwise.
+
+         Raises:
+             TagNotFoundException: If one of the specified tags does not exist in the snapshot.
+        """
+        result = self.begin_update_tags(subscription_id, resource_group_name, snapshot_name, tag_changes)
 
         return bool(result)
 
 
+    def begin_update_tags(self, subscription_id: str, resource_group_name: str, snapshot_name: str, tag_changes: dict):
+        """Starts the update of several existing tags of a snapshot.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group.
+             snapshot_name (str): The name of the snapshot.
+             tag_changes (dict): The new values, keyed by tag key.
+
+         returns:
+             LROPoller: The poller tracking the long-running update.
+
+         Raises:
+             TagNotFoundException: If one of the specified tags does not exist in the snapshot.
+        """
+        with self.__lease(subscription_id) as compute_client:
+            snapshot = self.__call("get", subscription_id, READ, compute_client.snapshots.get, resource_group_name, snapshot_name)
+
+            existing_tags = snapshot.tags or {}
+
+            for tag_key in tag_changes:
+                if tag_key not in existing_tags:
+                    raise TagNotFoundException(tag_key)
+
+            snapshot.tags = {**existing_tags, **tag_changes}
+            poller = self.__call("update", subscription_id, WRITE, compute_client.snapshots.begin_update,
+                                 resource_group_name, snapshot_name, snapshot)
+            self.__retain_until_done(compute_client, poller)
+        self.__forget(subscription_id, resource_group_name, snapshot_name)
+
+        return poller
+
+
+    def patch_tags(self, subscription_id: str, resource_group_name: str, snapshot_name: str, tags: dict,
+                   operation: str = TAG_MERGE, etag: str = None, require_existing: bool = False):
+        """Changes several tags of a snapshot by sending only the tags, in a single request.
+
+         The request is a PATCH of the Tags API at the scope of the snapshot, whose body holds the operation and the
+         given tags only. With an ETag, it is sent with an If-Match header and rejected if the snapshot changed since.
+         Only when require_existing is True, the snapshot is read first: the keys are checked, the new tags are
+         computed from the ones read and they are sent as a tags-only snapshot update, guarded by the given ETag or
+         by the one of the read; it is never sent without either.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group.
+             snapshot_name (str): The name of the snapshot.
+             tags (dict): The tags of the operation, keyed by tag key.
+             operation (str): TAG_MERGE adds or overwrites the given keys, TAG_REPLACE replaces every tag with the
+                 given ones (adding and removing keys at once) and TAG_DELETE removes the given keys, or only the
+                 tags having the given value when it is not empty.
+             etag (str): The ETag the snapshot must still have, or None to update it unconditionally.
+             require_existing (bool): True to fail unless every given tag already exists in the snapshot, as matched
+                 by find_tag().
+
+         returns:
+             dict: The tags of the snapshot after the update.
+
+         Raises:
+             ValueError: If the operation is not one of TAG_OPERATIONS.
+             TagNotFoundException: If require_existing is True and a given key does not exist in the snapshot.
+             ResourceModifiedError: If the snapshot no longer has the given ETag, or if require_existing is True and
+                 there is no ETag to guard the update with.
+        """
+        if operation not in TAG_OPERATIONS:
+            raise ValueError(f'The "operation" parameter must be one of {", ".join(TAG_OPERATIONS)}.')
+
+        if require_existing:
+            with self.__lease(subscription_id) as compute_client:
+                new_tags = self.__read_modify_write_tags(compute_client, subscription_id, resource_group_name,
+                                                         snapshot_name, tags, operation, etag)
+        else:
+            body = self.__call("patch_tags", subscription_id, WRITE, self.__get_tags_client().patch,
+                               format_snapshot_id(subscription_id, resource_group_name, snapshot_name), operation,
+                               tags, etag)
+            new_tags = (body.get("properties") or {}).get("tags") or {}
+
+        self.__forget(subscription_id, resource_group_name, snapshot_name)
+
+        return new_tags
+
+
+    def __read_modify_write_tags(self, compute_client, subscription_id, resource_group_name, snapshot_name, tags,
+                                 operation, etag):
+        """Reads a snapshot and its ETag, checks that the given keys exist, sends its new tags only and waits for the
+        update to complete.
+
+         returns:
+             dict: The tags sent.
+
+         Raises:
+             ResourceModifiedError: If neither the caller nor the read gave an ETag to send as If-Match.
+        """
+        snapshot, read_etag = self.__call(
+            "get", subscription_id, READ, compute_client.snapshots.get, resource_group_name, snapshot_name,
+            cls=lambda pipeline_response, deserialized, _: (deserialized, pipeline_response.http_response.headers.get("ETag")))
+
+        existing_tags = snapshot.tags or {}
+        for tag_key, tag_value in tags.items():
+            if find_tag(existing_tags, tag_key, operation, tag_value) is None:
+                raise TagNotFoundException(tag_key)
+
+        new_tags = apply_tag_operation(existing_tags, tags, operation)
+        etag = etag or read_etag
+        if etag is None:
+            # Without an If-Match, a change made since the read would be silently overwritten.
+            raise import_attribute("azure.core.exceptions", "ResourceModifiedError")(
+                f"The snapshot '{snapshot_name}' was read without an ETag; its tags are not written unconditionally.")
+        snapshot_update_class = import_attribute("azure.mgmt.compute.models", "SnapshotUpdate")
+        self.__call("update", subscription_id, WRITE, compute_client.snapshots.begin_update, resource_group_name,
+                    snapshot_name, snapshot_update_class(tags=new_tags),
+                    headers={"If-Match": etag} if etag is not None else None).result()
+
+        return new_tags
+
+
+    def begin_delete(self,subscription_id, resource_group_name: str, snapshot_name: str):
+        """Starts the deletion of a snapshot.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group.
+             snapshot_name (str): The name of the snapshot.
+
+         returns:
+             LROPoller: The poller tracking the long-running deletion.
+        """
+        with self.__lease(subscription_id) as compute_client:
+            poller = self.__call("delete", subscription_id, DELETE, compute_client.snapshots.begin_delete,
+                                 resource_group_name, snapshot_name)
+            self.__retain_until_done(compute_client, poller)
+        self.__forget(subscription_id, resource_group_name, snapshot_name)
+
+        return poller
+
+
+    def __tracked_polling(self, subscription_id: str, compute_client):
+        """Builds the polling method of a mutation that is polled by a JobTracker.
+
+         Its status requests take read tokens of the subscription and are reported as "poll" operations. It takes
+         a lease on the compute client, released once the operation is done, when the mutation is sent.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             compute_client(ComputeManagementClient): The client the mutation is sent and polled through.
+
+         returns:
+             TrackedPolling: A polling method to be given to begin_update or begin_delete.
+        """
+        polling_class = import_attribute("module_snapshot.infra.lro_polling", "TrackedPolling")
+
+        return polling_class(call=lambda function: self.__call("poll", subscription_id, READ, function),
+                             response_hook=self.__throttle.response_hook(subscription_id, READ),
+                             on_done=lambda: self.__release(compute_client))
+
+
+    def start_update_tags(self, subscription_id: str, resource_group_name: str, snapshot_name: str, tag_changes: dict):
+        """Sends the update of existing tags of a snapshot without waiting for it to complete.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group.
+             snapshot_name (str): The name of the snapshot.
+             tag_changes (dict): The new values, keyed by tag key.
+
+         returns:
+             TrackedPolling: The long-running update, to be polled by a JobTracker.
+
+         Raises:
+             TagNotFoundException: If one of the specified tags does not exist in the snapshot.
+        """
+        with self.__lease(subscription_id) as compute_client:
+            snapshot = self.__call("get", subscription_id, READ, compute_client.snapshots.get, resource_group_name, snapshot_name)
+
+            existing_tags = snapshot.tags or {}
+
+            for tag_key in tag_changes:
+                if tag_key not in existing_tags:
+                    raise TagNotFoundException(tag_key)
+
+            snapshot.tags = {**existing_tags, **tag_changes}
+            polling = self.__tracked_polling(subscription_id, compute_client)
+            self.__call("update", subscription_id, WRITE, compute_client.snapshots.begin_update,
+                        resource_group_name, snapshot_name, snapshot, polling=polling)
+            self.__retain(compute_client)
+        self.__forget(subscription_id, resource_group_name, snapshot_name)
+
+        return polling
+
+
+    def start_delete(self, subscription_id: str, resource_group_name: str, snapshot_name: str):
+        """Sends the deletion of a snapshot without waiting for it to complete.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group.
+             snapshot_name (str): The name of the snapshot.
+
+         returns:
+             TrackedPolling: The long-running deletion, to be polled by a JobTracker.
+        """
+        with self.__lease(subscription_id) as compute_client:
+            polling = self.__tracked_polling(subscription_id, compute_client)
+            self.__call("delete", subscription_id, DELETE, compute_client.snapshots.begin_delete,
+                        resource_group_name, snapshot_name, polling=polling)
+            self.__retain(compute_client)
+        self.__forget(subscription_id, resource_group_name, snapshot_name)
+
+        return polling
+
+
     def delete(self,subscription_id, resource_group_name: str, snapshot_name: str):
         """Deletes a snapshot.
 
@@ -142,7 +865,6 @@ class SnapshotServices:
          returns:
              bool: True if deletion was successful, False otherwise.
         """
-        compute_client = ComputeManagementClient(self.__credential, subscription_id)
-        result = compute_client.snapshots.begin_delete(resource_group_name, snapshot_name)
+        result = self.begin_delete(subscription_id, resource_group_name, snapshot_name)
 
         return bool(result)
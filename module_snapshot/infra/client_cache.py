@@ -0,0 +1,135 @@
+"""Cache of Azure management clients"""
+import threading
+from collections import OrderedDict
+
+
+class ClientCache:
+    """
+    A thread-safe, bounded cache of Azure management clients keyed by subscription ID.
+
+    Clients are created on demand through the given factory and kept alive so that their HTTP pipeline and
+    connection pool are reused across calls. When the cache is full, the least recently used client is dropped.
+
+    Attributes:
+        max_size (int): The maximum number of clients kept in the cache.
+
+    Methods:
+        get_client(subscription_id): Returns the cached client for a subscription, creating it if needed.
+        peek(subscription_id): Returns the cached client for a subscription, or None, without creating it.
+        drain(): Removes every client from the cache and returns them.
+        close(): Closes every cached client and empties the cache.
+    """
+
+    def __init__(self, client_factory, max_size: int = 32, on_evict=None) -> None:
+        """
+        Initializes the cache.
+
+        Args:
+            client_factory (callable): A callable that receives a subscription ID and returns a new client.
+            max_size (int): The maximum number of clients kept in the cache.
+            on_evict (callable): Called with each client dropped to make room, outside the lock.
+
+        Raises:
+            ValueError: If max_size is lower than 1.
+        """
+        if max_size < 1:
+            raise ValueError('The "max_size" parameter must be greater than zero.')
+
+        self.max_size = max_size
+        self.__client_factory = client_factory
+        self.__on_evict = on_evict
+        self.__clients = OrderedDict()
+        self.__creation_locks = {}
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__clients)
+
+    def __contains__(self, subscription_id) -> bool:
+        with self.__lock:
+            return subscription_id in self.__clients
+
+    def get_client(self, subscription_id: str):
+        """
+        Returns the cached client for a subscription, creating it if needed.
+
+        The client is built under a lock of its subscription only, so a slow factory does not hold up the callers of
+        the other subscriptions.
+
+        Args:
+            subscription_id (str): The subscription ID.
+
+        Returns:
+            The management client bound to the subscription.
+        """
+        with self.__lock:
+            client = self.__get_cached(subscription_id)
+            if client is not None:
+                return client
+
+            creation_lock = self.__creation_locks.setdefault(subscription_id, threading.Lock())
+
+        with creation_lock:
+            with self.__lock:
+                client = self.__get_cached(subscription_id)
+            if client is not None:
+                return client
+
+            evicted = []
+            try:
+                client = self.__client_factory(subscription_id)
+            finally:
+                with self.__lock:
+                    self.__creation_locks.pop(subscription_id, None)
+                    if client is not None:
+                        self.__clients[subscription_id] = client
+
+                        # Evicted clients are not closed here: another caller may still be using them.
+                        while len(self.__clients) > self.max_size:
+                            evicted.append(self.__clients.popitem(last=False)[1])
+
+        if self.__on_evict is not None:
+            for evicted_client in evicted:
+                self.__on_evict(evicted_client)
+
+        return client
+
+    def __get_cached(self, subscription_id: str):
+        """Returns the cached client of a subscription, marked as the most recently used, or None. Holds the lock."""
+        client = self.__clients.get(subscription_id)
+        if client is not None:
+            self.__clients.move_to_end(subscription_id)
+
+        return client
+
+    def peek(self, subscription_id: str):
+        """
+        Returns the cached client of a subscription without creating it or changing its recency.
+
+        Args:
+            subscription_id (str): The subscription ID.
+
+        Returns:
+            The management client bound to the subscription, or None if it is not cached.
+        """
+        with self.__lock:
+            return self.__clients.get(subscription_id)
+
+    def drain(self) -> list:
+        """
+        Removes every client from the cache and returns them.
+
+        Returns:
+            list: The clients that were in the cache.
+        """
+        with self.__lock:
+            clients = list(self.__clients.values())
+            self.__clients.clear()
+
+        return clients
+
+    def close(self) -> None:
+        """Closes every cached client and empties the cache."""
+        for client in self.drain():
+            client.close()
@@ -0,0 +1,99 @@
+"""Process-wide configuration and credential"""
+import threading
+from module_snapshot.utils.lazy_import import import_attribute
+from module_snapshot.utils.shared_instance import SharedInstance
+
+Config = None
+ClientSecretCredential = None
+
+
+class CredentialProvider:
+    """
+    A class that lazily builds the Config and the ClientSecretCredential once and shares them.
+
+    Sharing a single ClientSecretCredential means its token cache is shared too: the access token is fetched once
+    and the credential refreshes it shortly before it expires, instead of every service object fetching its own.
+
+    Methods:
+        config(): Returns the shared Config, loading it on first use.
+        credential(): Returns the shared ClientSecretCredential, creating it on first use.
+        close(): Closes the shared credential and forgets the cached objects.
+    """
+
+    def __init__(self, config=None, credential=None) -> None:
+        """
+        Initializes the provider.
+
+        Args:
+            config (Config): An optional Config to use instead of loading settings.toml/.secrets.toml.
+            credential: An optional credential to use instead of building a ClientSecretCredential.
+        """
+        self.__config = config
+        self.__credential = credential
+        self.__lock = threading.Lock()
+
+    def config(self):
+        """
+        Returns the shared Config, loading it on first use.
+
+        Returns:
+            Config: The configuration with the Azure credentials.
+        """
+        if self.__config is None:
+            with self.__lock:
+                if self.__config is None:
+                    config_class = Config or import_attribute("module_snapshot.infra.config", "Config")
+                    self.__config = config_class()
+
+        return self.__config
+
+    def credential(self):
+        """
+        Returns the shared ClientSecretCredential, creating it on first use.
+
+        Returns:
+            ClientSecretCredential: The credential shared by every client of the process.
+        """
+        if self.__credential is None:
+            config = self.config()
+            with self.__lock:
+                if self.__credential is None:
+                    credential_class = ClientSecretCredential or import_attribute("azure.identity", "ClientSecretCredential")
+                    self.__credential = credential_class(
+                        tenant_id= config.tenant_id,
+                        client_id= config.client_id,
+                        client_secret= config.client_secret
+                    )
+
+        return self.__credential
+
+    def close(self) -> None:
+        """Closes the shared credential and forgets the cached objects."""
+        with self.__lock:
+            credential, self.__credential, self.__config = self.__credential, None, None
+
+        if credential is not None and hasattr(credential, "close"):
+            credential.close()
+
+
+_provider = SharedInstance(CredentialProvider)
+
+
+def get_credential_provider() -> CredentialProvider:
+    """
+    Returns the process-wide CredentialProvider, creating it on first use.
+
+    Returns:
+        CredentialProvider: The shared provider.
+    """
+    return _provider.get()
+
+
+def set_credential_provider(provider: CredentialProvider) -> None:
+    """
+    Replaces the process-wide CredentialProvider, e.g. to inject a fake credential in tests.
+
+    Args:
+        provider (CredentialProvider): The provider to be shared, or None to build a new one on next use.
+    """
+    _provider.set(provider)
@@ -0,0 +1,225 @@
+"""Streaming writers of snapshot inventories"""
+import csv
+import gzip
+import io
+import json
+from contextlib import ExitStack, contextmanager
+from dataclasses import fields as dataclass_fields
+from module_snapshot.entities.snapshot_model import SnapshotModel
+from module_snapshot.utils.lazy_import import import_optional
+
+JSONL = "jsonl"
+CSV = "csv"
+PARQUET = "parquet"
+FORMATS = (JSONL, CSV, PARQUET)
+
+GZIP = "gzip"
+ZSTD = "zstd"
+COMPRESSIONS = (GZIP, ZSTD)
+
+FORMAT_SUFFIXES = {".jsonl": JSONL, ".ndjson": JSONL, ".csv": CSV, ".parquet": PARQUET}
+COMPRESSION_SUFFIXES = {".gz": GZIP, ".zst": ZSTD}
+
+FIELD_TYPES = {field.name: field.type for field in dataclass_fields(SnapshotModel)}
+
+
+def infer_format(path: str, compression: str = None) -> str:
+    """Infers the file format from the suffix of a path, e.g. "inventory.csv.gz".
+
+     Args:
+         path(str): The output path.
+         compression(str): The compression, whose suffix is ignored.
+
+     returns:
+         str: JSONL, CSV or PARQUET.
+
+     Raises:
+         ValueError: If the suffix is not a known format.
+    """
+    name = path.lower()
+    for suffix in COMPRESSION_SUFFIXES:
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+
+    for suffix, file_format in FORMAT_SUFFIXES.items():
+        if name.endswith(suffix):
+            return file_format
+
+    raise ValueError(f"Cannot infer the format of '{path}'; pass one of {', '.join(FORMATS)}.")
+
+
+def infer_compression(path: str) -> str:
+    """Infers the compression from the suffix of a path: GZIP for ".gz", ZSTD for ".zst", otherwise None."""
+    name = path.lower()
+    for suffix, compression in COMPRESSION_SUFFIXES.items():
+        if name.endswith(suffix):
+            return compression
+
+    return None
+
+
+def validate_output(file_format: str, compression: str = None) -> None:
+    """Checks that a format and a compression are known and that their optional packages are installed.
+
+     Args:
+         file_format(str): JSONL, CSV or PARQUET.
+         compression(str): GZIP, ZSTD or None.
+
+     Raises:
+         ValueError: If the format or the compression is unknown.
+         ImportError: If pyarrow is needed for PARQUET, or zstandard for ZSTD, and is not installed.
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown format '{file_format}'; expected one of {', '.join(FORMATS)}.")
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}'; expected one of {', '.join(COMPRESSIONS)}.")
+
+    if file_format == PARQUET and import_optional("pyarrow") is None:
+        raise ImportError("The Parquet export requires the pyarrow package.")
+    if file_format != PARQUET and compression == ZSTD and import_optional("zstandard") is None:
+        raise ImportError("The zstd compression requires the zstandard package.")
+
+
+class JsonLinesWriter:
+    """Writes one JSON object per snapshot and line."""
+
+    def __init__(self, stream, fields: list) -> None:
+        self.__stream = io.TextIOWrapper(stream, encoding="utf-8", newline="\n")
+        self.__fields = fields
+
+    def write_batch(self, snapshots: list) -> None:
+        """Writes a batch of SnapshotModel objects."""
+        fields = self.__fields
+        self.__stream.writelines(
+            json.dumps({field: getattr(snapshot, field) for field in fields}, ensure_ascii=False) + "\n"
+            for snapshot in snapshots
+        )
+
+    def close(self) -> None:
+        """Flushes the buffered lines, leaving the underlying stream open."""
+        self.__stream.flush()
+        self.__stream.detach()
+
+
+class CsvWriter:
+    """Writes a header row and one row per snapshot; tags are written as a JSON object."""
+
+    def __init__(self, stream, fields: list) -> None:
+        self.__stream = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+        self.__fields = fields
+        self.__writer = csv.writer(self.__stream)
+        self.__writer.writerow(fields)
+
+    def write_batch(self, snapshots: list) -> None:
+        """Writes a batch of SnapshotModel objects."""
+        fields = self.__fields
+        self.__writer.writerows(
+            [json.dumps(value, ensure_ascii=False) if isinstance(value, dict) else value
+             for value in (getattr(snapshot, field) for field in fields)]
+            for snapshot in snapshots
+        )
+
+    def close(self) -> None:
+        """Flushes the buffered rows, leaving the underlying stream open."""
+        self.__stream.flush()
+        self.__stream.detach()
+
+
+class ParquetWriter:
+    """Writes each batch as a Parquet row group; tags are a map column."""
+
+    def __init__(self, stream, fields: list, compression: str = None) -> None:
+        self.__pyarrow = import_optional("pyarrow")
+        if self.__pyarrow is None:
+            raise ImportError("The Parquet export requires the pyarrow package.")
+
+        self.__fields = fields
+        self.__schema = self.__pyarrow.schema([(field, self.__arrow_type(field)) for field in fields])
+        self.__writer = import_optional("pyarrow.parquet").ParquetWriter(stream, self.__schema, compression=compression or "snappy")
+
+    def __arrow_type(self, field: str):
+        """Returns the Arrow type of a SnapshotModel field."""
+        pyarrow = self.__pyarrow
+        if field == "tags":
+            return pyarrow.map_(pyarrow.string(), pyarrow.string())
+
+        return {int: pyarrow.int64(), float: pyarrow.float64(), bool: pyarrow.bool_()}.get(FIELD_TYPES[field], pyarrow.string())
+
+    def write_batch(self, snapshots: list) -> None:
+        """Writes a batch of SnapshotModel objects as one row group."""
+        columns = {
+            field: [list(value.items()) if field == "tags" and value is not None else value
+                    for value in (getattr(snapshot, field) for snapshot in snapshots)]
+            for field in self.__fields
+        }
+        self.__writer.write_table(self.__pyarrow.Table.from_pydict(columns, schema=self.__schema))
+
+    def close(self) -> None:
+        """Writes the Parquet footer."""
+        self.__writer.close()
+
+
+@contextmanager
+def open_compressed(path: str, compression: str = None):
+    """Opens a binary output file, compressing what is written to it.
+
+     Args:
+         path(str): The output path.
+         compression(str): GZIP, ZSTD or None.
+
+     yields:
+         A writable binary stream.
+
+     Raises:
+         ImportError: If ZSTD is requested and the zstandard package is not installed.
+    """
+    zstandard = import_optional("zstandard") if compression == ZSTD else None
+    if compression == ZSTD and zstandard is None:
+        raise ImportError("The zstd compression requires the zstandard package.")
+
+    with ExitStack() as stack:
+        stream = stack.enter_context(open(path, "wb"))
+        if compression == GZIP:
+            stream = stack.enter_context(gzip.GzipFile(fileobj=stream, mode="wb"))
+        elif compression == ZSTD:
+            stream = stack.enter_context(zstandard.ZstdCompressor().stream_writer(stream, closefd=False))
+
+        yield stream
+
+
+@contextmanager
+def open_snapshot_writer(path: str, file_format: str, fields: list, compression: str = None):
+    """Opens a writer of snapshot batches.
+
+     Parquet files compress their pages themselves, so for PARQUET the compression is the Parquet codec and the
+     file itself is not wrapped.
+
+     Args:
+         path(str): The output path.
+         file_format(str): JSONL, CSV or PARQUET.
+         fields(list): The SnapshotModel fields written, in order.
+         compression(str): GZIP, ZSTD or None.
+
+     yields:
+         The writer, exposing write_batch(snapshots).
+
+     Raises:
+         ValueError: If the format or the compression is unknown.
+    """
+    validate_output(file_format, compression)
+
+    if file_format == PARQUET:
+        with open(path, "wb") as file:
+            writer = ParquetWriter(file, fields, compression)
+            try:
+                yield writer
+            finally:
+                writer.close()
+        return
+
+    with open_compressed(path, compression) as stream:
+        writer = (JsonLinesWriter if file_format == JSONL else CsvWriter)(stream, fields)
+        try:
+            yield writer
+        finally:
+            writer.close()
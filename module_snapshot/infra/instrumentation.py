@@ -0,0 +1,284 @@
+"""Metrics hooks around the Azure calls of the snapshot services"""
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from module_snapshot.utils.shared_instance import SharedInstance
+
+# The default bucket bounds of the Prometheus client, in seconds.
+DEFAULT_LATENCY_BOUNDS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+
+class Instrumentation:
+    """
+    The hooks called by SnapshotServices around every Azure operation. Every hook does nothing, so this class is
+    the no-op default and the base class of the adapters: override the hooks to forward the measurements to
+    Prometheus, OpenTelemetry or any other backend. Hooks are called from the threads that run the operations and
+    must be thread-safe.
+
+    Operations are named after the SDK calls: "list", "list_by_resource_group", "get", "update" and "delete", plus
+    "poll" for the status requests of the mutations tracked by a JobTracker.
+
+    Methods:
+        record_call(operation, subscription_id, seconds, error): One operation completed or failed.
+        record_page(operation, subscription_id, items, seconds): One listing page was received.
+        record_retry(operation, subscription_id, error, attempt): A transient failure is about to be retried.
+    """
+
+    def record_call(self, operation: str, subscription_id: str, seconds: float, error: Exception = None) -> None:
+        """
+        Called once per operation, after it completed or failed. For listings, seconds only counts the time spent
+        fetching the pages, not the time the caller spent consuming them.
+
+        Args:
+            operation (str): The name of the operation.
+            subscription_id (str): The subscription ID.
+            seconds (float): The duration of the operation, including retries and rate limiting.
+            error (Exception): The exception that ended the operation, or None if it succeeded.
+        """
+
+    def record_page(self, operation: str, subscription_id: str, items: int, seconds: float) -> None:
+        """
+        Called once per listing page received.
+
+        Args:
+            operation (str): The name of the listing operation.
+            subscription_id (str): The subscription ID.
+            items (int): The number of snapshots in the page, before filtering.
+            seconds (float): The time spent fetching the page.
+        """
+
+    def record_retry(self, operation: str, subscription_id: str, error: Exception, attempt: int) -> None:
+        """
+        Called when a transient failure is about to be retried.
+
+        Args:
+            operation (str): The name of the operation.
+            subscription_id (str): The subscription ID.
+            error (Exception): The transient failure.
+            attempt (int): The number of the attempt that failed, starting at 1.
+        """
+
+
+class LatencyHistogram:
+    """
+    A cumulative-style latency histogram with fixed bucket bounds.
+
+    Attributes:
+        bounds (tuple): The upper bounds of the buckets, in seconds; a last bucket holds the larger values.
+        counts (list): The number of observations per bucket.
+        count (int): The number of observations.
+        total (float): The sum of the observations, in seconds.
+    """
+
+    def __init__(self, bounds: tuple = DEFAULT_LATENCY_BOUNDS) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Adds an observation to its bucket."""
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, fraction: float) -> float:
+        """
+        Estimates a quantile as the upper bound of the bucket that contains it.
+
+        Args:
+            fraction (float): The quantile, e.g. 0.99.
+
+        Returns:
+            float: The upper bound in seconds, infinity for the last bucket, or None without observations.
+        """
+        if not self.count:
+            return None
+
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return self.bounds[index] if index < len(self.bounds) else float("inf")
+
+        return float("inf")
+
+
+@dataclass
+class OperationStats:
+    """
+    The measurements of one operation on one subscription.
+
+    Attributes:
+        calls (int): The number of operations.
+        errors (dict): The number of failed operations per exception type name.
+        retries (int): The number of retried attempts.
+        pages (int): The number of listing pages received.
+        items (int): The number of snapshots received in listing pages.
+        latency (LatencyHistogram): The durations of the operations.
+        page_latency (LatencyHistogram): The fetch times of the listing pages.
+    """
+    calls: int = 0
+    errors: dict = field(default_factory=dict)
+    retries: int = 0
+    pages: int = 0
+    items: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    page_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    @property
+    def items_per_page(self) -> float:
+        """The average number of snapshots per listing page."""
+        return self.items / self.pages if self.pages else 0.0
+
+
+class InMemoryInstrumentation(Instrumentation):
+    """
+    An Instrumentation that keeps OperationStats per operation and subscription in memory.
+
+    Methods:
+        stats(operation, subscription_id): Returns the stats of one operation and subscription.
+        summary(): Returns the stats of every operation, merged across subscriptions.
+        reset(): Forgets every measurement.
+    """
+
+    def __init__(self, latency_bounds: tuple = DEFAULT_LATENCY_BOUNDS) -> None:
+        """
+        Initializes an empty collector.
+
+        Args:
+            latency_bounds (tuple): The bucket bounds of the latency histograms, in seconds.
+        """
+        self.latency_bounds = latency_bounds
+        self.__stats = {}
+        self.__lock = threading.Lock()
+
+    def __get(self, operation: str, subscription_id: str) -> OperationStats:
+        """Returns the stats of a key, creating them on first use. Must be called with the lock held."""
+        stats = self.__stats.get((operation, subscription_id))
+        if stats is None:
+            stats = self.__stats[(operation, subscription_id)] = OperationStats(
+                latency=LatencyHistogram(self.latency_bounds), page_latency=LatencyHistogram(self.latency_bounds)
+            )
+
+        return stats
+
+    def record_call(self, operation, subscription_id, seconds, error=None):
+        with self.__lock:
+            stats = self.__get(operation, subscription_id)
+            stats.calls += 1
+            stats.latency.observe(seconds)
+            if error is not None:
+                error_type = type(error).__name__
+                stats.errors[error_type] = stats.errors.get(error_type, 0) + 1
+
+    def record_page(self, operation, subscription_id, items, seconds):
+        with self.__lock:
+            stats = self.__get(operation, subscription_id)
+            stats.pages += 1
+            stats.items += items
+            stats.page_latency.observe(seconds)
+
+    def record_retry(self, operation, subscription_id, error, attempt):
+        with self.__lock:
+            self.__get(operation, subscription_id).retries += 1
+
+    def stats(self, operation: str, subscription_id: str) -> OperationStats:
+        """
+        Returns the stats of one operation and subscription.
+
+        Args:
+            operation (str): The name of the operation.
+            subscription_id (str): The subscription ID.
+
+        Returns:
+            OperationStats: The measurements, empty if the operation was never called.
+        """
+        with self.__lock:
+            return self.__stats.get((operation, subscription_id)) or OperationStats(
+                latency=LatencyHistogram(self.latency_bounds), page_latency=LatencyHistogram(self.latency_bounds)
+            )
+
+    def keys(self) -> list:
+        """Returns the (operation, subscription_id) pairs that have measurements."""
+        with self.__lock:
+            return sorted(self.__stats)
+
+    def summary(self) -> dict:
+        """
+        Returns the main figures of every operation, merged across subscriptions.
+
+        Returns:
+            dict: Per operation, the calls, errors, retries, pages, items, average items per page, and the p50 and
+            p99 latency bucket bounds in seconds.
+        """
+        with self.__lock:
+            merged = {}
+            for (operation, _), stats in self.__stats.items():
+                summary = merged.setdefault(operation, {"calls": 0, "errors": 0, "retries": 0, "pages": 0, "items": 0,
+                                                        "latency": LatencyHistogram(self.latency_bounds)})
+                summary["calls"] += stats.calls
+                summary["errors"] += sum(stats.errors.values())
+                summary["retries"] += stats.retries
+                summary["pages"] += stats.pages
+                summary["items"] += stats.items
+                latency = summary["latency"]
+                latency.counts = [total + count for total, count in zip(latency.counts, stats.latency.counts)]
+                latency.count += stats.latency.count
+                latency.total += stats.latency.total
+
+        for summary in merged.values():
+            latency = summary.pop("latency")
+            summary["items_per_page"] = summary["items"] / summary["pages"] if summary["pages"] else 0.0
+            summary["p50_seconds"] = latency.quantile(0.5)
+            summary["p99_seconds"] = latency.quantile(0.99)
+
+        return merged
+
+    def reset(self) -> None:
+        """Forgets every measurement."""
+        with self.__lock:
+            self.__stats.clear()
+
+
+class CompositeInstrumentation(Instrumentation):
+    """An Instrumentation that forwards every hook to several others, e.g. an in-memory collector and an adapter."""
+
+    def __init__(self, *instrumentations: Instrumentation) -> None:
+        self.instrumentations = instrumentations
+
+    def record_call(self, operation, subscription_id, seconds, error=None):
+        for instrumentation in self.instrumentations:
+            instrumentation.record_call(operation, subscription_id, seconds, error)
+
+    def record_page(self, operation, subscription_id, items, seconds):
+        for instrumentation in self.instrumentations:
+            instrumentation.record_page(operation, subscription_id, items, seconds)
+
+    def record_retry(self, operation, subscription_id, error, attempt):
+        for instrumentation in self.instrumentations:
+            instrumentation.record_retry(operation, subscription_id, error, attempt)
+
+
+_instrumentation = SharedInstance(Instrumentation)
+
+
+def get_instrumentation() -> Instrumentation:
+    """
+    Returns the process-wide Instrumentation, a no-op one unless another was set.
+
+    Returns:
+        Instrumentation: The instrumentation used by SnapshotServices objects built without one.
+    """
+    return _instrumentation.get()
+
+
+def set_instrumentation(instrumentation: Instrumentation) -> None:
+    """
+    Replaces the process-wide Instrumentation.
+
+    Args:
+        instrumentation (Instrumentation): The instrumentation to be shared, or None to go back to the no-op one.
+    """
+    _instrumentation.set(instrumentation)
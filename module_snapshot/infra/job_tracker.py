@@ -0,0 +1,373 @@
+"""Track many long-running snapshot mutations with one shared polling loop"""
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from azure.core.exceptions import ResourceNotFoundError
+from module_snapshot.entities.operation_result import OperationStatus
+from module_snapshot.utils.exception import ExceptionError
+from module_snapshot.utils.tag_exception import TagNotFoundException
+
+
+class JobHandle:
+    """
+    The handle of one mutation tracked by a JobTracker.
+
+    Attributes:
+        job_id (int): The identifier of the job in its tracker.
+        resource_id (str): The resource ID of the snapshot.
+        operation (str): The name of the mutation, e.g. "update" or "delete".
+        status (OperationStatus): IN_PROGRESS until the mutation completes, then SUCCESS, TAG_NOT_FOUND, NOT_FOUND or
+            ERROR.
+        error (Exception): The exception that ended the mutation, if any.
+        result: The value returned by the operation, e.g. the updated snapshot.
+        polls (int): The number of status requests sent.
+        submitted_at (datetime): When the job was submitted.
+        completed_at (datetime): When the job completed, or None.
+
+    Methods:
+        done(): Returns True once the job completed.
+        wait(timeout): Blocks until the job completes.
+        add_done_callback(callback): Calls a function with the handle once the job completed.
+        complete(status, result, error): Records the outcome of the job; used by its JobTracker.
+    """
+
+    def __init__(self, job_id: int, resource_id: str, operation: str) -> None:
+        self.job_id = job_id
+        self.resource_id = resource_id
+        self.operation = operation
+        self.status = OperationStatus.IN_PROGRESS
+        self.error = None
+        self.result = None
+        self.polls = 0
+        self.submitted_at = datetime.now(timezone.utc)
+        self.completed_at = None
+        self.__callbacks = []
+        self.__lock = threading.Lock()
+        self.__done = threading.Event()
+
+    def __repr__(self) -> str:
+        return f"JobHandle({self.job_id}, {self.operation!r}, {self.resource_id!r}, {self.status.value})"
+
+    @property
+    def succeeded(self) -> bool:
+        """Returns True when the mutation succeeded."""
+        return self.status is OperationStatus.SUCCESS
+
+    @property
+    def duration_seconds(self) -> float:
+        """Returns how long the job took, or None if it did not complete."""
+        if self.completed_at is None:
+            return None
+
+        return (self.completed_at - self.submitted_at).total_seconds()
+
+    def done(self) -> bool:
+        """Returns True once the job completed, successfully or not."""
+        return self.__done.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Blocks until the job completes.
+
+        Args:
+            timeout (float): The maximum number of seconds to wait; None waits forever.
+
+        Returns:
+            bool: True if the job completed.
+        """
+        return self.__done.wait(timeout)
+
+    def add_done_callback(self, callback) -> None:
+        """
+        Calls a function with the handle once the job completed; immediately if it already did. Callbacks run on a
+        thread of the tracker and must not block.
+
+        Args:
+            callback (callable): The function to be called with the handle.
+        """
+        with self.__lock:
+            if not self.__done.is_set():
+                self.__callbacks.append(callback)
+                return
+
+        callback(self)
+
+    def complete(self, status: OperationStatus, result=None, error: Exception = None) -> list:
+        """
+        Records the outcome of the job and wakes up its waiters. Called once by the tracker of the job, which then
+        calls the returned callbacks.
+
+        Args:
+            status (OperationStatus): The final status of the job.
+            result: The value returned by the operation.
+            error (Exception): The exception that ended the job, if any.
+
+        Returns:
+            list: The callbacks added before the completion.
+        """
+        with self.__lock:
+            self.status, self.result, self.error = status, result, error
+            self.completed_at = datetime.now(timezone.utc)
+            self.__done.set()
+            callbacks, self.__callbacks = self.__callbacks, []
+
+        return callbacks
+
+
+class JobTracker:
+    """
+    Polls many long-running operations from one scheduler thread and a small pool of workers, whatever the number of
+    operations in flight.
+
+    A job is started by calling a function returning a pollable operation, such as the TrackedPolling returned by
+    SnapshotServices.start_delete(). The operation must provide done(), poll() (one status request, returning
+    whether it is done), result() (the final value, or the failure raised) and a retry_after attribute. Each job is
+    polled after the Retry-After of its last response when there is one, otherwise after an interval growing from
+    poll_interval to max_poll_interval.
+
+    Methods:
+        submit(resource_id, start, operation, callback): Starts a job and returns its JobHandle.
+        wait_all(timeout): Blocks until every submitted job completed.
+        handles(status): Returns the handles of the jobs, optionally only those with a status.
+        status_counts(): Returns the number of jobs per status.
+        clear_completed(): Forgets the completed jobs.
+        close(wait): Stops the polling loop and the workers.
+    """
+
+    def __init__(self, max_workers: int = 8, poll_interval: float = 1.0, max_poll_interval: float = 30.0,
+                 backoff_factor: float = 2.0) -> None:
+        """
+        Initializes the tracker. Its threads are started by the first submit().
+
+        Args:
+            max_workers (int): The maximum number of requests (starts, polls and completions) sent at the same time.
+            poll_interval (float): The delay before the first status request of a job, in seconds.
+            max_poll_interval (float): The maximum delay between two status requests of a job, in seconds.
+            backoff_factor (float): The factor applied to the delay after each status request.
+        """
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.backoff_factor = backoff_factor
+        self.__jobs = {}
+        self.__schedule = []
+        self.__ids = itertools.count(1)
+        self.__in_progress = 0
+        self.__closed = False
+        self.__condition = threading.Condition()
+        self.__executor = None
+        self.__scheduler = None
+        self.__exception_error = ExceptionError()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __start_threads(self) -> None:
+        """Starts the worker pool and the scheduler thread. Must be called with the condition held."""
+        if self.__scheduler is None:
+            self.__executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="JobTracker")
+            self.__scheduler = threading.Thread(target=self.__run_schedule, name="JobTracker-scheduler", daemon=True)
+            self.__scheduler.start()
+
+    def submit(self, resource_id: str, start, operation: str = "", callback=None) -> JobHandle:
+        """
+        Starts a job without waiting for it: start() is called on a worker of the tracker.
+
+        Args:
+            resource_id (str): The resource ID of the snapshot.
+            start (callable): The function sending the initial request and returning the pollable operation.
+            operation (str): The name of the mutation, stored in the handle.
+            callback (callable): Optional function called with the handle once the job completed.
+
+        Returns:
+            JobHandle: The handle of the job, IN_PROGRESS.
+
+        Raises:
+            RuntimeError: If the tracker is being closed.
+        """
+        with self.__condition:
+            if self.__closed:
+                raise RuntimeError("The job tracker is being closed.")
+
+            handle = JobHandle(next(self.__ids), resource_id, operation)
+            if callback is not None:
+                handle.add_done_callback(callback)
+
+            self.__jobs[handle.job_id] = handle
+            self.__in_progress += 1
+            self.__start_threads()
+            self.__executor.submit(self.__start, handle, start)
+
+        return handle
+
+    def __start(self, handle: JobHandle, start) -> None:
+        """Sends the initial request of a job and schedules its first poll."""
+        try:
+            operation = start()
+            if operation.done():
+                self.__complete(handle, operation)
+            else:
+                self.__reschedule(handle, operation, self.poll_interval)
+
+        except Exception as exception:
+            self.__fail(handle, exception)
+
+    def __poll(self, handle: JobHandle, operation, interval: float) -> None:
+        """Sends one status request of a job and schedules the next one, or completes the job."""
+        try:
+            handle.polls += 1
+            if operation.poll():
+                self.__complete(handle, operation)
+            else:
+                self.__reschedule(handle, operation, min(interval * self.backoff_factor, self.max_poll_interval))
+
+        except Exception as exception:
+            self.__fail(handle, exception)
+
+    def __reschedule(self, handle: JobHandle, operation, interval: float) -> None:
+        """Schedules the next poll of a job after the Retry-After of its last response, or after the interval."""
+        delay = operation.retry_after if operation.retry_after is not None else interval
+
+        with self.__condition:
+            heapq.heappush(self.__schedule, (time.monotonic() + delay, handle.job_id, handle, operation, interval))
+            self.__condition.notify_all()
+
+    def __run_schedule(self) -> None:
+        """The polling loop: hands each job whose poll is due to the worker pool."""
+        with self.__condition:
+            while not self.__closed:
+                if not self.__schedule:
+                    self.__condition.wait()
+                    continue
+
+                delay = self.__schedule[0][0] - time.monotonic()
+                if delay > 0:
+                    self.__condition.wait(delay)
+                    continue
+
+                _, _, handle, operation, interval = heapq.heappop(self.__schedule)
+                self.__executor.submit(self.__poll, handle, operation, interval)
+
+    def __complete(self, handle: JobHandle, operation) -> None:
+        """Completes a done job with the result of its operation."""
+        try:
+            result = operation.result()
+        except Exception as exception:
+            self.__fail(handle, exception)
+            return
+
+        self.__finish(handle, handle.complete(OperationStatus.SUCCESS, result=result))
+
+    def __fail(self, handle: JobHandle, exception: Exception) -> None:
+        """Completes a job with the status matching the exception that ended it."""
+        if isinstance(exception, TagNotFoundException):
+            status = OperationStatus.TAG_NOT_FOUND
+        elif isinstance(exception, ResourceNotFoundError):
+            status = OperationStatus.NOT_FOUND
+        else:
+            self.__exception_error.exception_error(f'JobTracker {handle.operation}', exception)
+            status = OperationStatus.ERROR
+
+        self.__finish(handle, handle.complete(status, error=exception))
+
+    def __finish(self, handle: JobHandle, callbacks: list) -> None:
+        """Calls the callbacks of a completed job and wakes up wait_all()."""
+        for callback in callbacks:
+            try:
+                callback(handle)
+            except Exception as exception:
+                self.__exception_error.exception_error('JobTracker callback', exception)
+
+        with self.__condition:
+            self.__in_progress -= 1
+            self.__condition.notify_all()
+
+    def wait_all(self, timeout: float = None) -> bool:
+        """
+        Blocks until every submitted job completed.
+
+        Args:
+            timeout (float): The maximum number of seconds to wait; None waits forever.
+
+        Returns:
+            bool: True if no job is in progress anymore.
+        """
+        with self.__condition:
+            return self.__condition.wait_for(lambda: self.__in_progress == 0, timeout)
+
+    def handles(self, status: OperationStatus = None) -> list:
+        """
+        Returns the handles of the jobs, in submission order.
+
+        Args:
+            status (OperationStatus): Optional status the jobs must have, e.g. IN_PROGRESS.
+
+        Returns:
+            list: The JobHandle objects.
+        """
+        with self.__condition:
+            handles = list(self.__jobs.values())
+
+        return [handle for handle in handles if status is None or handle.status is status]
+
+    def status_counts(self) -> dict:
+        """
+        Returns the number of jobs per status.
+
+        Returns:
+            dict: The number of jobs keyed by OperationStatus, without the statuses no job has.
+        """
+        counts = {}
+        for handle in self.handles():
+            counts[handle.status] = counts.get(handle.status, 0) + 1
+
+        return counts
+
+    def clear_completed(self) -> int:
+        """
+        Forgets the completed jobs, e.g. after their results were processed.
+
+        Returns:
+            int: The number of jobs forgotten.
+        """
+        with self.__condition:
+            completed = [job_id for job_id, handle in self.__jobs.items() if handle.done()]
+            for job_id in completed:
+                del self.__jobs[job_id]
+
+        return len(completed)
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stops the polling loop and the workers. The tracker starts them again on the next submit().
+
+        Args:
+            wait (bool): Whether to wait for the jobs in progress first. When False, the requests being sent are
+                finished and the other jobs are abandoned: they complete with the status ERROR.
+        """
+        if wait:
+            self.wait_all()
+
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify_all()
+            executor, scheduler = self.__executor, self.__scheduler
+
+        if scheduler is not None:
+            scheduler.join()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        for handle in self.handles(OperationStatus.IN_PROGRESS):
+            error = RuntimeError("The job tracker was closed before the job completed.")
+            self.__finish(handle, handle.complete(OperationStatus.ERROR, error=error))
+
+        with self.__condition:
+            self.__schedule.clear()
+            self.__executor = self.__scheduler = None
+            self.__closed = False
@@ -0,0 +1,93 @@
+"""ARM long-running operations advanced by a JobTracker instead of one thread per LROPoller"""
+from azure.mgmt.core.polling.arm_polling import ARMPolling
+from module_snapshot.infra.throttling import retry_after_seconds
+
+
+class TrackedPolling(ARMPolling):
+    """
+    An ARMPolling sending one status request at a time, when a JobTracker asks for it.
+
+    The LROPoller built by begin_update/begin_delete starts a thread running the polling method unless finished()
+    is True after the initial response, so finished() always reports True to it; the tracker uses done(), poll() and
+    result(), which see the real status of the operation.
+
+    Attributes:
+        retry_after (float): The delay the last response asked for before the next status request, or None.
+    """
+
+    def __init__(self, call=None, response_hook=None, on_done=None, **operation_config) -> None:
+        """
+        Args:
+            call (callable): Called with each request function of the polling (the status requests and the final
+                GET), e.g. to send them through a Throttle. The functions accept and ignore keyword arguments.
+            response_hook (callable): A raw_response_hook also called with every polling response.
+            on_done (callable): Called once, without arguments, after result() or after a failed status request,
+                e.g. to release the client the operation is polled through.
+            **operation_config: The other keyword arguments of ARMPolling.
+        """
+        super().__init__(raw_response_hook=self.__observe, **operation_config)
+        self.__call = call or (lambda function: function())
+        self.__response_hook = response_hook
+        self.__on_done = on_done
+        self.retry_after = None
+
+    def __observe(self, pipeline_response) -> None:
+        """Keeps the Retry-After of a polling response and forwards the response to the response hook."""
+        self.retry_after = retry_after_seconds(pipeline_response.http_response.headers)
+        if self.__response_hook is not None:
+            self.__response_hook(pipeline_response)
+
+    def initialize(self, client, initial_response, deserialization_callback) -> None:
+        self.retry_after = retry_after_seconds(initial_response.http_response.headers)
+        super().initialize(client, initial_response, deserialization_callback)
+
+    def finished(self) -> bool:
+        return True
+
+    def done(self) -> bool:
+        """Returns True once the operation reached a terminal status, successful or not."""
+        return super().finished()
+
+    def poll(self) -> bool:
+        """
+        Sends one status request, unless the operation is already done.
+
+        Returns:
+            bool: True if the operation reached a terminal status.
+        """
+        if not self.done():
+            try:
+                self.__call(self.__update_status)
+            except Exception:
+                self.__finish()
+                raise
+
+        return self.done()
+
+    def result(self):
+        """
+        Completes a done operation, sending its final GET when it has one.
+
+        Returns:
+            The deserialized resource, e.g. the updated Snapshot, or None for a deletion.
+
+        Raises:
+            HttpResponseError: If the operation failed or was canceled.
+        """
+        try:
+            self.__call(self.__complete)
+        finally:
+            self.__finish()
+
+        return self.resource()
+
+    def __finish(self) -> None:
+        on_done, self.__on_done = self.__on_done, None
+        if on_done is not None:
+            on_done()
+
+    def __update_status(self, **kwargs) -> None:
+        self.update_status()
+
+    def __complete(self, **kwargs) -> None:
+        self.run()
@@ -0,0 +1,174 @@
+"""Provide snapshot listing backed by Azure Resource Graph"""
+from module_snapshot.infra.authenticate import AzureAuthenticate
+from module_snapshot.entities.snapshot_model import SnapshotModel
+from module_snapshot.utils.lazy_import import import_optional
+from module_snapshot.utils.resource_id import parse_snapshot_id
+
+ResourceGraphClient = None
+
+SNAPSHOT_RESOURCE_TYPE = "Microsoft.Compute/snapshots"
+MAX_SUBSCRIPTIONS_PER_QUERY = 1000
+
+
+def kql_quote(value: str) -> str:
+    """Quotes a value as a KQL string literal.
+
+     Args:
+         value(str): The value to be quoted.
+
+     returns:
+         str: The value between single quotes, with backslashes and quotes escaped.
+    """
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def build_snapshot_query(tags: dict = None, locations: list = None) -> str:
+    """Builds the Resource Graph query listing snapshots with only the fields needed by SnapshotModel.
+
+     Args:
+         tags(dict): Optional tag filter. Each key must exist; a value other than None must also match.
+         locations(list): Optional list of locations the snapshots must be in.
+
+     returns:
+         str: The KQL query.
+    """
+    clauses = ["Resources", f"| where type =~ {kql_quote(SNAPSHOT_RESOURCE_TYPE)}"]
+
+    if locations:
+        clauses.append(f"| where location in~ ({', '.join(kql_quote(location) for location in locations)})")
+
+    for tag_key, tag_value in (tags or {}).items():
+        if tag_value is None:
+            clauses.append(f"| where isnotnull(tags[{kql_quote(tag_key)}])")
+        else:
+            clauses.append(f"| where tostring(tags[{kql_quote(tag_key)}]) == {kql_quote(tag_value)}")
+
+    clauses.append("| project id, name, location, tags, subscriptionId, timeCreated = tostring(properties.timeCreated),"
+                   " sourceResourceId = tostring(properties.creationData.sourceResourceId),"
+                   " diskSizeGB = toint(properties.diskSizeGB), incremental = tobool(properties.incremental),"
+                   " sku = tostring(sku.name)")
+    clauses.append("| order by id asc")
+
+    return "\n".join(clauses)
+
+
+def row_to_snapshot_model(row: dict) -> SnapshotModel:
+    """Converts a Resource Graph row into a SnapshotModel identical to the one built from the Compute API.
+
+     Args:
+         row(dict): A row of the snapshot query, in objectArray format.
+
+     returns:
+         SnapshotModel: A SnapshotModel object containing snapshot information.
+    """
+    resource_id = row["id"]
+    # timeCreated is an ISO 8601 UTC timestamp such as 2023-06-08T21:25:28.1023990+00:00.
+    created_time = row["timeCreated"][:19].replace("T", " ")
+
+    return SnapshotModel(
+                        row["subscriptionId"],
+                        parse_snapshot_id(resource_id)[1],
+                        resource_id,
+                        row["name"],
+                        row["location"],
+                        # Resource Graph returns {} for an untagged snapshot, where the Compute API returns None.
+                        row.get("tags") or None,
+                        SNAPSHOT_RESOURCE_TYPE,
+                        created_time,
+                        row.get("sourceResourceId") or None,
+                        row.get("diskSizeGB"),
+                        row.get("incremental"),
+                        row.get("sku") or None
+                    )
+
+
+class ResourceGraphSnapshotServices:
+    """Class responsible for listing snapshots of many subscriptions through Azure Resource Graph."""
+
+    def __init__(self, client=None, page_size: int = 1000):
+        """
+        Args:
+            client: An optional Resource Graph client exposing resources(query). When omitted, a
+                ResourceGraphClient is built on first use with the shared credential.
+            page_size (int): The number of rows requested per page (at most 1000).
+        """
+        self.__client = client
+        self.__page_size = page_size
+
+    def __get_client(self):
+        """Returns the Resource Graph client, building it on first use.
+
+         returns:
+             ResourceGraphClient: The client used to run the queries.
+
+         Raises:
+             ImportError: If the azure-mgmt-resourcegraph package is not installed.
+        """
+        if self.__client is None:
+            client_class = ResourceGraphClient
+            if client_class is None:
+                resourcegraph = import_optional("azure.mgmt.resourcegraph")
+                if resourcegraph is None:
+                    raise ImportError("The Resource Graph backend requires the azure-mgmt-resourcegraph package.")
+                client_class = resourcegraph.ResourceGraphClient
+
+            self.__client = client_class(AzureAuthenticate().client_credentials())
+
+        return self.__client
+
+    def iter_snapshot_pages(self, subscription_ids: list, tags: dict = None, locations: list = None):
+        """Yields the snapshots of many subscriptions one Resource Graph page at a time.
+
+         Args:
+             subscription_ids(list): The subscription IDs.
+             tags(dict): Optional tag filter. Each key must exist; a value other than None must also match.
+             locations(list): Optional list of locations the snapshots must be in.
+
+         yields:
+             list: A list of SnapshotModel objects for each page returned by Resource Graph.
+        """
+        client = self.__get_client()
+        query = build_snapshot_query(tags, locations)
+
+        for start in range(0, len(subscription_ids), MAX_SUBSCRIPTIONS_PER_QUERY):
+            subscriptions = subscription_ids[start:start + MAX_SUBSCRIPTIONS_PER_QUERY]
+            skip_token = None
+
+            while True:
+                options = {"$top": self.__page_size, "resultFormat": "objectArray"}
+                if skip_token:
+                    options["$skipToken"] = skip_token
+
+                response = client.resources({"subscriptions": subscriptions, "query": query, "options": options})
+                yield [row_to_snapshot_model(row) for row in response.data]
+
+                skip_token = response.skip_token
+                if not skip_token:
+                    break
+
+    def iter_snapshots(self, subscription_ids: list, tags: dict = None, locations: list = None):
+        """Yields the snapshots of many subscriptions as the Resource Graph pages arrive.
+
+         Args:
+             subscription_ids(list): The subscription IDs.
+             tags(dict): Optional tag filter. Each key must exist; a value other than None must also match.
+             locations(list): Optional list of locations the snapshots must be in.
+
+         yields:
+             SnapshotModel: A SnapshotModel object containing snapshot information.
+        """
+        for page in self.iter_snapshot_pages(subscription_ids, tags, locations):
+            yield from page
+
+    def list_snapshots(self, subscription_ids: list, tags: dict = None, locations: list = None):
+        """Lists the snapshots of many subscriptions in one paged query.
+
+         Args:
+             subscription_ids(list): The subscription IDs.
+             tags(dict): Optional tag filter. Each key must exist; a value other than None must also match.
+             locations(list): Optional list of locations the snapshots must be in.
+
+         returns:
+             list: A list of SnapshotModel objects containing snapshot information.
+        """
+        return list(self.iter_snapshots(subscription_ids, tags, locations))
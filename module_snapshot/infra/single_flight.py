@@ -0,0 +1,178 @@
+"""Coalescing of concurrent identical reads, with an optional short-lived memoization"""
+import threading
+import time
+from collections import OrderedDict
+from module_snapshot.utils.shared_instance import SharedInstance
+
+
+class _Flight:
+    """One call in progress, shared by every caller asking for the same key."""
+
+    def __init__(self, generation: int) -> None:
+        self.generation = generation
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Shares one in-flight call, and its result or exception, between the threads asking for the same key.
+
+    The first caller of a key runs the function; the callers arriving while it runs wait for it and receive the same
+    result, or the same exception raised again. With ttl_seconds above zero, successful results are also memoized for
+    that long, at most max_entries of them, the least recently used being evicted first. Exceptions are never
+    memoized, nor the results of the calls that were in flight when invalidate() ran, as they may have read the state
+    the invalidation was about. Results are shared as they are: callers must not modify them.
+
+    Attributes:
+        ttl_seconds (float): How long a successful result is reused; 0 only coalesces concurrent calls.
+        max_entries (int): The maximum number of memoized results.
+
+    Methods:
+        do(key, function): Returns the result of function(), shared with the concurrent calls of the same key.
+        invalidate(predicate): Forgets the memoized results whose key matches.
+        stats(): Returns the number of calls, of shared calls and of memoized results used.
+    """
+
+    def __init__(self, ttl_seconds: float = 0.0, max_entries: int = 1024) -> None:
+        """
+        Args:
+            ttl_seconds (float): How long a successful result is reused; 0 disables the memoization.
+            max_entries (int): The maximum number of memoized results.
+
+        Raises:
+            ValueError: If ttl_seconds is negative or max_entries is lower than 1.
+        """
+        if ttl_seconds < 0 or max_entries < 1:
+            raise ValueError('The "ttl_seconds" parameter must not be negative and "max_entries" must be greater than zero.')
+
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.__flights = {}
+        self.__memo = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__calls = 0
+        self.__shared = 0
+        self.__memo_hits = 0
+        # Bumped by invalidate(): a call started before an invalidation does not memoize its result.
+        self.__generation = 0
+
+    def __memoized(self, key):
+        """Returns (True, result) for a fresh memoized result, else (False, None). Must be called with the lock."""
+        entry = self.__memo.get(key)
+        if entry is None:
+            return False, None
+
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del self.__memo[key]
+            return False, None
+
+        self.__memo.move_to_end(key)
+        return True, result
+
+    def do(self, key, function):
+        """
+        Returns the result of function(), running it only if no call of the same key is in flight or memoized.
+
+        Args:
+            key (hashable): Identifies identical calls, e.g. ("get", subscription_id, resource_group, name).
+            function (callable): The call to run, without arguments.
+
+        Returns:
+            The result of the call, possibly shared with other callers.
+
+        Raises:
+            Exception: The exception raised by the shared call.
+        """
+        with self.__lock:
+            found, result = self.__memoized(key)
+            if found:
+                self.__memo_hits += 1
+                return result
+
+            flight = self.__flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.__flights[key] = _Flight(self.__generation)
+                self.__calls += 1
+            else:
+                self.__shared += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = function()
+        except BaseException as exception:
+            flight.error = exception
+            raise
+        finally:
+            with self.__lock:
+                del self.__flights[key]
+                if flight.error is None and self.ttl_seconds > 0 and flight.generation == self.__generation:
+                    self.__memo[key] = (time.monotonic() + self.ttl_seconds, flight.result)
+                    self.__memo.move_to_end(key)
+                    while len(self.__memo) > self.max_entries:
+                        self.__memo.popitem(last=False)
+            flight.done.set()
+
+        return flight.result
+
+    def invalidate(self, predicate=None) -> int:
+        """
+        Forgets memoized results, e.g. after a write made them stale. Calls in flight still return their result to
+        their callers, but do not memoize it.
+
+        Args:
+            predicate (callable): Receives each key and returns True for those to forget; every key when omitted.
+
+        Returns:
+            int: The number of results forgotten.
+        """
+        with self.__lock:
+            self.__generation += 1
+            keys = [key for key in self.__memo if predicate is None or predicate(key)]
+            for key in keys:
+                del self.__memo[key]
+
+        return len(keys)
+
+    def stats(self) -> dict:
+        """
+        Returns the counters of the coalescing.
+
+        Returns:
+            dict: "calls" (functions run), "shared" (callers that waited for a call in flight), "memo_hits" (callers
+            served by a memoized result) and "memoized" (results currently memoized).
+        """
+        with self.__lock:
+            return {"calls": self.__calls, "shared": self.__shared, "memo_hits": self.__memo_hits,
+                    "memoized": len(self.__memo)}
+
+
+_single_flight = SharedInstance(SingleFlight)
+
+
+def get_single_flight() -> SingleFlight:
+    """
+    Returns the process-wide SingleFlight, creating it on first use.
+
+    Returns:
+        SingleFlight: The SingleFlight shared by every SnapshotServices of the process built without one.
+    """
+    return _single_flight.get()
+
+
+def set_single_flight(single_flight: SingleFlight) -> None:
+    """
+    Replaces the process-wide SingleFlight, e.g. to memoize the reads of every service for a few seconds.
+
+    Args:
+        single_flight (SingleFlight): The SingleFlight to be shared, or None to build a new one on next use.
+    """
+    _single_flight.set(single_flight)
@@ -0,0 +1,321 @@
+"""Local persistent cache of the snapshot inventory"""
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import asdict
+from module_snapshot.entities.snapshot_model import SnapshotModel
+
+SUBSCRIPTION_SCOPE = ""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    resource_id TEXT PRIMARY KEY,
+    subscription_id TEXT NOT NULL,
+    resource_group_name TEXT NOT NULL COLLATE NOCASE,
+    snapshot_name TEXT NOT NULL COLLATE NOCASE,
+    location TEXT,
+    created_date TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_snapshots_resource_group ON snapshots (subscription_id, resource_group_name, snapshot_name);
+CREATE INDEX IF NOT EXISTS ix_snapshots_location ON snapshots (location);
+CREATE INDEX IF NOT EXISTS ix_snapshots_created_date ON snapshots (created_date);
+CREATE TABLE IF NOT EXISTS snapshot_tags (
+    resource_id TEXT NOT NULL REFERENCES snapshots (resource_id) ON DELETE CASCADE,
+    tag_key TEXT NOT NULL,
+    tag_value TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_snapshot_tags_key_value ON snapshot_tags (tag_key, tag_value);
+CREATE INDEX IF NOT EXISTS ix_snapshot_tags_resource_id ON snapshot_tags (resource_id);
+CREATE TABLE IF NOT EXISTS scopes (
+    subscription_id TEXT NOT NULL,
+    resource_group_name TEXT NOT NULL COLLATE NOCASE,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (subscription_id, resource_group_name)
+);
+"""
+
+
+
+class SnapshotCache:
+    """
+    A SQLite-backed cache of SnapshotModel rows with a TTL per subscription and per resource group.
+
+    A listing stored for a whole subscription also makes each of its resource groups fresh. Snapshots, their tags,
+    resource groups, locations and created dates are indexed, so questions such as "which snapshots in RG X carry
+    tag Y" are answered with query() without calling Azure.
+
+    Attributes:
+        ttl_seconds (float): How long a stored listing is considered fresh.
+    """
+
+    def __init__(self, path: str = ":memory:", ttl_seconds: float = 900) -> None:
+        """
+        Opens (and creates if needed) the cache database.
+
+        Args:
+            path (str): The SQLite database file, or ":memory:" for a cache private to the process.
+            ttl_seconds (float): How long a stored listing is considered fresh.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute("PRAGMA foreign_keys = ON")
+        self.__connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """Closes the cache database."""
+        with self.__lock:
+            self.__connection.close()
+
+    @staticmethod
+    def __to_model(row) -> SnapshotModel:
+        """Converts a snapshots row into a SnapshotModel."""
+        return SnapshotModel(**json.loads(row[0]))
+
+    def __insert(self, snapshots) -> None:
+        """Inserts or replaces snapshots and their tags. Must be called inside a transaction."""
+        for snapshot in snapshots:
+            self.__connection.execute("DELETE FROM snapshots WHERE resource_id = ?", (snapshot.resource_id,))
+            self.__connection.execute(
+                "INSERT INTO snapshots (resource_id, subscription_id, resource_group_name, snapshot_name, location, created_date, data)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (snapshot.resource_id, snapshot.subscription_id, snapshot.resource_group_name, snapshot.snapshot_name,
+                 snapshot.location, snapshot.created_date, json.dumps(asdict(snapshot)))
+            )
+            self.__connection.executemany(
+                "INSERT INTO snapshot_tags (resource_id, tag_key, tag_value) VALUES (?, ?, ?)",
+                [(snapshot.resource_id, tag_key, tag_value) for tag_key, tag_value in (snapshot.tags or {}).items()]
+            )
+
+    def __mark_fresh(self, subscription_id: str, resource_group_name: str) -> None:
+        """Records that a scope was just listed. Must be called inside a transaction."""
+        self.__connection.execute(
+            "INSERT OR REPLACE INTO scopes (subscription_id, resource_group_name, fetched_at) VALUES (?, ?, ?)",
+            (subscription_id, resource_group_name, time.time())
+        )
+
+    def is_fresh(self, subscription_id: str, resource_group_name: str = None) -> bool:
+        """
+        Checks whether the listing of a subscription or resource group is stored and younger than the TTL.
+
+        Args:
+            subscription_id (str): The subscription ID.
+            resource_group_name (str): The name of the resource group, or None for the whole subscription.
+
+        Returns:
+            bool: True if the stored listing can be served.
+        """
+        scopes = [SUBSCRIPTION_SCOPE] if resource_group_name is None else [SUBSCRIPTION_SCOPE, resource_group_name]
+
+        with self.__lock:
+            row = self.__connection.execute(
+                f"SELECT MAX(fetched_at) FROM scopes WHERE subscription_id = ? AND resource_group_name IN ({', '.join('?' * len(scopes))})",
+                (subscription_id, *scopes)
+            ).fetchone()
+
+        return row[0] is not None and time.time() - row[0] < self.ttl_seconds
+
+    def store_subscription(self, subscription_id: str, snapshots: list) -> None:
+        """
+        Replaces the cached snapshots of a subscription with a fresh listing.
+
+        Args:
+            subscription_id (str): The subscription ID.
+            snapshots (list): Every SnapshotModel of the subscription.
+        """
+        with self.__lock, self.__connection:
+            self.__connection.execute("DELETE FROM snapshots WHERE subscription_id = ?", (subscription_id,))
+            self.__connection.execute("DELETE FROM scopes WHERE subscription_id = ?", (subscription_id,))
+            self.__insert(snapshots)
+            self.__mark_fresh(subscription_id, SUBSCRIPTION_SCOPE)
+
+    def store_resource_group(self, subscription_id: str, resource_group_name: str, snapshots: list) -> None:
+        """
+        Replaces the cached snapshots of a resource group with a fresh listing.
+
+        Args:
+            subscription_id (str): The subscription ID.
+            resource_group_name (str): The name of the resource group.
+            snapshots (list): Every SnapshotModel of the resource group.
+        """
+        with self.__lock, self.__connection:
+            self.__connection.execute(
+                "DELETE FROM snapshots WHERE subscription_id = ? AND resource_group_name = ?",
+                (subscription_id, resource_group_name)
+            )
+            self.__insert(snapshots)
+            self.__mark_fresh(subscription_id, resource_group_name)
+
+    def store_snapshot(self, snapshot: SnapshotModel) -> None:
+        """
+        Inserts or replaces a single snapshot, without changing the freshness of any listing.
+
+        Args:
+            snapshot (SnapshotModel): The snapshot to be stored.
+        """
+        with self.__lock, self.__connection:
+            self.__insert([snapshot])
+
+    def list_snapshots(self, subscription_id: str, resource_group_name: str = None) -> list:
+        """
+        Returns the cached snapshots of a subscription or resource group.
+
+        Args:
+            subscription_id (str): The subscription ID.
+            resource_group_name (str): The name of the resource group, or None for the whole subscription.
+
+        Returns:
+            list: A list of SnapshotModel objects.
+        """
+        return self.query(subscription_id=subscription_id, resource_group_name=resource_group_name)
+
+    def get_snapshot(self, subscription_id: str, resource_group_name: str, snapshot_name: str):
+        """
+        Returns a cached snapshot.
+
+        Args:
+            subscription_id (str): The subscription ID.
+            resource_group_name (str): The name of the resource group.
+            snapshot_name (str): The name of the snapshot.
+
+        Returns:
+            SnapshotModel: The cached snapshot, or None if it is not cached.
+        """
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT data FROM snapshots WHERE subscription_id = ? AND resource_group_name = ? AND snapshot_name = ?",
+                (subscription_id, resource_group_name, snapshot_name)
+            ).fetchone()
+
+        return self.__to_model(row) if row is not None else None
+
+    @staticmethod
+    def __add_tag_conditions(tags: dict, conditions: list, params: list) -> None:
+        """Adds a condition per required tag to a query: the key must exist, with the given value unless it is None."""
+        for tag_key, tag_value in tags.items():
+            if tag_value is None:
+                conditions.append("resource_id IN (SELECT resource_id FROM snapshot_tags WHERE tag_key = ?)")
+                params.append(tag_key)
+            else:
+                conditions.append("resource_id IN (SELECT resource_id FROM snapshot_tags WHERE tag_key = ? AND tag_value = ?)")
+                params.extend((tag_key, tag_value))
+
+    def query(self, subscription_id: str = None, resource_group_name: str = None, location: str = None,
+              tags: dict = None, created_after: str = None, created_before: str = None) -> list:
+        """
+        Returns the cached snapshots matching every given criterion, using the indexes of the cache.
+
+        Args:
+            subscription_id (str): The subscription ID.
+            resource_group_name (str): The name of the resource group.
+            location (str): The location of the snapshots.
+            tags (dict): Tags the snapshots must carry. A None value only requires the key to exist.
+            created_after (str): Only snapshots created at or after this "%Y-%m-%d %H:%M:%S" date.
+            created_before (str): Only snapshots created before this "%Y-%m-%d %H:%M:%S" date.
+
+        Returns:
+            list: A list of SnapshotModel objects ordered by resource ID.
+        """
+        conditions, params = [], []
+
+        for column, operator, value in (("subscription_id", "=", subscription_id),
+                                        ("resource_group_name", "=", resource_group_name),
+                                        ("location", "=", location),
+                                        ("created_date", ">=", created_after),
+                                        ("created_date", "<", created_before)):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                params.append(value)
+
+        self.__add_tag_conditions(tags or {}, conditions, params)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self.__lock:
+            rows = self.__connection.execute(f"SELECT data FROM snapshots{where} ORDER BY resource_id", params).fetchall()
+
+        return [self.__to_model(row) for row in rows]
+
+    def __change_tags(self, subscription_id: str, resource_group_name: str, snapshot_name: str, change) -> None:
+        """Reads a cached snapshot, computes its new tags and stores it in one transaction, if it is cached.
+
+        Args:
+            change (callable): Receives the cached tags (a dict, possibly empty) and returns the new ones.
+        """
+        with self.__lock, self.__connection:
+            row = self.__connection.execute(
+                "SELECT data FROM snapshots WHERE subscription_id = ? AND resource_group_name = ? AND snapshot_name = ?",
+                (subscription_id, resource_group_name, snapshot_name)
+            ).fetchone()
+            if row is None:
+                return
+
+            snapshot = self.__to_model(row)
+            snapshot.tags = change(snapshot.tags or {})
+            self.__insert([snapshot])
+
+    def update_tags(self, subscription_id: str, resource_group_name: str, snapshot_name: str, tag_changes: dict) -> None:
+        """
+        Writes tag changes through to a cached snapshot, if it is cached. Concurrent changes of the same snapshot are
+        applied one after the other.
+
+        Args:
+            subscription_id (str): The subscription ID.
+            resource_group_name (str): The name of the resource group.
+            snapshot_name (str): The name of the snapshot.
+            tag_changes (dict): The new values, keyed by tag key.
+        """
+        self.__change_tags(subscription_id, resource_group_name, snapshot_name, lambda tags: {**tags, **tag_changes})
+
+    def set_tags(self, subscription_id: str, resource_group_name: str, snapshot_name: str, tags: dict) -> None:
+        """
+        Replaces the tags of a cached snapshot, if it is cached.
+
+        Args:
+            subscription_id (str): The subscription ID.
+            resource_group_name (str): The name of the resource group.
+            snapshot_name (str): The name of the snapshot.
+            tags (dict): Its new tags.
+        """
+        self.__change_tags(subscription_id, resource_group_name, snapshot_name, lambda _: dict(tags))
+
+    def delete_snapshot(self, subscription_id: str, resource_group_name: str, snapshot_name: str) -> None:
+        """
+        Removes a snapshot from the cache.
+
+        Args:
+            subscription_id (str): The subscription ID.
+            resource_group_name (str): The name of the resource group.
+            snapshot_name (str): The name of the snapshot.
+        """
+        with self.__lock, self.__connection:
+            self.__connection.execute(
+                "DELETE FROM snapshots WHERE subscription_id = ? AND resource_group_name = ? AND snapshot_name = ?",
+                (subscription_id, resource_group_name, snapshot_name)
+            )
+
+    def invalidate(self, subscription_id: str, resource_group_name: str = None) -> None:
+        """
+        Marks the listing of a subscription or resource group as stale, so it is fetched again on next use.
+
+        Invalidating a resource group also invalidates the listing of its whole subscription, which contains it.
+
+        Args:
+            subscription_id (str): The subscription ID.
+            resource_group_name (str): The name of the resource group, or None for the whole subscription.
+        """
+        with self.__lock, self.__connection:
+            if resource_group_name is None:
+                self.__connection.execute("DELETE FROM scopes WHERE subscription_id = ?", (subscription_id,))
+            else:
+                self.__connection.execute(
+                    "DELETE FROM scopes WHERE subscription_id = ? AND resource_group_name IN (?, ?)",
+                    (subscription_id, SUBSCRIPTION_SCOPE, resource_group_name)
+                )
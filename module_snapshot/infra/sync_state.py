@@ -0,0 +1,155 @@
+"""Persistent state of the incremental inventory sync"""
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_digests (
+    subscription_id TEXT NOT NULL,
+    resource_id TEXT NOT NULL,
+    properties_digest TEXT NOT NULL,
+    tags_digest TEXT NOT NULL,
+    PRIMARY KEY (subscription_id, resource_id)
+);
+CREATE TABLE IF NOT EXISTS sync_watermarks (
+    subscription_id TEXT PRIMARY KEY,
+    watermark INTEGER NOT NULL,
+    synced_at TEXT NOT NULL,
+    committed_at REAL NOT NULL
+);
+"""
+
+
+class StaleWatermarkError(Exception):
+    """Raised when a sync result is committed after another result of the same subscription."""
+
+    def __init__(self, subscription_id: str, expected: int, current: int):
+        self.subscription_id = subscription_id
+        self.expected = expected
+        self.current = current
+        super().__init__(f"The sync state of '{subscription_id}' is at watermark {current}, not {expected}.")
+
+
+class SyncStateStore:
+    """
+    A SQLite store of the last committed digests of each snapshot and of a watermark per subscription.
+
+    The watermark is a counter incremented by every commit, so a result computed from an older state cannot
+    overwrite a newer one. Commits only write the digests that changed.
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        """
+        Opens (and creates if needed) the state database.
+
+        Args:
+            path (str): The SQLite database file, or ":memory:" for a state private to the process.
+        """
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """Closes the state database."""
+        with self.__lock:
+            self.__connection.close()
+
+    def watermark(self, subscription_id: str) -> int:
+        """
+        Returns the watermark of a subscription.
+
+        Args:
+            subscription_id (str): The subscription ID.
+
+        Returns:
+            int: The number of commits of the subscription, 0 if it was never synced.
+        """
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT watermark FROM sync_watermarks WHERE subscription_id = ?", (subscription_id,)
+            ).fetchone()
+
+        return row[0] if row is not None else 0
+
+    def load(self, subscription_id: str) -> tuple:
+        """
+        Returns the committed state of a subscription.
+
+        Args:
+            subscription_id (str): The subscription ID.
+
+        Returns:
+            tuple: The watermark and a dict mapping each resource ID to its (properties, tags) digests.
+        """
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT watermark FROM sync_watermarks WHERE subscription_id = ?", (subscription_id,)
+            ).fetchone()
+            digests = {
+                resource_id: (properties_digest, tags_digest)
+                for resource_id, properties_digest, tags_digest in self.__connection.execute(
+                    "SELECT resource_id, properties_digest, tags_digest FROM sync_digests WHERE subscription_id = ?",
+                    (subscription_id,)
+                )
+            }
+
+        return (row[0] if row is not None else 0), digests
+
+    def commit(self, subscription_id: str, base_watermark: int, upserts: dict, deletions: list, synced_at: str) -> int:
+        """
+        Applies the changes of a sync and advances the watermark, in one transaction.
+
+        Args:
+            subscription_id (str): The subscription ID.
+            base_watermark (int): The watermark the changes were computed from.
+            upserts (dict): The new (properties, tags) digests, keyed by resource ID.
+            deletions (list): The resource IDs that no longer exist.
+            synced_at (str): When the listing was taken, as "%Y-%m-%d %H:%M:%S" UTC.
+
+        Returns:
+            int: The new watermark.
+
+        Raises:
+            StaleWatermarkError: If another result was committed since base_watermark.
+        """
+        with self.__lock, self.__connection:
+            row = self.__connection.execute(
+                "SELECT watermark FROM sync_watermarks WHERE subscription_id = ?", (subscription_id,)
+            ).fetchone()
+            current = row[0] if row is not None else 0
+            if current != base_watermark:
+                raise StaleWatermarkError(subscription_id, base_watermark, current)
+
+            self.__connection.executemany(
+                "INSERT OR REPLACE INTO sync_digests (subscription_id, resource_id, properties_digest, tags_digest)"
+                " VALUES (?, ?, ?, ?)",
+                [(subscription_id, resource_id, *digests) for resource_id, digests in upserts.items()]
+            )
+            self.__connection.executemany(
+                "DELETE FROM sync_digests WHERE subscription_id = ? AND resource_id = ?",
+                [(subscription_id, resource_id) for resource_id in deletions]
+            )
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO sync_watermarks (subscription_id, watermark, synced_at, committed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (subscription_id, current + 1, synced_at, time.time())
+            )
+
+        return current + 1
+
+    def reset(self, subscription_id: str) -> None:
+        """
+        Forgets the state of a subscription, so the next sync reports every snapshot as added.
+
+        Args:
+            subscription_id (str): The subscription ID.
+        """
+        with self.__lock, self.__connection:
+            self.__connection.execute("DELETE FROM sync_digests WHERE subscription_id = ?", (subscription_id,))
+            self.__connection.execute("DELETE FROM sync_watermarks WHERE subscription_id = ?", (subscription_id,))
@@ -0,0 +1,83 @@
+"""Client of the ARM Tags API, built from the public azure-core pipeline"""
+from azure.core.exceptions import HttpResponseError, ResourceExistsError, ResourceModifiedError, ResourceNotFoundError, map_error
+from azure.core.pipeline.policies import CustomHookPolicy, HeadersPolicy, RequestIdPolicy, UserAgentPolicy
+from azure.core.rest import HttpRequest
+from azure.mgmt.core import ARMPipelineClient
+from azure.mgmt.core.policies import ARMChallengeAuthenticationPolicy, ARMHttpLoggingPolicy
+
+ARM_ENDPOINT = "https://management.azure.com"
+TAGS_API_VERSION = "2021-04-01"
+TAGS_ERROR_MAP = {404: ResourceNotFoundError, 409: ResourceExistsError, 412: ResourceModifiedError}
+
+
+class TagsClient:
+    """
+    Sends the requests of the ARM Tags API at the scope of a resource.
+
+    The pipeline has no retry policy: the callers send the requests through a Throttle, which retries the transient
+    failures itself.
+
+    Methods:
+        patch(scope, operation, tags, etag): Sends a Tags API PATCH and returns the body of the response.
+        close(): Closes the connections of the pipeline.
+    """
+
+    def __init__(self, credential, base_url: str = ARM_ENDPOINT, **kwargs) -> None:
+        """
+        Args:
+            credential: The credential the requests are authorized with.
+            base_url (str): The Azure Resource Manager endpoint.
+            **kwargs: The other keyword arguments of the pipeline client, e.g. transport.
+        """
+        policies = [
+            RequestIdPolicy(**kwargs),
+            HeadersPolicy(**kwargs),
+            UserAgentPolicy(sdk_moniker="module-snapshot", **kwargs),
+            CustomHookPolicy(**kwargs),
+            ARMChallengeAuthenticationPolicy(credential, f"{base_url}/.default"),
+            ARMHttpLoggingPolicy(**kwargs),
+        ]
+        self.__pipeline_client = ARMPipelineClient(base_url, policies=policies, **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def patch(self, scope: str, operation: str, tags: dict, etag: str = None, **kwargs) -> dict:
+        """
+        Sends a PATCH of the Tags API whose body holds only the operation and the given tags.
+
+        Args:
+            scope (str): The resource ID the tags belong to.
+            operation (str): "Merge", "Replace" or "Delete".
+            tags (dict): The tags of the operation, keyed by tag key.
+            etag (str): The ETag the resource must still have, sent as If-Match; None to update it unconditionally.
+            **kwargs: The keyword arguments of the request, e.g. raw_response_hook.
+
+        Returns:
+            dict: The body of the response.
+
+        Raises:
+            ResourceNotFoundError: If the resource does not exist.
+            ResourceModifiedError: If the resource no longer has the given ETag.
+            HttpResponseError: If the request failed for another reason.
+        """
+        request = HttpRequest(
+            "PATCH",
+            self.__pipeline_client.format_url(f"{scope}/providers/Microsoft.Resources/tags/default"),
+            params={"api-version": TAGS_API_VERSION},
+            headers={"If-Match": etag} if etag is not None else None,
+            json={"operation": operation, "properties": {"tags": tags}})
+
+        response = self.__pipeline_client.send_request(request, **kwargs)
+        if response.status_code != 200:
+            map_error(response.status_code, response, TAGS_ERROR_MAP)
+            raise HttpResponseError(response=response)
+
+        return response.json()
+
+    def close(self) -> None:
+        """Closes the connections of the pipeline."""
+        self.__pipeline_client.close()
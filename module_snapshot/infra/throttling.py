@@ -0,0 +1,437 @@
+"""Client-side rate limiting and retries for Azure Resource Manager requests"""
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from azure.core.exceptions import HttpResponseError, ServiceRequestError, ServiceResponseError
+from module_snapshot.utils.shared_instance import SharedInstance
+
+READ = "read"
+WRITE = "write"
+DELETE = "delete"
+
+# ARM throttles each subscription with token buckets per region: 250 reads refilled at 25 per second, and 200
+# writes or deletes refilled at 10 per second.
+DEFAULT_LIMITS = {READ: (25.0, 250.0), WRITE: (10.0, 200.0), DELETE: (10.0, 200.0)}
+
+REMAINING_HEADERS = {
+    READ: "x-ms-ratelimit-remaining-subscription-reads",
+    WRITE: "x-ms-ratelimit-remaining-subscription-writes",
+    DELETE: "x-ms-ratelimit-remaining-subscription-deletes",
+}
+
+RETRYABLE_STATUS_CODES = frozenset((408, 429, 500, 502, 503, 504))
+
+
+def retry_after_seconds(headers) -> float:
+    """Reads how long the server asked to wait before the next request.
+
+     Args:
+         headers: The response headers.
+
+     returns:
+         float: The delay in seconds, or None if the response has no usable retry header.
+    """
+    if not headers:
+        return None
+
+    for header in ("retry-after-ms", "x-ms-retry-after-ms"):
+        value = headers.get(header)
+        if value:
+            try:
+                return max(float(value) / 1000, 0.0)
+            except ValueError:
+                pass
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket that blocks callers once the burst capacity is spent.
+
+    Attributes:
+        rate (float): The number of tokens added per second.
+        capacity (float): The maximum number of tokens held.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock=time.monotonic, sleep=time.sleep) -> None:
+        """
+        Initializes a full bucket.
+
+        Args:
+            rate (float): The number of tokens added per second.
+            capacity (float): The maximum number of tokens held.
+            clock (callable): A monotonic clock, in seconds.
+            sleep (callable): The function used to wait.
+
+        Raises:
+            ValueError: If rate or capacity is not greater than zero.
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError('The "rate" and "capacity" parameters must be greater than zero.')
+
+        self.rate = rate
+        self.capacity = capacity
+        self.__clock = clock
+        self.__sleep = sleep
+        self.__tokens = capacity
+        self.__updated_at = clock()
+        self.__resume_at = 0.0
+        self.__lock = threading.Lock()
+
+    def __refill(self, now: float) -> None:
+        """Adds the tokens earned since the last update. Must be called with the lock held."""
+        self.__tokens = min(self.capacity, self.__tokens + (now - self.__updated_at) * self.rate)
+        self.__updated_at = now
+
+    def acquire(self) -> float:
+        """
+        Takes one token, waiting until one is available and any pause has ended.
+
+        Returns:
+            float: The number of seconds spent waiting.
+        """
+        waited = 0.0
+
+        while True:
+            with self.__lock:
+                now = self.__clock()
+                self.__refill(now)
+
+                if now < self.__resume_at:
+                    delay = self.__resume_at - now
+                elif self.__tokens >= 1:
+                    self.__tokens -= 1
+                    return waited
+                else:
+                    delay = (1 - self.__tokens) / self.rate
+
+            self.__sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stops handing out tokens for a while, e.g. after the server answered with Retry-After.
+
+        Args:
+            seconds (float): How long to pause.
+        """
+        with self.__lock:
+            self.__resume_at = max(self.__resume_at, self.__clock() + seconds)
+
+    def limit(self, remaining: float) -> None:
+        """
+        Lowers the available tokens to what the server reports as remaining, so the local bucket never promises
+        more requests than the server will accept.
+
+        Args:
+            remaining (float): The number of requests the server still accepts.
+        """
+        with self.__lock:
+            self.__refill(self.__clock())
+            self.__tokens = min(self.__tokens, max(remaining, 0.0))
+
+    @property
+    def tokens(self) -> float:
+        """The number of tokens currently available."""
+        with self.__lock:
+            self.__refill(self.__clock())
+            return self.__tokens
+
+
+class RateLimiter:
+    """
+    Token buckets per subscription and per kind of request (read, write, delete).
+
+    Methods:
+        acquire(subscription_id, kind): Waits for permission to send a request.
+        pause(subscription_id, seconds): Stops every kind of request of a subscription for a while.
+        observe(subscription_id, kind, headers): Adapts the buckets to the headers of a response.
+    """
+
+    def __init__(self, limits: dict = None, clock=time.monotonic, sleep=time.sleep) -> None:
+        """
+        Initializes the limiter.
+
+        Args:
+            limits (dict): (rate, capacity) per kind of request; DEFAULT_LIMITS fills the missing kinds.
+            clock (callable): A monotonic clock, in seconds.
+            sleep (callable): The function used to wait.
+        """
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.__clock = clock
+        self.__sleep = sleep
+        self.__buckets = {}
+        self.__lock = threading.Lock()
+
+    def bucket(self, subscription_id: str, kind: str = READ) -> TokenBucket:
+        """
+        Returns the bucket of a subscription and kind of request, creating it on first use.
+
+        Args:
+            subscription_id (str): The subscription ID.
+            kind (str): READ, WRITE or DELETE.
+
+        Returns:
+            TokenBucket: The bucket.
+        """
+        key = (subscription_id, kind)
+        bucket = self.__buckets.get(key)
+
+        if bucket is None:
+            with self.__lock:
+                bucket = self.__buckets.get(key)
+                if bucket is None:
+                    rate, capacity = self.limits[kind]
+                    bucket = self.__buckets[key] = TokenBucket(rate, capacity, self.__clock, self.__sleep)
+
+        return bucket
+
+    def acquire(self, subscription_id: str, kind: str = READ) -> float:
+        """
+        Waits for permission to send a request.
+
+        Args:
+            subscription_id (str): The subscription ID.
+            kind (str): READ, WRITE or DELETE.
+
+        Returns:
+            float: The number of seconds spent waiting.
+        """
+        return self.bucket(subscription_id, kind).acquire()
+
+    def pause(self, subscription_id: str, seconds: float) -> None:
+        """
+        Stops every kind of request of a subscription for a while.
+
+        Args:
+            subscription_id (str): The subscription ID.
+            seconds (float): How long to pause.
+        """
+        for kind in self.limits:
+            self.bucket(subscription_id, kind).pause(seconds)
+
+    def observe(self, subscription_id: str, kind: str, headers, status_code: int = None) -> None:
+        """
+        Adapts the buckets of a subscription to the headers of a response.
+
+        Args:
+            subscription_id (str): The subscription ID.
+            kind (str): READ, WRITE or DELETE.
+            headers: The response headers.
+            status_code (int): The HTTP status code of the response.
+        """
+        if not headers:
+            return
+
+        remaining = headers.get(REMAINING_HEADERS[kind])
+        if remaining is not None:
+            try:
+                self.bucket(subscription_id, kind).limit(float(remaining))
+            except ValueError:
+                pass
+
+        if status_code == 429:
+            delay = retry_after_seconds(headers)
+            if delay is not None:
+                self.pause(subscription_id, delay)
+
+
+class RetryPolicy:
+    """
+    Decides which failures are retried and how long to wait between attempts.
+
+    Attributes:
+        max_attempts (int): The maximum number of attempts of a request, including the first one.
+        backoff (float): The base delay, in seconds, of the exponential backoff.
+        max_backoff (float): The maximum delay, in seconds, between two attempts.
+    """
+
+    def __init__(self, max_attempts: int = 5, backoff: float = 1.0, max_backoff: float = 60.0) -> None:
+        if max_attempts < 1:
+            raise ValueError('The "max_attempts" parameter must be greater than zero.')
+
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    @staticmethod
+    def is_retryable(exception: Exception) -> bool:
+        """
+        Checks whether a failure is transient: throttling, a server error or a connection error.
+
+        Args:
+            exception (Exception): The failure.
+
+        Returns:
+            bool: True if the request should be sent again.
+        """
+        if isinstance(exception, (ServiceRequestError, ServiceResponseError)):
+            return True
+
+        return isinstance(exception, HttpResponseError) and exception.status_code in RETRYABLE_STATUS_CODES
+
+    def delay(self, attempt: int) -> float:
+        """
+        Returns a "full jitter" exponential backoff delay.
+
+        Args:
+            attempt (int): The number of failed attempts so far, starting at 1.
+
+        Returns:
+            float: A random delay between zero and the capped exponential backoff.
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+
+class Throttle:
+    """
+    Sends Azure requests through a RateLimiter and retries the transient failures with a RetryPolicy.
+
+    Every response is observed through the azure-core raw_response_hook, so the remaining-requests headers and
+    the Retry-After of throttled responses (including those retried inside the SDK) slow down every caller of the
+    subscription, not only the one that was throttled.
+
+    Methods:
+        call(subscription_id, kind, function, *args, **kwargs): Calls an SDK operation.
+        iter_pages(subscription_id, list_function, *args, **kwargs): Yields the pages of an SDK listing.
+        response_hook(subscription_id, kind): Returns a raw_response_hook feeding the responses to the limiter.
+    """
+
+    def __init__(self, limiter: RateLimiter = None, retry_policy: RetryPolicy = None, sleep=time.sleep) -> None:
+        """
+        Initializes the throttle.
+
+        Args:
+            limiter (RateLimiter): The rate limiter; a default one is created when omitted.
+            retry_policy (RetryPolicy): The retry policy; a default one is created when omitted.
+            sleep (callable): The function used to wait between attempts.
+        """
+        self.limiter = limiter or RateLimiter(sleep=sleep)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.__sleep = sleep
+
+    def response_hook(self, subscription_id: str, kind: str):
+        """Returns a raw_response_hook that feeds every response of a request to the limiter."""
+        def hook(pipeline_response):
+            http_response = pipeline_response.http_response
+            self.limiter.observe(subscription_id, kind, http_response.headers, http_response.status_code)
+
+        return hook
+
+    def __backoff(self, subscription_id: str, exception: Exception, attempt: int, on_retry) -> None:
+        """Raises the exception if it is final, otherwise waits before the next attempt."""
+        if attempt >= self.retry_policy.max_attempts or not self.retry_policy.is_retryable(exception):
+            raise exception
+
+        if on_retry is not None:
+            on_retry(exception, attempt)
+
+        response = getattr(exception, "response", None)
+        delay = retry_after_seconds(getattr(response, "headers", None))
+
+        if delay is not None:
+            self.limiter.pause(subscription_id, delay)
+        else:
+            self.__sleep(self.retry_policy.delay(attempt))
+
+    def call(self, subscription_id: str, kind: str, function, *args, on_retry=None, **kwargs):
+        """
+        Calls an SDK operation once a token is available, retrying the transient failures.
+
+        Args:
+            subscription_id (str): The subscription ID.
+            kind (str): READ, WRITE or DELETE.
+            function (callable): The SDK operation.
+            *args: The positional arguments of the operation.
+            on_retry (callable): Optional function called with the exception and the attempt number before a retry.
+            **kwargs: The keyword arguments of the operation.
+
+        Returns:
+            The result of the operation.
+
+        Raises:
+            Exception: The last failure, when it is not transient or the attempts are exhausted.
+        """
+        kwargs.setdefault("raw_response_hook", self.response_hook(subscription_id, kind))
+        attempt = 0
+
+        while True:
+            self.limiter.acquire(subscription_id, kind)
+            attempt += 1
+            try:
+                return function(*args, **kwargs)
+            except Exception as exception:
+                self.__backoff(subscription_id, exception, attempt, on_retry)
+
+    def iter_pages(self, subscription_id: str, list_function, *args, on_retry=None, **kwargs):
+        """
+        Yields the pages of an SDK listing, taking a read token per page and resuming a failed page from the
+        continuation token of the last page received.
+
+        Args:
+            subscription_id (str): The subscription ID.
+            list_function (callable): The SDK operation returning an ItemPaged.
+            *args: The positional arguments of the operation.
+            on_retry (callable): Optional function called with the exception and the attempt number before a retry.
+            **kwargs: The keyword arguments of the operation.
+
+        yields:
+            list: The items of each page.
+        """
+        kwargs.setdefault("raw_response_hook", self.response_hook(subscription_id, READ))
+        continuation_token, pages, attempt = None, None, 0
+
+        while True:
+            self.limiter.acquire(subscription_id, READ)
+            attempt += 1
+            try:
+                if pages is None:
+                    pages = list_function(*args, **kwargs).by_page(continuation_token=continuation_token)
+                page = list(next(pages))
+            except StopIteration:
+                return
+            except Exception as exception:
+                self.__backoff(subscription_id, exception, attempt, on_retry)
+                pages = None
+                continue
+
+            attempt = 0
+            continuation_token = pages.continuation_token
+            yield page
+
+
+_throttle = SharedInstance(Throttle)
+
+
+def get_throttle() -> Throttle:
+    """
+    Returns the process-wide Throttle, creating it on first use.
+
+    Returns:
+        Throttle: The throttle shared by every SnapshotServices of the process.
+    """
+    return _throttle.get()
+
+
+def set_throttle(throttle: Throttle) -> None:
+    """
+    Replaces the process-wide Throttle, e.g. to change the limits or the retry policy.
+
+    Args:
+        throttle (Throttle): The throttle to be shared, or None to build a new one on next use.
+    """
+    _throttle.set(throttle)
@@ -0,0 +1,179 @@
+"""Provide asyncio services related to snapshots in Azure."""
+from module_snapshot.utils.type_validation import TypeValidation
+from module_snapshot.infra.async_azure_cloud_services import AsyncSnapshotServices
+from module_snapshot.utils.exception import ExceptionError
+from module_snapshot.utils.concurrency import gather_with_concurrency
+
+class AsyncAzureSnapshot:
+    """Class responsible for providing asyncio services related to snapshots in Azure."""
+
+    def __init__(self, max_cached_clients: int = 32):
+        self.__type_validation = TypeValidation()
+        self.__snapshot_services = AsyncSnapshotServices(max_cached_clients)
+        self.__exception_error = ExceptionError()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Closes the Azure clients and the credential used by the snapshot services."""
+        await self.__snapshot_services.close()
+
+    def __validate_types(self, params):
+        """Validates the types of parameters passed.
+
+         Args:
+             params(list): A list of tuples containing (value, name, type) of the parameters.
+
+         Raises:
+             TypeError: If any parameter has an invalid type.
+        """
+        for var, name, type_var in params:
+            self.__type_validation.validate_parameter_type(var, name, type_var)
+
+    def __validate_snapshot_types(self, subscription_id, resource_group_name, snapshot_name, params=()):
+        """Validates the names identifying a snapshot and the other parameters of a call about it.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group.
+             snapshot_name (str): The name of the snapshot.
+             params(list): The (value, name, type) tuples of the other parameters.
+
+         Raises:
+             TypeError: If any parameter has an invalid type.
+        """
+        self.__validate_types([(subscription_id, 'subscription_id', str), (resource_group_name, 'resource_group_name', str),
+                               (snapshot_name, 'snapshot_name', str), *params])
+
+    async def gather(self, awaitables, max_concurrency:int = 100):
+        """Awaits several calls of this class while keeping at most max_concurrency of them in flight.
+
+         Args:
+             awaitables(iterable): Coroutines returned by the methods of this class.
+             max_concurrency(int): The maximum number of requests in flight.
+
+         returns:
+             list: The results in the same order as the awaitables.
+        """
+        self.__validate_types([(max_concurrency, 'max_concurrency', int)])
+
+        return await gather_with_concurrency(awaitables, max_concurrency)
+
+    async def list_snapshot_by_subscription_id(self, subscription_id:str):
+        """Lists all snapshots of a specific subscription.
+
+         Args:
+             subscription_id(str): The subscription ID.
+
+         returns:
+             list: A list of SnapshotModel objects containing snapshot information.
+
+         Raises:
+             Exception: If an error occurs while listing snapshots.
+        """
+        self.__validate_types([(subscription_id, 'sub_id', str)])
+
+        try:
+            return await self.__snapshot_services.list_by_subscription_id(subscription_id)
+
+        except Exception as exception:
+            self.__exception_error.exception_error('list_snapshot_by_subscription_id', exception)
+
+    async def list_snapshot_by_resource_group(self, subscription_id:str, resource_group_name:str):
+        """Lists all snapshots of a given resource group.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group.
+
+         returns:
+             list: A list of SnapshotModel objects containing snapshot information.
+
+         Raises:
+             Exception: If an error occurs while listing snapshots.
+        """
+        self.__validate_types([
+            (subscription_id, 'subscription_id', str),
+            (resource_group_name, 'resource_group_name', str)
+        ])
+
+        try:
+            return await self.__snapshot_services.list_by_resource_group(subscription_id, resource_group_name)
+
+        except Exception as exception:
+            self.__exception_error.exception_error('list_snapshot_by_resource_group', exception)
+
+    async def get_snapshot(self,subscription_id, resource_group_name: str, snapshot_name: str):
+        """Get information for a specific snapshot.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group.
+             snapshot_name (str): The name of the snapshot.
+
+         returns:
+             SnapshotModel: A SnapshotModel object containing snapshot information.
+
+         Raises:
+             Exception: If an error occurs while obtaining snapshot information.
+        """
+        self.__validate_snapshot_types(subscription_id, resource_group_name, snapshot_name)
+
+        try:
+            return await self.__snapshot_services.get(subscription_id, resource_group_name, snapshot_name)
+
+        except Exception as exception:
+            self.__exception_error.exception_error('get_snapshot', exception)
+
+    async def update_snapshot_tag(self, subscription_id: str, resource_group_name: str, snapshot_name: str, tag_key:str, new_tag_value:str):
+        """Updates the value of a tag in a snapshot.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group.
+             snapshot_name (str): The name of the snapshot.
+             tag_key (str): The key of the tag to be updated.
+             new_tag_value(str): The new tag value.
+
+         returns:
+             bool: True if the update was successful, False otherwise.
+
+         Raises:
+             Exception: If an error occurs while updating the tag.
+        """
+        self.__validate_snapshot_types(subscription_id, resource_group_name, snapshot_name,
+                                       [(tag_key, 'tag_key', str), (new_tag_value, 'new_tag_value', str)])
+
+        try:
+            return await self.__snapshot_services.update_tag(subscription_id, resource_group_name, snapshot_name, tag_key, new_tag_value)
+
+        except Exception as exception:
+            self.__exception_error.exception_error('update_snapshot_tag', exception)
+            return False
+
+    async def delete_snapshot(self,subscription_id, resource_group_name: str, snapshot_name: str):
+        """Deletes a snapshot.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group.
+             snapshot_name (str): The name of the snapshot.
+
+         returns:
+             bool: True if deletion was successful, False otherwise.
+
+         Raises:
+             Exception: If an error occurs while deleting the snapshot.
+        """
+        self.__validate_snapshot_types(subscription_id, resource_group_name, snapshot_name)
+
+        try:
+            return await self.__snapshot_services.delete(subscription_id, resource_group_name, snapshot_name)
+
+        except Exception as exception:
+            self.__exception_error.exception_error('delete_snapshot', exception)
+            return False
@@ -1,15 +1,96 @@
 """Provide services related to snapshots in Azure."""
+from azure.core.exceptions import ResourceNotFoundError
 from module_snapshot.utils.type_validation import TypeValidation
 from module_snapshot.infra.azure_cloud_services import SnapshotServices
+from module_snapshot.infra.resource_graph_services import ResourceGraphSnapshotServices
 from module_snapshot.utils.exception import ExceptionError
-
-class AzureSnapshot:
-    """Class responsible for providing services related to snapshots in Azure."""
-
-    def __init__(self):
+from module_snapshot.utils.concurrency import iter_concurrently, run_concurrently
+from module_snapshot.utils.resource_id import parse_snapshot_id
+from module_snapshot.entities.listing_result import MultiSubscriptionListing
+from module_snapshot.entities.inventory_summary import AGE_BUCKETS_DAYS, DIMENSIONS, InventoryAggregator
+from module_snapshot.entities.snapshot_table import SnapshotTable
+from module_snapshot.entities.tag_index import TagIndex
+from module_snapshot.entities.snapshot_filter import SnapshotFilter, project_model, validate_fields
+from module_snapshot.infra.job_tracker import JobTracker
+from module_snapshot.entities.operation_result import GetResult, OperationStatus
+from module_snapshot.services.snapshot_delete_services import SnapshotDeleteServices
+from module_snapshot.services.snapshot_export_services import SnapshotExportServices
+from module_snapshot.services.snapshot_records import SnapshotRecords
+from module_snapshot.services.snapshot_tag_services import SnapshotTagServices
+
+class AzureSnapshot(SnapshotTagServices, SnapshotDeleteServices, SnapshotExportServices):
+    """Class responsible for providing services related to snapshots in Azure.
+
+     The listings and reads are defined here; the tag updates, the deletions and the exports come from
+     SnapshotTagServices, SnapshotDeleteServices and SnapshotExportServices.
+    """
+
+    def __init__(self, max_cached_clients: int = 32, resource_graph_client=None, cache=None, throttle=None,
+                 instrumentation=None, job_tracker=None, single_flight=None, tag_index=None):
         self.__type_validation = TypeValidation()
-        self.__snapshot_services = SnapshotServices()
+        self.__snapshot_services = SnapshotServices(max_cached_clients, throttle=throttle, instrumentation=instrumentation,
+                                                    single_flight=single_flight)
+        self.__resource_graph_services = ResourceGraphSnapshotServices(resource_graph_client)
+        self.__cache = cache
+        self.__tag_index = tag_index
         self.__exception_error = ExceptionError()
+        self.__owns_job_tracker = job_tracker is None
+        self.__job_tracker = job_tracker or JobTracker()
+
+        records = SnapshotRecords(cache, tag_index)
+        SnapshotTagServices.__init__(self, self.__snapshot_services, records, self.__job_tracker,
+                                     self.iter_snapshots_by_subscription_id)
+        SnapshotDeleteServices.__init__(self, self.__snapshot_services, records, self.__job_tracker)
+        SnapshotExportServices.__init__(self, self.iter_snapshot_pages_across_subscriptions)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Waits for the jobs of the JobTracker it created, then closes the Azure clients kept alive by the snapshot
+        services."""
+        if self.__owns_job_tracker:
+            self.__job_tracker.close()
+
+        self.__snapshot_services.close()
+
+    @property
+    def job_tracker(self) -> JobTracker:
+        """The JobTracker polling the submitted mutations; its threads only start with the first submission."""
+        return self.__job_tracker
+
+    @property
+    def tag_index(self) -> TagIndex:
+        """The TagIndex fed by the listings and reads and kept up to date by the mutations, or None."""
+        return self.__tag_index
+
+    def __index(self, snapshots, fields=None):
+        """Adds the snapshots of a listing or a read to the tag index, if there is one, and returns them.
+
+         Args:
+             snapshots: A list of SnapshotModel objects, a SnapshotTable, a SnapshotModel, or None.
+             fields(list): The fields the listing filled; snapshots without their resource_id or tags are skipped.
+
+         returns:
+             The snapshots, unchanged.
+        """
+        if self.__tag_index is None or snapshots is None:
+            return snapshots
+        if fields is not None and not {'resource_id', 'tags'}.issubset(fields):
+            return snapshots
+
+        if isinstance(snapshots, SnapshotTable):
+            for resource_id, tags in zip(snapshots.column('resource_id'), snapshots.column('tags')):
+                self.__tag_index.add(resource_id, tags)
+        elif isinstance(snapshots, list):
+            self.__tag_index.add_snapshots(snapshots)
+        else:
+            self.__tag_index.add(snapshots.resource_id, snapshots.tags)
+
+        return snapshots
 
     def __validate_types(self, params):
         """Validates the types of parameters passed.
@@ -23,46 +104,382 @@ class AzureSnapshot:
         for var, name, type_var in params:
             self.__type_validation.validate_parameter_type(var, name, type_var)
 
-    def list_snapshot_by_subscription_id(self, subscription_id:str):
+    def __iter_safely(self, method, iterator):
+        """Yields the items of an iterator, logging the error that interrupts it.
+
+         Args:
+             method(str): The name of the public method, used in the error message.
+             iterator(iterator): The iterator returned by the snapshot services.
+
+         yields:
+             The items produced by the iterator.
+        """
+        try:
+            yield from iterator
+
+        except Exception as exception:
+            self.__exception_error.exception_error(method, exception)
+
+    def __validate_listing(self, snapshot_filter, fields):
+        """Validates the filter and projection parameters of the list methods.
+
+         Args:
+             snapshot_filter(SnapshotFilter): The criteria the snapshots must match, or None.
+             fields(list): The SnapshotModel fields to fill, or None.
+
+         Raises:
+             TypeError: If a parameter has an invalid type.
+             ValueError: If a field is not a SnapshotModel field.
+        """
+        if snapshot_filter is not None:
+            self.__validate_types([(snapshot_filter, 'snapshot_filter', SnapshotFilter)])
+        if fields is not None:
+            self.__validate_types([(fields, 'fields', (list, tuple))])
+            validate_fields(fields)
+
+    def iter_snapshots_by_subscription_id(self, subscription_id:str, snapshot_filter:SnapshotFilter = None, fields:list = None):
+        """Yields the snapshots of a specific subscription as the pages arrive from Azure.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             snapshot_filter(SnapshotFilter): Optional criteria the snapshots must match, checked while streaming.
+             fields(list): Optional SnapshotModel fields to fill; the others are left as None.
+
+         returns:
+             generator: A generator of SnapshotModel objects. It stops early if an error occurs while listing.
+        """
+        self.__validate_types([(subscription_id, 'subscription_id', str)])
+        self.__validate_listing(snapshot_filter, fields)
+
+        return self.__iter_safely('iter_snapshots_by_subscription_id',
+                                  self.__snapshot_services.iter_snapshots_by_subscription_id(subscription_id, snapshot_filter, fields))
+
+    def iter_snapshot_pages_by_subscription_id(self, subscription_id:str, snapshot_filter:SnapshotFilter = None, fields:list = None):
+        """Yields the snapshots of a specific subscription one page at a time.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             snapshot_filter(SnapshotFilter): Optional criteria the snapshots must match, checked while streaming.
+             fields(list): Optional SnapshotModel fields to fill; the others are left as None.
+
+         returns:
+             generator: A generator of lists of SnapshotModel objects, one list per page. It stops early if an
+             error occurs while listing.
+        """
+        self.__validate_types([(subscription_id, 'subscription_id', str)])
+        self.__validate_listing(snapshot_filter, fields)
+
+        return self.__iter_safely('iter_snapshot_pages_by_subscription_id',
+                                  self.__snapshot_services.iter_snapshot_pages_by_subscription_id(subscription_id, snapshot_filter, fields))
+
+    def iter_snapshots_by_resource_group(self, subscription_id:str, resource_group_name:str, snapshot_filter:SnapshotFilter = None, fields:list = None):
+        """Yields the snapshots of a given resource group as the pages arrive from Azure.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group.
+             snapshot_filter(SnapshotFilter): Optional criteria the snapshots must match, checked while streaming.
+             fields(list): Optional SnapshotModel fields to fill; the others are left as None.
+
+         returns:
+             generator: A generator of SnapshotModel objects. It stops early if an error occurs while listing.
+        """
+        self.__validate_types([
+            (subscription_id, 'subscription_id', str),
+            (resource_group_name, 'resource_group_name', str)
+        ])
+        self.__validate_listing(snapshot_filter, fields)
+
+        return self.__iter_safely('iter_snapshots_by_resource_group',
+                                  self.__snapshot_services.iter_snapshots_by_resource_group(subscription_id, resource_group_name, snapshot_filter, fields))
+
+    def iter_snapshot_pages_by_resource_group(self, subscription_id:str, resource_group_name:str, snapshot_filter:SnapshotFilter = None, fields:list = None):
+        """Yields the snapshots of a given resource group one page at a time.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group.
+             snapshot_filter(SnapshotFilter): Optional criteria the snapshots must match, checked while streaming.
+             fields(list): Optional SnapshotModel fields to fill; the others are left as None.
+
+         returns:
+             generator: A generator of lists of SnapshotModel objects, one list per page. It stops early if an
+             error occurs while listing.
+        """
+        self.__validate_types([
+            (subscription_id, 'subscription_id', str),
+            (resource_group_name, 'resource_group_name', str)
+        ])
+        self.__validate_listing(snapshot_filter, fields)
+
+        return self.__iter_safely('iter_snapshot_pages_by_resource_group',
+                                  self.__snapshot_services.iter_snapshot_pages_by_resource_group(subscription_id, resource_group_name, snapshot_filter, fields))
+
+    @staticmethod
+    def __filter_cached(snapshots, as_table, snapshot_filter, fields):
+        """Applies the filter, projection and output format of the list methods to cached snapshots.
+
+         Args:
+             snapshots(list): The complete SnapshotModel listing.
+             as_table(bool): Whether to return a SnapshotTable.
+             snapshot_filter(SnapshotFilter): The criteria the snapshots must match, or None.
+             fields(list): The SnapshotModel fields to fill, or None.
+
+         returns:
+             list: The filtered SnapshotModel objects, or a SnapshotTable.
+        """
+        if snapshot_filter is not None:
+            snapshots = [snapshot for snapshot in snapshots if snapshot_filter.matches_model(snapshot)]
+
+        if as_table:
+            return SnapshotTable.from_models(snapshots)
+
+        return [project_model(snapshot, fields) for snapshot in snapshots] if fields is not None else snapshots
+
+    def list_snapshot_by_subscription_id(self, subscription_id:str, as_table:bool = False, snapshot_filter:SnapshotFilter = None, fields:list = None):
         """Lists all snapshots of a specific subscription.
 
          Args:
              subscription_id(str): The subscription ID.
+             as_table(bool): Whether to return a columnar SnapshotTable instead of a list.
+             snapshot_filter(SnapshotFilter): Optional criteria the snapshots must match, checked while streaming.
+             fields(list): Optional SnapshotModel fields to fill; the others are left as None. Ignored with as_table.
 
          returns:
-             list: A list of SnapshotModel objects containing snapshot information.
+             list: A list of SnapshotModel objects containing snapshot information, or a SnapshotTable.
 
          Raises:
              Exception: If an error occurs while listing snapshots.
         """
-        self.__validate_types([(subscription_id, 'sub_id', str)])
+        self.__validate_types([
+            (subscription_id, 'sub_id', str),
+            (as_table, 'as_table', bool)
+        ])
+        self.__validate_listing(snapshot_filter, fields)
 
         try:
-            return self.__snapshot_services.list_by_subscription_id(subscription_id)
+            if self.__cache is not None and (self.__cache.is_fresh(subscription_id) or (snapshot_filter is None and fields is None)):
+                if self.__cache.is_fresh(subscription_id):
+                    snapshots = self.__cache.list_snapshots(subscription_id)
+                else:
+                    snapshots = self.__snapshot_services.list_by_subscription_id(subscription_id)
+                    self.__cache.store_subscription(subscription_id, snapshots)
+
+                return self.__index(self.__filter_cached(snapshots, as_table, snapshot_filter, fields), fields)
+
+            if as_table:
+                return self.__index(self.__snapshot_services.list_table_by_subscription_id(subscription_id, snapshot_filter))
+
+            return self.__index(self.__snapshot_services.list_by_subscription_id(subscription_id, snapshot_filter, fields), fields)
 
         except Exception as exception:
             self.__exception_error.exception_error('list_snapshot_by_subscription_id', exception)
 
-    def list_snapshot_by_resource_group(self, subscription_id:str, resource_group_name:str):
+    def list_snapshots_across_subscriptions(self, subscription_ids:list, max_workers:int = 8):
+        """Lists all snapshots of several subscriptions concurrently.
+
+         Args:
+             subscription_ids(list): The subscription IDs.
+             max_workers(int): The maximum number of subscriptions listed at the same time.
+
+         returns:
+             MultiSubscriptionListing: The merged list of SnapshotModel objects, in the order of the given
+             subscriptions, and a dict mapping each subscription ID that failed to its exception.
+        """
+        self.__validate_types([
+            (subscription_ids, 'subscription_ids', list),
+            (max_workers, 'max_workers', int)
+        ])
+        self.__validate_types([(subscription_id, 'subscription_id', str) for subscription_id in subscription_ids])
+
+        listing = MultiSubscriptionListing()
+        unique_subscription_ids = list(dict.fromkeys(subscription_ids))
+        results = run_concurrently(self.__snapshot_services.list_by_subscription_id, unique_subscription_ids, max_workers)
+
+        for subscription_id, snapshots, exception in results:
+            if exception is not None:
+                listing.failures[subscription_id] = exception
+            else:
+                listing.snapshots.extend(self.__index(snapshots))
+
+        return listing
+
+    def iter_snapshot_pages_across_subscriptions(self, subscription_ids:list, snapshot_filter:SnapshotFilter = None, fields:list = None,
+                                                 max_workers:int = 8, max_pending_pages:int = 16):
+        """Lists several subscriptions concurrently and yields their pages as they arrive.
+
+         Memory stays bounded by max_pending_pages pages: the listings wait while the consumer is behind. Closing
+         the generator early stops them.
+
+         Args:
+             subscription_ids(list): The subscription IDs; duplicates are listed once.
+             snapshot_filter(SnapshotFilter): Optional criteria the snapshots must match.
+             fields(list): Optional SnapshotModel fields to fill; the others are left as None.
+             max_workers(int): The maximum number of subscriptions listed at the same time.
+             max_pending_pages(int): The maximum number of listed pages waiting to be consumed.
+
+         yields:
+             tuple: A (subscription_id, page, None) tuple per page of SnapshotModel objects, or a
+             (subscription_id, None, exception) tuple when the listing of a subscription fails.
+        """
+        self.__validate_types([
+            (subscription_ids, 'subscription_ids', list),
+            (max_workers, 'max_workers', int),
+            (max_pending_pages, 'max_pending_pages', int)
+        ])
+        self.__validate_types([(subscription_id, 'subscription_id', str) for subscription_id in subscription_ids])
+        self.__validate_listing(snapshot_filter, fields)
+
+        return iter_concurrently(
+            lambda subscription_id: self.__snapshot_services.iter_snapshot_pages_by_subscription_id(subscription_id, snapshot_filter, fields),
+            list(dict.fromkeys(subscription_ids)), max_workers, max_pending_pages
+        )
+
+    def __iter_summary_pages(self, subscription_id, snapshot_filter, fields):
+        """Yields the pages of a subscription to summarize, from the cache when it is fresh."""
+        if self.__cache is not None and self.__cache.is_fresh(subscription_id):
+            yield self.__filter_cached(self.__cache.list_snapshots(subscription_id), False, snapshot_filter, None)
+        else:
+            yield from self.__snapshot_services.iter_snapshot_pages_by_subscription_id(subscription_id, snapshot_filter, fields)
+
+    def summarize_snapshots(self, subscription_ids:list, dimensions:list = DIMENSIONS, age_buckets_days:list = AGE_BUCKETS_DAYS,
+                            snapshot_filter:SnapshotFilter = None, max_workers:int = 8, max_pending_pages:int = 16):
+        """Aggregates the count and total disk size of the snapshots of several subscriptions in a single pass.
+
+         The subscriptions are listed concurrently, only with the fields the dimensions need, and each page is
+         added to the totals as it arrives, so memory is bounded by the number of groups rather than the number of
+         snapshots. Subscriptions with a fresh cache entry are read from the cache.
+
+         Args:
+             subscription_ids(list): The subscription IDs.
+             dimensions(list): The dimensions to group by: "subscription_id", "resource_group", "location", "sku",
+                 "age" and "tag:<key>".
+             age_buckets_days(list): The increasing upper bounds of the age buckets, in days.
+             snapshot_filter(SnapshotFilter): Optional criteria the snapshots must match.
+             max_workers(int): The maximum number of subscriptions listed at the same time.
+             max_pending_pages(int): The maximum number of listed pages waiting to be aggregated.
+
+         returns:
+             InventorySummary: The overall totals, the totals per value of each dimension, and a dict mapping each
+             subscription ID that failed to its exception; None if the aggregation failed.
+
+         Raises:
+             ValueError: If a dimension is unknown.
+        """
+        self.__validate_types([
+            (subscription_ids, 'subscription_ids', list),
+            (max_workers, 'max_workers', int),
+            (max_pending_pages, 'max_pending_pages', int)
+        ])
+        self.__validate_types([(subscription_id, 'subscription_id', str) for subscription_id in subscription_ids])
+        self.__validate_listing(snapshot_filter, None)
+
+        aggregator = InventoryAggregator(dimensions, age_buckets_days)
+        summary = aggregator.summary()
+        pages = iter_concurrently(
+            lambda subscription_id: self.__iter_summary_pages(subscription_id, snapshot_filter, aggregator.fields),
+            list(dict.fromkeys(subscription_ids)), max_workers, max_pending_pages
+        )
+
+        try:
+            for subscription_id, page, exception in pages:
+                if exception is not None:
+                    self.__exception_error.exception_error('summarize_snapshots', exception)
+                    summary.failures[subscription_id] = exception
+                    continue
+
+                aggregator.add_all(page)
+
+            return summary
+
+        except Exception as exception:
+            self.__exception_error.exception_error('summarize_snapshots', exception)
+        finally:
+            pages.close()
+
+    def list_snapshots_from_resource_graph(self, subscription_ids:list, tags:dict = None, locations:list = None):
+        """Lists the snapshots of many subscriptions with a single paged Azure Resource Graph query.
+
+         Args:
+             subscription_ids(list): The subscription IDs.
+             tags(dict): Optional tag filter. Each key must exist; a value other than None must also match.
+             locations(list): Optional list of locations the snapshots must be in.
+
+         returns:
+             list: A list of SnapshotModel objects, identical to the ones returned by list_snapshot_by_subscription_id.
+
+         Raises:
+             Exception: If an error occurs while querying Resource Graph.
+        """
+        self.__validate_types([
+            (subscription_ids, 'subscription_ids', list),
+            (tags or {}, 'tags', dict),
+            (locations or [], 'locations', list)
+        ])
+
+        try:
+            return self.__resource_graph_services.list_snapshots(subscription_ids, tags, locations)
+
+        except Exception as exception:
+            self.__exception_error.exception_error('list_snapshots_from_resource_graph', exception)
+
+    def iter_snapshots_from_resource_graph(self, subscription_ids:list, tags:dict = None, locations:list = None):
+        """Yields the snapshots of many subscriptions as the Azure Resource Graph pages arrive.
+
+         Args:
+             subscription_ids(list): The subscription IDs.
+             tags(dict): Optional tag filter. Each key must exist; a value other than None must also match.
+             locations(list): Optional list of locations the snapshots must be in.
+
+         returns:
+             generator: A generator of SnapshotModel objects. It stops early if an error occurs while querying.
+        """
+        self.__validate_types([
+            (subscription_ids, 'subscription_ids', list),
+            (tags or {}, 'tags', dict),
+            (locations or [], 'locations', list)
+        ])
+
+        return self.__iter_safely('iter_snapshots_from_resource_graph',
+                                  self.__resource_graph_services.iter_snapshots(subscription_ids, tags, locations))
+
+    def list_snapshot_by_resource_group(self, subscription_id:str, resource_group_name:str, as_table:bool = False, snapshot_filter:SnapshotFilter = None, fields:list = None):
         """Lists all snapshots of a given resource group.
 
          Args:
              subscription_id(str): The subscription ID.
              resource_group_name (str): The name of the resource group.
+             as_table(bool): Whether to return a columnar SnapshotTable instead of a list.
+             snapshot_filter(SnapshotFilter): Optional criteria the snapshots must match, checked while streaming.
+             fields(list): Optional SnapshotModel fields to fill; the others are left as None. Ignored with as_table.
 
          returns:
-             list: A list of SnapshotModel objects containing snapshot information.
+             list: A list of SnapshotModel objects containing snapshot information, or a SnapshotTable.
 
          Raises:
              Exception: If an error occurs while listing snapshots.
         """
         self.__validate_types([
             (subscription_id, 'subscription_id', str),
-            (resource_group_name, 'resource_group_name', str)
+            (resource_group_name, 'resource_group_name', str),
+            (as_table, 'as_table', bool)
         ])
+        self.__validate_listing(snapshot_filter, fields)
 
         try:
-            return self.__snapshot_services.list_by_resource_group(subscription_id, resource_group_name)
+            if self.__cache is not None and (self.__cache.is_fresh(subscription_id, resource_group_name) or (snapshot_filter is None and fields is None)):
+                if self.__cache.is_fresh(subscription_id, resource_group_name):
+                    snapshots = self.__cache.list_snapshots(subscription_id, resource_group_name)
+                else:
+                    snapshots = self.__snapshot_services.list_by_resource_group(subscription_id, resource_group_name)
+                    self.__cache.store_resource_group(subscription_id, resource_group_name, snapshots)
+
+                return self.__index(self.__filter_cached(snapshots, as_table, snapshot_filter, fields), fields)
+
+            if as_table:
+                return self.__index(self.__snapshot_services.list_table_by_resource_group(subscription_id, resource_group_name, snapshot_filter))
+
+            return self.__index(self.__snapshot_services.list_by_resource_group(subscription_id, resource_group_name, snapshot_filter, fields), fields)
 
         except Exception as exception:
             self.__exception_error.exception_error('list_snapshot_by_resource_group', exception)
@@ -88,65 +505,101 @@ class AzureSnapshot:
         ])
 
         try:
-            return self.__snapshot_services.get(subscription_id, resource_group_name, snapshot_name)
+            return self.__get(subscription_id, resource_group_name, snapshot_name)
 
         except Exception as exception:
             self.__exception_error.exception_error('get_snapshot', exception)
 
-    def update_snapshot_tag(self, subscription_id: str, resource_group_name: str, snapshot_name: str, tag_key:str, new_tag_value:str):
-        """Updates the value of a tag in a snapshot.
+    def __get(self, subscription_id, resource_group_name, snapshot_name):
+        """Returns a snapshot from the cache when its resource group is fresh there, otherwise from Azure.
 
          Args:
              subscription_id(str): The subscription ID.
              resource_group_name (str): The name of the resource group.
              snapshot_name (str): The name of the snapshot.
-             tag_key (str): The key of the tag to be updated.
-             new_tag_value(str): The new tag value.
 
          returns:
-             bool: True if the update was successful, False otherwise.
+             SnapshotModel: The snapshot.
+        """
+        if self.__cache is None:
+            return self.__index(self.__snapshot_services.get(subscription_id, resource_group_name, snapshot_name))
 
-         Raises:
-             Exception: If an error occurs while updating the tag.
+        if self.__cache.is_fresh(subscription_id, resource_group_name):
+            snapshot = self.__cache.get_snapshot(subscription_id, resource_group_name, snapshot_name)
+            if snapshot is not None:
+                return self.__index(snapshot)
+
+        snapshot = self.__snapshot_services.get(subscription_id, resource_group_name, snapshot_name)
+        self.__cache.store_snapshot(snapshot)
+
+        return self.__index(snapshot)
+
+    def __get_item(self, item):
+        """Fetches one snapshot of a batch get and converts the outcome into a GetResult.
+
+         Args:
+             item(tuple): A (resource_id, (subscription_id, resource_group_name, snapshot_name)) tuple.
+
+         returns:
+             GetResult: The outcome of the read.
         """
-        self.__validate_types([
-            (subscription_id, 'subscription_id', str),
-            (resource_group_name, 'resource_group_name', str),
-            (snapshot_name, 'snapshot_name', str),
-            (tag_key, 'tag_key', str),
-            (new_tag_value, 'new_tag_value', str)
-        ])
+        resource_id, (subscription_id, resource_group_name, snapshot_name) = item
 
         try:
-            return self.__snapshot_services.update_tag(subscription_id, resource_group_name, snapshot_name, tag_key, new_tag_value)
+            snapshot = self.__get(subscription_id, resource_group_name, snapshot_name)
+
+        except ResourceNotFoundError as exception:
+            return GetResult(resource_id, OperationStatus.NOT_FOUND, exception)
 
         except Exception as exception:
-            self.__exception_error.exception_error('update_snapshot_tag', exception)
-            return False
+            self.__exception_error.exception_error('get_snapshots', exception)
+            return GetResult(resource_id, OperationStatus.ERROR, exception)
 
-    def delete_snapshot(self,subscription_id, resource_group_name: str, snapshot_name: str):
-        """Deletes a snapshot.
+        return GetResult(resource_id, OperationStatus.SUCCESS, snapshot=snapshot)
+
+    def get_snapshots(self, resource_ids:list, max_workers:int = 8):
+        """Gets many snapshots from their ARM resource IDs concurrently.
+
+         The IDs are parsed with parse_snapshot_id, and IDs naming the same snapshot (ARM names are
+         case-insensitive) are fetched once. The reads are grouped by subscription, so each compute client is
+         created once and then shared.
 
          Args:
-             subscription_id(str): The subscription ID.
-             resource_group_name (str): The name of the resource group.
-             snapshot_name (str): The name of the snapshot.
+             resource_ids(list): The resource IDs of the snapshots, possibly with duplicates.
+             max_workers(int): The maximum number of snapshots read at the same time.
 
          returns:
-             bool: True if deletion was successful, False otherwise.
-
-         Raises:
-             Exception: If an error occurs while deleting the snapshot.
+             dict: A GetResult per given resource ID, with the status SUCCESS and the SnapshotModel, NOT_FOUND,
+             or ERROR (including IDs that are not snapshot IDs).
         """
         self.__validate_types([
-            (subscription_id, 'subscription_id', str),
-            (resource_group_name, 'resource_group_name', str),
-            (snapshot_name, 'snapshot_name', str)
+            (resource_ids, 'resource_ids', list),
+            (max_workers, 'max_workers', int)
         ])
+        self.__validate_types([(resource_id, 'resource_id', str) for resource_id in resource_ids])
 
-        try:
-            return self.__snapshot_services.delete(subscription_id, resource_group_name, snapshot_name)
+        results, keys, unique_keys, by_subscription = {}, {}, set(), {}
 
-        except Exception as exception:
-            self.__exception_error.exception_error('delete_snapshot', exception)
-            return False
+        for resource_id in dict.fromkeys(resource_ids):
+            try:
+                parts = parse_snapshot_id(resource_id)
+            except ValueError as exception:
+                results[resource_id] = GetResult(resource_id, OperationStatus.ERROR, exception)
+                continue
+
+            key = tuple(part.lower() for part in parts)
+            if key not in unique_keys:
+                unique_keys.add(key)
+                by_subscription.setdefault(key[0], []).append((resource_id, parts))
+            keys[resource_id] = key
+
+        items = [item for group in by_subscription.values() for item in group]
+        fetched = {tuple(part.lower() for part in parts): result
+                   for (_, parts), result, _ in run_concurrently(self.__get_item, items, max_workers)}
+
+        for resource_id, key in keys.items():
+            result = fetched[key]
+            results[resource_id] = result if result.resource_id == resource_id else GetResult(
+                resource_id, result.status, result.error, snapshot=result.snapshot)
+
+        return {resource_id: results[resource_id] for resource_id in resource_ids}
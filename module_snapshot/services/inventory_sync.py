@@ -0,0 +1,117 @@
+"""Detect the snapshots added, removed and changed since the last inventory sync."""
+import hashlib
+import json
+from datetime import datetime, timezone
+from module_snapshot.entities.snapshot_filter import SNAPSHOT_FIELDS
+from module_snapshot.entities.sync_result import SnapshotChange, SyncResult
+from module_snapshot.infra.azure_cloud_services import SnapshotServices
+from module_snapshot.infra.sync_state import SyncStateStore
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+PROPERTIES = "properties"
+TAGS = "tags"
+
+PROPERTY_FIELDS = tuple(field for field in SNAPSHOT_FIELDS if field != "tags")
+
+
+def snapshot_digests(snapshot) -> tuple:
+    """Hashes a SnapshotModel into a digest of its properties and a digest of its tags.
+
+     Args:
+         snapshot(SnapshotModel): The snapshot.
+
+     returns:
+         tuple: The (properties, tags) hexadecimal digests.
+    """
+    properties = json.dumps([getattr(snapshot, field) for field in PROPERTY_FIELDS], default=str)
+    tags = json.dumps(snapshot.tags, sort_keys=True)
+
+    return (hashlib.blake2b(properties.encode(), digest_size=16).hexdigest(),
+            hashlib.blake2b(tags.encode(), digest_size=16).hexdigest())
+
+
+class InventorySync:
+    """Class responsible for comparing a listing with the last committed state of a subscription.
+
+    The state holds two digests per resource ID, one of the properties and one of the tags, so a sync tells
+    which part of a snapshot changed without keeping previous listings. sync() only computes the changes; once
+    they are processed downstream, commit() persists them and advances the watermark, so a run that fails before
+    committing reports the same changes again.
+    """
+
+    def __init__(self, state_store: SyncStateStore = None, snapshot_services=None):
+        """
+        Args:
+            state_store (SyncStateStore): Where the digests and watermarks are kept; in memory when omitted.
+            snapshot_services (SnapshotServices): The service listing the subscriptions when sync() is not given
+                the snapshots. Its errors propagate, so a failed listing is never mistaken for deletions.
+        """
+        self.__state_store = state_store or SyncStateStore()
+        self.__snapshot_services = snapshot_services
+
+    def __get_snapshot_services(self):
+        """Returns the snapshot services, building them on first use."""
+        if self.__snapshot_services is None:
+            self.__snapshot_services = SnapshotServices()
+
+        return self.__snapshot_services
+
+    def sync(self, subscription_id: str, snapshots=None, commit: bool = False) -> SyncResult:
+        """Compares the current snapshots of a subscription with its last committed state.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             snapshots(iterable): The complete current inventory of the subscription; listed from Azure when
+                 omitted.
+             commit(bool): Whether to commit the result immediately.
+
+         returns:
+             SyncResult: The added SnapshotModel objects, the removed resource IDs, the changed snapshots with
+             the parts that changed ("properties", "tags"), and the number of unchanged snapshots.
+        """
+        if snapshots is None:
+            snapshots = self.__get_snapshot_services().iter_snapshots_by_subscription_id(subscription_id)
+
+        base_watermark, previous = self.__state_store.load(subscription_id)
+        result = SyncResult(subscription_id, base_watermark, datetime.now(timezone.utc).strftime(DATE_FORMAT))
+
+        for snapshot in snapshots:
+            digests = snapshot_digests(snapshot)
+            known = previous.pop(snapshot.resource_id, None)
+
+            if known is None:
+                result.added.append(snapshot)
+                result.pending[snapshot.resource_id] = digests
+            elif known != digests:
+                changed = tuple(part for part, old, new in zip((PROPERTIES, TAGS), known, digests) if old != new)
+                result.changed.append(SnapshotChange(snapshot, changed))
+                result.pending[snapshot.resource_id] = digests
+            else:
+                result.unchanged += 1
+
+        result.removed = sorted(previous)
+
+        if commit:
+            self.commit(result)
+
+        return result
+
+    def commit(self, result: SyncResult) -> int:
+        """Persists the changes of a sync result and advances the watermark of its subscription.
+
+         Args:
+             result(SyncResult): A result returned by sync().
+
+         returns:
+             int: The new watermark.
+
+         Raises:
+             StaleWatermarkError: If another result of the subscription was committed in the meantime.
+        """
+        return self.__state_store.commit(result.subscription_id, result.base_watermark, result.pending,
+                                         result.removed, result.synced_at)
+
+    def watermark(self, subscription_id: str) -> int:
+        """Returns the number of commits of a subscription, 0 if it was never synced."""
+        return self.__state_store.watermark(subscription_id)
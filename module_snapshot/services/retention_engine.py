@@ -0,0 +1,117 @@
+"""Evaluate retention policies over a snapshot inventory and execute the resulting plan."""
+from datetime import datetime, timedelta, timezone
+from module_snapshot.entities.retention_policy import RetentionDecision, RetentionPlan
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+EXEMPT = "exempt"
+EXPIRED = "expired"
+BEYOND_KEEP_LAST = "beyond_keep_last"
+WITHIN_MAX_AGE = "within_max_age"
+WITHIN_KEEP_LAST = "within_keep_last"
+NO_RULE = "no_rule"
+
+
+class RetentionEngine:
+    """Class responsible for planning and executing snapshot cleanups from a RetentionPolicy.
+
+    A snapshot is deleted only when it is not exempted by its tags and every configured rule lets it go: it is older
+    than max_age_days and it is not one of the keep_last_per_source newest snapshots of its source disk. Snapshots
+    without a known source disk are never removed by the keep-last rule.
+    """
+
+    def __init__(self, policy, azure_snapshot=None):
+        """
+        Args:
+            policy (RetentionPolicy): The rules to be evaluated.
+            azure_snapshot (AzureSnapshot): The service used by execute() to delete snapshots.
+        """
+        self.__policy = policy
+        self.__azure_snapshot = azure_snapshot
+
+    def __is_exempt(self, tags) -> bool:
+        """Checks whether the tags of a snapshot match one of the exempt tags of the policy."""
+        if not tags:
+            return False
+
+        for tag_key, tag_value in self.__policy.exempt_tags.items():
+            if tag_key in tags and (tag_value is None or tags[tag_key] == tag_value):
+                return True
+
+        return False
+
+    def __newest_per_source(self, snapshots) -> set:
+        """Returns the indexes of the keep_last_per_source newest snapshots of each source disk."""
+        by_source = {}
+        for index, snapshot in enumerate(snapshots):
+            if snapshot.source_resource_id is not None:
+                by_source.setdefault(snapshot.source_resource_id, []).append((snapshot.created_date, index))
+
+        kept = set()
+        keep_last = self.__policy.keep_last_per_source
+        for entries in by_source.values():
+            entries.sort(reverse=True)
+            kept.update(index for _, index in entries[:keep_last])
+
+        return kept
+
+    def evaluate(self, snapshots, now: datetime = None) -> RetentionPlan:
+        """Evaluates the policy over an inventory and returns a dry-run plan.
+
+         Created dates are compared as "%Y-%m-%d %H:%M:%S" strings, which sort chronologically, so the inventory is
+         never parsed into datetimes.
+
+         Args:
+             snapshots(iterable): The SnapshotModel objects of the inventory.
+             now(datetime): The reference time of the evaluation, in UTC. Defaults to the current time.
+
+         returns:
+             RetentionPlan: The snapshots to delete and to keep, each with the reason of the decision.
+        """
+        snapshots = list(snapshots)
+        now = now or datetime.now(timezone.utc)
+        plan = RetentionPlan(now.strftime(DATE_FORMAT))
+
+        max_age_days = self.__policy.max_age_days
+        keep_last = self.__policy.keep_last_per_source
+        if max_age_days is None and keep_last is None:
+            plan.to_keep = [RetentionDecision(snapshot, NO_RULE) for snapshot in snapshots]
+            return plan
+
+        cutoff = (now - timedelta(days=max_age_days)).strftime(DATE_FORMAT) if max_age_days is not None else None
+        newest = self.__newest_per_source(snapshots) if keep_last is not None else None
+        exempt_tags = self.__policy.exempt_tags
+        to_delete, to_keep = plan.to_delete, plan.to_keep
+
+        for index, snapshot in enumerate(snapshots):
+            if exempt_tags and self.__is_exempt(snapshot.tags):
+                to_keep.append(RetentionDecision(snapshot, EXEMPT))
+            elif cutoff is not None and snapshot.created_date >= cutoff:
+                to_keep.append(RetentionDecision(snapshot, WITHIN_MAX_AGE))
+            elif newest is not None and (snapshot.source_resource_id is None or index in newest):
+                to_keep.append(RetentionDecision(snapshot, WITHIN_KEEP_LAST))
+            else:
+                to_delete.append(RetentionDecision(snapshot, EXPIRED if cutoff is not None else BEYOND_KEEP_LAST))
+
+        return plan
+
+    def execute(self, plan: RetentionPlan, max_in_flight: int = 16, wait: bool = True) -> list:
+        """Deletes the snapshots planned for deletion with bounded parallelism.
+
+         Args:
+             plan(RetentionPlan): A plan returned by evaluate().
+             max_in_flight(int): The maximum number of deletions running at the same time.
+             wait(bool): Whether to wait for every deletion to complete.
+
+         returns:
+             list: One DeleteResult per deleted snapshot.
+
+         Raises:
+             ValueError: If the engine was created without an AzureSnapshot.
+        """
+        if self.__azure_snapshot is None:
+            raise ValueError("An AzureSnapshot is required to execute a retention plan.")
+
+        snapshots = [decision.snapshot for decision in plan.to_delete]
+
+        return self.__azure_snapshot.delete_snapshots(snapshots, max_in_flight=max_in_flight, wait=wait)
@@ -0,0 +1,168 @@
+"""Deletion of the snapshots in Azure"""
+import queue
+from datetime import datetime, timezone
+from azure.core.exceptions import ResourceNotFoundError
+from module_snapshot.utils.type_validation import TypeValidation
+from module_snapshot.utils.exception import ExceptionError
+from module_snapshot.utils.concurrency import run_concurrently
+from module_snapshot.utils.resource_id import parse_snapshot_id
+from module_snapshot.entities.operation_result import DeleteResult, OperationStatus
+
+
+class SnapshotDeleteServices:
+    """The deletion methods of AzureSnapshot. The deletions that succeed are written through to its SnapshotRecords."""
+
+    def __init__(self, snapshot_services, records, job_tracker) -> None:
+        """
+        Args:
+            snapshot_services (SnapshotServices): The services sending the requests to Azure.
+            records (SnapshotRecords): The cache and tag index to keep up to date.
+            job_tracker (JobTracker): The tracker polling the submitted deletions.
+        """
+        self.__snapshot_services = snapshot_services
+        self.__records = records
+        self.__job_tracker = job_tracker
+        self.__type_validation = TypeValidation()
+        self.__exception_error = ExceptionError()
+
+    def delete_snapshot(self,subscription_id, resource_group_name: str, snapshot_name: str):
+        """Deletes a snapshot.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group.
+             snapshot_name (str): The name of the snapshot.
+
+         returns:
+             bool: True if deletion was successful, False otherwise.
+
+         Raises:
+             Exception: If an error occurs while deleting the snapshot.
+        """
+        self.__type_validation.validate_parameter_types([
+            (subscription_id, 'subscription_id', str),
+            (resource_group_name, 'resource_group_name', str),
+            (snapshot_name, 'snapshot_name', str)
+        ])
+
+        try:
+            poller = self.__snapshot_services.begin_delete(subscription_id, resource_group_name, snapshot_name)
+            self.__records.record_deletion_when_done(poller, subscription_id, resource_group_name, snapshot_name)
+
+            return bool(poller)
+
+        except Exception as exception:
+            self.__exception_error.exception_error('delete_snapshot', exception)
+            return False
+
+    def submit_snapshot_delete(self, resource_id:str, callback=None):
+        """Submits the deletion of a snapshot to the job tracker, without waiting for it.
+
+         Args:
+             resource_id(str): The resource ID of the snapshot.
+             callback(callable): Optional function called with the JobHandle once the deletion completed.
+
+         returns:
+             JobHandle: The handle of the deletion, whose status becomes SUCCESS, NOT_FOUND or ERROR.
+        """
+        self.__type_validation.validate_parameter_types([(resource_id, 'resource_id', str)])
+
+        def start():
+            return self.__snapshot_services.start_delete(*parse_snapshot_id(resource_id))
+
+        def on_done(handle):
+            if handle.succeeded:
+                self.__records.record_deletion(*parse_snapshot_id(resource_id))
+            if callback is not None:
+                callback(handle)
+
+        return self.__job_tracker.submit(resource_id, start, 'delete', on_done)
+
+    def __start_delete_item(self, resource_id):
+        """Starts one deletion of a bulk deletion that is not waited for and converts it into a DeleteResult.
+
+         Args:
+             resource_id(str): The resource ID of the snapshot.
+
+         returns:
+             DeleteResult: The status IN_PROGRESS and the poller of the deletion, NOT_FOUND or ERROR.
+        """
+        result = DeleteResult(resource_id, OperationStatus.IN_PROGRESS)
+
+        try:
+            subscription_id, resource_group_name, snapshot_name = parse_snapshot_id(resource_id)
+            result.started_at = datetime.now(timezone.utc)
+            result.poller = self.__snapshot_services.begin_delete(subscription_id, resource_group_name, snapshot_name)
+
+            self.__records.record_deletion_when_done(result.poller, subscription_id, resource_group_name, snapshot_name)
+
+        except ResourceNotFoundError as exception:
+            result.status, result.error = OperationStatus.NOT_FOUND, exception
+
+        except Exception as exception:
+            self.__exception_error.exception_error('delete_snapshots', exception)
+            result.status, result.error = OperationStatus.ERROR, exception
+
+        return result
+
+    def __delete_and_wait(self, resource_ids, max_in_flight):
+        """Submits the deletions to the job tracker, at most max_in_flight at a time, and waits for all of them.
+
+         The deletions are polled together by the scheduler of the tracker, so no thread waits for one of them.
+
+         Args:
+             resource_ids(list): The resource IDs of the snapshots.
+             max_in_flight(int): The maximum number of deletions running at the same time.
+
+         returns:
+             list: One DeleteResult per resource ID, in the same order, with the status SUCCESS, NOT_FOUND or ERROR.
+        """
+        # One entry per running deletion: put() blocks while max_in_flight of them are running.
+        slots = queue.Queue(max_in_flight)
+        handles = []
+        for resource_id in resource_ids:
+            slots.put(resource_id)
+            handles.append(self.submit_snapshot_delete(resource_id, callback=lambda handle: slots.get_nowait()))
+
+        results = []
+        for handle in handles:
+            handle.wait()
+            status = handle.status if handle.status in (OperationStatus.SUCCESS, OperationStatus.NOT_FOUND) else OperationStatus.ERROR
+            results.append(DeleteResult(handle.resource_id, status, handle.error, started_at=handle.submitted_at,
+                                        completed_at=handle.completed_at if handle.succeeded else None))
+
+        return results
+
+    def delete_snapshots(self, items:list, max_in_flight:int = 16, wait:bool = True):
+        """Deletes many snapshots concurrently.
+
+         Args:
+             items(list): The resource IDs or SnapshotModel objects of the snapshots to delete.
+             max_in_flight(int): The maximum number of deletions running at the same time.
+             wait(bool): Whether to wait for every deletion to complete. When True, the deletions are polled together
+                 by the job tracker. When False, each result carries the poller of its deletion and the status
+                 IN_PROGRESS.
+
+         returns:
+             list: One DeleteResult per item, in the same order, with its start and completion times.
+
+         Raises:
+             ValueError: If max_in_flight is lower than 1.
+        """
+        self.__type_validation.validate_parameter_types([
+            (items, 'items', list),
+            (max_in_flight, 'max_in_flight', int),
+            (wait, 'wait', bool)
+        ])
+        if max_in_flight < 1:
+            raise ValueError('The "max_in_flight" parameter must be greater than zero.')
+
+        resource_ids = [getattr(item, 'resource_id', item) for item in items]
+        self.__type_validation.validate_parameter_types([(resource_id, 'resource_id', str) for resource_id in resource_ids])
+
+        if wait:
+            return self.__delete_and_wait(resource_ids, max_in_flight)
+
+        results = run_concurrently(self.__start_delete_item, resource_ids, max_in_flight)
+
+        return [result for _, result, _ in results]
@@ -0,0 +1,104 @@
+"""Export of the snapshots of several subscriptions into files"""
+from module_snapshot.utils.type_validation import TypeValidation
+from module_snapshot.utils.exception import ExceptionError
+from module_snapshot.entities.export_result import ExportResult
+from module_snapshot.entities.snapshot_filter import SNAPSHOT_FIELDS, SnapshotFilter
+from module_snapshot.infra.export_writers import infer_compression, infer_format, open_snapshot_writer, validate_output
+
+
+class SnapshotExportServices:
+    """The export methods of AzureSnapshot, which stream concurrent listings into JSONL, CSV or Parquet files."""
+
+    def __init__(self, iter_pages) -> None:
+        """
+        Args:
+            iter_pages (callable): Lists several subscriptions concurrently, with the parameters of
+                AzureSnapshot.iter_snapshot_pages_across_subscriptions, and yields their pages as they arrive.
+        """
+        self.__type_validation = TypeValidation()
+        self.__exception_error = ExceptionError()
+        self.__iter_pages = iter_pages
+
+    def export_snapshots(self, subscription_ids:list, path:str, file_format:str = None, compression:str = None,
+                         snapshot_filter:SnapshotFilter = None, fields:list = None, batch_size:int = 10000,
+                         max_workers:int = 8, max_pending_pages:int = 16):
+        """Streams the snapshots of several subscriptions into a JSONL, CSV or Parquet file.
+
+         The subscriptions are listed concurrently and their pages are written as they arrive, in batches of
+         batch_size rows, so memory stays bounded by max_pending_pages pages plus one batch whatever the size of
+         the inventory. The rows of a subscription that fails part-way through its listing remain in the file.
+
+         Args:
+             subscription_ids(list): The subscription IDs.
+             path(str): The output file.
+             file_format(str): "jsonl", "csv" or "parquet"; inferred from the suffix of the path when omitted.
+             compression(str): "gzip", "zstd" or None; inferred from a ".gz" or ".zst" suffix when omitted.
+                 Parquet files use it as their page codec.
+             snapshot_filter(SnapshotFilter): Optional criteria the snapshots must match.
+             fields(list): Optional SnapshotModel fields to export, in order; every field by default.
+             batch_size(int): The number of rows written at once (one row group per batch in Parquet).
+             max_workers(int): The maximum number of subscriptions listed at the same time.
+             max_pending_pages(int): The maximum number of listed pages waiting to be written.
+
+         returns:
+             ExportResult: The number of rows and batches written, and a dict mapping each subscription ID that
+             failed to its exception; None if the file could not be written.
+
+         Raises:
+             ValueError: If the format or the compression is unknown or cannot be inferred, or if batch_size is
+                 less than 1.
+             ImportError: If pyarrow (Parquet) or zstandard (zstd) is needed and not installed.
+        """
+        self.__type_validation.validate_parameter_types([
+            (path, 'path', str),
+            (batch_size, 'batch_size', int)
+        ])
+        if batch_size < 1:
+            raise ValueError('The "batch_size" parameter must be greater than zero.')
+
+        compression = compression if compression is not None else infer_compression(path)
+        file_format = file_format if file_format is not None else infer_format(path, compression)
+        validate_output(file_format, compression)
+        columns = list(fields) if fields is not None else list(SNAPSHOT_FIELDS)
+
+        # Validates the listing parameters before any subscription is listed.
+        pages = self.__iter_pages(subscription_ids, snapshot_filter, fields, max_workers, max_pending_pages)
+
+        try:
+            with open_snapshot_writer(path, file_format, columns, compression) as writer:
+                return self.__write_pages(writer, pages, batch_size, ExportResult(path))
+
+        except Exception as exception:
+            self.__exception_error.exception_error('export_snapshots', exception)
+        finally:
+            pages.close()
+
+    def __write_pages(self, writer, pages, batch_size, result):
+        """Writes the pages of the listings in batches of batch_size rows and records the failed subscriptions.
+
+         Args:
+             writer: The writer returned by open_snapshot_writer.
+             pages(iterator): The (subscription_id, page, exception) tuples of the listings.
+             batch_size(int): The number of rows written at once.
+             result(ExportResult): The result receiving the counts and the failures.
+
+         returns:
+             ExportResult: The result.
+        """
+        batch = []
+        for subscription_id, page, exception in pages:
+            if exception is not None:
+                self.__exception_error.exception_error('export_snapshots', exception)
+                result.failures[subscription_id] = exception
+                continue
+
+            batch.extend(page)
+            while len(batch) >= batch_size:
+                writer.write_batch(batch[:batch_size])
+                result.rows, result.batches, batch = result.rows + batch_size, result.batches + 1, batch[batch_size:]
+
+        if batch:
+            writer.write_batch(batch)
+            result.rows, result.batches = result.rows + len(batch), result.batches + 1
+
+        return result
@@ -0,0 +1,64 @@
+"""Write-through of the successful mutations to the local copies of the inventory"""
+from module_snapshot.utils.resource_id import format_snapshot_id
+
+
+class SnapshotRecords:
+    """
+    Keeps the SnapshotCache and the TagIndex of an AzureSnapshot in line with the mutations that succeeded in Azure.
+    Either of them may be None.
+
+    Methods:
+        record_tag_changes(subscription_id, resource_group_name, snapshot_name, tag_changes): Applies tag changes.
+        record_tag_changes_when_done(poller, subscription_id, resource_group_name, snapshot_name, tag_changes):
+            Applies tag changes once the update tracked by its poller succeeded.
+        record_tags(subscription_id, resource_group_name, snapshot_name, tags): Replaces the tags of a snapshot.
+        record_deletion(subscription_id, resource_group_name, snapshot_name): Removes a deleted snapshot.
+        record_deletion_when_done(poller, subscription_id, resource_group_name, snapshot_name): Removes a snapshot
+            once the deletion tracked by its poller succeeded.
+    """
+
+    def __init__(self, cache=None, tag_index=None) -> None:
+        """
+        Args:
+            cache (SnapshotCache): The cache of the listings and reads, or None.
+            tag_index (TagIndex): The index of the tags, or None.
+        """
+        self.__cache = cache
+        self.__tag_index = tag_index
+
+    def record_tag_changes(self, subscription_id, resource_group_name, snapshot_name, tag_changes):
+        """Applies successful tag changes to the cache and the tag index."""
+        if self.__cache is not None:
+            self.__cache.update_tags(subscription_id, resource_group_name, snapshot_name, tag_changes)
+        if self.__tag_index is not None:
+            self.__tag_index.update_tags(format_snapshot_id(subscription_id, resource_group_name, snapshot_name), tag_changes)
+
+    def record_tag_changes_when_done(self, poller, subscription_id, resource_group_name, snapshot_name, tag_changes):
+        """Applies tag changes to the cache and the tag index once the update tracked by its poller succeeded."""
+        def on_done(polling_method):
+            if str(polling_method.status()).lower() == 'succeeded':
+                self.record_tag_changes(subscription_id, resource_group_name, snapshot_name, tag_changes)
+
+        poller.add_done_callback(on_done)
+
+    def record_tags(self, subscription_id, resource_group_name, snapshot_name, tags):
+        """Replaces the tags of a snapshot in the cache and the tag index with the ones it has after an update."""
+        if self.__cache is not None:
+            self.__cache.set_tags(subscription_id, resource_group_name, snapshot_name, tags)
+        if self.__tag_index is not None:
+            self.__tag_index.add(format_snapshot_id(subscription_id, resource_group_name, snapshot_name), tags)
+
+    def record_deletion(self, subscription_id, resource_group_name, snapshot_name):
+        """Removes a deleted snapshot from the cache and the tag index."""
+        if self.__cache is not None:
+            self.__cache.delete_snapshot(subscription_id, resource_group_name, snapshot_name)
+        if self.__tag_index is not None:
+            self.__tag_index.remove(format_snapshot_id(subscription_id, resource_group_name, snapshot_name))
+
+    def record_deletion_when_done(self, poller, subscription_id, resource_group_name, snapshot_name):
+        """Removes a snapshot from the cache and the tag index once the deletion tracked by its poller succeeded."""
+        def on_done(polling_method):
+            if str(polling_method.status()).lower() == 'succeeded':
+                self.record_deletion(subscription_id, resource_group_name, snapshot_name)
+
+        poller.add_done_callback(on_done)
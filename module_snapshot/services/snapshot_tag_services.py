@@ -0,0 +1,231 @@
+"""Tag updates of the snapshots in Azure"""
+from azure.core.exceptions import ResourceModifiedError, ResourceNotFoundError
+from module_snapshot.utils.type_validation import TypeValidation
+from module_snapshot.infra.azure_cloud_services import TAG_MERGE, TAG_OPERATIONS
+from module_snapshot.utils.exception import ExceptionError
+from module_snapshot.utils.concurrency import run_concurrently
+from module_snapshot.utils.resource_id import parse_snapshot_id
+from module_snapshot.utils.tag_exception import TagNotFoundException
+from module_snapshot.entities.operation_result import OperationResult, OperationStatus, TagPatchResult
+
+
+class SnapshotTagServices:
+    """The tag update methods of AzureSnapshot. The updates that succeed are written through to its SnapshotRecords."""
+
+    def __init__(self, snapshot_services, records, job_tracker, iter_snapshots) -> None:
+        """
+        Args:
+            snapshot_services (SnapshotServices): The services sending the requests to Azure.
+            records (SnapshotRecords): The cache and tag index to keep up to date.
+            job_tracker (JobTracker): The tracker polling the submitted updates.
+            iter_snapshots (callable): Yields the SnapshotModel objects of a subscription, given its ID.
+        """
+        self.__type_validation = TypeValidation()
+        self.__exception_error = ExceptionError()
+        self.__snapshot_services = snapshot_services
+        self.__records = records
+        self.__job_tracker = job_tracker
+        self.__iter_snapshots = iter_snapshots
+
+    def update_snapshot_tag(self, subscription_id: str, resource_group_name: str, snapshot_name: str, tag_key:str, new_tag_value:str):
+        """Updates the value of a tag in a snapshot, without waiting for the update to complete.
+
+         The cache and the tag index receive the new value once the update succeeded.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             resource_group_name (str): The name of the resource group.
+             snapshot_name (str): The name of the snapshot.
+             tag_key (str): The key of the tag to be updated.
+             new_tag_value(str): The new tag value.
+
+         returns:
+             bool: True if the update was successful, False otherwise.
+
+         Raises:
+             Exception: If an error occurs while updating the tag.
+        """
+        self.__type_validation.validate_parameter_types([
+            (subscription_id, 'subscription_id', str),
+            (resource_group_name, 'resource_group_name', str),
+            (snapshot_name, 'snapshot_name', str),
+            (tag_key, 'tag_key', str),
+            (new_tag_value, 'new_tag_value', str)
+        ])
+
+        try:
+            poller = self.__snapshot_services.begin_update_tags(subscription_id, resource_group_name, snapshot_name,
+                                                                {tag_key: new_tag_value})
+            self.__records.record_tag_changes_when_done(poller, subscription_id, resource_group_name, snapshot_name,
+                                                        {tag_key: new_tag_value})
+
+            return bool(poller)
+
+        except Exception as exception:
+            self.__exception_error.exception_error('update_snapshot_tag', exception)
+            return False
+
+    def __update_tags_item(self, item):
+        """Applies the tag changes of one bulk item and converts the outcome into an OperationResult.
+
+         Args:
+             item(tuple): A (resource_id, tag_changes) tuple.
+
+         returns:
+             OperationResult: The outcome of the update.
+        """
+        resource_id, tag_changes = item
+
+        try:
+            subscription_id, resource_group_name, snapshot_name = parse_snapshot_id(resource_id)
+            poller = self.__snapshot_services.begin_update_tags(subscription_id, resource_group_name, snapshot_name,
+                                                                tag_changes)
+            poller.result()
+
+            self.__records.record_tag_changes(subscription_id, resource_group_name, snapshot_name, tag_changes)
+
+        except TagNotFoundException as exception:
+            return OperationResult(resource_id, OperationStatus.TAG_NOT_FOUND, exception)
+
+        except ResourceNotFoundError as exception:
+            return OperationResult(resource_id, OperationStatus.NOT_FOUND, exception)
+
+        except Exception as exception:
+            self.__exception_error.exception_error('update_snapshot_tags', exception)
+            return OperationResult(resource_id, OperationStatus.ERROR, exception)
+
+        return OperationResult(resource_id, OperationStatus.SUCCESS)
+
+    def update_snapshot_tags(self, items:list, max_workers:int = 8):
+        """Updates existing tags of many snapshots concurrently, waiting for each update to complete.
+
+         Args:
+             items(list): A list of (resource_id, tag_changes) tuples, where tag_changes is a dict of new values
+                 keyed by tag key. Every key must already exist in the snapshot.
+             max_workers(int): The maximum number of snapshots updated at the same time.
+
+         returns:
+             list: One OperationResult per item, in the same order, with the status SUCCESS once the update
+             completed, TAG_NOT_FOUND, NOT_FOUND or ERROR.
+        """
+        self.__type_validation.validate_parameter_types([
+            (items, 'items', list),
+            (max_workers, 'max_workers', int)
+        ])
+        for resource_id, tag_changes in items:
+            self.__type_validation.validate_parameter_types([
+                (resource_id, 'resource_id', str),
+                (tag_changes, 'tag_changes', dict)
+            ])
+
+        results = run_concurrently(self.__update_tags_item, items, max_workers)
+
+        return [result for _, result, _ in results]
+
+    def update_snapshot_tags_by_selector(self, subscription_id:str, selector, tag_changes:dict, max_workers:int = 8):
+        """Updates existing tags of every snapshot of a subscription accepted by a selector.
+
+         Args:
+             subscription_id(str): The subscription ID.
+             selector(callable): A function receiving a SnapshotModel and returning True for the snapshots to update.
+             tag_changes(dict): The new values, keyed by tag key.
+             max_workers(int): The maximum number of snapshots updated at the same time.
+
+         returns:
+             list: One OperationResult per selected snapshot.
+        """
+        self.__type_validation.validate_parameter_types([
+            (subscription_id, 'subscription_id', str),
+            (tag_changes, 'tag_changes', dict)
+        ])
+
+        items = [(snapshot.resource_id, tag_changes)
+                 for snapshot in self.__iter_snapshots(subscription_id)
+                 if selector(snapshot)]
+
+        return self.update_snapshot_tags(items, max_workers)
+
+    def patch_snapshot_tags(self, resource_id:str, tags:dict, operation:str = TAG_MERGE, etag:str = None,
+                            require_existing:bool = False):
+        """Adds, overwrites, replaces or removes several tags of a snapshot in a single tags-only request.
+
+         Unless require_existing is True, the snapshot is not read first: only the operation and the given tags are
+         sent. The tags the snapshot has afterwards are written to the cache and the tag index.
+
+         Args:
+             resource_id(str): The resource ID of the snapshot.
+             tags(dict): The tags of the operation, keyed by tag key.
+             operation(str): "Merge" adds or overwrites the given keys, "Replace" replaces every tag with the given
+                 ones and "Delete" removes the given keys, or only the tags having the given value when it is not
+                 empty. Keys are matched case-insensitively.
+             etag(str): The ETag the snapshot must still have, or None to update it unconditionally.
+             require_existing(bool): True to read the snapshot first and fail unless every given tag exists.
+
+         returns:
+             TagPatchResult: The status SUCCESS with the new tags, TAG_NOT_FOUND, NOT_FOUND, CONFLICT when the
+             snapshot no longer has the given ETag or when a read-modify-write has no ETag to be guarded by, or ERROR.
+        """
+        self.__type_validation.validate_parameter_types([
+            (resource_id, 'resource_id', str),
+            (tags, 'tags', dict),
+            (operation, 'operation', str),
+            (require_existing, 'require_existing', bool)
+        ])
+        if etag is not None:
+            self.__type_validation.validate_parameter_types([(etag, 'etag', str)])
+        if operation not in TAG_OPERATIONS:
+            raise ValueError(f'The "operation" parameter must be one of {", ".join(TAG_OPERATIONS)}.')
+
+        try:
+            subscription_id, resource_group_name, snapshot_name = parse_snapshot_id(resource_id)
+            new_tags = self.__snapshot_services.patch_tags(subscription_id, resource_group_name, snapshot_name, tags,
+                                                           operation, etag, require_existing)
+
+            self.__records.record_tags(subscription_id, resource_group_name, snapshot_name, new_tags)
+
+        except TagNotFoundException as exception:
+            return TagPatchResult(resource_id, OperationStatus.TAG_NOT_FOUND, exception)
+
+        except ResourceNotFoundError as exception:
+            return TagPatchResult(resource_id, OperationStatus.NOT_FOUND, exception)
+
+        except ResourceModifiedError as exception:
+            return TagPatchResult(resource_id, OperationStatus.CONFLICT, exception)
+
+        except Exception as exception:
+            if getattr(exception, 'status_code', None) == 412:
+                return TagPatchResult(resource_id, OperationStatus.CONFLICT, exception)
+
+            self.__exception_error.exception_error('patch_snapshot_tags', exception)
+            return TagPatchResult(resource_id, OperationStatus.ERROR, exception)
+
+        return TagPatchResult(resource_id, OperationStatus.SUCCESS, tags=new_tags)
+
+    def submit_snapshot_tags_update(self, resource_id:str, tag_changes:dict, callback=None):
+        """Submits the update of existing tags of a snapshot to the job tracker, without waiting for it.
+
+         Args:
+             resource_id(str): The resource ID of the snapshot.
+             tag_changes(dict): The new values, keyed by tag key. Every key must already exist in the snapshot.
+             callback(callable): Optional function called with the JobHandle once the update completed.
+
+         returns:
+             JobHandle: The handle of the update, whose status becomes SUCCESS, TAG_NOT_FOUND, NOT_FOUND or ERROR.
+        """
+        self.__type_validation.validate_parameter_types([
+            (resource_id, 'resource_id', str),
+            (tag_changes, 'tag_changes', dict)
+        ])
+
+        def start():
+            subscription_id, resource_group_name, snapshot_name = parse_snapshot_id(resource_id)
+            return self.__snapshot_services.start_update_tags(subscription_id, resource_group_name, snapshot_name,
+                                                              tag_changes)
+
+        def on_done(handle):
+            if handle.succeeded:
+                self.__records.record_tag_changes(*parse_snapshot_id(resource_id), tag_changes)
+            if callback is not None:
+                callback(handle)
+
+        return self.__job_tracker.submit(resource_id, start, 'update', on_done)
@@ -0,0 +1,130 @@
+"""Helpers to run blocking calls and coroutines concurrently"""
+import asyncio
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+def run_concurrently(function, items, max_workers: int = 8):
+    """Calls a function once per item on a bounded thread pool.
+
+     Args:
+         function(callable): The function to be called with each item.
+         items(iterable): The items to be processed.
+         max_workers(int): The maximum number of concurrent calls.
+
+     returns:
+         list: A list of (item, result, exception) tuples in the same order as the items. Exactly one of
+         result and exception is meaningful; exception is None when the call succeeded.
+
+     Raises:
+         ValueError: If max_workers is lower than 1.
+    """
+    if max_workers < 1:
+        raise ValueError('The "max_workers" parameter must be greater than zero.')
+
+    items = list(items)
+    if not items:
+        return []
+
+    def call(item):
+        try:
+            return item, function(item), None
+        except Exception as exception:
+            return item, None, exception
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(call, items))
+
+
+async def gather_with_concurrency(awaitables, max_concurrency: int = 100, return_exceptions: bool = False):
+    """Awaits several awaitables while keeping at most max_concurrency of them in flight.
+
+     Args:
+         awaitables(iterable): The coroutines or awaitables to be awaited.
+         max_concurrency(int): The maximum number of awaitables running at the same time.
+         return_exceptions(bool): Whether exceptions are returned as results instead of being raised.
+
+     returns:
+         list: The results in the same order as the awaitables.
+
+     Raises:
+         ValueError: If max_concurrency is lower than 1.
+    """
+    if max_concurrency < 1:
+        raise ValueError('The "max_concurrency" parameter must be greater than zero.')
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def bounded(awaitable):
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(*(bounded(awaitable) for awaitable in awaitables), return_exceptions=return_exceptions)
+
+
+def iter_concurrently(function, items, max_workers: int = 8, max_pending: int = 16):
+    """Consumes one iterator per item on a bounded thread pool and yields their values as they are produced.
+
+     At most max_pending values wait in memory: the workers block while the consumer is behind. Closing the
+     generator early stops the workers at their next value.
+
+     Args:
+         function(callable): The function returning an iterator for each item.
+         items(iterable): The items to be processed.
+         max_workers(int): The maximum number of iterators consumed at the same time.
+         max_pending(int): The maximum number of values produced but not yet yielded.
+
+     yields:
+         tuple: An (item, value, None) tuple per value, or an (item, None, exception) tuple when the iterator of
+         an item fails; the values of one item keep their order.
+
+     Raises:
+         ValueError: If max_workers or max_pending is lower than 1.
+    """
+    if max_workers < 1 or max_pending < 1:
+        raise ValueError('The "max_workers" and "max_pending" parameters must be greater than zero.')
+
+    items = list(items)
+    if not items:
+        return
+
+    pending = queue.Queue(maxsize=max_pending)
+    stopped = threading.Event()
+    done = object()
+
+    def put(entry):
+        while not stopped.is_set():
+            try:
+                pending.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def consume(item):
+        try:
+            for value in function(item):
+                if not put((item, value, None)):
+                    return
+        except Exception as exception:
+            put((item, None, exception))
+        finally:
+            put(done)
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(items)))
+    try:
+        for item in items:
+            executor.submit(consume, item)
+
+        remaining = len(items)
+        while remaining:
+            entry = pending.get()
+            if entry is done:
+                remaining -= 1
+            else:
+                yield entry
+    finally:
+        stopped.set()
+        executor.shutdown(wait=True, cancel_futures=True)
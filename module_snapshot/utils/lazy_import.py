@@ -0,0 +1,43 @@
+"""Import heavy dependencies on first use instead of at import time
+
+The Azure SDK classes that take long to import (the compute clients, the credentials, the Resource Graph client and
+the dynaconf Config) are imported through import_attribute() or import_optional() when they are first needed. Each
+module using one declares a module-level placeholder set to None, e.g. ComputeManagementClient, and uses the class
+assigned to it instead when there is one, which is how the tests replace them. azure.core is still imported eagerly:
+the throttle, the polling and the Tags API client need it, and it is a fraction of the import time of the SDKs
+deferred here.
+"""
+import importlib
+
+
+def import_attribute(module_name: str, attribute: str):
+    """Imports a module and returns one of its attributes.
+
+     Modules are only imported once per process, so calling this on every use costs a dictionary lookup.
+
+     Args:
+         module_name(str): The dotted name of the module, e.g. "azure.mgmt.compute".
+         attribute(str): The name of the attribute, e.g. "ComputeManagementClient".
+
+     returns:
+         The attribute.
+
+     Raises:
+         ImportError: If the module is not installed.
+    """
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def import_optional(module_name: str):
+    """Imports an optional package.
+
+     Args:
+         module_name(str): The dotted name of the module, e.g. "pyarrow.parquet".
+
+     returns:
+         module: The module, or None if it is not installed.
+    """
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        return None
@@ -0,0 +1,45 @@
+"""Parse Azure resource IDs of snapshots"""
+
+
+def parse_snapshot_id(resource_id: str):
+    """Splits the ARM resource ID of a snapshot into its parts.
+
+     The segment names are matched case-insensitively and leading, trailing or repeated slashes are ignored, as
+     ARM does.
+
+     Args:
+         resource_id(str): The resource ID, e.g.
+             /subscriptions/<id>/resourceGroups/<rg>/providers/Microsoft.Compute/snapshots/<name>
+
+     returns:
+         tuple: A (subscription_id, resource_group_name, snapshot_name) tuple.
+
+     Raises:
+         ValueError: If the resource ID is not the ID of a snapshot.
+    """
+    segments = [segment for segment in resource_id.strip().split("/") if segment]
+
+    if (len(segments) != 8
+            or segments[0].lower() != "subscriptions"
+            or segments[2].lower() != "resourcegroups"
+            or segments[4].lower() != "providers"
+            or segments[5].lower() != "microsoft.compute"
+            or segments[6].lower() != "snapshots"):
+        raise ValueError(f"'{resource_id}' is not a snapshot resource ID.")
+
+    return segments[1], segments[3], segments[7]
+
+
+def format_snapshot_id(subscription_id: str, resource_group_name: str, snapshot_name: str) -> str:
+    """Builds the ARM resource ID of a snapshot from its parts.
+
+     Args:
+         subscription_id(str): The subscription ID.
+         resource_group_name(str): The name of the resource group.
+         snapshot_name(str): The name of the snapshot.
+
+     returns:
+         str: The resource ID, e.g. /subscriptions/<id>/resourceGroups/<rg>/providers/Microsoft.Compute/snapshots/<name>
+    """
+    return (f"/subscriptions/{subscription_id}/resourceGroups/{resource_group_name}"
+            f"/providers/Microsoft.Compute/snapshots/{snapshot_name}")
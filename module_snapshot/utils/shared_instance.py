@@ -0,0 +1,43 @@
+"""Process-wide instances created on first use"""
+import threading
+
+
+class SharedInstance:
+    """
+    A thread-safe holder of an object shared by the whole process, built by a factory on first use and replaceable
+    at any time, e.g. by tests.
+
+    Methods:
+        get(): Returns the shared object, building it if needed.
+        set(instance): Replaces the shared object; None builds a new one on next use.
+    """
+
+    def __init__(self, factory) -> None:
+        """
+        Args:
+            factory (callable): Builds the shared object, without arguments.
+        """
+        self.__factory = factory
+        self.__instance = None
+        self.__lock = threading.Lock()
+
+    def get(self):
+        """Returns the shared object, building it on first use."""
+        instance = self.__instance
+        if instance is None:
+            with self.__lock:
+                if self.__instance is None:
+                    self.__instance = self.__factory()
+                instance = self.__instance
+
+        return instance
+
+    def set(self, instance) -> None:
+        """
+        Replaces the shared object.
+
+        Args:
+            instance: The object to be shared, or None to build a new one on next use.
+        """
+        with self.__lock:
+            self.__instance = instance
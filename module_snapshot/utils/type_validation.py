@@ -8,4 +8,8 @@ class TypeValidation:
             return True
         else:
             raise TypeError(f'The "{param_name}" parameter must be {type}.')
-        
+
+    def validate_parameter_types(self, params):
+        """Validate the types of several parameters, given as (value, name, type) tuples."""
+        for param, param_name, param_type in params:
+            self.validate_parameter_type(param, param_name, param_type)
@@ -1,11 +1,62 @@
 """Create mocks and fixtures for tests"""
 import datetime
-from unittest.mock import MagicMock
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 from pytest import fixture
+from azure.core.paging import ItemPaged
 from module_snapshot.entities.snapshot_model import SnapshotModel
 import module_snapshot.infra.azure_cloud_services as mock_az_snapshot_services
+import module_snapshot.infra.async_azure_cloud_services as mock_async_az_snapshot_services
+import module_snapshot.infra.authenticate as mock_authenticate
+from module_snapshot.infra.credential_provider import set_credential_provider
 from module_snapshot.utils.tag_exception import TagNotFoundException
 
+def mock_pager(items, page_size=1):
+    """Builds an Azure ItemPaged pager that serves the given items in pages.
+
+     Args:
+         items(list): The items returned by the pager.
+         page_size(int): The number of items in each page.
+
+     returns:
+         ItemPaged: A pager that supports both item iteration and by_page().
+    """
+    def get_next(continuation_token=None):
+        start = continuation_token or 0
+        return start, items[start:start + page_size]
+
+    def extract_data(response):
+        start, page = response
+        next_token = start + page_size if start + page_size < len(items) else None
+        return next_token, iter(page)
+
+    return ItemPaged(get_next, extract_data)
+
+def fake_response(status_code, method, body=None, headers=None):
+    """Builds an azure-core pipeline response with the attributes read by ARMPolling."""
+    request = SimpleNamespace(method=method, url='https://management.azure.com/op',
+                              headers={'x-ms-client-request-id': 'request-1'})
+    text = json.dumps(body) if body is not None else ''
+    http_response = SimpleNamespace(status_code=status_code, headers=headers or {}, request=request,
+                                    reason='OK', content_type='application/json', content=text.encode(),
+                                    text=lambda encoding=None: text)
+
+    return SimpleNamespace(http_response=http_response, context={})
+
+def mock_done_poller():
+    """Builds the mock poller of an update or a deletion that already succeeded: its done callbacks are called
+     immediately.
+
+     returns:
+         MagicMock: A mock LROPoller.
+    """
+    poller = MagicMock()
+    poller.polling_method.return_value.status.return_value = 'Succeeded'
+    poller.add_done_callback.side_effect = lambda callback: callback(poller.polling_method())
+
+    return poller
+
 @fixture(autouse=True)
 def mock_env_var(monkeypatch):
     """
@@ -19,8 +70,18 @@ def mock_env_var(monkeypatch):
     monkeypatch.setenv("AZURE_CLIENT_ID", "client")
     monkeypatch.setenv("AZURE_CLIENT_SECRET", "secret")
 
-@fixture
-def mock_snapshot_services(monkeypatch):
+@fixture(autouse=True)
+def reset_credential_provider():
+    """
+    Fixture that discards the process-wide CredentialProvider after each test, so that every test loads the
+    configuration from its own environment variables.
+    """
+    set_credential_provider(None)
+    yield
+    set_credential_provider(None)
+
+@fixture(name='mock_snapshot_services')
+def fixture_mock_snapshot_services(monkeypatch):
     """Create a mock for snapshot services.
 
      Args:
@@ -30,7 +91,7 @@ def mock_snapshot_services(monkeypatch):
          MagicMock: Mock object of the snapshot service.
     """
 
-    def mock_snapshot(*args):
+    def mock_snapshot(*args, **kwargs):
         mock_compute_management_client = MagicMock()
         mock_compute_client_snapshots = MagicMock()
         mock_compute_management_client.snapshots = mock_compute_client_snapshots
@@ -44,18 +105,24 @@ def mock_snapshot_services(monkeypatch):
         snapshots_list.tags = {'Responsible - App': 'lucasraugi@gmail.com'}
         snapshots_list.type = 'Microsoft.Compute/snapshots'
         snapshots_list.time_created = datetime.datetime(2023, 6, 8, 21, 25, 28, 102399)
+        snapshots_list.creation_data.source_resource_id = '/subscriptions/b12a52ca-48bb-46a0-870d-239dcd058d7e/resourceGroups/rgtest/providers/Microsoft.Compute/disks/disk1'
+        snapshots_list.disk_size_gb = 128
+        snapshots_list.incremental = True
+        snapshots_list.sku.name = 'Standard_LRS'
 
         def mock_list(*args, **Kwargs):
-            return [snapshots_list]
+            return mock_pager([snapshots_list])
 
         def mock_get(*args, **Kwargs):
             return snapshots_list
 
         def mock_update(*args, **Kwargs):
-            return True
+            return mock_done_poller()
 
-        def mock_delete(*args, **Kwargs):
-            return True
+        def mock_delete(*args, polling=None, **Kwargs):
+            if polling is not None:
+                polling.initialize(MagicMock(), fake_response(200, 'DELETE'), lambda pipeline_response: None)
+            return mock_done_poller()
 
         mock_compute_client_snapshots.list = mock_list
         mock_compute_client_snapshots.list_by_resource_group = mock_list
@@ -67,6 +134,27 @@ def mock_snapshot_services(monkeypatch):
 
     monkeypatch.setattr(mock_az_snapshot_services, "ComputeManagementClient", mock_snapshot)
 
+@fixture
+def paged_snapshot_services(monkeypatch, mock_snapshot_services):
+    """Serves five snapshots in pages of two for every subscription except 'broken', whose listing fails.
+
+     Args:
+         monkeypatch: Object used to patch methods during tests.
+         mock_snapshot_services: Mock object for snapshot services.
+    """
+    mock_compute_management_client = mock_az_snapshot_services.ComputeManagementClient
+
+    def paged_client(credential, subscription_id, **kwargs):
+        compute_client = mock_compute_management_client(credential, subscription_id, **kwargs)
+        snapshot = compute_client.snapshots.get()
+        if subscription_id == 'broken':
+            compute_client.snapshots.list = lambda *args, **kwargs: None
+        else:
+            compute_client.snapshots.list = lambda *args, **kwargs: mock_pager([snapshot] * 5, page_size=2)
+        return compute_client
+
+    monkeypatch.setattr(mock_az_snapshot_services, "ComputeManagementClient", paged_client)
+
 @fixture
 def mock_snapshot_services_exception(monkeypatch):
     """Creates a mock for the snapshot services that throws exceptions.
@@ -78,7 +166,7 @@ def mock_snapshot_services_exception(monkeypatch):
          MagicMock: Mock object of the snapshot service.
     """
 
-    def mock_snapshot(*args):
+    def mock_snapshot(*args, **kwargs):
         mock_compute_management_client = MagicMock()
         mock_compute_client_snapshots = MagicMock()
         mock_compute_management_client.snapshots = mock_compute_client_snapshots
@@ -120,7 +208,11 @@ def mock_snapshot_list_return():
                location='eastus',
                tags={'Responsible - App': 'lucasraugi@gmail.com'},
                resource_type='Microsoft.Compute/snapshots',
-               created_date='2023-06-08 21:25:28')]
+               created_date='2023-06-08 21:25:28',
+               source_resource_id='/subscriptions/b12a52ca-48bb-46a0-870d-239dcd058d7e/resourceGroups/rgtest/providers/Microsoft.Compute/disks/disk1',
+               disk_size_gb=128,
+               incremental=True,
+               sku='Standard_LRS')]
 
 @fixture
 def mock_snapshot_return():
@@ -136,4 +228,65 @@ def mock_snapshot_return():
                location='eastus',
                tags={'Responsible - App': 'lucasraugi@gmail.com'},
                resource_type='Microsoft.Compute/snapshots',
-               created_date='2023-06-08 21:25:28')
+               created_date='2023-06-08 21:25:28',
+               source_resource_id='/subscriptions/b12a52ca-48bb-46a0-870d-239dcd058d7e/resourceGroups/rgtest/providers/Microsoft.Compute/disks/disk1',
+               disk_size_gb=128,
+               incremental=True,
+               sku='Standard_LRS')
+
+@fixture
+def mock_async_snapshot_services(monkeypatch):
+    """Create a mock for the asyncio snapshot services.
+
+     Args:
+         monkeypatch: Object used to patch methods during tests.
+
+     returns:
+         MagicMock: Mock object of the asyncio snapshot service.
+    """
+
+    def mock_snapshot(*args, **kwargs):
+        mock_compute_management_client = MagicMock()
+        mock_compute_management_client.close = AsyncMock()
+        mock_compute_client_snapshots = MagicMock()
+        mock_compute_management_client.snapshots = mock_compute_client_snapshots
+
+        snapshots_list = MagicMock()
+        snapshots_list.id = '/subscriptions/b12a52ca-48bb-46a0-870d-239dcd058d7e/resourceGroups/rgtest/providers/Microsoft.Compute/snapshots/excluir1'
+        snapshots_list.name = 'excluir1'
+        snapshots_list.location = 'eastus'
+        snapshots_list.tags = {'Responsible - App': 'lucasraugi@gmail.com'}
+        snapshots_list.type = 'Microsoft.Compute/snapshots'
+        snapshots_list.time_created = datetime.datetime(2023, 6, 8, 21, 25, 28, 102399)
+        snapshots_list.creation_data.source_resource_id = '/subscriptions/b12a52ca-48bb-46a0-870d-239dcd058d7e/resourceGroups/rgtest/providers/Microsoft.Compute/disks/disk1'
+        snapshots_list.disk_size_gb = 128
+        snapshots_list.incremental = True
+        snapshots_list.sku.name = 'Standard_LRS'
+
+        async def mock_list(*args, **Kwargs):
+            yield snapshots_list
+
+        async def mock_get(*args, **Kwargs):
+            return snapshots_list
+
+        async def mock_update(*args, **Kwargs):
+            return True
+
+        async def mock_delete(*args, **Kwargs):
+            return True
+
+        mock_compute_client_snapshots.list = mock_list
+        mock_compute_client_snapshots.list_by_resource_group = mock_list
+        mock_compute_client_snapshots.get = mock_get
+        mock_compute_client_snapshots.begin_update = mock_update
+        mock_compute_client_snapshots.begin_delete = mock_delete
+
+        return mock_compute_management_client
+
+    def mock_async_credential(*args, **kwargs):
+        mock_credential = MagicMock()
+        mock_credential.close = AsyncMock()
+        return mock_credential
+
+    monkeypatch.setattr(mock_async_az_snapshot_services, "ComputeManagementClient", mock_snapshot)
+    monkeypatch.setattr(mock_authenticate, "AsyncClientSecretCredential", mock_async_credential)
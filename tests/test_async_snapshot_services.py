@@ -0,0 +1,151 @@
+"""Test for the AsyncAzureSnapshot class."""
+import asyncio
+import module_snapshot.infra.async_azure_cloud_services as mock_async_az_snapshot_services
+from module_snapshot.services.async_az_snapshot_services import AsyncAzureSnapshot
+
+def run(coroutine_function):
+    """Runs a coroutine function that receives an AsyncAzureSnapshot and closes it afterwards.
+
+     Args:
+         coroutine_function: Coroutine function receiving the AsyncAzureSnapshot instance.
+
+     returns:
+         The value returned by the coroutine function.
+    """
+    async def runner():
+        async with AsyncAzureSnapshot() as snapshot_services:
+            return await coroutine_function(snapshot_services)
+
+    return asyncio.run(runner())
+
+class TestAsyncAzureSnapshot:
+    """Test class for the AsyncAzureSnapshot class."""
+
+    def test_list_by_subscription_id(self, mock_async_snapshot_services, mock_snapshot_list_return):
+        """Test the list_snapshot_by_subscription_id method of the AsyncAzureSnapshot class.
+
+         Args:
+             mock_async_snapshot_services: Mock object for the asyncio snapshot services.
+             mock_snapshot_list_return: Mock list of snapshots returned.
+        """
+        expected = run(lambda snapshot_services: snapshot_services.list_snapshot_by_subscription_id('132465789'))
+
+        assert expected == mock_snapshot_list_return
+
+    def test_list_by_resource_group(self, mock_async_snapshot_services, mock_snapshot_list_return):
+        """Test the list_snapshot_by_resource_group method of the AsyncAzureSnapshot class.
+
+         Args:
+             mock_async_snapshot_services: Mock object for the asyncio snapshot services.
+             mock_snapshot_list_return: Mock list of snapshots returned.
+        """
+        expected = run(lambda snapshot_services: snapshot_services.list_snapshot_by_resource_group('132465789', 'rgtest'))
+
+        assert expected == mock_snapshot_list_return
+
+    def test_get_snapshot(self, mock_async_snapshot_services, mock_snapshot_return):
+        """Test the get_snapshot method of the AsyncAzureSnapshot class.
+
+         Args:
+             mock_async_snapshot_services: Mock object for the asyncio snapshot services.
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        expected = run(lambda snapshot_services: snapshot_services.get_snapshot('132465789', 'rgtest', 'excluir1'))
+
+        assert expected == mock_snapshot_return
+
+    def test_update_tag_when_tag_exist(self, mock_async_snapshot_services):
+        """Tests the update_snapshot_tag method of the AsyncAzureSnapshot class when the tag already exists.
+
+         Args:
+             mock_async_snapshot_services: Mock object for the asyncio snapshot services.
+        """
+        expected = run(lambda snapshot_services: snapshot_services.update_snapshot_tag('132465789', 'rgtest', 'excluir1', 'Responsible - App', 'lucasraugi@gmail.com'))
+
+        assert expected is True
+
+    def test_update_tag_when_tag_not_exist(self, mock_async_snapshot_services):
+        """Tests the update_snapshot_tag method of the AsyncAzureSnapshot class when the tag does not exist.
+
+         Args:
+             mock_async_snapshot_services: Mock object for the asyncio snapshot services.
+        """
+        expected = run(lambda snapshot_services: snapshot_services.update_snapshot_tag('132465789', 'rgtest', 'excluir1', 'Missing', 'value'))
+
+        assert expected is False
+
+    def test_delete_snapshot(self, mock_async_snapshot_services):
+        """Tests the delete_snapshot method of the AsyncAzureSnapshot class.
+
+         Args:
+             mock_async_snapshot_services: Mock object for the asyncio snapshot services.
+        """
+        expected = run(lambda snapshot_services: snapshot_services.delete_snapshot('132465789', 'rgtest', 'excluir1'))
+
+        assert expected is True
+
+    def test_gather_keeps_concurrency_bounded(self, mock_async_snapshot_services):
+        """Tests that gather returns every result while never exceeding max_concurrency calls in flight.
+
+         Args:
+             mock_async_snapshot_services: Mock object for the asyncio snapshot services.
+        """
+        in_flight = []
+        peak = []
+
+        async def tracked_get(snapshot_services, index):
+            in_flight.append(index)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0)
+            snapshot = await snapshot_services.get_snapshot('132465789', 'rgtest', f'excluir{index}')
+            in_flight.remove(index)
+            return snapshot
+
+        async def gather(snapshot_services):
+            return await snapshot_services.gather((tracked_get(snapshot_services, index) for index in range(20)), max_concurrency=3)
+
+        expected = run(gather)
+
+        assert len(expected) == 20
+        assert max(peak) == 3
+
+    def test_evicted_clients_are_closed_once_idle(self, monkeypatch, mock_async_snapshot_services):
+        """Tests that a client evicted from the cache is closed after its last call, and the others on close().
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_async_snapshot_services: Mock object for the asyncio snapshot services.
+        """
+        created = []
+        client_class = mock_async_az_snapshot_services.ComputeManagementClient
+
+        def compute_client(*args, **kwargs):
+            created.append(client_class(*args, **kwargs))
+            return created[-1]
+
+        monkeypatch.setattr(mock_async_az_snapshot_services, 'ComputeManagementClient', compute_client)
+        closed_while_in_use = []
+
+        async def runner():
+            async with AsyncAzureSnapshot(max_cached_clients=1) as snapshot_services:
+                await snapshot_services.get_snapshot('sub-1', 'rgtest', 'excluir1')
+                first_get = created[0].snapshots.get
+
+                async def slow_get(*args, **kwargs):
+                    await asyncio.sleep(0.01)
+                    closed_while_in_use.append(created[0].close.await_count)
+                    return await first_get(*args, **kwargs)
+
+                created[0].snapshots.get = slow_get
+                in_use = asyncio.ensure_future(snapshot_services.get_snapshot('sub-1', 'rgtest', 'excluir1'))
+                await asyncio.sleep(0)
+                await snapshot_services.get_snapshot('sub-2', 'rgtest', 'excluir1')
+                await in_use
+                evicted_closes = created[0].close.await_count
+
+            return evicted_closes
+
+        evicted_closes = asyncio.run(runner())
+
+        assert closed_while_in_use == [0] and evicted_closes == 1
+        assert [client.close.await_count for client in created] == [1, 1]
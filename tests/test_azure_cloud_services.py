@@ -1,5 +1,8 @@
 "Tests for the SnapshotServices class."
+from unittest.mock import MagicMock
+import module_snapshot.infra.azure_cloud_services as mock_az_snapshot_services
 from module_snapshot.infra.azure_cloud_services import SnapshotServices
+from tests.conftest import mock_pager
 
 class TestSnapshotServices:
     """Test class for the SnapshotServices class."""
@@ -69,3 +72,110 @@ class TestSnapshotServices:
         expected = snapshot_services.delete('132465789', 'rgtest', 'excluir1')
 
         assert expected is True
+
+    def test_compute_client_is_reused_between_calls(self, monkeypatch, mock_snapshot_services):
+        """Tests that SnapshotServices builds a single ComputeManagementClient per subscription.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        created_clients = []
+        mock_compute_management_client = mock_az_snapshot_services.ComputeManagementClient
+
+        def counting_client(*args, **kwargs):
+            created_clients.append(args)
+            return mock_compute_management_client(*args, **kwargs)
+
+        monkeypatch.setattr(mock_az_snapshot_services, "ComputeManagementClient", counting_client)
+
+        with SnapshotServices() as snapshot_services:
+            snapshot_services.get('132465789', 'rgtest', 'excluir1')
+            snapshot_services.update_tag('132465789', 'rgtest', 'excluir1', 'Responsible - App', 'lucasraugi@gmail.com')
+            snapshot_services.delete('132465789', 'rgtest', 'excluir1')
+
+        assert len(created_clients) == 1
+
+    def test_iter_snapshot_pages_by_subscription_id(self, monkeypatch, mock_snapshot_services, mock_snapshot_return):
+        """Tests that iter_snapshot_pages_by_subscription_id yields one list of models per Azure page.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        mock_compute_management_client = mock_az_snapshot_services.ComputeManagementClient
+        fetched_pages = []
+
+        def paged_client(*args, **kwargs):
+            compute_client = mock_compute_management_client(*args, **kwargs)
+            snapshot = compute_client.snapshots.get()
+            pager = mock_pager([snapshot] * 3, page_size=2)
+            compute_client.snapshots.list = lambda *args, **kwargs: pager
+            fetched_pages.append(pager)
+            return compute_client
+
+        monkeypatch.setattr(mock_az_snapshot_services, "ComputeManagementClient", paged_client)
+
+        snapshot_services = SnapshotServices()
+        pages = list(snapshot_services.iter_snapshot_pages_by_subscription_id('132465789'))
+
+        assert [len(page) for page in pages] == [2, 1]
+        assert pages[0][0] == mock_snapshot_return
+
+    def test_iter_snapshots_by_resource_group_is_lazy(self, monkeypatch, mock_snapshot_services, mock_snapshot_return):
+        """Tests that iter_snapshots_by_resource_group does not call Azure until it is consumed.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        created_clients = []
+        mock_compute_management_client = mock_az_snapshot_services.ComputeManagementClient
+
+        def counting_client(*args, **kwargs):
+            created_clients.append(args)
+            return mock_compute_management_client(*args, **kwargs)
+
+        monkeypatch.setattr(mock_az_snapshot_services, "ComputeManagementClient", counting_client)
+
+        snapshot_services = SnapshotServices()
+        snapshots = snapshot_services.iter_snapshots_by_resource_group('132465789', 'rgtest')
+
+        assert not created_clients
+        assert next(snapshots) == mock_snapshot_return
+
+    def test_evicted_clients_are_closed_once_idle(self, monkeypatch, mock_snapshot_services):
+        """Tests that a client evicted from the cache is closed once its listings and operations are done, and the
+        others on close().
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        created = []
+        mock_compute_management_client = mock_az_snapshot_services.ComputeManagementClient
+
+        def recorded_client(*args, **kwargs):
+            created.append(mock_compute_management_client(*args, **kwargs))
+            return created[-1]
+
+        monkeypatch.setattr(mock_az_snapshot_services, "ComputeManagementClient", recorded_client)
+
+        with SnapshotServices(max_cached_clients=1) as snapshot_services:
+            pages = snapshot_services.iter_snapshot_pages_by_subscription_id('sub-1')
+            next(pages)
+            poller, done_callbacks = MagicMock(), []
+            poller.add_done_callback.side_effect = done_callbacks.append
+            created[0].snapshots.begin_delete = lambda *args, **kwargs: poller
+            snapshot_services.begin_delete('sub-1', 'rgtest', 'excluir1')
+
+            snapshot_services.get('sub-2', 'rgtest', 'excluir1')
+            pages.close()
+            closed_while_deleting = created[0].close.call_count
+            done_callbacks[0](poller.polling_method())
+            evicted_closes = created[0].close.call_count
+
+        assert closed_while_deleting == 0 and evicted_closes == 1
+        assert [client.close.call_count for client in created] == [1, 1]
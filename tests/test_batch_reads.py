@@ -0,0 +1,86 @@
+"""Tests for the AzureSnapshot reads of several subscriptions or snapshots at once."""
+from azure.core.exceptions import ResourceNotFoundError
+import module_snapshot.infra.azure_cloud_services as mock_az_snapshot_services
+from module_snapshot.entities.operation_result import OperationStatus
+from module_snapshot.services.az_snapshot_services import AzureSnapshot
+
+class TestBatchReads:
+    """Test class for list_snapshots_across_subscriptions and get_snapshots."""
+
+    def test_list_snapshots_across_subscriptions_merges_results(self, mock_snapshot_services, mock_snapshot_list_return):
+        """Tests the list_snapshots_across_subscriptions method of the AzureSnapshot class when every subscription is valid.
+
+         Args:
+             mock_snapshot_services: Mock object for snapshot services.
+             mock_snapshot_list_return: Mock list of snapshots returned.
+        """
+        snapshot_services = AzureSnapshot()
+        expected = snapshot_services.list_snapshots_across_subscriptions(['132465789', '987654321', '132465789'], max_workers=2)
+
+        assert expected.succeeded
+        assert [snapshot.subscription_id for snapshot in expected.snapshots] == ['132465789', '987654321']
+        assert expected.snapshots[0] == mock_snapshot_list_return[0]
+
+    def test_list_snapshots_across_subscriptions_reports_failures(self, monkeypatch, mock_snapshot_services, mock_snapshot_list_return):
+        """Tests that list_snapshots_across_subscriptions reports failing subscriptions separately.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+             mock_snapshot_list_return: Mock list of snapshots returned.
+        """
+        mock_compute_management_client = mock_az_snapshot_services.ComputeManagementClient
+
+        def failing_client(credential, subscription_id, **kwargs):
+            if subscription_id == 'forbidden':
+                raise PermissionError(subscription_id)
+            return mock_compute_management_client(credential, subscription_id, **kwargs)
+
+        monkeypatch.setattr(mock_az_snapshot_services, "ComputeManagementClient", failing_client)
+
+        snapshot_services = AzureSnapshot()
+        expected = snapshot_services.list_snapshots_across_subscriptions(['132465789', 'forbidden'])
+
+        assert expected.snapshots == mock_snapshot_list_return
+        assert list(expected.failures) == ['forbidden']
+        assert isinstance(expected.failures['forbidden'], PermissionError)
+
+    def test_get_snapshots_deduplicates_and_reports_each_id(self, monkeypatch, mock_snapshot_services, mock_snapshot_return):
+        """Tests that get_snapshots fetches equivalent IDs once and reports not-found and invalid IDs.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        mock_compute_management_client = mock_az_snapshot_services.ComputeManagementClient
+        fetched = []
+
+        def recording_client(*args, **kwargs):
+            compute_client = mock_compute_management_client(*args, **kwargs)
+            get = compute_client.snapshots.get
+
+            def recording_get(resource_group_name, snapshot_name, **kwargs):
+                fetched.append((args[1], resource_group_name, snapshot_name))
+                if snapshot_name == 'missing':
+                    raise ResourceNotFoundError('not found')
+                return get(resource_group_name, snapshot_name)
+
+            compute_client.snapshots.get = recording_get
+            return compute_client
+
+        monkeypatch.setattr(mock_az_snapshot_services, "ComputeManagementClient", recording_client)
+
+        resource_id = '/subscriptions/132465789/resourceGroups/rgtest/providers/Microsoft.Compute/snapshots/excluir1'
+        same_snapshot = '/SUBSCRIPTIONS/132465789/resourcegroups/RGTEST/providers/microsoft.compute/snapshots/EXCLUIR1/'
+        missing = '/subscriptions/132465789/resourceGroups/rgtest/providers/Microsoft.Compute/snapshots/missing'
+
+        results = AzureSnapshot().get_snapshots([resource_id, same_snapshot, missing, 'not-an-id', resource_id])
+
+        assert list(results) == [resource_id, same_snapshot, missing, 'not-an-id']
+        assert len(fetched) == 2
+        assert results[resource_id].snapshot == mock_snapshot_return
+        assert results[same_snapshot].status is OperationStatus.SUCCESS
+        assert results[same_snapshot].resource_id == same_snapshot
+        assert results[missing].status is OperationStatus.NOT_FOUND
+        assert results['not-an-id'].status is OperationStatus.ERROR
@@ -0,0 +1,44 @@
+"""Smoke tests for the benchmark suite and its simulated backend."""
+from benchmarks.fake_compute import BackendConfig
+from benchmarks.run_benchmarks import SCENARIOS, run_scenario
+from benchmarks.startup import measure_startup
+from benchmarks.tag_queries import QUERIES, measure_tag_queries
+
+class TestBenchmarks:
+    """Test class for the benchmark scenarios."""
+
+    def test_every_scenario_runs_on_a_small_backend(self):
+        """Tests that each scenario completes without errors and counts its operations."""
+        config = BackendConfig(snapshots_per_subscription=50, resource_groups=3, page_size=10)
+
+        results = {scenario: run_scenario(scenario, config, operations=5) for scenario in SCENARIOS}
+
+        assert results['list'].operations == 50 and results['list'].requests == 5
+        assert results['list-table'].operations == 50
+        assert all(results[scenario].operations == 5 for scenario in ('get', 'tag', 'delete'))
+        assert not any(result.errors for result in results.values())
+
+    def test_throttled_requests_are_retried(self):
+        """Tests that the simulated 429 responses are absorbed by the throttle."""
+        config = BackendConfig(snapshots_per_subscription=40, resource_groups=2, page_size=5, throttle_every=3)
+
+        listing = run_scenario('list', config, measure_memory=False)
+        gets = run_scenario('get', config, operations=10, workers=4, measure_memory=False)
+
+        assert listing.operations == 40 and listing.throttled > 0
+        assert gets.errors == 0 and gets.throttled > 0
+
+    def test_startup_defers_the_heavy_imports(self):
+        """Tests that importing the module and building an AzureSnapshot import no deferred package."""
+        result = measure_startup(runs=1, budget_ms=2000)
+
+        assert result.loaded == []
+        assert result.within_budget
+
+    def test_tag_queries_run_on_a_small_index(self):
+        """Tests that every tag query is measured and finds its snapshots."""
+        results = {result.query: result for result in measure_tag_queries(snapshots=20000, repeat=3)}
+
+        assert set(results) == set(QUERIES)
+        assert results['exact'].matches == results['exact-ignore-case'].matches == 1
+        assert results['prefix'].matches == 10 and results['key-missing'].matches == 0
@@ -0,0 +1,103 @@
+"""Tests for the command-line entry point."""
+import io
+import json
+import pytest
+from module_snapshot.cli import Progress, main, read_ids
+
+RESOURCE_ID = '/subscriptions/sub1/resourceGroups/rgtest/providers/Microsoft.Compute/snapshots/excluir1'
+
+def output_rows(capsys):
+    """Returns the JSON lines written on stdout."""
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+class TestCli:
+    """Test class for the module-snapshot command line."""
+
+    def test_list_streams_every_subscription(self, capsys, paged_snapshot_services):
+        """Tests that the snapshots of several subscriptions are written as JSON lines and failures are reported.
+
+         Args:
+             capsys: Captures the output of the command.
+             paged_snapshot_services: Mock object for paged snapshot services.
+        """
+        status = main(['list', 'sub1', 'sub2', 'broken', '--jobs', '3', '--fields', 'subscription_id', 'disk_size_gb'])
+        rows = output_rows(capsys)
+
+        assert status == 1
+        assert sorted(row['subscription_id'] for row in rows if 'status' not in row) == ['sub1'] * 5 + ['sub2'] * 5
+        assert [row['subscription_id'] for row in rows if row.get('status') == 'error'] == ['broken']
+        assert all(row.get('disk_size_gb') == 128 for row in rows if 'status' not in row)
+
+    def test_get_reads_ids_from_stdin_in_chunks(self, capsys, monkeypatch, mock_snapshot_services):
+        """Tests that resource IDs read from stdin are processed chunk by chunk, invalid IDs reported as errors.
+
+         Args:
+             capsys: Captures the output of the command.
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        monkeypatch.setattr('sys.stdin', io.StringIO(f'{RESOURCE_ID}\n\n# comment\nnot-an-id\n{RESOURCE_ID}\n'))
+
+        status = main(['get', '--chunk-size', '2'])
+        rows = output_rows(capsys)
+
+        assert status == 1
+        assert [row['status'] for row in rows] == ['success', 'error', 'success']
+        assert rows[0]['snapshot']['sku'] == 'Standard_LRS'
+
+    def test_tag_and_delete(self, capsys, tmp_path, mock_snapshot_services):
+        """Tests the tag and delete commands with IDs read from a file and written to an output file.
+
+         Args:
+             capsys: Captures the output of the command.
+             tmp_path: Temporary directory of the test.
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        ids = tmp_path / 'ids.txt'
+        ids.write_text(f'{RESOURCE_ID}\n')
+        output = tmp_path / 'results.jsonl'
+
+        assert main(['tag', '-i', str(ids), '--set', 'Responsible - App=ops', '-o', str(output)]) == 0
+        assert json.loads(output.read_text())['status'] == 'success'
+        assert main(['tag', RESOURCE_ID, '--set', 'missing=x']) == 1
+        assert output_rows(capsys)[0]['status'] == 'tag_not_found'
+        assert main(['delete', RESOURCE_ID, '--jobs', '2']) == 0
+        assert output_rows(capsys)[0]['status'] == 'success'
+
+    def test_export_writes_a_summary(self, capsys, tmp_path, paged_snapshot_services):
+        """Tests that the export command writes the file and a summary line.
+
+         Args:
+             capsys: Captures the output of the command.
+             tmp_path: Temporary directory of the test.
+             paged_snapshot_services: Mock object for paged snapshot services.
+        """
+        path = tmp_path / 'inventory.csv'
+
+        assert main(['export', 'sub1', 'sub2', '-o', str(path)]) == 0
+        assert output_rows(capsys) == [{'path': str(path), 'rows': 10, 'batches': 1, 'failures': {}}]
+        assert len(path.read_text().splitlines()) == 11
+
+    def test_invalid_arguments(self, capsys):
+        """Tests that malformed KEY=VALUE pairs, a zero --jobs and a zero --batch-size are rejected by the parser."""
+        with pytest.raises(SystemExit) as error:
+            main(['tag', RESOURCE_ID, '--set', 'novalue'])
+        assert error.value.code == 2
+
+        with pytest.raises(SystemExit):
+            main(['get', RESOURCE_ID, '--jobs', '0'])
+
+        with pytest.raises(SystemExit) as error:
+            main(['export', 'sub1', '-o', 'inventory.csv', '--batch-size', '0'])
+        assert error.value.code == 2
+
+    def test_read_ids_and_progress(self):
+        """Tests reading IDs from arguments then stdin, and the progress line."""
+        assert list(read_ids(['a'], ['-'], io.StringIO(' b \n#c\n'))) == ['a', 'b']
+
+        stream = io.StringIO()
+        progress = Progress('get', stream, enabled=True, interval=0)
+        progress.update(done=3, failed=1)
+        progress.close()
+
+        assert stream.getvalue().startswith('\rget: 3 done, 1 failed') and stream.getvalue().endswith('/s\n')
@@ -0,0 +1,72 @@
+"""Tests for the ClientCache class."""
+import threading
+from unittest.mock import MagicMock
+from pytest import raises
+from module_snapshot.infra.client_cache import ClientCache
+
+class TestClientCache:
+    """Test class for the ClientCache class."""
+
+    def test_get_client_reuses_client_for_same_subscription(self):
+        """Tests that the same client is returned for repeated calls with the same subscription ID."""
+        factory = MagicMock(side_effect=lambda subscription_id: MagicMock())
+        client_cache = ClientCache(factory)
+
+        first = client_cache.get_client('132465789')
+        second = client_cache.get_client('132465789')
+
+        assert first is second
+        assert factory.call_count == 1
+
+    def test_get_client_evicts_least_recently_used(self):
+        """Tests that the least recently used client is dropped when the cache is full."""
+        client_cache = ClientCache(lambda subscription_id: MagicMock(), max_size=2)
+
+        client_cache.get_client('sub-1')
+        client_cache.get_client('sub-2')
+        client_cache.get_client('sub-1')
+        client_cache.get_client('sub-3')
+
+        assert 'sub-1' in client_cache
+        assert 'sub-2' not in client_cache
+        assert len(client_cache) == 2
+
+    def test_evicted_clients_are_passed_to_on_evict(self):
+        """Tests that each client dropped to make room is handed to the on_evict callback, without being closed."""
+        evicted = []
+        client_cache = ClientCache(lambda subscription_id: MagicMock(), max_size=1, on_evict=evicted.append)
+
+        first = client_cache.get_client('sub-1')
+        client_cache.get_client('sub-2')
+
+        assert evicted == [first]
+        first.close.assert_not_called()
+
+    def test_close_closes_every_client(self):
+        """Tests that close() closes the cached clients and empties the cache."""
+        client_cache = ClientCache(lambda subscription_id: MagicMock())
+        clients = [client_cache.get_client('sub-1'), client_cache.get_client('sub-2')]
+
+        client_cache.close()
+
+        assert len(client_cache) == 0
+        for client in clients:
+            client.close.assert_called_once()
+
+    def test_get_client_is_thread_safe(self):
+        """Tests that concurrent calls for the same subscription create a single client."""
+        factory = MagicMock(side_effect=lambda subscription_id: MagicMock())
+        client_cache = ClientCache(factory)
+        threads = [threading.Thread(target=client_cache.get_client, args=('sub-1',)) for _ in range(20)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert factory.call_count == 1
+
+    def test_max_size_must_be_positive(self):
+        """Tests that a cache without room for any client is rejected."""
+        with raises(ValueError):
+            ClientCache(lambda subscription_id: MagicMock(), max_size=0)
@@ -0,0 +1,28 @@
+"""Tests for the concurrency helpers."""
+from pytest import raises
+from module_snapshot.utils.concurrency import run_concurrently
+
+class TestRunConcurrently:
+    """Test class for the run_concurrently function."""
+
+    def test_results_keep_item_order(self):
+        """Tests that results are returned in the same order as the items."""
+        results = run_concurrently(lambda item: item * 2, [3, 1, 2], max_workers=3)
+
+        assert results == [(3, 6, None), (1, 2, None), (2, 4, None)]
+
+    def test_exceptions_are_reported_per_item(self):
+        """Tests that an exception raised for one item does not affect the others."""
+        def divide(item):
+            return 10 // item
+
+        results = run_concurrently(divide, [5, 0])
+
+        assert results[0] == (5, 2, None)
+        assert results[1][0] == 0
+        assert isinstance(results[1][2], ZeroDivisionError)
+
+    def test_max_workers_must_be_positive(self):
+        """Tests that a pool without workers is rejected."""
+        with raises(ValueError):
+            run_concurrently(abs, [1], max_workers=0)
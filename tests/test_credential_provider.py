@@ -0,0 +1,93 @@
+"""Tests for the CredentialProvider class."""
+import threading
+from unittest.mock import MagicMock
+import module_snapshot.infra.credential_provider as mock_credential_provider
+import module_snapshot.infra.azure_cloud_services as mock_az_snapshot_services
+from module_snapshot.infra.credential_provider import CredentialProvider, get_credential_provider, set_credential_provider
+from module_snapshot.infra.azure_cloud_services import SnapshotServices
+
+class TestCredentialProvider:
+    """Test class for the CredentialProvider class."""
+
+    def test_config_and_credential_are_built_once(self, monkeypatch):
+        """Tests that the Config and the credential are only built on first use.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+        """
+        config_class = MagicMock()
+        credential_class = MagicMock()
+        monkeypatch.setattr(mock_credential_provider, "Config", config_class)
+        monkeypatch.setattr(mock_credential_provider, "ClientSecretCredential", credential_class)
+
+        provider = CredentialProvider()
+        assert config_class.call_count == 0
+
+        threads = [threading.Thread(target=provider.credential) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert provider.credential() is credential_class.return_value
+        assert config_class.call_count == 1
+        assert credential_class.call_count == 1
+
+    def test_snapshot_services_share_the_credential(self, monkeypatch, mock_snapshot_services):
+        """Tests that every SnapshotServices of the process uses the same credential.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        credentials = []
+        mock_compute_management_client = mock_az_snapshot_services.ComputeManagementClient
+
+        def recording_client(credential, subscription_id, **kwargs):
+            credentials.append(credential)
+            return mock_compute_management_client(credential, subscription_id, **kwargs)
+
+        monkeypatch.setattr(mock_az_snapshot_services, "ComputeManagementClient", recording_client)
+
+        SnapshotServices().get('132465789', 'rgtest', 'excluir1')
+        SnapshotServices().get('132465789', 'rgtest', 'excluir1')
+
+        assert credentials[0] is credentials[1]
+
+    def test_injected_credential_is_used(self, mock_snapshot_services):
+        """Tests that a provider injected with set_credential_provider is used instead of the configuration files.
+
+         Args:
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        credential = MagicMock()
+        set_credential_provider(CredentialProvider(config=MagicMock(), credential=credential))
+
+        assert get_credential_provider().credential() is credential
+
+    def test_close_closes_the_credential(self):
+        """Tests that close() closes the shared credential and forgets it."""
+        credential = MagicMock()
+        provider = CredentialProvider(config=MagicMock(), credential=credential)
+
+        provider.close()
+
+        credential.close.assert_called_once()
+
+    def test_snapshot_services_defer_the_config_to_the_first_call(self, monkeypatch, mock_snapshot_services):
+        """Tests that building SnapshotServices loads neither the Config nor the credential.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        config_class = MagicMock()
+        monkeypatch.setattr(mock_credential_provider, "Config", config_class)
+        monkeypatch.setattr(mock_credential_provider, "ClientSecretCredential", MagicMock())
+        set_credential_provider(CredentialProvider())
+
+        snapshot_services = SnapshotServices()
+        assert config_class.call_count == 0
+
+        snapshot_services.get('132465789', 'rgtest', 'excluir1')
+        assert config_class.call_count == 1
@@ -0,0 +1,138 @@
+"""Tests for the streaming inventory export."""
+import csv
+import gzip
+import json
+import sys
+import pytest
+from module_snapshot.entities.snapshot_filter import SnapshotFilter
+from module_snapshot.infra.export_writers import infer_compression, infer_format
+from module_snapshot.services.az_snapshot_services import AzureSnapshot
+from module_snapshot.utils.concurrency import iter_concurrently
+
+class TestExport:
+    """Test class for the export_snapshots method and its writers."""
+
+    def test_infer_format_and_compression(self):
+        """Tests that the format and the compression are read from the suffix of the path."""
+        assert infer_format('inventory.csv.gz') == 'csv'
+        assert infer_format('inventory.NDJSON') == 'jsonl'
+        assert infer_compression('inventory.jsonl.zst') == 'zstd'
+        assert infer_compression('inventory.parquet') is None
+        with pytest.raises(ValueError):
+            infer_format('inventory.txt')
+
+    def test_jsonl_export_in_batches(self, tmp_path, paged_snapshot_services, mock_snapshot_return):
+        """Tests that several subscriptions are merged into one gzip JSONL file written in batches.
+
+         Args:
+             tmp_path: Temporary directory of the test.
+             paged_snapshot_services: Mock object for paged snapshot services.
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        path = str(tmp_path / 'inventory.jsonl.gz')
+
+        result = AzureSnapshot().export_snapshots(['sub1', 'sub2', 'broken', 'sub1'], path, batch_size=3)
+
+        with gzip.open(path, 'rt', encoding='utf-8') as file:
+            rows = [json.loads(line) for line in file]
+
+        assert (result.rows, result.batches) == (10, 4)
+        assert list(result.failures) == ['broken'] and not result.succeeded
+        assert sorted(row['subscription_id'] for row in rows) == ['sub1'] * 5 + ['sub2'] * 5
+        assert rows[0]['tags'] == mock_snapshot_return.tags
+
+    def test_csv_export_with_fields_and_filter(self, tmp_path, paged_snapshot_services, mock_snapshot_return):
+        """Tests that only the requested columns of the matching snapshots are written.
+
+         Args:
+             tmp_path: Temporary directory of the test.
+             paged_snapshot_services: Mock object for paged snapshot services.
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        path = str(tmp_path / 'inventory.csv')
+        azure_snapshot = AzureSnapshot()
+
+        azure_snapshot.export_snapshots(['sub1'], path, fields=['resource_id', 'tags'])
+        empty = azure_snapshot.export_snapshots(['sub1'], str(tmp_path / 'empty.csv'),
+                                                snapshot_filter=SnapshotFilter(locations=['westus']))
+
+        with open(path, newline='', encoding='utf-8') as file:
+            rows = list(csv.reader(file))
+
+        assert rows[0] == ['resource_id', 'tags']
+        assert rows[1] == [mock_snapshot_return.resource_id, json.dumps(mock_snapshot_return.tags)]
+        assert len(rows) == 6
+        assert empty.rows == 0
+
+    def test_parquet_export(self, tmp_path, paged_snapshot_services, mock_snapshot_return):
+        """Tests that each batch becomes a Parquet row group with a map column for the tags.
+
+         Args:
+             tmp_path: Temporary directory of the test.
+             paged_snapshot_services: Mock object for paged snapshot services.
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        parquet = pytest.importorskip('pyarrow.parquet')
+        path = str(tmp_path / 'inventory.parquet')
+
+        result = AzureSnapshot().export_snapshots(['sub1', 'sub2'], path, compression='zstd', batch_size=4)
+
+        table = parquet.read_table(path)
+        assert table.num_rows == result.rows == 10
+        assert parquet.ParquetFile(path).num_row_groups == result.batches == 3
+        assert dict(table.column('tags')[0].as_py()) == mock_snapshot_return.tags
+
+    def test_missing_optional_packages(self, tmp_path, monkeypatch, mock_snapshot_services):
+        """Tests that Parquet and zstd require their optional packages.
+
+         Args:
+             tmp_path: Temporary directory of the test.
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        monkeypatch.setitem(sys.modules, 'pyarrow', None)
+        monkeypatch.setitem(sys.modules, 'zstandard', None)
+
+        with pytest.raises(ImportError):
+            AzureSnapshot().export_snapshots(['sub1'], str(tmp_path / 'inventory.parquet'))
+        with pytest.raises(ImportError):
+            AzureSnapshot().export_snapshots(['sub1'], str(tmp_path / 'inventory.jsonl.zst'))
+
+    def test_batch_size_must_be_positive(self, tmp_path, paged_snapshot_services):
+        """Tests that a batch size below one is rejected before anything is listed or written.
+
+         Args:
+             tmp_path: Temporary directory of the test.
+             paged_snapshot_services: Mock object for paged snapshot services.
+        """
+        path = tmp_path / 'inventory.jsonl'
+
+        for batch_size in (0, -1):
+            with pytest.raises(ValueError):
+                AzureSnapshot().export_snapshots(['sub1'], str(path), batch_size=batch_size)
+
+        assert not path.exists()
+
+    def test_iter_concurrently_reports_failures_and_stops_early(self):
+        """Tests the fan-in helper: values keep their per-item order, failures are yielded, and closing stops it."""
+        def produce(item):
+            if item == 'bad':
+                raise RuntimeError(item)
+            yield from (f'{item}{index}' for index in range(3))
+
+        entries = list(iter_concurrently(produce, ['a', 'bad', 'b'], max_workers=2, max_pending=1))
+
+        assert [value for item, value, _ in entries if item == 'a'] == ['a0', 'a1', 'a2']
+        assert [type(exception) for item, _, exception in entries if item == 'bad'] == [RuntimeError]
+
+        produced = []
+
+        def endless(item):
+            while True:
+                produced.append(item)
+                yield item
+
+        stream = iter_concurrently(endless, ['x'], max_pending=2)
+        next(stream)
+        stream.close()
+        assert len(produced) < 10
@@ -0,0 +1,98 @@
+"""Tests for the instrumentation hooks."""
+from unittest.mock import MagicMock
+import pytest
+from azure.core.exceptions import HttpResponseError
+import module_snapshot.infra.azure_cloud_services as mock_az_snapshot_services
+from module_snapshot.infra.azure_cloud_services import SnapshotServices
+from module_snapshot.infra.instrumentation import (CompositeInstrumentation, InMemoryInstrumentation, Instrumentation,
+                                                   LatencyHistogram, get_instrumentation, set_instrumentation)
+from module_snapshot.infra.throttling import Throttle
+from module_snapshot.services.az_snapshot_services import AzureSnapshot
+from tests.conftest import mock_pager
+
+class TestInstrumentation:
+    """Test class for the instrumentation hooks."""
+
+    def test_latency_histogram(self):
+        """Tests the bucketing and the quantile estimate of the histogram."""
+        histogram = LatencyHistogram((0.1, 1.0))
+        for seconds in (0.05, 0.05, 0.5, 3.0):
+            histogram.observe(seconds)
+
+        assert histogram.counts == [2, 1, 1]
+        assert histogram.quantile(0.5) == 0.1
+        assert histogram.quantile(0.99) == float('inf')
+        assert LatencyHistogram().quantile(0.5) is None
+
+    def test_default_is_a_no_op(self):
+        """Tests that the process-wide instrumentation does nothing until one is set."""
+        default = get_instrumentation()
+        assert isinstance(default, Instrumentation) and not isinstance(default, InMemoryInstrumentation)
+
+        collector = InMemoryInstrumentation()
+        set_instrumentation(collector)
+        assert get_instrumentation() is collector
+
+        set_instrumentation(None)
+        assert not isinstance(get_instrumentation(), InMemoryInstrumentation)
+        assert isinstance(get_instrumentation(), Instrumentation)
+
+    def test_records_calls_pages_and_errors(self, monkeypatch, mock_snapshot_services):
+        """Tests that SnapshotServices reports listings, pages, calls and failures per operation and subscription.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        mock_compute_management_client = mock_az_snapshot_services.ComputeManagementClient
+
+        def paged_client(*args, **kwargs):
+            compute_client = mock_compute_management_client(*args, **kwargs)
+            snapshot = compute_client.snapshots.get()
+            compute_client.snapshots.list = lambda *args, **kwargs: mock_pager([snapshot] * 5, page_size=2)
+            return compute_client
+
+        monkeypatch.setattr(mock_az_snapshot_services, "ComputeManagementClient", paged_client)
+
+        collector = InMemoryInstrumentation()
+        adapter = MagicMock(spec=Instrumentation)
+        snapshot_services = AzureSnapshot(instrumentation=CompositeInstrumentation(collector, adapter))
+
+        assert len(snapshot_services.list_snapshot_by_subscription_id('132465789')) == 5
+        snapshot_services.get_snapshot('132465789', 'rgtest', 'excluir1')
+        snapshot_services.update_snapshot_tag('132465789', 'rgtest', 'excluir1', 'missing', 'value')
+
+        listing = collector.stats('list', '132465789')
+        assert (listing.calls, listing.pages, listing.items, listing.items_per_page) == (1, 3, 5, 5 / 3)
+        assert collector.stats('get', '132465789').calls == 2
+        assert collector.stats('update', '132465789').calls == 0
+        assert collector.summary()['list']['pages'] == 3
+        assert adapter.record_page.call_count == 3
+
+    def test_records_retries_and_errors(self, monkeypatch, mock_snapshot_services):
+        """Tests that retried attempts and the final error are reported.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        mock_compute_management_client = mock_az_snapshot_services.ComputeManagementClient
+        response = MagicMock(status_code=503, headers={})
+
+        def failing_client(*args, **kwargs):
+            compute_client = mock_compute_management_client(*args, **kwargs)
+            compute_client.snapshots.get = MagicMock(side_effect=HttpResponseError(response=response))
+            return compute_client
+
+        monkeypatch.setattr(mock_az_snapshot_services, "ComputeManagementClient", failing_client)
+
+        collector = InMemoryInstrumentation()
+        snapshot_services = SnapshotServices(throttle=Throttle(sleep=lambda seconds: None), instrumentation=collector)
+
+        with pytest.raises(HttpResponseError):
+            snapshot_services.get('132465789', 'rgtest', 'excluir1')
+
+        stats = collector.stats('get', '132465789')
+        assert stats.retries == 4
+        assert stats.errors == {'HttpResponseError': 1}
+        assert stats.latency.count == 1
@@ -0,0 +1,83 @@
+"""Tests for the inventory aggregations."""
+from dataclasses import replace
+import pytest
+from module_snapshot.entities.inventory_summary import InventoryAggregator, age_bucket_labels
+from module_snapshot.entities.snapshot_table import SnapshotTable, date_to_epoch
+from module_snapshot.infra.snapshot_cache import SnapshotCache
+from module_snapshot.services.az_snapshot_services import AzureSnapshot
+
+NOW = date_to_epoch('2023-07-01 00:00:00')
+DIMENSIONS = ['subscription_id', 'resource_group', 'location', 'sku', 'age', 'tag:env']
+
+def inventory(snapshot):
+    """Builds an inventory of four snapshots of two subscriptions from a template snapshot."""
+    return [
+        replace(snapshot, tags={'env': 'prod'}),
+        replace(snapshot, resource_id='2', location='westus', disk_size_gb=64, sku='Premium_LRS',
+                created_date='2023-01-01 00:00:00', tags={'env': 'dev'}),
+        replace(snapshot, resource_id='3', subscription_id='sub2', disk_size_gb=None, tags=None,
+                created_date='2023-06-28 00:00:00'),
+        replace(snapshot, resource_id='4', subscription_id='sub2', resource_group_name='rgother', disk_size_gb=32,
+                created_date='2021-01-01 00:00:00', tags={'env': 'prod'}),
+    ]
+
+class TestInventorySummary:
+    """Test class for the InventoryAggregator class and the summarize_snapshots method."""
+
+    def test_aggregator_groups_by_every_dimension(self, mock_snapshot_return):
+        """Tests the totals per dimension, the age buckets and the snapshots without a size.
+
+         Args:
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        summary = InventoryAggregator(DIMENSIONS, now=NOW).add_all(inventory(mock_snapshot_return)).summary()
+        subscription_id = mock_snapshot_return.subscription_id
+
+        assert (summary.total.count, summary.total.size_gb, summary.total.unknown_size) == (4, 224, 1)
+        assert {key: totals.size_gb for key, totals in summary.by('subscription_id').items()} == {subscription_id: 192, 'sub2': 32}
+        assert summary.by('resource_group')[('sub2', 'rgother')].count == 1
+        assert summary.by('sku')['Premium_LRS'].size_gb == 64
+        assert {key: totals.count for key, totals in summary.by('age').items()} == {'7-30d': 1, '180-365d': 1, '<7d': 1, '>=365d': 1}
+        assert summary.by('tag:env')[None].unknown_size == 1
+        assert list(summary.by('tag:env')) == ['prod', 'dev', None]
+        assert len(summary.to_rows()) == sum(len(totals) for totals in summary.groups.values())
+
+    def test_table_summary_matches_the_models(self, mock_snapshot_return):
+        """Tests that summarizing a SnapshotTable on its codes gives the same totals as its models.
+
+         Args:
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        snapshots = inventory(mock_snapshot_return)
+
+        from_table = SnapshotTable.from_models(snapshots).summarize(InventoryAggregator(DIMENSIONS, now=NOW))
+        from_models = InventoryAggregator(DIMENSIONS, now=NOW).add_all(snapshots).summary()
+
+        assert from_table == from_models
+
+    def test_invalid_dimension_and_bucket_labels(self):
+        """Tests that unknown dimensions are rejected and the labels of the age buckets."""
+        with pytest.raises(ValueError):
+            InventoryAggregator(['owner'])
+        with pytest.raises(ValueError):
+            InventoryAggregator(['tag:'])
+
+        assert age_bucket_labels([7, 30]) == ('<7d', '7-30d', '>=30d')
+        assert InventoryAggregator(['sku']).fields == ('disk_size_gb', 'sku')
+
+    def test_summarize_snapshots_streams_and_uses_the_cache(self, paged_snapshot_services, mock_snapshot_return):
+        """Tests that subscriptions are aggregated page by page, from a fresh cache when there is one.
+
+         Args:
+             paged_snapshot_services: Mock object for paged snapshot services.
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        with SnapshotCache() as cache:
+            cache.store_subscription('cached', [replace(mock_snapshot_return, subscription_id='cached', disk_size_gb=10)])
+
+            summary = AzureSnapshot(cache=cache).summarize_snapshots(['sub1', 'cached', 'broken'], ['subscription_id', 'sku'])
+
+        assert list(summary.failures) == ['broken'] and not summary.succeeded
+        assert (summary.by('subscription_id')['sub1'].count, summary.by('subscription_id')['sub1'].size_gb) == (5, 640)
+        assert summary.by('subscription_id')['cached'].size_gb == 10
+        assert summary.by('sku') == {'Standard_LRS': summary.total}
@@ -0,0 +1,102 @@
+"""Tests for the InventorySync class."""
+from dataclasses import replace
+import pytest
+from module_snapshot.infra.sync_state import StaleWatermarkError, SyncStateStore
+from module_snapshot.services.inventory_sync import InventorySync
+
+def inventory(snapshot):
+    """Builds an inventory of three snapshots from a template snapshot."""
+    return [replace(snapshot, resource_id=f'{snapshot.resource_id}{index}', snapshot_name=f'excluir{index}')
+            for index in range(3)]
+
+class TestInventorySync:
+    """Test class for the InventorySync class."""
+
+    def test_first_sync_adds_everything(self, mock_snapshot_return):
+        """Tests that every snapshot is added on the first sync and nothing changes on the next one.
+
+         Args:
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        inventory_sync = InventorySync()
+        snapshots = inventory(mock_snapshot_return)
+
+        first = inventory_sync.sync('132465789', snapshots, commit=True)
+        second = inventory_sync.sync('132465789', snapshots)
+
+        assert first.summary() == {'added': 3, 'removed': 0, 'changed': 0, 'unchanged': 0}
+        assert not second.has_changes and second.unchanged == 3
+        assert inventory_sync.watermark('132465789') == 1
+
+    def test_detects_added_removed_and_changed(self, mock_snapshot_return):
+        """Tests the change sets and which part of a snapshot changed.
+
+         Args:
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        inventory_sync = InventorySync()
+        snapshots = inventory(mock_snapshot_return)
+        inventory_sync.sync('132465789', snapshots, commit=True)
+
+        current = [
+            replace(snapshots[0], tags={'env': 'prod'}),
+            replace(snapshots[1], location='westus'),
+            replace(mock_snapshot_return, resource_id='new'),
+        ]
+        result = inventory_sync.sync('132465789', current)
+
+        assert [snapshot.resource_id for snapshot in result.added] == ['new']
+        assert result.removed == [snapshots[2].resource_id]
+        assert [(change.snapshot.resource_id, change.changed) for change in result.changed] == [
+            (snapshots[0].resource_id, ('tags',)),
+            (snapshots[1].resource_id, ('properties',)),
+        ]
+
+    def test_uncommitted_changes_are_reported_again(self, tmp_path, mock_snapshot_return):
+        """Tests that the state persists across instances and only moves forward on commit.
+
+         Args:
+             tmp_path: Temporary directory of the test.
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        path = str(tmp_path / 'sync.db')
+        snapshots = inventory(mock_snapshot_return)
+
+        with SyncStateStore(path) as state_store:
+            InventorySync(state_store).sync('132465789', snapshots[:2], commit=True)
+
+        with SyncStateStore(path) as state_store:
+            inventory_sync = InventorySync(state_store)
+            pending = inventory_sync.sync('132465789', snapshots)
+            again = inventory_sync.sync('132465789', snapshots)
+            inventory_sync.commit(again)
+
+            assert len(pending.added) == len(again.added) == 1
+            with pytest.raises(StaleWatermarkError):
+                inventory_sync.commit(pending)
+            assert not inventory_sync.sync('132465789', snapshots).has_changes
+
+    def test_lists_the_subscription_when_no_snapshots_are_given(self, mock_snapshot_services, mock_snapshot_return):
+        """Tests that sync() lists the subscription through the snapshot services.
+
+         Args:
+             mock_snapshot_services: Mock object for snapshot services.
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        result = InventorySync().sync('132465789')
+
+        assert result.added == [mock_snapshot_return]
+
+    def test_failed_listing_is_not_a_removal(self, mock_snapshot_services_exception, mock_snapshot_return):
+        """Tests that a failed listing raises instead of reporting every snapshot as removed.
+
+         Args:
+             mock_snapshot_services_exception: Mock object of snapshot services with exception.
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        inventory_sync = InventorySync()
+        inventory_sync.sync('132465789', [mock_snapshot_return], commit=True)
+
+        with pytest.raises(Exception):
+            inventory_sync.sync('132465789')
+        assert inventory_sync.watermark('132465789') == 1
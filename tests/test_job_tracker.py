@@ -0,0 +1,209 @@
+"""Tests for the JobTracker class and the tracked long-running operations."""
+import threading
+from unittest.mock import MagicMock
+import pytest
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+import module_snapshot.infra.azure_cloud_services as mock_az_snapshot_services
+from module_snapshot.entities.operation_result import OperationStatus
+from module_snapshot.infra.job_tracker import JobTracker
+from module_snapshot.infra.lro_polling import TrackedPolling
+from module_snapshot.services.az_snapshot_services import AzureSnapshot
+from module_snapshot.utils.tag_exception import TagNotFoundException
+from tests.conftest import fake_response
+
+RESOURCE_ID = '/subscriptions/sub1/resourceGroups/rgtest/providers/Microsoft.Compute/snapshots/excluir1'
+
+
+class FakeOperation:
+    """A long-running operation that is done after a number of polls."""
+
+    def __init__(self, polls_needed=2, result=None, error=None, retry_after=None):
+        self.polls_needed = polls_needed
+        self.polls = 0
+        self.value = result
+        self.error = error
+        self.retry_after = retry_after
+
+    def done(self):
+        """Returns True once the operation was polled the needed number of times."""
+        return self.polls >= self.polls_needed
+
+    def poll(self):
+        """Counts a status request and returns whether the operation is done."""
+        self.polls += 1
+        return self.done()
+
+    def result(self):
+        """Returns the result of the operation, or raises its error."""
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class TestJobTracker:
+    """Test class for the JobTracker class."""
+
+    def test_many_jobs_share_the_polling_threads(self):
+        """Tests that many jobs complete with their results and callbacks, polled by a bounded number of threads."""
+        completed = []
+        threads_before = threading.active_count()
+
+        with JobTracker(max_workers=4, poll_interval=0.001, max_poll_interval=0.01) as tracker:
+            handles = [tracker.submit(f'id{index}', lambda index=index: FakeOperation(3, result=index), 'update',
+                                      completed.append)
+                       for index in range(200)]
+
+            assert threading.active_count() - threads_before <= 5
+            assert tracker.wait_all(timeout=10)
+
+        assert [handle.result for handle in handles] == list(range(200))
+        assert all(handle.succeeded and handle.polls == 3 and handle.duration_seconds >= 0 for handle in handles)
+        assert len(completed) == 200
+        assert tracker.status_counts() == {OperationStatus.SUCCESS: 200}
+
+    def test_failures_are_classified(self):
+        """Tests the statuses of jobs failing at start, while polling and at completion."""
+        def raise_error(error):
+            raise error
+
+        with JobTracker(poll_interval=0.001) as tracker:
+            not_found = tracker.submit('a', lambda: raise_error(ResourceNotFoundError('gone')))
+            tag_not_found = tracker.submit('b', lambda: raise_error(TagNotFoundException('tag')))
+            failed = tracker.submit('c', lambda: FakeOperation(1, error=HttpResponseError('failed')))
+            succeeded = tracker.submit('d', lambda: FakeOperation(0, result='done'))
+            tracker.wait_all(timeout=5)
+
+        assert not_found.status is OperationStatus.NOT_FOUND
+        assert tag_not_found.status is OperationStatus.TAG_NOT_FOUND
+        assert failed.status is OperationStatus.ERROR and isinstance(failed.error, HttpResponseError)
+        assert succeeded.succeeded and succeeded.polls == 0 and succeeded.result == 'done'
+        assert [handle.resource_id for handle in tracker.handles(OperationStatus.ERROR)] == ['c']
+
+    def test_wait_all_timeout_and_close_without_waiting(self):
+        """Tests that wait_all() gives up after its timeout and close(wait=False) abandons the pending jobs."""
+        tracker = JobTracker(poll_interval=0.001, max_poll_interval=0.001)
+        handle = tracker.submit('a', lambda: FakeOperation(10 ** 9))
+
+        assert not tracker.wait_all(timeout=0.05)
+        assert not handle.done() and handle.polls > 0
+
+        tracker.close(wait=False)
+
+        assert handle.status is OperationStatus.ERROR and isinstance(handle.error, RuntimeError)
+        assert tracker.wait_all(timeout=0)
+
+        reused = tracker.submit('b', lambda: FakeOperation(0))
+        assert reused.wait(timeout=5) and reused.succeeded
+        assert tracker.clear_completed() == 2 and tracker.handles() == []
+        tracker.close()
+
+    def test_retry_after_overrides_the_backoff(self):
+        """Tests that a Retry-After of the operation is used as the delay before the next poll."""
+        with JobTracker(poll_interval=60, max_poll_interval=60) as tracker:
+            handle = tracker.submit('a', lambda: FakeOperation(2, retry_after=0.001))
+            assert handle.wait(timeout=5) and handle.polls == 2
+
+    def test_callback_added_after_completion_is_called(self):
+        """Tests that add_done_callback() calls the function immediately for a completed job."""
+        with JobTracker() as tracker:
+            handle = tracker.submit('a', lambda: FakeOperation(0))
+            handle.wait(timeout=5)
+
+        callback = MagicMock()
+        handle.add_done_callback(callback)
+
+        callback.assert_called_once_with(handle)
+
+
+class TestTrackedPolling:
+    """Test class for the TrackedPolling class."""
+
+    def test_polling_is_driven_by_the_caller(self):
+        """Tests that the operation only sends a status request when poll() is called and keeps its Retry-After."""
+        responses = iter([fake_response(200, 'GET', {'status': 'InProgress'}, {'retry-after': '3'}),
+                          fake_response(200, 'GET', {'status': 'Succeeded'})])
+        client = MagicMock()
+        observed = []
+
+        def send_request(request, **kwargs):
+            response = next(responses)
+            kwargs['raw_response_hook'](response)
+            return response
+
+        client.send_request.side_effect = send_request
+
+        polling = TrackedPolling(response_hook=observed.append)
+        polling.initialize(client, fake_response(202, 'DELETE', headers={'azure-asyncoperation': 'https://op/status'}),
+                           lambda pipeline_response: None)
+
+        assert polling.finished() and not polling.done() and polling.retry_after is None
+        assert not polling.poll() and polling.retry_after == 3
+        assert polling.poll() and polling.result() is None
+        assert len(observed) == 2 and client.send_request.call_count == 2
+
+    def test_failed_operation_raises(self):
+        """Tests that result() raises when the operation failed."""
+        client = MagicMock()
+        client.send_request.return_value = fake_response(200, 'GET', {'status': 'Failed'})
+
+        polling = TrackedPolling()
+        polling.initialize(client, fake_response(202, 'DELETE', headers={'azure-asyncoperation': 'https://op/status'}),
+                           lambda pipeline_response: None)
+
+        assert polling.poll()
+        with pytest.raises(HttpResponseError):
+            polling.result()
+
+
+class TestSubmittedMutations:
+    """Test class for the mutations submitted through AzureSnapshot."""
+
+    def test_submit_delete_and_tags_update(self, monkeypatch, mock_snapshot_services):
+        """Tests that submitted mutations start with a TrackedPolling and report their outcome through the handles.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        compute_client = mock_az_snapshot_services.ComputeManagementClient('credential', 'sub1')
+        monkeypatch.setattr(mock_az_snapshot_services, 'ComputeManagementClient', lambda *args, **kwargs: compute_client)
+        pollings = []
+
+        def begin(*args, polling, **kwargs):
+            polling.initialize(MagicMock(), fake_response(200, 'DELETE'), lambda pipeline_response: None)
+            pollings.append(polling)
+            return MagicMock()
+
+        compute_client.snapshots.begin_delete = begin
+        compute_client.snapshots.begin_update = begin
+        callback = MagicMock()
+
+        with AzureSnapshot() as azure_snapshot:
+            deletion = azure_snapshot.submit_snapshot_delete(RESOURCE_ID, callback)
+            update = azure_snapshot.submit_snapshot_tags_update(RESOURCE_ID, {'Responsible - App': 'x'})
+            missing_tag = azure_snapshot.submit_snapshot_tags_update(RESOURCE_ID, {'missing': 'x'})
+            assert azure_snapshot.job_tracker.wait_all(timeout=5)
+
+        assert deletion.succeeded and update.succeeded
+        assert missing_tag.status is OperationStatus.TAG_NOT_FOUND
+        assert all(isinstance(polling, TrackedPolling) for polling in pollings) and len(pollings) == 2
+        callback.assert_called_once_with(deletion)
+
+    def test_tags_update_of_an_untagged_snapshot(self, monkeypatch, mock_snapshot_services):
+        """Tests that a snapshot whose tags are None reports its missing keys instead of failing with a TypeError.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        compute_client = mock_az_snapshot_services.ComputeManagementClient('credential', 'sub1')
+        monkeypatch.setattr(mock_az_snapshot_services, 'ComputeManagementClient', lambda *args, **kwargs: compute_client)
+        compute_client.snapshots.get().tags = None
+
+        with AzureSnapshot() as azure_snapshot:
+            submitted = azure_snapshot.submit_snapshot_tags_update(RESOURCE_ID, {'env': 'prod'})
+            assert azure_snapshot.job_tracker.wait_all(timeout=5)
+            results = azure_snapshot.update_snapshot_tags([(RESOURCE_ID, {'env': 'prod'})])
+
+        assert submitted.status is OperationStatus.TAG_NOT_FOUND
+        assert results[0].status is OperationStatus.TAG_NOT_FOUND
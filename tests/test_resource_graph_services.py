@@ -0,0 +1,106 @@
+"""Tests for the Resource Graph listing backend."""
+from types import SimpleNamespace
+from datetime import datetime, timezone
+from module_snapshot.infra.azure_cloud_services import to_snapshot_model
+from module_snapshot.infra.resource_graph_services import (ResourceGraphSnapshotServices, build_snapshot_query,
+                                                           row_to_snapshot_model)
+from module_snapshot.services.az_snapshot_services import AzureSnapshot
+
+class FakeResourceGraphClient:
+    """Local fake of the Resource Graph client serving rows in pages linked by skip tokens."""
+
+    def __init__(self, rows, page_size):
+        self.rows = rows
+        self.page_size = page_size
+        self.requests = []
+
+    def resources(self, query):
+        """Returns the page selected by the skip token of the request."""
+        self.requests.append(query)
+        start = int(query["options"].get("$skipToken", 0))
+        end = start + self.page_size
+        skip_token = str(end) if end < len(self.rows) else None
+
+        return SimpleNamespace(data=self.rows[start:end], skip_token=skip_token)
+
+def snapshot_row(name):
+    """Builds a Resource Graph row for a snapshot of the rgtest resource group."""
+    return {
+        'id': f'/subscriptions/b12a52ca-48bb-46a0-870d-239dcd058d7e/resourceGroups/rgtest/providers/Microsoft.Compute/snapshots/{name}',
+        'name': name,
+        'location': 'eastus',
+        'tags': {'Responsible - App': 'lucasraugi@gmail.com'},
+        'subscriptionId': '132465789',
+        'timeCreated': '2023-06-08T21:25:28.1023990+00:00',
+        'sourceResourceId': '/subscriptions/b12a52ca-48bb-46a0-870d-239dcd058d7e/resourceGroups/rgtest/providers/Microsoft.Compute/disks/disk1',
+        'diskSizeGB': 128,
+        'incremental': True,
+        'sku': 'Standard_LRS',
+    }
+
+class TestResourceGraphSnapshotServices:
+    """Test class for the ResourceGraphSnapshotServices class."""
+
+    def test_list_snapshots_follows_skip_tokens(self):
+        """Tests that every page is requested and converted into SnapshotModel objects."""
+        client = FakeResourceGraphClient([snapshot_row(f'excluir{index}') for index in range(5)], page_size=2)
+        resource_graph_services = ResourceGraphSnapshotServices(client)
+
+        expected = resource_graph_services.list_snapshots(['132465789'])
+
+        assert [snapshot.snapshot_name for snapshot in expected] == [f'excluir{index}' for index in range(5)]
+        assert len(client.requests) == 3
+        assert client.requests[0]['subscriptions'] == ['132465789']
+
+    def test_untagged_snapshots_have_the_same_tags_in_both_backends(self):
+        """Tests that Resource Graph rows without tags get None as tags, as the Compute API reports them."""
+        untagged_row = {**snapshot_row('excluir1'), 'tags': {}}
+        row_without_tags = {key: value for key, value in snapshot_row('excluir1').items() if key != 'tags'}
+        compute_snapshot = SimpleNamespace(id=untagged_row['id'], name='excluir1', location='eastus', tags=None,
+                                           type='Microsoft.Compute/snapshots', creation_data=None, disk_size_gb=128,
+                                           incremental=True, sku=None,
+                                           time_created=datetime(2023, 6, 8, 21, 25, 28, tzinfo=timezone.utc))
+
+        assert row_to_snapshot_model(untagged_row).tags is None
+        assert row_to_snapshot_model(row_without_tags).tags is None
+        assert to_snapshot_model('132465789', 'rgtest', compute_snapshot).tags is None
+        assert to_snapshot_model('132465789', 'rgtest', compute_snapshot, fields=['tags']).tags is None
+
+    def test_build_snapshot_query_filters_and_projects(self):
+        """Tests that tag and location filters and the projection are part of the query."""
+        expected = build_snapshot_query({'Responsible - App': "o'neil", 'env': None}, ['eastus'])
+
+        assert "| where location in~ ('eastus')" in expected
+        assert "| where tostring(tags['Responsible - App']) == 'o\\'neil'" in expected
+        assert "| where isnotnull(tags['env'])" in expected
+        assert '| project id, name, location, tags, subscriptionId' in expected
+
+class TestAzureSnapshotResourceGraph:
+    """Test class for the Resource Graph methods of the AzureSnapshot class."""
+
+    def test_list_snapshots_from_resource_graph_matches_compute_listing(self, mock_snapshot_services, mock_snapshot_return):
+        """Tests that Resource Graph produces the same SnapshotModel as the Compute API.
+
+         Args:
+             mock_snapshot_services: Mock object for snapshot services.
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        client = FakeResourceGraphClient([snapshot_row('excluir1')], page_size=1000)
+        snapshot_services = AzureSnapshot(resource_graph_client=client)
+
+        expected = snapshot_services.list_snapshots_from_resource_graph(['132465789'], tags={'Responsible - App': None})
+
+        assert expected == [mock_snapshot_return]
+
+    def test_list_snapshots_from_resource_graph_when_query_fails(self, mock_snapshot_services):
+        """Tests that list_snapshots_from_resource_graph returns None when the query fails.
+
+         Args:
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        client = FakeResourceGraphClient(None, page_size=1000)
+        snapshot_services = AzureSnapshot(resource_graph_client=client)
+
+        expected = snapshot_services.list_snapshots_from_resource_graph(['132465789'])
+
+        assert expected is None
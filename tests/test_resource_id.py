@@ -0,0 +1,33 @@
+"""Tests for the resource ID parser."""
+from pytest import mark, raises
+from module_snapshot.utils.resource_id import parse_snapshot_id
+
+class TestParseSnapshotId:
+    """Test class for the parse_snapshot_id function."""
+
+    def test_parse_snapshot_id(self):
+        """Tests that a snapshot resource ID is split into subscription, resource group and name."""
+        expected = parse_snapshot_id('/subscriptions/b12a52ca-48bb-46a0-870d-239dcd058d7e/resourceGroups/rgtest/providers/Microsoft.Compute/snapshots/excluir1')
+
+        assert expected == ('b12a52ca-48bb-46a0-870d-239dcd058d7e', 'rgtest', 'excluir1')
+
+    def test_parse_snapshot_id_ignores_case_and_extra_slashes(self):
+        """Tests that segment names are case-insensitive and extra slashes are ignored."""
+        expected = parse_snapshot_id(' /SUBSCRIPTIONS/sub//resourcegroups/RG-Live/providers/microsoft.compute/Snapshots/snap/ ')
+
+        assert expected == ('sub', 'RG-Live', 'snap')
+
+    @mark.parametrize('resource_id', [
+        '',
+        '/subscriptions/sub/resourceGroups/rg',
+        '/subscriptions/sub/resourceGroups/rg/providers/Microsoft.Compute/disks/disk1',
+        '/subscriptions/sub/resourceGroups/rg/providers/Microsoft.Compute/snapshots/snap/extra',
+    ])
+    def test_parse_snapshot_id_rejects_other_ids(self, resource_id):
+        """Tests that IDs which do not identify a snapshot are rejected.
+
+         Args:
+             resource_id: The invalid resource ID.
+        """
+        with raises(ValueError):
+            parse_snapshot_id(resource_id)
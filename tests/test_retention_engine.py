@@ -0,0 +1,77 @@
+"""Tests for the RetentionEngine class."""
+from dataclasses import replace
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+from pytest import raises
+from module_snapshot.entities.retention_policy import RetentionPolicy
+from module_snapshot.services.retention_engine import RetentionEngine
+
+NOW = datetime(2023, 7, 1, tzinfo=timezone.utc)
+
+def inventory(snapshot):
+    """Builds an inventory of four snapshots of the same disk plus one without source from a template snapshot."""
+    snapshots = [replace(snapshot, resource_id=f'{snapshot.resource_id}-{day}', created_date=f'2023-06-{day:02d} 00:00:00')
+                 for day in (1, 10, 20, 30)]
+    snapshots.append(replace(snapshot, resource_id=f'{snapshot.resource_id}-orphan', created_date='2022-01-01 00:00:00', source_resource_id=None))
+    return snapshots
+
+class TestRetentionEngine:
+    """Test class for the RetentionEngine class."""
+
+    def test_max_age(self, mock_snapshot_return):
+        """Tests that only snapshots older than max_age_days are planned for deletion.
+
+         Args:
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        plan = RetentionEngine(RetentionPolicy(max_age_days=15)).evaluate(inventory(mock_snapshot_return), NOW)
+
+        assert [decision.snapshot.created_date[:10] for decision in plan.to_delete] == ['2023-06-01', '2023-06-10', '2022-01-01']
+        assert plan.summary() == {'delete:expired': 3, 'keep:within_max_age': 2}
+
+    def test_keep_last_per_source_protects_newest(self, mock_snapshot_return):
+        """Tests that the newest snapshots of each source disk are kept even when expired.
+
+         Args:
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        plan = RetentionEngine(RetentionPolicy(max_age_days=5, keep_last_per_source=2)).evaluate(inventory(mock_snapshot_return), NOW)
+
+        assert [decision.snapshot.created_date[:10] for decision in plan.to_delete] == ['2023-06-01', '2023-06-10']
+        assert plan.summary()['keep:within_keep_last'] == 2
+
+    def test_exempt_tags(self, mock_snapshot_return):
+        """Tests that snapshots carrying an exempt tag are never deleted.
+
+         Args:
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        plan = RetentionEngine(RetentionPolicy(keep_last_per_source=1, exempt_tags={'Responsible - App': None})).evaluate(inventory(mock_snapshot_return), NOW)
+
+        assert plan.to_delete == []
+        assert plan.summary() == {'keep:exempt': 5}
+
+    def test_execute_deletes_planned_snapshots(self, mock_snapshot_return):
+        """Tests that execute() deletes the planned snapshots through AzureSnapshot.delete_snapshots.
+
+         Args:
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        azure_snapshot = MagicMock()
+        engine = RetentionEngine(RetentionPolicy(keep_last_per_source=3), azure_snapshot)
+        plan = engine.evaluate(inventory(mock_snapshot_return), NOW)
+
+        engine.execute(plan, max_in_flight=4)
+
+        azure_snapshot.delete_snapshots.assert_called_once_with([plan.to_delete[0].snapshot], max_in_flight=4, wait=True)
+
+    def test_execute_requires_azure_snapshot(self, mock_snapshot_return):
+        """Tests that a plan cannot be executed without an AzureSnapshot.
+
+         Args:
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        engine = RetentionEngine(RetentionPolicy(max_age_days=1))
+
+        with raises(ValueError):
+            engine.execute(engine.evaluate([mock_snapshot_return], NOW))
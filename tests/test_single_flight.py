@@ -0,0 +1,170 @@
+"""Tests for the SingleFlight class and the coalesced reads of SnapshotServices."""
+import threading
+import time
+from pytest import raises
+import module_snapshot.infra.azure_cloud_services as mock_az_snapshot_services
+from module_snapshot.infra.azure_cloud_services import SnapshotServices
+from module_snapshot.infra.single_flight import SingleFlight, get_single_flight, set_single_flight
+
+def run_together(function, count):
+    """Calls a function from several threads released at the same time and returns their results."""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def target(index):
+        barrier.wait()
+        results[index] = function()
+
+    threads = [threading.Thread(target=target, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return results
+
+class TestSingleFlight:
+    """Test class for the SingleFlight class."""
+
+    def test_concurrent_calls_share_one_call(self):
+        """Tests that callers arriving while a call is in flight receive its result without calling again."""
+        single_flight = SingleFlight()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.05)
+            return 'value'
+
+        results = run_together(lambda: single_flight.do('key', slow), 10)
+
+        assert results == ['value'] * 10
+        assert len(calls) == 1
+        assert single_flight.stats() == {'calls': 1, 'shared': 9, 'memo_hits': 0, 'memoized': 0}
+        assert single_flight.do('key', lambda: 'again') == 'again'
+
+    def test_exceptions_are_shared_but_not_memoized(self):
+        """Tests that the waiting callers receive the exception of the shared call and the next call runs again."""
+        single_flight = SingleFlight(ttl_seconds=60)
+
+        def failing():
+            time.sleep(0.05)
+            raise ValueError('failed')
+
+        def call():
+            try:
+                return single_flight.do('key', failing)
+            except ValueError as exception:
+                return exception
+
+        results = run_together(call, 5)
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert single_flight.stats()['calls'] == 1
+        assert single_flight.do('key', lambda: 'recovered') == 'recovered'
+
+    def test_memoization_expires_and_is_bounded(self):
+        """Tests the memoization window, the least recently used eviction and the invalidation."""
+        single_flight = SingleFlight(ttl_seconds=0.05, max_entries=2)
+
+        assert single_flight.do('a', lambda: 1) == 1
+        assert single_flight.do('a', lambda: 2) == 1
+        single_flight.do('b', lambda: 1)
+        single_flight.do('a', lambda: 3)
+        single_flight.do('c', lambda: 1)
+
+        assert single_flight.do('b', lambda: 'evicted') == 'evicted'
+        assert single_flight.invalidate(lambda key: key == 'c') == 1
+        time.sleep(0.06)
+        assert single_flight.do('a', lambda: 'expired') == 'expired'
+
+        with raises(ValueError):
+            SingleFlight(max_entries=0)
+
+    def test_calls_in_flight_during_an_invalidation_are_not_memoized(self):
+        """Tests that a result read before an invalidation is returned to its callers but not reused afterwards."""
+        single_flight = SingleFlight(ttl_seconds=60)
+        started = threading.Event()
+        release = threading.Event()
+
+        def stale():
+            started.set()
+            release.wait()
+            return 'stale'
+
+        thread = threading.Thread(target=single_flight.do, args=('key', stale))
+        thread.start()
+        started.wait()
+        single_flight.invalidate()
+        release.set()
+        thread.join()
+
+        assert single_flight.stats()['memoized'] == 0
+        assert single_flight.do('key', lambda: 'fresh') == 'fresh'
+
+    def test_services_share_the_process_wide_single_flight(self):
+        """Tests that the services built without a SingleFlight share the process-wide one, which can be replaced."""
+        shared = SingleFlight(ttl_seconds=5)
+        set_single_flight(shared)
+        try:
+            assert SnapshotServices().single_flight is shared and SnapshotServices().single_flight is shared
+        finally:
+            set_single_flight(None)
+
+        assert SnapshotServices().single_flight is get_single_flight() is not shared
+
+    def test_snapshot_services_coalesce_reads_and_forget_after_writes(self, monkeypatch, mock_snapshot_services):
+        """Tests that identical gets and listings of SnapshotServices share their requests until a mutation.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        compute_client = mock_az_snapshot_services.ComputeManagementClient('credential', 'sub1')
+        monkeypatch.setattr(mock_az_snapshot_services, 'ComputeManagementClient', lambda *args, **kwargs: compute_client)
+        snapshot = compute_client.snapshots.get()
+        gets = []
+
+        def slow_get(*args, **kwargs):
+            gets.append(args)
+            time.sleep(0.05)
+            return snapshot
+
+        compute_client.snapshots.get = slow_get
+
+        with SnapshotServices(single_flight=SingleFlight(ttl_seconds=60)) as snapshot_services:
+            results = run_together(lambda: snapshot_services.get('sub1', 'rgtest', 'excluir1'), 8)
+            listings = [snapshot_services.list_by_resource_group('sub1', 'rgtest') for _ in range(3)]
+            assert len(gets) == 1 and all(result is results[0] for result in results)
+            assert listings[0] == listings[1] and listings[0] is not listings[1]
+            assert snapshot_services.single_flight.stats()['memoized'] == 2
+
+            snapshot_services.update_tag('sub1', 'RGTEST', 'excluir1', 'Responsible - App', 'ops')
+            assert snapshot_services.single_flight.stats()['memoized'] == 0
+            snapshot_services.get('sub1', 'rgtest', 'excluir1')
+
+        assert len(gets) == 3
+
+    def test_snapshot_services_keys_ignore_the_case_of_names(self, monkeypatch, mock_snapshot_services):
+        """Tests that reads differing only by case share a memoized result, forgotten by a write in another case.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        compute_client = mock_az_snapshot_services.ComputeManagementClient('credential', 'sub1')
+        monkeypatch.setattr(mock_az_snapshot_services, 'ComputeManagementClient', lambda *args, **kwargs: compute_client)
+        snapshot = compute_client.snapshots.get()
+        gets = []
+        compute_client.snapshots.get = lambda *args, **kwargs: gets.append(args) or snapshot
+
+        with SnapshotServices(single_flight=SingleFlight(ttl_seconds=60)) as snapshot_services:
+            snapshot_services.get('sub1', 'rgtest', 'excluir1')
+            snapshot_services.get('SUB1', 'RGTest', 'Excluir1')
+            assert len(gets) == 1
+
+            snapshot_services.update_tag('Sub1', 'rgTEST', 'EXCLUIR1', 'Responsible - App', 'ops')
+            gets.clear()
+            snapshot_services.get('sub1', 'rgtest', 'excluir1')
+
+        assert len(gets) == 1
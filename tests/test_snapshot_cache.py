@@ -0,0 +1,187 @@
+"""Tests for the SnapshotCache class."""
+from dataclasses import replace
+from unittest.mock import MagicMock
+from azure.core.exceptions import HttpResponseError
+import module_snapshot.infra.azure_cloud_services as mock_az_snapshot_services
+from module_snapshot.entities.operation_result import OperationStatus
+from module_snapshot.infra.snapshot_cache import SnapshotCache
+from module_snapshot.services.az_snapshot_services import AzureSnapshot
+from module_snapshot.utils.concurrency import run_concurrently
+
+def snapshots_of(snapshot):
+    """Builds a small inventory of three snapshots from a template snapshot."""
+    return [
+        snapshot,
+        replace(snapshot, resource_id=snapshot.resource_id + '2', snapshot_name='excluir2', location='westus',
+                tags={'env': 'prod'}, created_date='2023-01-01 00:00:00'),
+        replace(snapshot, resource_id=snapshot.resource_id.replace('rgtest', 'rgother'), resource_group_name='rgother',
+                tags={'env': 'dev', 'Responsible - App': 'other@example.com'}),
+    ]
+
+class TestSnapshotCache:
+    """Test class for the SnapshotCache class."""
+
+    def test_store_subscription_and_query(self, mock_snapshot_return):
+        """Tests the indexed queries over a stored subscription listing.
+
+         Args:
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        with SnapshotCache() as cache:
+            cache.store_subscription('132465789', snapshots_of(mock_snapshot_return))
+
+            assert cache.is_fresh('132465789')
+            assert cache.is_fresh('132465789', 'RGTEST')
+            assert len(cache.list_snapshots('132465789')) == 3
+            assert [snapshot.snapshot_name for snapshot in cache.query(resource_group_name='rgtest', tags={'env': None})] == ['excluir2']
+            assert [snapshot.location for snapshot in cache.query(tags={'Responsible - App': None})] == ['eastus', 'eastus']
+            assert [snapshot.snapshot_name for snapshot in cache.query(location='westus')] == ['excluir2']
+            assert [snapshot.snapshot_name for snapshot in cache.query(created_before='2023-06-01 00:00:00')] == ['excluir2']
+            assert cache.get_snapshot('132465789', 'rgtest', 'excluir1') == mock_snapshot_return
+
+    def test_listing_expires_after_ttl(self, mock_snapshot_return):
+        """Tests that a listing older than the TTL is not fresh.
+
+         Args:
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        with SnapshotCache(ttl_seconds=0) as cache:
+            cache.store_resource_group('132465789', 'rgtest', [mock_snapshot_return])
+
+            assert not cache.is_fresh('132465789', 'rgtest')
+
+    def test_write_through_and_invalidation(self, mock_snapshot_return):
+        """Tests that tag updates, deletions and invalidations are applied to the cache.
+
+         Args:
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        with SnapshotCache() as cache:
+            cache.store_subscription('132465789', snapshots_of(mock_snapshot_return))
+
+            cache.update_tags('132465789', 'rgtest', 'excluir1', {'env': 'qa'})
+            cache.delete_snapshot('132465789', 'rgtest', 'excluir2')
+            cache.invalidate('132465789', 'rgother')
+
+            assert cache.get_snapshot('132465789', 'rgtest', 'excluir1').tags['env'] == 'qa'
+            assert [snapshot.snapshot_name for snapshot in cache.query(tags={'env': 'qa'})] == ['excluir1']
+            assert cache.get_snapshot('132465789', 'rgtest', 'excluir2') is None
+            assert not cache.is_fresh('132465789')
+
+            cache.set_tags('132465789', 'rgtest', 'excluir1', {'team': 'data'})
+            cache.set_tags('132465789', 'rgtest', 'excluir2', {'team': 'data'})
+            assert cache.get_snapshot('132465789', 'rgtest', 'excluir1').tags == {'team': 'data'}
+            assert cache.get_snapshot('132465789', 'rgtest', 'excluir2') is None
+
+    def test_concurrent_tag_changes_are_not_lost(self, mock_snapshot_return):
+        """Tests that tag changes written by several threads at the same time are all kept.
+
+         Args:
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        with SnapshotCache() as cache:
+            cache.store_snapshot(replace(mock_snapshot_return, tags={}))
+            run_concurrently(lambda number: cache.update_tags('132465789', 'rgtest', 'excluir1', {f'key{number}': 'x'}),
+                             list(range(50)), 16)
+
+            assert cache.get_snapshot('132465789', 'rgtest', 'excluir1').tags == {f'key{number}': 'x' for number in range(50)}
+            assert len(cache.query(tags={'key49': 'x'})) == 1
+
+class TestAzureSnapshotWithCache:
+    """Test class for the AzureSnapshot class backed by a SnapshotCache."""
+
+    def test_listing_is_served_from_cache_when_fresh(self, monkeypatch, mock_snapshot_services, mock_snapshot_list_return):
+        """Tests that a fresh listing is served from the cache without calling Azure.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+             mock_snapshot_list_return: Mock list of snapshots returned.
+        """
+        list_calls = []
+        mock_compute_management_client = mock_az_snapshot_services.ComputeManagementClient
+
+        def counting_client(*args, **kwargs):
+            compute_client = mock_compute_management_client(*args, **kwargs)
+            azure_list = compute_client.snapshots.list
+            compute_client.snapshots.list = lambda *args, **kwargs: list_calls.append(args) or azure_list()
+            return compute_client
+
+        monkeypatch.setattr(mock_az_snapshot_services, "ComputeManagementClient", counting_client)
+
+        snapshot_services = AzureSnapshot(cache=SnapshotCache())
+        first = snapshot_services.list_snapshot_by_subscription_id('132465789')
+        second = snapshot_services.list_snapshot_by_subscription_id('132465789')
+        from_cache = snapshot_services.get_snapshot('132465789', 'rgtest', 'excluir1')
+
+        assert first == second == mock_snapshot_list_return
+        assert from_cache == mock_snapshot_list_return[0]
+        assert len(list_calls) == 1
+
+    def test_update_and_delete_write_through(self, mock_snapshot_services):
+        """Tests that update_snapshot_tag and delete_snapshot are written through to the cache.
+
+         Args:
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        cache = SnapshotCache()
+        snapshot_services = AzureSnapshot(cache=cache)
+        snapshot_services.list_snapshot_by_resource_group('132465789', 'rgtest')
+
+        snapshot_services.update_snapshot_tag('132465789', 'rgtest', 'excluir1', 'Responsible - App', 'owner@example.com')
+        assert cache.get_snapshot('132465789', 'rgtest', 'excluir1').tags == {'Responsible - App': 'owner@example.com'}
+
+        snapshot_services.delete_snapshot('132465789', 'rgtest', 'excluir1')
+        assert cache.list_snapshots('132465789', 'rgtest') == []
+
+    def test_failed_deletions_stay_in_the_cache(self, monkeypatch, mock_snapshot_services):
+        """Tests that a deletion is only written through to the cache once it succeeded, waited for or not.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        compute_client = mock_az_snapshot_services.ComputeManagementClient('credential', '132465789')
+        monkeypatch.setattr(mock_az_snapshot_services, 'ComputeManagementClient', lambda *args, **kwargs: compute_client)
+        poller = MagicMock()
+        poller.result.side_effect = HttpResponseError('The deletion failed.')
+        poller.polling_method.return_value.status.return_value = 'Failed'
+        poller.add_done_callback.side_effect = lambda callback: callback(poller.polling_method())
+        compute_client.snapshots.begin_delete = lambda *args, **kwargs: poller
+
+        cache = SnapshotCache()
+        snapshot_services = AzureSnapshot(cache=cache)
+        snapshot = snapshot_services.list_snapshot_by_resource_group('132465789', 'rgtest')[0]
+
+        results = snapshot_services.delete_snapshots([snapshot.resource_id])
+        snapshot_services.delete_snapshots([snapshot.resource_id], wait=False)
+        snapshot_services.delete_snapshot('132465789', 'rgtest', 'excluir1')
+
+        assert results[0].status is OperationStatus.ERROR
+        assert cache.get_snapshot('132465789', 'rgtest', 'excluir1') == snapshot
+
+    def test_failed_tag_updates_stay_out_of_the_cache(self, monkeypatch, mock_snapshot_services):
+        """Tests that a tag update is only written through to the cache once it succeeded, waited for or not.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        compute_client = mock_az_snapshot_services.ComputeManagementClient('credential', '132465789')
+        monkeypatch.setattr(mock_az_snapshot_services, 'ComputeManagementClient', lambda *args, **kwargs: compute_client)
+        poller = MagicMock()
+        poller.result.side_effect = HttpResponseError('The update failed.')
+        poller.polling_method.return_value.status.return_value = 'Failed'
+        poller.add_done_callback.side_effect = lambda callback: callback(poller.polling_method())
+        compute_client.snapshots.begin_update = lambda *args, **kwargs: poller
+
+        cache = SnapshotCache()
+        snapshot_services = AzureSnapshot(cache=cache)
+        snapshot_services.list_snapshot_by_resource_group('132465789', 'rgtest')
+        resource_id = '/subscriptions/132465789/resourceGroups/rgtest/providers/Microsoft.Compute/snapshots/excluir1'
+
+        results = snapshot_services.update_snapshot_tags([(resource_id, {'Responsible - App': 'bulk@example.com'})])
+        snapshot_services.update_snapshot_tag('132465789', 'rgtest', 'excluir1', 'Responsible - App', 'one@example.com')
+
+        assert results[0].status is OperationStatus.ERROR
+        assert cache.get_snapshot('132465789', 'rgtest', 'excluir1').tags == {'Responsible - App': 'lucasraugi@gmail.com'}
@@ -0,0 +1,115 @@
+"""Tests for the SnapshotFilter class and the filtered listings."""
+from datetime import datetime
+from dataclasses import replace
+import pytest
+import module_snapshot.infra.azure_cloud_services as mock_az_snapshot_services
+from module_snapshot.entities.snapshot_filter import SnapshotFilter, project_model
+from module_snapshot.infra.azure_cloud_services import SnapshotServices
+from module_snapshot.infra.snapshot_cache import SnapshotCache
+from module_snapshot.services.az_snapshot_services import AzureSnapshot
+
+class TestSnapshotFilter:
+    """Test class for the SnapshotFilter class."""
+
+    def test_matches_model(self, mock_snapshot_return):
+        """Tests every criterion against a SnapshotModel.
+
+         Args:
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        assert SnapshotFilter().matches_model(mock_snapshot_return)
+        assert SnapshotFilter(resource_groups={'RGTEST'}, locations={'EastUS'}).matches_model(mock_snapshot_return)
+        assert not SnapshotFilter(resource_groups={'rgother'}).matches_model(mock_snapshot_return)
+        assert SnapshotFilter(tags={'Responsible - App': None}).matches_model(mock_snapshot_return)
+        assert SnapshotFilter(tags={'Responsible - App': lambda value: value.endswith('@gmail.com')}).matches_model(mock_snapshot_return)
+        assert not SnapshotFilter(tags={'Responsible - App': 'someone'}).matches_model(mock_snapshot_return)
+        assert not SnapshotFilter(tags={'env': None}).matches_model(replace(mock_snapshot_return, tags=None))
+        assert SnapshotFilter(created_after=datetime(2023, 6, 8, 21, 25, 28)).matches_model(mock_snapshot_return)
+        assert not SnapshotFilter(created_before=datetime(2023, 6, 8, 21, 25, 28)).matches_model(mock_snapshot_return)
+
+    def test_project_model(self, mock_snapshot_return):
+        """Tests that a projection keeps only the requested fields.
+
+         Args:
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        projected = project_model(mock_snapshot_return, ['resource_id', 'tags'])
+
+        assert projected.resource_id == mock_snapshot_return.resource_id
+        assert projected.tags == mock_snapshot_return.tags
+        assert projected.created_date is None and projected.location is None
+        assert project_model(mock_snapshot_return, None) is mock_snapshot_return
+
+class TestFilteredListings:
+    """Test class for the filter and fields parameters of the list methods."""
+
+    def test_resource_group_filter_lists_each_group_remotely(self, monkeypatch, mock_snapshot_services, mock_snapshot_return):
+        """Tests that a resource group filter on a subscription listing only lists the requested groups.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        mock_compute_management_client = mock_az_snapshot_services.ComputeManagementClient
+        listed_groups = []
+
+        def scoped_client(*args, **kwargs):
+            compute_client = mock_compute_management_client(*args, **kwargs)
+            list_by_resource_group = compute_client.snapshots.list_by_resource_group
+
+            def recording_list(resource_group_name, **kwargs):
+                listed_groups.append(resource_group_name)
+                return list_by_resource_group(resource_group_name)
+
+            compute_client.snapshots.list = lambda *args, **kwargs: pytest.fail("the subscription was listed")
+            compute_client.snapshots.list_by_resource_group = recording_list
+            return compute_client
+
+        monkeypatch.setattr(mock_az_snapshot_services, "ComputeManagementClient", scoped_client)
+
+        snapshots = SnapshotServices().list_by_subscription_id('132465789', SnapshotFilter(resource_groups=['rgtest', 'rgother']))
+
+        assert sorted(listed_groups) == ['rgother', 'rgtest']
+        assert snapshots == [replace(mock_snapshot_return, resource_group_name=name) for name in listed_groups]
+
+    def test_filter_and_fields(self, mock_snapshot_services, mock_snapshot_return):
+        """Tests that AzureSnapshot applies the filter and the projection while listing.
+
+         Args:
+             mock_snapshot_services: Mock object for snapshot services.
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        snapshot_services = AzureSnapshot()
+
+        assert snapshot_services.list_snapshot_by_subscription_id('132465789', snapshot_filter=SnapshotFilter(locations=['westus'])) == []
+        assert snapshot_services.list_snapshot_by_resource_group('132465789', 'rgtest', fields=['resource_id']) == [
+            project_model(mock_snapshot_return, ['resource_id'])
+        ]
+        assert len(snapshot_services.list_snapshot_by_subscription_id(
+            '132465789', as_table=True, snapshot_filter=SnapshotFilter(tags={'Responsible - App': None}))) == 1
+
+    def test_invalid_fields_are_rejected(self, mock_snapshot_services):
+        """Tests that an unknown field raises ValueError before Azure is called.
+
+         Args:
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        with pytest.raises(ValueError):
+            AzureSnapshot().list_snapshot_by_subscription_id('132465789', fields=['disk_size'])
+
+    def test_filter_on_fresh_cache(self, mock_snapshot_services, mock_snapshot_return):
+        """Tests that a fresh cache is filtered and projected without listing Azure again.
+
+         Args:
+             mock_snapshot_services: Mock object for snapshot services.
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        cache = SnapshotCache()
+        cache.store_subscription('132465789', [mock_snapshot_return, replace(mock_snapshot_return, resource_id='other', location='westus')])
+        snapshot_services = AzureSnapshot(cache=cache)
+
+        snapshots = snapshot_services.list_snapshot_by_subscription_id(
+            '132465789', snapshot_filter=SnapshotFilter(locations=['westus']), fields=['resource_id', 'location'])
+
+        assert [(snapshot.resource_id, snapshot.location, snapshot.snapshot_name) for snapshot in snapshots] == [('other', 'westus', None)]
@@ -1,5 +1,9 @@
 """Test for the AzureSnapshot class."""
+import module_snapshot.infra.azure_cloud_services as mock_az_snapshot_services
 from module_snapshot.services.az_snapshot_services import AzureSnapshot
+from module_snapshot.entities.operation_result import OperationStatus
+from module_snapshot.infra.job_tracker import JobTracker
+from module_snapshot.infra.lro_polling import TrackedPolling
 
 class TestAzureSnapshot:
     """Test class for the AzureSnapshot class."""
@@ -146,3 +150,133 @@ class TestAzureSnapshot:
         expected = snapshot_services.delete_snapshot('132465789', 'rgtest', 'excluir1')
 
         assert expected is False
+
+    def test_iter_snapshots_by_subscription_id(self, mock_snapshot_services, mock_snapshot_list_return):
+        """Tests the iter_snapshots_by_subscription_id method of the AzureSnapshot class.
+
+         Args:
+             mock_snapshot_services: Mock object for snapshot services.
+             mock_snapshot_list_return: Mock list of snapshots returned.
+        """
+        snapshot_services = AzureSnapshot()
+        expected = list(snapshot_services.iter_snapshots_by_subscription_id('132465789'))
+
+        assert expected == mock_snapshot_list_return
+
+    def test_iter_snapshot_pages_by_resource_group(self, mock_snapshot_services, mock_snapshot_list_return):
+        """Tests the iter_snapshot_pages_by_resource_group method of the AzureSnapshot class.
+
+         Args:
+             mock_snapshot_services: Mock object for snapshot services.
+             mock_snapshot_list_return: Mock list of snapshots returned.
+        """
+        snapshot_services = AzureSnapshot()
+        expected = list(snapshot_services.iter_snapshot_pages_by_resource_group('132465789', 'rgtest'))
+
+        assert expected == [mock_snapshot_list_return]
+
+    def test_iter_snapshots_by_subscription_id_when_subscription_id_is_not_valid(self, mock_snapshot_services_exception):
+        """Tests that iter_snapshots_by_subscription_id stops without raising when listing fails.
+
+         Args:
+             mock_snapshot_services_exception: Mock object of snapshot services with exception.
+        """
+        snapshot_services = AzureSnapshot()
+        expected = list(snapshot_services.iter_snapshots_by_subscription_id('132465789'))
+
+        assert not expected
+
+    def test_update_snapshot_tags_reports_each_item(self, mock_snapshot_services, mock_snapshot_return):
+        """Tests that update_snapshot_tags returns one result per item with its own status.
+
+         Args:
+             mock_snapshot_services: Mock object for snapshot services.
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        resource_id = mock_snapshot_return.resource_id
+        snapshot_services = AzureSnapshot()
+        expected = snapshot_services.update_snapshot_tags([
+            (resource_id, {'Responsible - App': 'owner@example.com'}),
+            (resource_id, {'Missing': 'value'}),
+            ('not-a-resource-id', {'Responsible - App': 'owner@example.com'}),
+        ], max_workers=2)
+
+        assert [result.status for result in expected] == [OperationStatus.SUCCESS, OperationStatus.TAG_NOT_FOUND, OperationStatus.ERROR]
+        assert [result.resource_id for result in expected] == [resource_id, resource_id, 'not-a-resource-id']
+
+    def test_update_snapshot_tags_by_selector(self, mock_snapshot_services):
+        """Tests that update_snapshot_tags_by_selector only updates the selected snapshots.
+
+         Args:
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        snapshot_services = AzureSnapshot()
+        selected = snapshot_services.update_snapshot_tags_by_selector('132465789', lambda snapshot: snapshot.location == 'eastus', {'Responsible - App': 'owner@example.com'})
+        not_selected = snapshot_services.update_snapshot_tags_by_selector('132465789', lambda snapshot: snapshot.location == 'westus', {'Responsible - App': 'owner@example.com'})
+
+        assert [result.succeeded for result in selected] == [True]
+        assert not_selected == []
+
+    def test_delete_snapshots_waits_for_completion(self, mock_snapshot_services, mock_snapshot_return):
+        """Tests that delete_snapshots waits for each deletion and records its completion time.
+
+         Args:
+             mock_snapshot_services: Mock object for snapshot services.
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        snapshot_services = AzureSnapshot()
+        expected = snapshot_services.delete_snapshots([mock_snapshot_return, 'not-a-resource-id'], max_in_flight=2)
+
+        assert [result.status for result in expected] == [OperationStatus.SUCCESS, OperationStatus.ERROR]
+        assert expected[0].resource_id == mock_snapshot_return.resource_id
+        assert expected[0].duration_seconds >= 0
+        assert expected[1].completed_at is None
+
+    def test_waited_deletions_are_polled_by_the_job_tracker(self, monkeypatch, mock_snapshot_services, mock_snapshot_return):
+        """Tests that waited bulk deletions are submitted to the job tracker with a TrackedPolling each.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        compute_client = mock_az_snapshot_services.ComputeManagementClient('credential', '132465789')
+        monkeypatch.setattr(mock_az_snapshot_services, 'ComputeManagementClient', lambda *args, **kwargs: compute_client)
+        begin_delete, pollings = compute_client.snapshots.begin_delete, []
+        compute_client.snapshots.begin_delete = lambda *args, polling=None, **kwargs: pollings.append(polling) or begin_delete(*args, polling=polling, **kwargs)
+        resource_ids = [f'{mock_snapshot_return.resource_id}{number}' for number in range(12)]
+
+        with JobTracker(max_workers=2) as job_tracker, AzureSnapshot(job_tracker=job_tracker) as snapshot_services:
+            expected = snapshot_services.delete_snapshots(resource_ids, max_in_flight=3)
+            handles = snapshot_services.job_tracker.handles()
+
+        assert [result.resource_id for result in expected] == resource_ids
+        assert all(result.status is OperationStatus.SUCCESS for result in expected)
+        assert len(handles) == 12 and all(isinstance(polling, TrackedPolling) for polling in pollings)
+
+    def test_delete_snapshots_without_waiting_returns_pollers(self, mock_snapshot_services, mock_snapshot_return):
+        """Tests that delete_snapshots with wait=False returns the pollers of the started deletions.
+
+         Args:
+             mock_snapshot_services: Mock object for snapshot services.
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        snapshot_services = AzureSnapshot()
+        expected = snapshot_services.delete_snapshots([mock_snapshot_return.resource_id], wait=False)
+
+        assert expected[0].status is OperationStatus.IN_PROGRESS
+        assert expected[0].poller is not None
+        expected[0].poller.result.assert_not_called()
+
+    def test_delete_snapshots_when_deletion_fails(self, mock_snapshot_services_exception, mock_snapshot_return):
+        """Tests that delete_snapshots reports the deletions that could not be started.
+
+         Args:
+             mock_snapshot_services_exception: Mock object of snapshot services with exception.
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        snapshot_services = AzureSnapshot()
+        expected = snapshot_services.delete_snapshots([mock_snapshot_return.resource_id])
+
+        assert expected[0].status is OperationStatus.ERROR
+        assert expected[0].error is not None
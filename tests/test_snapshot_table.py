@@ -0,0 +1,72 @@
+"""Tests for the SnapshotTable class."""
+from dataclasses import replace
+from module_snapshot.entities.snapshot_table import SnapshotTable, date_to_epoch
+from module_snapshot.services.az_snapshot_services import AzureSnapshot
+
+def inventory(snapshot):
+    """Builds an inventory of three snapshots from a template snapshot."""
+    return [
+        snapshot,
+        replace(snapshot, resource_id=snapshot.resource_id + '2', snapshot_name='excluir2', location='westus',
+                tags={'env': 'prod'}, created_date='2023-01-01 00:00:00'),
+        replace(snapshot, resource_id=snapshot.resource_id + '3', snapshot_name='excluir3', resource_group_name='rgother',
+                tags=None, created_date='2023-03-01 12:00:00'),
+    ]
+
+class TestSnapshotTable:
+    """Test class for the SnapshotTable class."""
+
+    def test_round_trip_with_models(self, mock_snapshot_return):
+        """Tests that converting models to a table and back preserves every field.
+
+         Args:
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        snapshots = inventory(mock_snapshot_return)
+        table = SnapshotTable.from_models(snapshots)
+
+        assert len(table) == 3
+        assert table.to_models() == snapshots
+        assert table[1] == snapshots[1]
+
+    def test_filter(self, mock_snapshot_return):
+        """Tests filtering on encoded columns, tags and creation time.
+
+         Args:
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        table = SnapshotTable.from_models(inventory(mock_snapshot_return))
+
+        assert table.filter(location='westus').column('snapshot_name') == ['excluir2']
+        assert table.filter(location='northeurope').to_models() == []
+        assert table.filter(tags={'Responsible - App': None}).column('snapshot_name') == ['excluir1']
+        assert table.filter(created_before=date_to_epoch('2023-06-01 00:00:00'), resource_group_name='rgtest').column('snapshot_name') == ['excluir2']
+        assert table.filter(lambda snapshot: snapshot.tags is None).column('snapshot_name') == ['excluir3']
+
+    def test_sort_group_and_count(self, mock_snapshot_return):
+        """Tests sorting, grouping and counting by column.
+
+         Args:
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        table = SnapshotTable.from_models(inventory(mock_snapshot_return))
+
+        assert table.sort_by('created_date').column('snapshot_name') == ['excluir2', 'excluir3', 'excluir1']
+        assert table.sort_by('created_date', reverse=True).column('created_date')[0] == '2023-06-08 21:25:28'
+        assert {name: len(group) for name, group in table.group_by('resource_group_name').items()} == {'rgtest': 2, 'rgother': 1}
+        assert table.count_by('location') == {'eastus': 2, 'westus': 1}
+
+    def test_list_snapshot_as_table(self, mock_snapshot_services, mock_snapshot_list_return):
+        """Tests that the AzureSnapshot listing methods can return a SnapshotTable directly.
+
+         Args:
+             mock_snapshot_services: Mock object for snapshot services.
+             mock_snapshot_list_return: Mock list of snapshots returned.
+        """
+        snapshot_services = AzureSnapshot()
+        by_subscription = snapshot_services.list_snapshot_by_subscription_id('132465789', as_table=True)
+        by_resource_group = snapshot_services.list_snapshot_by_resource_group('132465789', 'rgtest', as_table=True)
+
+        assert isinstance(by_subscription, SnapshotTable)
+        assert by_subscription.to_models() == mock_snapshot_list_return
+        assert by_resource_group.to_models() == mock_snapshot_list_return
@@ -0,0 +1,101 @@
+"""Tests for the TagIndex class and its upkeep by AzureSnapshot."""
+from pytest import raises
+from module_snapshot.entities.tag_index import And, HasTag, Not, Or, TagIndex, TagQuery
+from module_snapshot.services.az_snapshot_services import AzureSnapshot
+
+def build_index():
+    """Builds an index of four snapshots."""
+    index = TagIndex()
+    index.add('/s/a', {'env': 'prod', 'owner': 'team-data'})
+    index.add('/s/b', {'Env': 'Prod', 'owner': 'team-web', 'cost-center': '42'})
+    index.add('/s/c', {'env': 'dev', 'owner': 'alice'})
+    index.add('/s/d', None)
+    return index
+
+class TestTagIndex:
+    """Test class for the TagIndex class."""
+
+    def test_exact_and_case_insensitive_lookups(self):
+        """Tests that keys are matched case-insensitively and values only when asked."""
+        index = build_index()
+
+        assert index.query(HasTag('ENV', 'prod')) == ['/s/a']
+        assert index.query(HasTag('env', 'PROD', ignore_case=True)) == ['/s/a', '/s/b']
+        assert index.query(HasTag('env')) == ['/s/a', '/s/b', '/s/c']
+        assert index.query(HasTag('missing', 'x')) == []
+
+    def test_prefix_lookups(self):
+        """Tests prefix matching on values, case-sensitive or not, and on keys."""
+        index = build_index()
+
+        assert index.query(HasTag('owner', 'team-', prefix=True)) == ['/s/a', '/s/b']
+        assert index.query(HasTag('env', 'p', prefix=True)) == ['/s/a']
+        assert index.query(HasTag('env', 'p', prefix=True, ignore_case=True)) == ['/s/a', '/s/b']
+        assert index.query(HasTag('co', prefix=True)) == ['/s/b']
+
+    def test_custom_queries_use_the_public_lookups(self):
+        """Tests that TagQuery is abstract and that a query of its own can be built on lookup() and all_documents()."""
+        class OwnedOutsideTeams(TagQuery):
+            """Matches the snapshots with an owner that is not a team."""
+
+            def evaluate(self, index):
+                """Returns the documents with an owner tag whose value does not start with "team-"."""
+                return index.lookup('owner') - index.lookup('owner', 'team-', prefix=True)
+
+        index = build_index()
+
+        with raises(TypeError):
+            TagQuery()
+        assert index.query(OwnedOutsideTeams()) == ['/s/c']
+        assert index.count(Not(OwnedOutsideTeams())) == len(index.all_documents()) - 1
+
+    def test_boolean_queries(self):
+        """Tests AND, OR and NOT, with their operators."""
+        index = build_index()
+
+        assert index.query(HasTag('env', 'prod', ignore_case=True) & ~HasTag('owner', 'team-web')) == ['/s/a']
+        assert index.query(Or(HasTag('env', 'dev'), HasTag('cost-center'))) == ['/s/b', '/s/c']
+        assert index.query(Not(HasTag('env'))) == ['/s/d']
+        assert index.query(And(~HasTag('env', 'dev'), ~HasTag('owner', 'team', prefix=True))) == ['/s/d']
+        assert index.count(HasTag('owner') | ~HasTag('owner')) == 4
+
+    def test_incremental_updates(self):
+        """Tests that merged tag changes, replaced tags and removals keep the postings exact."""
+        index = build_index()
+
+        index.update_tags('/S/A', {'ENV': 'dev', 'new': 'x'})
+        index.add('/s/c', {'owner': 'bob'})
+        assert index.remove('/s/b') and not index.remove('/s/b')
+        index.update_tags('/s/unknown', {'env': 'prod'})
+
+        assert index.get_tags('/s/a') == {'owner': 'team-data', 'ENV': 'dev', 'new': 'x'}
+        assert index.query(HasTag('env', 'dev')) == ['/s/a']
+        assert index.query(HasTag('env', 'p', prefix=True, ignore_case=True)) == []
+        assert index.query(HasTag('owner', 'b', prefix=True)) == ['/s/c']
+        assert '/s/unknown' not in index and len(index) == 3
+
+        index.add('/s/e', {'env': 'prod'})
+        assert index.query(HasTag('env', 'prod')) == ['/s/e']
+
+    def test_azure_snapshot_keeps_the_index_up_to_date(self, mock_snapshot_services):
+        """Tests that listings feed the index and successful tag updates and deletions update it.
+
+         Args:
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        index = TagIndex()
+        azure_snapshot = AzureSnapshot(tag_index=index)
+        snapshot = azure_snapshot.list_snapshot_by_subscription_id('b12a52ca-48bb-46a0-870d-239dcd058d7e')[0]
+        azure_snapshot.list_snapshot_by_subscription_id('other', fields=['snapshot_name'])
+
+        assert azure_snapshot.tag_index is index
+        assert index.query(HasTag('responsible - app', 'lucas', prefix=True)) == [snapshot.resource_id]
+
+        azure_snapshot.update_snapshot_tag('b12a52ca-48bb-46a0-870d-239dcd058d7e', 'rgtest', 'excluir1', 'Responsible - App', 'ops')
+        assert index.query(HasTag('Responsible - App', 'ops')) == [snapshot.resource_id]
+
+        azure_snapshot.delete_snapshot('b12a52ca-48bb-46a0-870d-239dcd058d7e', 'rgtest', 'excluir1')
+        assert len(index) == 0
+
+        azure_snapshot.list_snapshot_by_subscription_id('sub', as_table=True)
+        assert index.query(HasTag('Responsible - App')) == [snapshot.resource_id]
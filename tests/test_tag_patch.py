@@ -0,0 +1,240 @@
+"""Tests for the tags-only updates of SnapshotServices and AzureSnapshot."""
+import io
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from pytest import fail, raises
+from requests import Response, Session
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from azure.core.credentials import AccessToken
+from azure.core.exceptions import ResourceModifiedError
+from azure.core.pipeline import transport
+import module_snapshot.infra.azure_cloud_services as mock_az_snapshot_services
+from module_snapshot.entities.operation_result import OperationStatus
+from module_snapshot.entities.tag_index import HasTag, TagIndex
+from module_snapshot.infra.credential_provider import CredentialProvider, set_credential_provider
+from module_snapshot.infra.azure_cloud_services import (TAG_DELETE, TAG_MERGE, TAG_REPLACE, SnapshotServices,
+                                                        apply_tag_operation, find_tag)
+from module_snapshot.infra.tags_client import TagsClient
+from module_snapshot.services.az_snapshot_services import AzureSnapshot
+from module_snapshot.utils.tag_exception import TagNotFoundException
+
+RESOURCE_ID = '/subscriptions/sub1/resourceGroups/rgtest/providers/Microsoft.Compute/snapshots/excluir1'
+
+class FakeCredential:
+    """A credential whose access token never expires."""
+
+    def get_token(self, *scopes, **kwargs):
+        """Returns a token valid for an hour, whatever the scopes."""
+        return AccessToken('token', int(time.time()) + 3600)
+
+class FakeTagsAdapter(BaseAdapter):
+    """A requests adapter answering the Tags API requests from memory, as if the snapshot had the tags
+     {'Responsible - App': 'lucas', 'env': 'dev'}."""
+
+    def __init__(self, status_code):
+        super().__init__()
+        self.status_code = status_code
+        self.requests = []
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        """Records the request and answers it with the tags the operation leaves, or a 412."""
+        self.requests.append(request)
+        if self.status_code != 200:
+            body = {'error': {'code': 'PreconditionFailed', 'message': 'The ETag changed.'}}
+        else:
+            changes = json.loads(request.body)
+            tags = apply_tag_operation({'Responsible - App': 'lucas', 'env': 'dev'}, changes['properties']['tags'],
+                                       changes['operation'])
+            body = {'properties': {'tags': tags}}
+
+        response = Response()
+        response.status_code = self.status_code
+        response.reason = 'OK' if self.status_code == 200 else 'Precondition Failed'
+        response.headers = CaseInsensitiveDict({'Content-Type': 'application/json'})
+        response.raw = io.BytesIO(json.dumps(body).encode())
+        response.request = request
+        response.url = request.url
+
+        return response
+
+    def close(self):
+        pass
+
+def patch_compute_client(monkeypatch, status_code=200, etag='"7"'):
+    """Makes every SnapshotServices use one compute client whose reads return the snapshot with the given ETag, or
+     none, and send its Tags API requests to a FakeTagsAdapter through the real azure-core pipeline.
+
+     returns:
+         tuple: The compute client and the list of requests received by the adapter.
+    """
+    compute_client = mock_az_snapshot_services.ComputeManagementClient('credential', 'sub1')
+    monkeypatch.setattr(mock_az_snapshot_services, 'ComputeManagementClient', lambda *args, **kwargs: compute_client)
+    set_credential_provider(CredentialProvider(config=SimpleNamespace(), credential=FakeCredential()))
+
+    adapter = FakeTagsAdapter(status_code)
+    session = Session()
+    session.mount('https://', adapter)
+    monkeypatch.setattr(mock_az_snapshot_services, 'TagsClient', lambda credential, **kwargs: TagsClient(
+        credential, transport=transport.RequestsTransport(session=session, session_owner=False)))
+
+    class PipelineResponse:
+        """The pipeline response given to the cls callback of get()."""
+        class http_response:
+            """The HTTP response of the read, with its ETag header."""
+            headers = {'ETag': etag} if etag is not None else {}
+
+    snapshot = compute_client.snapshots.get()
+    compute_client.snapshots.get = lambda *args, cls=None, **kwargs: cls(PipelineResponse, snapshot, {})
+
+    return compute_client, adapter.requests
+
+class TestTagPatch:
+    """Test class for the tags-only updates."""
+
+    def test_apply_tag_operation(self):
+        """Tests the merge, replace and delete semantics, with keys matched case-insensitively."""
+        tags = {'Env': 'dev', 'owner': 'alice'}
+
+        assert apply_tag_operation(tags, {'env': 'prod', 'team': 'data'}, TAG_MERGE) == {'owner': 'alice', 'env': 'prod', 'team': 'data'}
+        assert apply_tag_operation(tags, {'team': 'data'}, TAG_REPLACE) == {'team': 'data'}
+        assert apply_tag_operation(tags, {'ENV': '', 'missing': ''}, TAG_DELETE) == {'owner': 'alice'}
+        assert apply_tag_operation(tags, {'env': 'dev', 'OWNER': 'bob'}, TAG_DELETE) == {'owner': 'alice'}
+        assert apply_tag_operation(None, {'env': 'prod'}, TAG_MERGE) == {'env': 'prod'}
+        assert tags == {'Env': 'dev', 'owner': 'alice'}
+
+    def test_find_tag_matches_keys_case_insensitively_and_delete_values(self):
+        """Tests that keys are found in any case and that only TAG_DELETE also requires a given value to match."""
+        tags = {'Env': 'dev', 'owner': 'alice'}
+
+        assert find_tag(tags, 'ENV', TAG_MERGE, 'prod') == 'Env'
+        assert find_tag(tags, 'eNv', TAG_DELETE, 'dev') == 'Env'
+        assert find_tag(tags, 'env', TAG_DELETE, '') == 'Env'
+        assert find_tag(tags, 'Owner', TAG_DELETE, 'bob') is None
+        assert find_tag(None, 'env', TAG_MERGE) is None
+
+    def test_patch_tags_sends_one_tags_only_request(self, monkeypatch, mock_snapshot_services):
+        """Tests that several keys are changed by one PATCH of the Tags API, without reading the snapshot.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        compute_client, requests = patch_compute_client(monkeypatch)
+
+        def get(*args, **kwargs):
+            fail('the snapshot must not be read')
+
+        compute_client.snapshots.get = get
+
+        with SnapshotServices() as snapshot_services:
+            merged = snapshot_services.patch_tags('sub1', 'rgtest', 'excluir1', {'env': 'prod', 'team': 'data'}, etag='"1"')
+            replaced = snapshot_services.patch_tags('sub1', 'rgtest', 'excluir1', {'team': 'data'}, TAG_REPLACE)
+
+        assert merged == {'Responsible - App': 'lucas', 'env': 'prod', 'team': 'data'}
+        assert replaced == {'team': 'data'}
+        assert len(requests) == 2
+        assert requests[0].method == 'PATCH'
+        assert requests[0].url == ('https://management.azure.com' + RESOURCE_ID
+                                   + '/providers/Microsoft.Resources/tags/default?api-version=2021-04-01')
+        assert json.loads(requests[0].body) == {'operation': 'Merge', 'properties': {'tags': {'env': 'prod', 'team': 'data'}}}
+        assert requests[0].headers['If-Match'] == '"1"' and 'If-Match' not in requests[1].headers
+        assert requests[0].headers['Authorization'] == 'Bearer token'
+
+        with raises(ValueError):
+            SnapshotServices().patch_tags('sub1', 'rgtest', 'excluir1', {}, 'merge')
+
+    def test_patch_tags_rejected_by_etag(self, monkeypatch, mock_snapshot_services):
+        """Tests that a failed If-Match precondition raises ResourceModifiedError.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        patch_compute_client(monkeypatch, status_code=412)
+
+        with raises(ResourceModifiedError):
+            SnapshotServices().patch_tags('sub1', 'rgtest', 'excluir1', {'env': 'prod'}, etag='"old"')
+
+    def test_patch_tags_with_required_keys_reads_then_writes_with_the_etag_read(self, monkeypatch, mock_snapshot_services):
+        """Tests the read-modify-write fallback: the keys are checked and the new tags are sent with If-Match.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        compute_client, requests = patch_compute_client(monkeypatch)
+        updates = []
+        compute_client.snapshots.begin_update = lambda *args, **kwargs: updates.append((args, kwargs)) or MagicMock()
+
+        with SnapshotServices() as snapshot_services:
+            new_tags = snapshot_services.patch_tags('sub1', 'rgtest', 'excluir1', {'Responsible - App': ''}, TAG_DELETE,
+                                                    require_existing=True)
+            merged = snapshot_services.patch_tags('sub1', 'rgtest', 'excluir1', {'RESPONSIBLE - APP': 'ops'}, require_existing=True)
+            with raises(TagNotFoundException):
+                snapshot_services.patch_tags('sub1', 'rgtest', 'excluir1', {'missing': 'x'}, require_existing=True)
+            with raises(TagNotFoundException):
+                snapshot_services.patch_tags('sub1', 'rgtest', 'excluir1', {'Responsible - App': 'someone else'}, TAG_DELETE,
+                                             require_existing=True)
+
+        (resource_group_name, snapshot_name, snapshot_update), kwargs = updates[0]
+        assert not new_tags and not requests and len(updates) == 2
+        assert merged == {'RESPONSIBLE - APP': 'ops'}
+        assert (resource_group_name, snapshot_name, snapshot_update.tags) == ('rgtest', 'excluir1', {})
+        assert kwargs['headers'] == {'If-Match': '"7"'}
+
+    def test_patch_tags_with_required_keys_never_writes_without_an_etag(self, monkeypatch, mock_snapshot_services):
+        """Tests that the read-modify-write fallback is refused when the read has no ETag and the caller gave none.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        compute_client, _ = patch_compute_client(monkeypatch, etag=None)
+        updates = []
+        compute_client.snapshots.begin_update = lambda *args, **kwargs: updates.append(kwargs['headers']) or MagicMock()
+
+        with AzureSnapshot() as azure_snapshot:
+            unguarded = azure_snapshot.patch_snapshot_tags(RESOURCE_ID, {'Responsible - App': 'ops'}, require_existing=True)
+            guarded = azure_snapshot.patch_snapshot_tags(RESOURCE_ID, {'Responsible - App': 'ops'}, etag='"3"',
+                                                         require_existing=True)
+
+        assert unguarded.status is OperationStatus.CONFLICT and isinstance(unguarded.error, ResourceModifiedError)
+        assert guarded.succeeded and updates == [{'If-Match': '"3"'}]
+
+    def test_azure_snapshot_records_the_new_tags(self, monkeypatch, mock_snapshot_services):
+        """Tests that AzureSnapshot reports each outcome and replaces the indexed tags with the ones returned.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        patch_compute_client(monkeypatch)
+        index = TagIndex()
+        index.add(RESOURCE_ID, {'Responsible - App': 'lucas', 'env': 'dev'})
+
+        with AzureSnapshot(tag_index=index) as azure_snapshot:
+            result = azure_snapshot.patch_snapshot_tags(RESOURCE_ID, {'env': ''}, 'Delete')
+            missing = azure_snapshot.patch_snapshot_tags(RESOURCE_ID, {'missing': 'x'}, require_existing=True)
+            invalid = azure_snapshot.patch_snapshot_tags('not-an-id', {'env': 'prod'})
+
+        assert result.succeeded and result.tags == {'Responsible - App': 'lucas'}
+        assert index.query(HasTag('env')) == [] and index.get_tags(RESOURCE_ID) == {'Responsible - App': 'lucas'}
+        assert missing.status is OperationStatus.TAG_NOT_FOUND
+        assert invalid.status is OperationStatus.ERROR
+
+    def test_azure_snapshot_reports_conflicts(self, monkeypatch, mock_snapshot_services):
+        """Tests that a rejected ETag is reported as a CONFLICT.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+        """
+        patch_compute_client(monkeypatch, status_code=412)
+
+        with AzureSnapshot() as azure_snapshot:
+            result = azure_snapshot.patch_snapshot_tags(RESOURCE_ID, {'env': 'prod'}, etag='"old"')
+
+        assert result.status is OperationStatus.CONFLICT and result.tags is None
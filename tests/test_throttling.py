@@ -0,0 +1,186 @@
+"""Tests for the rate limiter and retry policy."""
+from unittest.mock import MagicMock
+import pytest
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+import module_snapshot.infra.azure_cloud_services as mock_az_snapshot_services
+from module_snapshot.infra.azure_cloud_services import SnapshotServices
+from module_snapshot.infra.throttling import READ, RateLimiter, RetryPolicy, Throttle, TokenBucket, retry_after_seconds
+from tests.conftest import mock_pager
+
+class FakeClock:
+    """A clock that only advances when something sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        """Records the delay and advances the clock by it."""
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+def throttled_error(status_code=429, headers=None):
+    """Builds an HttpResponseError as raised by the SDK for a given status."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return HttpResponseError(response=response)
+
+class TestTokenBucket:
+    """Test class for the TokenBucket class."""
+
+    def test_waits_once_the_burst_is_spent(self):
+        """Tests that the burst is served immediately and the next tokens at the refill rate."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=2, clock=clock, sleep=clock.sleep)
+
+        assert bucket.acquire() == 0 and bucket.acquire() == 0
+        assert bucket.acquire() == pytest.approx(0.5)
+
+    def test_pause_and_limit(self):
+        """Tests that a pause delays every token and that limit() caps the available tokens."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, capacity=100, clock=clock, sleep=clock.sleep)
+
+        bucket.limit(3)
+        assert bucket.tokens == 3
+
+        bucket.pause(5)
+        assert bucket.acquire() == pytest.approx(5)
+
+class TestThrottle:
+    """Test class for the Throttle class."""
+
+    def test_retry_after_header(self):
+        """Tests the parsing of the retry headers."""
+        assert retry_after_seconds({'retry-after': '7'}) == 7
+        assert retry_after_seconds({'retry-after-ms': '1500'}) == 1.5
+        assert retry_after_seconds({'retry-after': 'soon'}) is None
+        assert retry_after_seconds(None) is None
+
+    def test_call_honors_retry_after(self):
+        """Tests that a throttled call pauses the subscription for Retry-After and is sent again."""
+        clock = FakeClock()
+        throttle = Throttle(RateLimiter(clock=clock, sleep=clock.sleep), sleep=clock.sleep)
+        responses = [throttled_error(headers={'retry-after': '3'}), 'snapshot']
+
+        def operation(*args, **kwargs):
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        assert throttle.call('sub', READ, operation) == 'snapshot'
+        assert clock.sleeps == [pytest.approx(3)]
+
+    def test_call_does_not_retry_permanent_errors(self):
+        """Tests that a not-found error is raised at once."""
+        throttle = Throttle(retry_policy=RetryPolicy(max_attempts=3), sleep=lambda seconds: None)
+        calls = []
+
+        def operation(**kwargs):
+            calls.append(kwargs)
+            raise ResourceNotFoundError('not found')
+
+        with pytest.raises(ResourceNotFoundError):
+            throttle.call('sub', READ, operation)
+        assert len(calls) == 1
+        assert 'raw_response_hook' in calls[0]
+
+    def test_call_gives_up_after_max_attempts(self):
+        """Tests that server errors are retried with jittered backoff up to max_attempts."""
+        sleeps = []
+        throttle = Throttle(retry_policy=RetryPolicy(max_attempts=3, backoff=1), sleep=sleeps.append)
+
+        def operation(**kwargs):
+            raise throttled_error(status_code=503)
+
+        with pytest.raises(HttpResponseError):
+            throttle.call('sub', READ, operation)
+        assert len(sleeps) == 2
+        assert 0 <= sleeps[0] <= 1 and 0 <= sleeps[1] <= 2
+
+    def test_response_headers_limit_the_bucket(self):
+        """Tests that the remaining-requests header observed by the hook lowers the tokens of the subscription."""
+        limiter = RateLimiter()
+        throttle = Throttle(limiter)
+
+        def operation(raw_response_hook):
+            pipeline_response = MagicMock()
+            pipeline_response.http_response.status_code = 200
+            pipeline_response.http_response.headers = {'x-ms-ratelimit-remaining-subscription-reads': '4'}
+            raw_response_hook(pipeline_response)
+
+        throttle.call('sub', READ, operation)
+
+        assert limiter.bucket('sub', READ).tokens < 5
+        assert limiter.bucket('other', READ).tokens > 200
+
+    def test_iter_pages_resumes_from_the_last_page(self):
+        """Tests that a throttled page is requested again from the continuation token of the previous page."""
+        pager = mock_pager([1, 2, 3], page_size=1)
+        failures = [throttled_error(headers={'retry-after': '0'})]
+        tokens = []
+
+        class FlakyPager:
+            """A pager whose second page is throttled once."""
+
+            def __init__(self):
+                self.pages = None
+
+            def by_page(self, continuation_token=None):
+                """Restarts the listing from a continuation token."""
+                tokens.append(continuation_token)
+                self.pages = pager.by_page(continuation_token=continuation_token)
+                return self
+
+            def __next__(self):
+                if self.continuation_token == 1 and failures:
+                    raise failures.pop()
+                return next(self.pages)
+
+            @property
+            def continuation_token(self):
+                """The continuation token of the last page returned."""
+                return self.pages.continuation_token
+
+        throttle = Throttle(sleep=lambda seconds: None)
+
+        assert list(throttle.iter_pages('sub', lambda **kwargs: FlakyPager())) == [[1], [2], [3]]
+        assert tokens == [None, 1]
+
+    def test_snapshot_services_retry_throttled_get(self, monkeypatch, mock_snapshot_services, mock_snapshot_return):
+        """Tests that SnapshotServices sends a throttled request again instead of failing.
+
+         Args:
+             monkeypatch: Object used to patch methods during tests.
+             mock_snapshot_services: Mock object for snapshot services.
+             mock_snapshot_return: Mock of a returned snapshot.
+        """
+        mock_compute_management_client = mock_az_snapshot_services.ComputeManagementClient
+        failures = [throttled_error(headers={'retry-after': '0'})]
+        client_options = []
+
+        def throttled_client(*args, **kwargs):
+            client_options.append(kwargs)
+            compute_client = mock_compute_management_client(*args, **kwargs)
+            get = compute_client.snapshots.get
+
+            def flaky_get(*args, **kwargs):
+                if failures:
+                    raise failures.pop()
+                return get(*args, **kwargs)
+
+            compute_client.snapshots.get = flaky_get
+            return compute_client
+
+        monkeypatch.setattr(mock_az_snapshot_services, "ComputeManagementClient", throttled_client)
+
+        snapshot_services = SnapshotServices(throttle=Throttle(sleep=lambda seconds: None))
+
+        assert snapshot_services.get('132465789', 'rgtest', 'excluir1') == mock_snapshot_return
+        assert not failures
+        assert client_options == [{'retry_total': 0}]